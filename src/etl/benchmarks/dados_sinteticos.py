@@ -0,0 +1,327 @@
+"""
+Script para gerar versões sintéticas, em escala de produção, dos arquivos de origem
+(CSV) dos cinco datasets.
+
+Os dados são gerados a partir da versão mais recente de cada dataset na camada Raw
+(os valores exatamente como lidos dos arquivos de origem), copiada até atingir a
+quantidade de linhas desejada. Assim, os formatos, categorias e problemas dos dados
+reais (duplicidades, colunas deslocadas, códigos de filial incorretos etc.) aparecem
+nas mesmas proporções. Em cada cópia, as colunas de `COLUNAS_VARIACAO` (cliente,
+código da peça, modelo do veículo, número da OS) recebem o número da cópia, para que
+as cópias não sejam duplicatas umas das outras.
+
+Além dos problemas já existentes, cada lote recebe, na proporção `--taxa-sujeira`,
+os problemas de `SUJEIRAS` de cada dataset: linhas duplicadas, código de filial
+"01/01/2002", valores negativos de dias em estoque e de horas de serviço, custo da
+peça igual a zero e linhas com colunas deslocadas.
+
+Os arquivos são gravados em lotes, sem manter o dataset completo em memória.
+
+Uso (a partir da raiz do projeto):
+    python -m src.etl.benchmarks.dados_sinteticos --linhas 1000000 --destino dados
+    python -m src.etl.benchmarks.dados_sinteticos --linhas 100000000 --destino dados \\
+        --datasets historico-venda-pecas --taxa-sujeira 0.05
+"""
+
+import argparse
+import math
+import re
+import polars as pl
+
+from pathlib import Path
+from src.etl.pipeline import DATASETS
+from src.ferramentas.catalogo import ultima_versao
+from src.ferramentas.funcoes_suporte import COLUNA_ARQUIVO_ORIGEM
+
+# region ----- Caminho Arquivos Raw -----
+RAW_PATH: Path = Path(__file__).parent.parent / "data" / "0-raw"
+# endregion
+
+
+# region ----- Configuração dos Datasets -----
+# Arquivo de origem e separador de cada dataset (conforme os scripts da camada Raw)
+ARQUIVOS_ORIGEM: dict = {
+    "estoque-pecas": ("estoque-atual-de-pecas.csv", ","),
+    "estoque-veiculos": ("estoque-atual-de-veiculos.csv", ";"),
+    "historico-servicos": ("historico-de-servicos-realizados.csv", ","),
+    "historico-venda-pecas": ("historico-de-vendas-de-pecas.csv", ","),
+    "historico-venda-veiculos": ("historico-de-vendas-de-veiculos.csv", ";"),
+}
+
+# Colunas que recebem o número da cópia, para que as cópias não sejam duplicatas
+# umas das outras
+COLUNAS_VARIACAO: dict = {
+    "estoque-pecas": ["Codigo_da_Peca_no_Estoque"],
+    "estoque-veiculos": ["Modelo_do_Veiculo"],
+    "historico-servicos": [
+        "Numero_Da_OS_De_Servico",
+        "Nome_Do_Cliente_Que_Fez_O_Servico",
+    ],
+    "historico-venda-pecas": ["Nome_do_Comprador_da_Peca"],
+    "historico-venda-veiculos": ["Nome_do_Comprador_do_Veiculo"],
+}
+
+# Problemas incluídos em cada lote, na proporção `--taxa-sujeira`:
+# - duplicadas: cópias exatas de linhas do lote;
+# - filial_como_data: código da filial salvo como data (ex.: "01/01/2002");
+# - valor_negativo: valor da coluna com sinal negativo;
+# - valor_zero: valor da coluna igual a zero;
+# - colunas_deslocadas: linhas reais com as colunas deslocadas para a direita (com
+#   valor na coluna sem nome), copiadas dos dados originais.
+SUJEIRAS: dict = {
+    "estoque-pecas": [("duplicadas", None)],
+    "estoque-veiculos": [("duplicadas", None)],
+    "historico-servicos": [
+        ("duplicadas", None),
+        ("filial_como_data", "Cod_Filial"),
+        ("valor_negativo", "Tempo_Que_O_Servico_Levou_Para_Ser_Realizado_em_Horas"),
+    ],
+    "historico-venda-pecas": [
+        ("duplicadas", None),
+        ("filial_como_data", "Cod_Filial"),
+        ("valor_zero", "Custo_da_Peca"),
+    ],
+    "historico-venda-veiculos": [
+        ("duplicadas", None),
+        ("filial_como_data", "Cod_Filial"),
+        ("valor_negativo", "Dias_que_o_Carro_Ficou_no_Estoque"),
+        ("colunas_deslocadas", ""),
+    ],
+}
+
+FILIAL_COMO_DATA: str = "01/01/2002"
+
+# Quantidade aproximada de linhas de cada lote gravado
+TAMANHO_LOTE: int = 1_000_000
+# endregion
+
+
+# region ----- Geração -----
+def ler_original(dataset: str) -> tuple[pl.DataFrame, list]:
+    """
+    Lê a versão mais recente de um dataset da camada Raw, sem as colunas de controle
+    do ETL, e o cabeçalho original do arquivo de origem.
+
+    Args:
+        dataset (str): Nome do dataset.
+
+    Returns:
+        tuple[pl.DataFrame, list]: Dataset original e nomes das colunas no arquivo
+            de origem (colunas repetidas voltam a ter o mesmo nome).
+    """
+    df: pl.DataFrame = pl.read_parquet(source=ultima_versao(RAW_PATH / dataset)).drop(
+        COLUNA_ARQUIVO_ORIGEM, strict=False
+    )
+    cabecalho: list = [re.sub(r"_duplicated_\d+$", "", coluna) for coluna in df.columns]
+
+    return df, cabecalho
+
+
+def variar_copia(df: pl.DataFrame, dataset: str, copia: int) -> pl.DataFrame:
+    """
+    Inclui o número da cópia nas colunas de `COLUNAS_VARIACAO` do dataset.
+
+    Args:
+        df (pl.DataFrame): Dataset original.
+        dataset (str): Nome do dataset.
+        copia (int): Número da cópia (a cópia 0 é mantida sem alterações).
+
+    Returns:
+        pl.DataFrame: Cópia do dataset.
+    """
+    if copia == 0 or not COLUNAS_VARIACAO[dataset]:
+        return df
+
+    return df.with_columns(
+        pl.format("{}-{}", pl.col(coluna), pl.lit(copia)).alias(coluna)
+        for coluna in COLUNAS_VARIACAO[dataset]
+    )
+
+
+def sortear_linhas(taxa: float, semente: int) -> pl.Expr:
+    """
+    Sorteia, sem repetição, a proporção informada das linhas do lote.
+
+    Args:
+        taxa (float): Proporção das linhas sorteadas.
+        semente (int): Semente do sorteio.
+
+    Returns:
+        pl.Expr: Expressão booleana, verdadeira nas linhas sorteadas.
+    """
+    return pl.int_range(pl.len()).shuffle(seed=semente) < pl.len() * taxa
+
+
+def sujar_lote(
+    df: pl.DataFrame,
+    dataset: str,
+    taxa: float,
+    semente: int,
+    deslocadas: pl.DataFrame,
+) -> pl.DataFrame:
+    """
+    Inclui no lote os problemas de `SUJEIRAS` do dataset.
+
+    Args:
+        df (pl.DataFrame): Lote de cópias do dataset original.
+        dataset (str): Nome do dataset.
+        taxa (float): Proporção das linhas do lote com cada problema.
+        semente (int): Semente dos sorteios do lote.
+        deslocadas (pl.DataFrame): Linhas originais com colunas deslocadas.
+
+    Returns:
+        pl.DataFrame: Lote com os problemas incluídos.
+    """
+    if taxa <= 0:
+        return df
+
+    quantidade: int = math.ceil(df.height * taxa)
+    adicionais: list = []
+
+    for indice, (sujeira, coluna) in enumerate(SUJEIRAS[dataset]):
+        sorteadas: pl.Expr = sortear_linhas(taxa, semente + indice)
+
+        if sujeira == "duplicadas":
+            adicionais.append(df.filter(sorteadas))
+        elif sujeira == "filial_como_data":
+            df = df.with_columns(
+                pl.when(sorteadas)
+                .then(pl.lit(FILIAL_COMO_DATA))
+                .otherwise(pl.col(coluna))
+                .alias(coluna)
+            )
+        elif sujeira == "valor_negativo":
+            df = df.with_columns(
+                pl.when(sorteadas & ~pl.col(coluna).str.starts_with("-"))
+                .then(pl.format("-{}", pl.col(coluna)))
+                .otherwise(pl.col(coluna))
+                .alias(coluna)
+            )
+        elif sujeira == "valor_zero":
+            df = df.with_columns(
+                pl.when(sorteadas)
+                .then(pl.lit("0.0"))
+                .otherwise(pl.col(coluna))
+                .alias(coluna)
+            )
+        elif sujeira == "colunas_deslocadas" and not deslocadas.is_empty():
+            adicionais.append(
+                deslocadas.sample(
+                    n=quantidade, with_replacement=True, seed=semente + indice
+                )
+            )
+
+    return pl.concat([df] + adicionais)
+
+
+def gerar_dataset(
+    dataset: str, linhas: int, destino: Path, taxa: float, semente: int = 0
+) -> Path:
+    """
+    Gera o arquivo de origem sintético de um dataset, gravado em lotes.
+
+    Args:
+        dataset (str): Nome do dataset.
+        linhas (int): Quantidade de linhas do arquivo gerado.
+        destino (Path): Pasta onde o arquivo será salvo.
+        taxa (float): Proporção das linhas de cada lote com cada problema.
+        semente (int): Semente dos sorteios.
+
+    Returns:
+        Path: Caminho do arquivo gerado.
+    """
+    nome_arquivo, separador = ARQUIVOS_ORIGEM[dataset]
+    original, cabecalho = ler_original(dataset)
+
+    # Linhas originais com colunas deslocadas (valor na coluna sem nome)
+    deslocadas: pl.DataFrame = (
+        original.filter(pl.col("").is_not_null())
+        if "" in original.columns
+        else original.clear()
+    )
+
+    copias_por_lote: int = max(1, TAMANHO_LOTE // original.height)
+    destino.mkdir(parents=True, exist_ok=True)
+    arquivo: Path = destino / nome_arquivo
+
+    gravadas: int = 0
+    copia: int = 0
+    with open(arquivo, "wb") as saida:
+        saida.write((separador.join(cabecalho) + "\n").encode("utf-8"))
+
+        while gravadas < linhas:
+            lote: pl.DataFrame = pl.concat(
+                variar_copia(original, dataset, copia + i)
+                for i in range(copias_por_lote)
+            )
+            lote = sujar_lote(
+                lote,
+                dataset=dataset,
+                taxa=taxa,
+                semente=semente + copia,
+                deslocadas=deslocadas,
+            )
+
+            # As linhas incluídas são distribuídas pelo lote antes do corte do
+            # último lote na quantidade de linhas desejada
+            lote = lote.sample(fraction=1, shuffle=True, seed=semente + copia).head(
+                linhas - gravadas
+            )
+
+            lote.write_csv(saida, include_header=False, separator=separador)
+            gravadas += lote.height
+            copia += copias_por_lote
+
+    return arquivo
+
+
+# endregion
+
+
+# region ----- Linha de Comando -----
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Gera os arquivos de origem sintéticos dos datasets."
+    )
+    parser.add_argument(
+        "--linhas",
+        type=int,
+        default=1_000_000,
+        help="Quantidade de linhas de cada arquivo gerado.",
+    )
+    parser.add_argument(
+        "--destino",
+        type=Path,
+        required=True,
+        help="Pasta onde os arquivos serão salvos.",
+    )
+    parser.add_argument(
+        "--datasets",
+        nargs="+",
+        choices=DATASETS,
+        default=DATASETS,
+        help="Datasets a serem gerados (padrão: todos).",
+    )
+    parser.add_argument(
+        "--taxa-sujeira",
+        type=float,
+        default=0.01,
+        help="Proporção das linhas com cada problema incluído (padrão: 0.01).",
+    )
+    parser.add_argument("--semente", type=int, default=0, help="Semente dos sorteios.")
+    args = parser.parse_args()
+
+    for dataset in args.datasets:
+        arquivo: Path = gerar_dataset(
+            dataset=dataset,
+            linhas=args.linhas,
+            destino=args.destino,
+            taxa=args.taxa_sujeira,
+            semente=args.semente,
+        )
+        print(f"{dataset}: {arquivo}")
+
+
+if __name__ == "__main__":
+    main()
+# endregion
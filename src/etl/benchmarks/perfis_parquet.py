@@ -0,0 +1,158 @@
+"""
+Script para comparar os perfis de escrita Parquet (ver `PERFIS_ESCRITA`) nos datasets
+da camada Trusted.
+
+Para cada dataset e perfil são apresentados o tamanho do arquivo, o tempo de leitura
+completa e o tempo de uma leitura filtrada (scan com filtro), que se beneficia das
+estatísticas dos grupos de linhas.
+
+Uso (a partir da raiz do projeto):
+    python -m src.etl.benchmarks.perfis_parquet --repeticoes 5
+"""
+
+import argparse
+import statistics
+import tempfile
+import time
+import polars as pl
+
+from datetime import timedelta
+from pathlib import Path
+from src.etl.pipeline import DATASETS
+from src.ferramentas.catalogo import ultima_versao
+from src.ferramentas.funcoes_suporte import (
+    PERFIS_ESCRITA,
+    ler_parquet_particionado,
+    salvar_parquet,
+)
+
+# region ----- Caminho Arquivos Trusted -----
+TRUSTED_PATH: Path = Path(__file__).parent.parent / "data" / "1-trusted"
+# endregion
+
+
+# region ----- Suporte -----
+def filtro_do_dataset(df: pl.DataFrame) -> pl.Expr:
+    """
+    Monta um filtro representativo das consultas feitas no dataset: o último mês da
+    primeira coluna de data ou, caso não exista, o valor mais comum da primeira
+    coluna de texto.
+
+    Args:
+        df (pl.DataFrame): Dataset avaliado.
+
+    Returns:
+        pl.Expr: Expressão do filtro.
+    """
+    colunas_data: list = [c for c, t in df.schema.items() if t == pl.Date]
+    if colunas_data:
+        data_maxima = df[colunas_data[0]].max()
+        return pl.col(colunas_data[0]) >= data_maxima - timedelta(days=30)
+
+    coluna_texto: str = next(c for c, t in df.schema.items() if t == pl.String)
+    valor_mais_comum = df[coluna_texto].mode().first()
+    return pl.col(coluna_texto) == valor_mais_comum
+
+
+def medir(funcao, repeticoes: int) -> float:
+    """
+    Mede o tempo de execução (mediana das repetições) de uma função.
+
+    Args:
+        funcao: Função sem argumentos a ser medida.
+        repeticoes (int): Quantidade de execuções.
+
+    Returns:
+        float: Mediana do tempo de execução, em milissegundos.
+    """
+    tempos: list = []
+    for _ in range(repeticoes):
+        inicio: float = time.perf_counter()
+        funcao()
+        tempos.append((time.perf_counter() - inicio) * 1000)
+
+    return statistics.median(tempos)
+
+
+# endregion
+
+
+# region ----- Benchmark -----
+def comparar_perfis(repeticoes: int) -> pl.DataFrame:
+    """
+    Salva a versão mais recente de cada dataset da camada Trusted com cada perfil de
+    escrita, em uma pasta temporária, e mede o tamanho e os tempos de leitura.
+
+    Args:
+        repeticoes (int): Quantidade de execuções de cada leitura.
+
+    Returns:
+        pl.DataFrame: Resultado por dataset e perfil.
+    """
+    resultados: list = []
+
+    with tempfile.TemporaryDirectory() as pasta_temporaria:
+        for dataset in DATASETS:
+            pasta_dataset: Path = TRUSTED_PATH / dataset
+            if not pasta_dataset.exists():
+                print(f"[benchmark] {dataset} sem arquivos na camada Trusted")
+                continue
+
+            arquivo_trusted: Path = ultima_versao(pasta_dataset)
+            df: pl.DataFrame = ler_parquet_particionado(path=arquivo_trusted).collect()
+            filtro: pl.Expr = filtro_do_dataset(df)
+
+            for perfil in PERFIS_ESCRITA:
+                file_name: str = f"{dataset}-{perfil}.parquet"
+                arquivo: Path = Path(pasta_temporaria) / file_name
+                salvar_parquet(
+                    df=df,
+                    file_name=file_name,
+                    path=Path(pasta_temporaria),
+                    perfil=perfil,
+                )
+
+                resultados.append(
+                    {
+                        "dataset": dataset,
+                        "perfil": perfil,
+                        "linhas": df.height,
+                        "tamanho_kb": round(arquivo.stat().st_size / 1024, 2),
+                        "leitura_ms": medir(
+                            lambda: pl.read_parquet(source=arquivo), repeticoes
+                        ),
+                        "leitura_filtrada_ms": medir(
+                            lambda: pl.scan_parquet(source=arquivo)
+                            .filter(filtro)
+                            .collect(),
+                            repeticoes,
+                        ),
+                    }
+                )
+
+    return pl.DataFrame(resultados)
+
+
+# endregion
+
+
+# region ----- Linha de Comando -----
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Compara os perfis de escrita Parquet nos datasets Trusted."
+    )
+    parser.add_argument(
+        "--repeticoes",
+        type=int,
+        default=5,
+        help="Quantidade de execuções de cada leitura (é utilizada a mediana).",
+    )
+    args = parser.parse_args()
+
+    with pl.Config(tbl_rows=-1, tbl_cols=-1):
+        print(comparar_perfis(repeticoes=max(1, args.repeticoes)))
+
+
+if __name__ == "__main__":
+    main()
+# endregion
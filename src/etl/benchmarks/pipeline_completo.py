@@ -0,0 +1,307 @@
+"""
+Script para medir o tempo e o pico de memória de cada etapa das camadas Raw e Trusted
+com arquivos de origem sintéticos em escala de produção (ver `dados_sinteticos.py`).
+
+Os scripts do ETL são copiados para uma área temporária, com os arquivos de origem
+sintéticos em `src/datasets`. Como os scripts definem as pastas de dados a partir do
+próprio caminho, os dados do projeto não são lidos nem alterados. Cada etapa é
+executada em um processo novo, na ordem das dependências, de forma que o pico de
+memória (RSS máximo do processo) de uma etapa não interfira nas demais.
+
+Os resultados podem ser comparados com as referências gravadas em `baselines.json`
+(por quantidade de linhas), indicando as etapas cujo tempo ou pico de memória ficou
+acima da tolerância. As referências dependem da máquina e devem ser gravadas novamente
+(`--salvar-baseline`) quando o benchmark for executado em outro ambiente.
+
+Uso (a partir da raiz do projeto):
+    python -m src.etl.benchmarks.pipeline_completo --linhas 1000000
+    python -m src.etl.benchmarks.pipeline_completo --linhas 1000000 --salvar-baseline
+    python -m src.etl.benchmarks.pipeline_completo --linhas 10000000 \\
+        --datasets historico-venda-pecas --tolerancia 0.5
+"""
+
+import argparse
+import json
+import multiprocessing
+import resource
+import runpy
+import shutil
+import sys
+import tempfile
+import time
+import polars as pl
+
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from src.etl.benchmarks.dados_sinteticos import gerar_dataset
+from src.etl.pipeline import DATASETS, SCRIPTS_PATH
+from src.ferramentas.catalogo import ler_ultima_versao
+
+# region ----- Caminho Arquivos -----
+BASELINES_PATH: Path = Path(__file__).parent / "baselines.json"
+
+# Camadas medidas, na ordem de execução, e sufixo dos scripts de cada camada
+CAMADAS: list = [("0-raw", "raw"), ("1-trusted", "trusted")]
+# endregion
+
+
+# region ----- Suporte -----
+def preparar_area(area: Path) -> Path:
+    """
+    Copia os scripts do ETL para a área do benchmark.
+
+    Args:
+        area (Path): Pasta da área do benchmark (equivalente à raiz do projeto).
+
+    Returns:
+        Path: Pasta dos arquivos de origem da área (`src/datasets`).
+    """
+    shutil.copytree(
+        SCRIPTS_PATH,
+        area / "src" / "etl" / "scripts",
+        ignore=shutil.ignore_patterns("__pycache__"),
+        dirs_exist_ok=True,
+    )
+
+    return area / "src" / "datasets"
+
+
+def executar_etapa(script: Path) -> tuple:
+    """
+    Executa um script do ETL como se fosse chamado pela linha de comando.
+
+    Executada em um processo separado, retornando o pico de memória do processo.
+
+    Args:
+        script (Path): Caminho do script na área do benchmark.
+
+    Returns:
+        tuple: Tempo de execução (segundos) e pico de memória do processo (MB).
+    """
+    inicio: float = time.perf_counter()
+    runpy.run_path(path_name=str(script), run_name="__main__")
+    segundos: float = time.perf_counter() - inicio
+
+    # ru_maxrss é informado em KB no Linux e em bytes no macOS
+    pico: int = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    pico_mb: float = pico / 1024**2 if sys.platform == "darwin" else pico / 1024
+
+    return segundos, pico_mb
+
+
+# endregion
+
+
+# region ----- Benchmark -----
+def medir_etapas(datasets: list, area: Path) -> pl.DataFrame:
+    """
+    Executa as etapas das camadas Raw e Trusted de cada dataset na área do benchmark.
+
+    Args:
+        datasets (list): Datasets avaliados.
+        area (Path): Pasta da área do benchmark, com os arquivos de origem gerados.
+
+    Returns:
+        pl.DataFrame: Linhas gravadas, tempo e pico de memória de cada etapa.
+    """
+    resultados: list = []
+
+    for dataset in datasets:
+        for camada, sufixo in CAMADAS:
+            etapa: str = f"{dataset}-{sufixo}"
+            script: Path = area / "src" / "etl" / "scripts" / camada / f"{etapa}.py"
+
+            # Um processo novo por etapa, para medir o pico de memória isolado
+            with ProcessPoolExecutor(
+                max_workers=1, mp_context=multiprocessing.get_context("spawn")
+            ) as executor:
+                segundos, pico_mb = executor.submit(executar_etapa, script).result()
+
+            registro: dict | None = ler_ultima_versao(
+                area / "src" / "etl" / "data" / camada / dataset
+            )
+            resultados.append(
+                {
+                    "etapa": etapa,
+                    "linhas": registro["linhas"] if registro is not None else None,
+                    "segundos": round(segundos, 3),
+                    "pico_memoria_mb": round(pico_mb, 1),
+                }
+            )
+            print(f"[benchmark] {etapa}: {segundos:.2f}s, {pico_mb:.0f} MB")
+
+    return pl.DataFrame(resultados)
+
+
+def ler_baselines() -> dict:
+    """
+    Lê as referências gravadas do benchmark.
+
+    Returns:
+        dict: Referências por quantidade de linhas e etapa. Vazio caso o arquivo
+            ainda não exista.
+    """
+    if not BASELINES_PATH.exists():
+        return {}
+
+    with open(BASELINES_PATH, "r", encoding="utf-8") as arquivo:
+        return json.load(arquivo)
+
+
+def salvar_baselines(df: pl.DataFrame, linhas: int) -> None:
+    """
+    Grava os resultados como referência da quantidade de linhas informada, mantendo
+    as referências das demais quantidades e das etapas não executadas.
+
+    Args:
+        df (pl.DataFrame): Resultado de `medir_etapas`.
+        linhas (int): Quantidade de linhas dos arquivos de origem.
+    """
+    baselines: dict = ler_baselines()
+    baselines.setdefault(str(linhas), {}).update(
+        {
+            resultado["etapa"]: {
+                "segundos": resultado["segundos"],
+                "pico_memoria_mb": resultado["pico_memoria_mb"],
+            }
+            for resultado in df.iter_rows(named=True)
+        }
+    )
+
+    with open(BASELINES_PATH, "w", encoding="utf-8") as arquivo:
+        json.dump(baselines, arquivo, indent=4, sort_keys=True)
+        arquivo.write("\n")
+
+
+def comparar_baselines(
+    df: pl.DataFrame, linhas: int, tolerancia: float
+) -> pl.DataFrame:
+    """
+    Compara o tempo e o pico de memória de cada etapa com as referências gravadas.
+
+    Args:
+        df (pl.DataFrame): Resultado de `medir_etapas`.
+        linhas (int): Quantidade de linhas dos arquivos de origem.
+        tolerancia (float): Aumento máximo aceito em relação à referência (ex.: 0.25
+            para 25%).
+
+    Returns:
+        pl.DataFrame: Resultado com a variação em relação à referência e o status
+            de cada etapa ("OK", "REGRESSÃO" ou "SEM BASELINE").
+    """
+    referencias: dict = ler_baselines().get(str(linhas), {})
+    df_referencias: pl.DataFrame = pl.DataFrame(
+        [
+            {
+                "etapa": etapa,
+                "segundos_baseline": referencia["segundos"],
+                "pico_memoria_mb_baseline": referencia["pico_memoria_mb"],
+            }
+            for etapa, referencia in referencias.items()
+        ],
+        schema={
+            "etapa": pl.String,
+            "segundos_baseline": pl.Float64,
+            "pico_memoria_mb_baseline": pl.Float64,
+        },
+    )
+
+    return (
+        df.join(df_referencias, on="etapa", how="left")
+        .with_columns(
+            (pl.col("segundos") / pl.col("segundos_baseline") - 1).alias(
+                "variacao_tempo"
+            ),
+            (pl.col("pico_memoria_mb") / pl.col("pico_memoria_mb_baseline") - 1).alias(
+                "variacao_memoria"
+            ),
+        )
+        .with_columns(
+            pl.when(pl.col("segundos_baseline").is_null())
+            .then(pl.lit("SEM BASELINE"))
+            .when(
+                (pl.col("variacao_tempo") > tolerancia)
+                | (pl.col("variacao_memoria") > tolerancia)
+            )
+            .then(pl.lit("REGRESSÃO"))
+            .otherwise(pl.lit("OK"))
+            .alias("status")
+        )
+    )
+
+
+# endregion
+
+
+# region ----- Linha de Comando -----
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description="Mede as etapas Raw e Trusted com dados sintéticos."
+    )
+    parser.add_argument(
+        "--linhas",
+        type=int,
+        default=1_000_000,
+        help="Quantidade de linhas de cada arquivo de origem sintético.",
+    )
+    parser.add_argument(
+        "--datasets",
+        nargs="+",
+        choices=DATASETS,
+        default=DATASETS,
+        help="Datasets a serem avaliados (padrão: todos).",
+    )
+    parser.add_argument(
+        "--taxa-sujeira",
+        type=float,
+        default=0.01,
+        help="Proporção das linhas com cada problema incluído (padrão: 0.01).",
+    )
+    parser.add_argument(
+        "--tolerancia",
+        type=float,
+        default=0.25,
+        help="Aumento máximo de tempo e memória aceito (padrão: 0.25).",
+    )
+    parser.add_argument(
+        "--salvar-baseline",
+        action="store_true",
+        help="Grava os resultados como referência da quantidade de linhas.",
+    )
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="benchmark-etl-") as pasta_temporaria:
+        area: Path = Path(pasta_temporaria)
+        datasets_path: Path = preparar_area(area)
+
+        # A geração também é feita em um processo separado: no Linux, o pico de
+        # memória do processo principal seria herdado pelos processos das etapas
+        with ProcessPoolExecutor(
+            max_workers=1, mp_context=multiprocessing.get_context("spawn")
+        ) as executor:
+            for dataset in args.datasets:
+                executor.submit(
+                    gerar_dataset,
+                    dataset=dataset,
+                    linhas=args.linhas,
+                    destino=datasets_path,
+                    taxa=args.taxa_sujeira,
+                ).result()
+
+        df: pl.DataFrame = medir_etapas(datasets=args.datasets, area=area)
+
+    df = comparar_baselines(df, linhas=args.linhas, tolerancia=args.tolerancia)
+    with pl.Config(tbl_rows=-1, tbl_cols=-1):
+        print(df)
+
+    if args.salvar_baseline:
+        salvar_baselines(df, linhas=args.linhas)
+        print(f"Referências gravadas em {BASELINES_PATH}")
+        return 0
+
+    return 1 if (df["status"] == "REGRESSÃO").any() else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
+# endregion
@@ -0,0 +1,197 @@
+"""
+Script para comparar o tratamento da camada Trusted antes e depois do plano único de
+consulta, em três modos:
+
+- "original": cópia dos scripts anteriores ao plano único
+  (`src/etl/benchmarks/tratamento_original`), executados etapa por etapa, com um
+  DataFrame materializado a cada etapa;
+- "eager": tratamento atual (`tratar_dataset`) executado sobre um DataFrame, com cada
+  etapa executada imediatamente;
+- "lazy": tratamento atual montado como um único plano de consulta (LazyFrame),
+  executado com o motor de streaming, como nos scripts da camada Trusted.
+
+A diferença entre "original" e "lazy" é o resultado completo das mudanças na camada
+Trusted (plano único e mudanças nas etapas, como a duplicidade por hash e os
+conversores vetorizados); a diferença entre "eager" e "lazy" isola o efeito do plano
+único sobre as mesmas etapas.
+
+A versão mais recente de cada dataset da camada Raw é replicada `--fator` vezes, para
+simular volumes maiores. Cada execução é feita em um processo separado, de forma que
+o pico de memória (RSS máximo do processo) de um modo não interfira no outro.
+
+Uso (a partir da raiz do projeto):
+    python -m src.etl.benchmarks.plano_lazy --fator 10
+    python -m src.etl.benchmarks.plano_lazy --fator 20 --datasets historico-venda-pecas
+"""
+
+import argparse
+import importlib
+import multiprocessing
+import resource
+import runpy
+import tempfile
+import time
+import polars as pl
+
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Callable
+from src.etl.pipeline import DATASETS, SCRIPTS_PATH
+from src.ferramentas.catalogo import ultima_versao
+from src.ferramentas.funcoes_suporte import COLUNA_ARQUIVO_ORIGEM
+
+# region ----- Modos de Execução -----
+MODOS: list = ["original", "eager", "lazy"]
+# endregion
+
+
+# region ----- Caminho Arquivos Raw -----
+RAW_PATH: Path = Path(__file__).parent.parent / "data" / "0-raw"
+# endregion
+
+
+# region ----- Suporte -----
+def replicar_dataset(dataset: str, fator: int, destino: Path) -> Path:
+    """
+    Salva a versão mais recente de um dataset da camada Raw replicada `fator` vezes.
+
+    Args:
+        dataset (str): Nome do dataset.
+        fator (int): Quantidade de cópias do dataset.
+        destino (Path): Pasta onde o arquivo replicado será salvo.
+
+    Returns:
+        Path: Caminho do arquivo replicado.
+    """
+    arquivo: Path = destino / f"{dataset}-x{fator}.parquet"
+    pl.concat(
+        [pl.scan_parquet(source=ultima_versao(RAW_PATH / dataset))] * fator
+    ).sink_parquet(path=arquivo)
+
+    return arquivo
+
+
+def executar_tratamento(dataset: str, arquivo: Path, modo: str) -> tuple:
+    """
+    Executa o tratamento da camada Trusted de um dataset, no modo informado.
+
+    Executada em um processo separado, retornando o pico de memória do processo.
+
+    Args:
+        dataset (str): Nome do dataset.
+        arquivo (Path): Arquivo da camada Raw a ser tratado.
+        modo (str): "original", "eager" ou "lazy" (ver `MODOS`).
+
+    Returns:
+        tuple: Quantidade de linhas, tempo de execução (segundos) e pico de memória
+            do processo (MB).
+    """
+    if modo == "original":
+        tratar_dataset: Callable = importlib.import_module(
+            f"src.etl.benchmarks.tratamento_original.{dataset.replace('-', '_')}"
+        ).tratar_dataset
+    else:
+        # Apenas as funções do script são carregadas, sem gravar o dataset tratado
+        tratar_dataset = runpy.run_path(
+            path_name=str(SCRIPTS_PATH / "1-trusted" / f"{dataset}-trusted.py"),
+            run_name="benchmark",
+        )["tratar_dataset"]
+
+    inicio: float = time.perf_counter()
+    if modo == "original":
+        # O arquivo de origem de cada linha não existia na camada Raw original
+        df: pl.DataFrame = tratar_dataset(
+            pl.read_parquet(source=arquivo).drop(COLUNA_ARQUIVO_ORIGEM, strict=False)
+        )
+    elif modo == "eager":
+        df = tratar_dataset(pl.read_parquet(source=arquivo))
+    else:
+        # Executado como nos scripts da camada Trusted (motor de streaming)
+        df = tratar_dataset(pl.scan_parquet(source=arquivo)).collect(engine="streaming")
+    segundos: float = time.perf_counter() - inicio
+
+    # No Linux, ru_maxrss é informado em KB
+    pico_mb: float = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+    return df.height, segundos, pico_mb
+
+
+# endregion
+
+
+# region ----- Benchmark -----
+def comparar_modos(datasets: list, fator: int) -> pl.DataFrame:
+    """
+    Executa o tratamento de cada dataset em cada modo (ver `MODOS`), com os dados
+    da camada Raw replicados.
+
+    Args:
+        datasets (list): Datasets a serem avaliados.
+        fator (int): Quantidade de cópias de cada dataset.
+
+    Returns:
+        pl.DataFrame: Resultado por dataset e modo.
+    """
+    resultados: list = []
+
+    with tempfile.TemporaryDirectory() as pasta_temporaria:
+        for dataset in datasets:
+            arquivo: Path = replicar_dataset(
+                dataset=dataset, fator=fator, destino=Path(pasta_temporaria)
+            )
+
+            for modo in MODOS:
+                # Um processo novo por execução, para medir o pico de memória isolado
+                with ProcessPoolExecutor(
+                    max_workers=1, mp_context=multiprocessing.get_context("spawn")
+                ) as executor:
+                    linhas, segundos, pico_mb = executor.submit(
+                        executar_tratamento, dataset, arquivo, modo
+                    ).result()
+
+                resultados.append(
+                    {
+                        "dataset": dataset,
+                        "modo": modo,
+                        "linhas": linhas,
+                        "segundos": round(segundos, 3),
+                        "pico_memoria_mb": round(pico_mb, 1),
+                    }
+                )
+
+    return pl.DataFrame(resultados)
+
+
+# endregion
+
+
+# region ----- Linha de Comando -----
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=(
+            "Compara o tratamento Trusted original, o atual etapa por etapa e o atual "
+            "em plano único."
+        )
+    )
+    parser.add_argument(
+        "--fator",
+        type=int,
+        default=10,
+        help="Quantidade de cópias dos dados da camada Raw (volume simulado).",
+    )
+    parser.add_argument(
+        "--datasets",
+        nargs="+",
+        choices=DATASETS,
+        default=DATASETS,
+        help="Datasets a serem avaliados (padrão: todos).",
+    )
+    args = parser.parse_args()
+
+    with pl.Config(tbl_rows=-1, tbl_cols=-1):
+        print(comparar_modos(datasets=args.datasets, fator=max(1, args.fator)))
+
+
+if __name__ == "__main__":
+    main()
+# endregion
@@ -0,0 +1,6 @@
+"""
+Cópias do tratamento original da camada Trusted (etapa por etapa, com um DataFrame
+materializado a cada etapa), utilizadas como referência pelo benchmark
+`src/etl/benchmarks/plano_lazy.py`. Cada módulo corresponde a um dataset, com o nome
+do dataset (ex.: `historico_venda_pecas`), e possui a função `tratar_dataset`.
+"""
@@ -0,0 +1,151 @@
+"""
+Cópia do tratamento original da camada Trusted do estoque de peças, executado etapa por
+etapa sobre um DataFrame, com o schema da época.
+
+Mantida apenas como referência do benchmark `src/etl/benchmarks/plano_lazy.py`: não
+deve ser alterada junto com o script da camada Trusted.
+"""
+
+import polars as pl
+
+ESTOQUE_PECAS_SCHEMA: dict = {
+    "cod_concessionaria": pl.String,
+    "cod_filial": pl.String,
+    "nome_da_concessionaria": pl.Utf8,
+    "nome_da_filial": pl.Utf8,
+    "marca_da_filial": pl.Utf8,
+    "valor_da_peca_em_estoque": pl.Float64,
+    "quantidade_da_peca_em_estoque": pl.Int64,
+    "descricao_da_peca": pl.Utf8,
+    "categoria_da_peca": pl.Utf8,
+    "data_de_ultima_venda_da_peca": pl.Date,
+    "data_da_ultima_entrada_no_estoque_da_peca": pl.Date,
+    "peca_esta_obsoleta": pl.Boolean,
+    "quanto_tempo_a_peca_esta_obsoleta": pl.Utf8,
+    "nome_da_marca_da_peca": pl.Utf8,
+    "codigo_da_peca_no_estoque": pl.String,
+    "valor_da_peca_em_estoque_revisado": pl.Float64,
+    "categoria_da_peca_padronizada": pl.Utf8,
+    "classificacao_obsolescencia": pl.Utf8,
+}
+
+
+# region ----- Suporte -----
+# Padronização categorias
+def categorias_padrao() -> dict:
+    categorias_padrao: dict = {
+        "ACESS.NAO ORIGINAIS": "ACESSORIOS NÃO ORIGINAIS",
+        "ACESSORIOS NAO ORIGI": "ACESSORIOS NÃO ORIGINAIS",
+        "ACESSORIOS NAO ORIG": "ACESSORIOS NÃO ORIGINAIS",
+        "ACESSORIOS ORIGINAIS": "ACESSORIOS ORIGINAIS",
+        "COMB./LUB.": "LUBRIFICANTES/COMBUSTÍVEL",
+        "LUBRIFICANTES": "LUBRIFICANTES/COMBUSTÍVEL",
+        "LUBRIFICANTES/COMB.": "LUBRIFICANTES/COMBUSTÍVEL",
+        "VOLKS-COM. LUBRIF.": "LUBRIFICANTES/COMBUSTÍVEL",
+        "PECAS NAO ORIGINAIS": "PEÇAS NÃO ORIGINAIS",
+        "VOLKS-PEC. NAO ORIG.": "PEÇAS NÃO ORIGINAIS",
+        "PEÇAS N.ORIGINAIS": "PEÇAS NÃO ORIGINAIS",
+        "NISSAN-PECAS ORIG.": "PEÇAS ORIGINAIS",
+        "PECAS ORIGINAIS VW": "PEÇAS ORIGINAIS",
+        "PECAS ORIGINAIS": "PEÇAS ORIGINAIS",
+        "PEÇAS ORIGINAIS": "PEÇAS ORIGINAIS",
+        "PNEUS": "PNEUS",
+        "VOLKS-PNEUS": "PNEUS",
+        "NISSAN-PNEUS": "PNEUS",
+        "OUTRAS MERCADORIAS": "OUTRAS MERCADORIAS",
+        "VOLKS-OUTRAS MERCAD.": "OUTRAS MERCADORIAS",
+    }
+
+    return categorias_padrao
+
+
+# Classificação obsolescencia
+def classificar_obsolescencia() -> dict:
+    classificacao_obsolescencia: dict = {
+        "0": "1 - DE 0 A 6 MESES",
+        "6 MESES A 1 ANO": "2 - DE 6 MESES A 1 ANO",
+        "1 ANO A 2 ANOS": "3 - DE 1 ANO A 2 ANOS",
+        "2 ANOS A 3 ANOS": "4 - DE 2 ANOS A 3 ANOS",
+        "MAIS DE 3 ANOS": "5 - MAIS DE 3 ANOS",
+    }
+
+    return classificacao_obsolescencia
+
+
+# endregion
+
+
+# region ----- Tratar Arquivo Raw -----
+def tratar_dataset(df_raw: pl.DataFrame) -> pl.DataFrame:
+    """
+    Trata o dataset bruto etapa por etapa, como no script original.
+
+    Args:
+        df_raw (pl.DataFrame): Dataset bruto.
+
+    Returns:
+        pl.DataFrame: Dataset tratado, conforme o schema original.
+    """
+    # Transformar dtypes das colunas
+    df_raw = df_raw.with_columns([pl.col("Valor_da_Peca_em_Estoque").cast(pl.Float64)])
+    df_raw = df_raw.with_columns(
+        [pl.col("Quantidade_da_Peca_em_Estoque").cast(pl.Int64)]
+    )
+    df_raw = df_raw.with_columns(
+        [
+            pl.col("Data_de_Ultima_Venda_da_Peca")
+            .str.strptime(pl.Date, "%Y-%m-%d")
+            .cast(pl.Date)
+        ]
+    )
+    df_raw = df_raw.with_columns(
+        [
+            pl.col("Data_da_Ultima_Entrada_no_Estoque_da_Peca")
+            .str.strptime(pl.Date, "%Y-%m-%d")
+            .cast(pl.Date)
+        ]
+    )
+
+    # Polars não consegue transformar os dados de strings diretamente para boolean,
+    # desta forma precisamos transformar os dados na coluna antes de transformar
+    df_raw = df_raw.with_columns(
+        [
+            pl.col("Peca_Esta_Obsoleta")
+            .map_elements(lambda x: True if x == "True" else False)
+            .cast(pl.Boolean)
+        ]
+    )
+
+    # Para peças em que a quantidade é igual a 0, o valor em estoque também deve ser
+    # igual a 0
+    df_raw = df_raw.with_columns(
+        [
+            pl.when(pl.col("Quantidade_da_Peca_em_Estoque") == 0)
+            .then(0.0)
+            .otherwise(pl.col("Valor_da_Peca_em_Estoque"))
+            .alias("Valor_da_Peca_em_Estoque_Revisado")
+        ]
+    )
+
+    # Padronizar as categorias
+    df_raw = df_raw.with_columns(
+        pl.col("Categoria_da_Peca")
+        .replace(categorias_padrao())
+        .alias("Categoria_da_Peca_Padronizada")
+    )
+
+    # Incluir a classificação de obsolescencia
+    df_raw = df_raw.with_columns(
+        pl.col("Quanto_Tempo_a_Peca_Esta_Obsoleta")
+        .replace(classificar_obsolescencia())
+        .alias("Classificacao_Obsolescencia")
+    )
+
+    # Renomear colunas para estarem em minúsculo
+    df_raw = df_raw.rename(str.lower)
+
+    # Salvar em um novo dataframe com os dados finais
+    return pl.DataFrame(data=df_raw, schema=ESTOQUE_PECAS_SCHEMA)
+
+
+# endregion
@@ -0,0 +1,131 @@
+"""
+Cópia do tratamento original da camada Trusted do estoque de veículos, executado etapa
+por etapa sobre um DataFrame, com o schema da época.
+
+Mantida apenas como referência do benchmark `src/etl/benchmarks/plano_lazy.py`: não
+deve ser alterada junto com o script da camada Trusted.
+"""
+
+import polars as pl
+
+ESTOQUE_VEICULOS_SCHEMA: dict = {
+    "nome_da_concessionaria": pl.Utf8,
+    "nome_da_filial": pl.Utf8,
+    "custo_do_veiculo": pl.Float64,
+    "marca_da_filial": pl.Utf8,
+    "marca_do_veiculo": pl.Utf8,
+    "modelo_do_veiculo": pl.Utf8,
+    "cor_do_veiculo": pl.Utf8,
+    "veiculo_novo_ou_semi_novo": pl.Utf8,
+    "tipo_do_combustivel": pl.Utf8,
+    "ano_modelo_do_veiculo": pl.Date,
+    "ano_fabricacao_do_veiculo": pl.Date,
+    "tempo_total_no_estoque": pl.Utf8,
+    "kilometragem_atual_do_veiculo": pl.Float64,
+    "data_de_entrada_do_veiculo_no_estoque": pl.Date,
+    "data_de_entrada_do_veiculo_no_estoque_duplicated_0": pl.Date,
+    "data_de_entrada_do_veiculo_no_estoque_duplicated_1": pl.Date,
+    "classificacao_tempo_no_estoque": pl.Utf8,
+    "data_de_entrada_do_veiculo_no_estoque_atualizada": pl.Date,
+}
+
+
+# region ----- Suporte -----
+# Classificação tempo no estoque
+def class_tempo_no_estoque() -> dict:
+    class_tempo_no_estoque: dict = {
+        "MENOS DE 1 MES": "1 - MENOS DE 1 MES",
+        "1 A 3 MESES": "2 - 1 A 3 MESES",
+        "3 A 6 MESES": "3 - 3 A 6 MESES",
+        "6 A 9 MESES": "4 - 6 A 9 MESES",
+        "9 A 12 MESES": "5 - 9 A 12 MESES",
+        "1 A 2 ANOS": "6 - 1 A 2 ANOS",
+        "2 A 3 ANOS": "7 - 2 A 3 ANOS",
+        "MAIS DE 3 ANOS": "8 - MAIS DE 3 ANOS",
+    }
+
+    return class_tempo_no_estoque
+
+
+# endregion
+
+
+# region ----- Tratar Arquivo Raw -----
+def tratar_dataset(df_raw: pl.DataFrame) -> pl.DataFrame:
+    """
+    Trata o dataset bruto etapa por etapa, como no script original.
+
+    Args:
+        df_raw (pl.DataFrame): Dataset bruto.
+
+    Returns:
+        pl.DataFrame: Dataset tratado, conforme o schema original.
+    """
+    # Transformar dtypes das colunas
+    df_raw = df_raw.with_columns([pl.col("Custo_do_Veiculo").cast(pl.Float64)])
+
+    df_raw = df_raw.with_columns(
+        pl.col("Ano_Modelo_do_Veiculo").replace({"0": None}).cast(pl.String)
+    )
+    df_raw = df_raw.with_columns(
+        pl.col("Ano_Modelo_do_Veiculo")
+        .str.strptime(pl.Date, "%Y")
+        .cast(pl.Date, strict=True)
+    )
+
+    df_raw = df_raw.with_columns(
+        pl.col("Ano_Fabricacao_do_Veiculo").replace({"0": None}).cast(pl.String)
+    )
+    df_raw = df_raw.with_columns(
+        pl.col("Ano_Fabricacao_do_Veiculo")
+        .str.strptime(pl.Date, "%Y")
+        .cast(pl.Date, strict=True)
+    )
+
+    df_raw = df_raw.with_columns(
+        pl.col("Data_de_Entrada_do_Veiculo_no_Estoque")
+        .str.strptime(pl.Date, "%d/%m/%Y")
+        .cast(pl.Date, strict=True)
+    )
+
+    df_raw = df_raw.with_columns(
+        pl.col("Data_de_Entrada_do_Veiculo_no_Estoque_duplicated_0")
+        .str.strptime(pl.Date, "%d/%m/%Y")
+        .cast(pl.Date, strict=True)
+    )
+
+    df_raw = df_raw.with_columns(
+        pl.col("Data_de_Entrada_do_Veiculo_no_Estoque_duplicated_1")
+        .str.strptime(pl.Date, "%d/%m/%Y")
+        .cast(pl.Date, strict=True)
+    )
+
+    df_raw = df_raw.with_columns(
+        [pl.col("Kilometragem_Atual_do_Veiculo").cast(pl.Float64)]
+    )
+
+    # Classificação tempo no estoque
+    df_raw = df_raw.with_columns(
+        pl.col("Tempo_Total_no_Estoque")
+        .replace(class_tempo_no_estoque())
+        .alias("Classificacao_Tempo_no_Estoque")
+    )
+
+    # Avaliar as colunas duplicadas de data, e considerar a data mais antiga
+    # De forma prudente, o custo deverá ser reconhecido no período mais antigo
+    df_raw = df_raw.with_columns(
+        pl.min_horizontal(
+            "Data_de_Entrada_do_Veiculo_no_Estoque",
+            "Data_de_Entrada_do_Veiculo_no_Estoque_duplicated_0",
+            "Data_de_Entrada_do_Veiculo_no_Estoque_duplicated_1",
+        ).alias("Data_de_Entrada_do_Veiculo_no_Estoque_Atualizada")
+    )
+
+    # Renomear colunas para estarem em minúsculo
+    df_raw = df_raw.rename(str.lower)
+
+    # Salvar em um novo dataframe com os dados finais
+    return pl.DataFrame(data=df_raw, schema=ESTOQUE_VEICULOS_SCHEMA)
+
+
+# endregion
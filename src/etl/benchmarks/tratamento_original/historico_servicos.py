@@ -0,0 +1,156 @@
+"""
+Cópia do tratamento original da camada Trusted do histórico de serviços, executado etapa
+por etapa sobre um DataFrame, com o schema da época.
+
+Mantida apenas como referência do benchmark `src/etl/benchmarks/plano_lazy.py`: não
+deve ser alterada junto com o script da camada Trusted.
+"""
+
+import polars as pl
+
+HISTORICO_SERVICOS_SCHEMA: dict = {
+    "cod_concessionaria": pl.Utf8,
+    "cod_filial": pl.String,
+    "nome_da_concessionaria": pl.Utf8,
+    "nome_da_filial": pl.Utf8,
+    "data_de_realizacao_do_servico": pl.Date,
+    "quantidade_de_servicos_realizados": pl.Float64,
+    "valor_total_do_servico_realizado": pl.Float64,
+    "lucro_do_servico": pl.Float64,
+    "descricao_do_servico_feito": pl.Utf8,
+    "secao_que_o_servico_foi_feito": pl.Utf8,
+    "departamento_que_realizou_o_servico": pl.Utf8,
+    "categoria_do_servico": pl.Utf8,
+    "tipo_de_servico_realizado": pl.Utf8,
+    "nome_do_vendedor_que_vendeu_o_servico": pl.Utf8,
+    "nome_do_mecanico_que_fez_o_servico": pl.Utf8,
+    "nome_do_cliente_que_fez_o_servico": pl.Utf8,
+    "cidade_do_servico": pl.Utf8,
+    "estado_brasileiro_do_servico": pl.Utf8,
+    "macroregiao_geografica_do_servico": pl.Utf8,
+    "tempo_que_o_servico_levou_para_ser_realizado_em_horas": pl.Float64,
+    "numero_da_os_de_servico": pl.String,
+    "situacao_da_os": pl.String,
+    "categoria_do_servico_padronizada": pl.Utf8,
+    "total_os": pl.Float64,
+    "cod_filial_ajustado": pl.String,
+    "valor_do_servico_ajustado_com_revisao_gratuita": pl.Float64,
+    "tempo_do_servico_horas_ajustado": pl.Float64,
+}
+
+
+# region ----- Suporte -----
+# Padronizar categoria do serviço
+def padronizar_categoria_serviço() -> dict:
+    padronizar_categoria_serviço: dict = {
+        "ACESSORIOS": "ACESSORIOS",
+        "ALINHAMENTO/BALANCEAMENTO": "ALINHAMENTO E BALANCEAMENTO",
+        "ALINHAMENTO E BALANCEAMEN": "ALINHAMENTO E BALANCEAMENTO",
+        "LUBRIFICACAO": "LUBRIFICAÇÃO",
+        "LUBRIFICAÇÃO": "LUBRIFICAÇÃO",
+        "MECANICA GERAL": "MECANICA",
+        "MECANICA E ELETRICA": "MECANICA",
+        "MECANICA": "MECANICA",
+        "PDI-REVISÃO DE ENTREGA": "REVISÃO",
+        "REVISAO PROGRAMADA": "REVISÃO",
+        "REVISAO GRATUITA": "REVISÃO GRATUITA",
+        "REVISAO": "REVISÃO",
+        "SERV TERCEIROS": "SERVIÇOS DE TERCEIRO",
+        "SERVICO TERCEIRO": "SERVIÇOS DE TERCEIRO",
+        "SERVIÇOS DE TERCEIROS": "SERVIÇOS DE TERCEIRO",
+        "ELETRIC": "ELETRICA",
+        "FUNILARI": "FUNILARIA",
+        "MONTAGEM": "MONTAGEM",
+        "LAVAGE": "LAVAGEM",
+        "PINTURA": "PINTURA",
+        "DEMAIS CATEGORIA": "OUTROS",
+    }
+
+    return padronizar_categoria_serviço
+
+
+# endregion
+
+
+# region ----- Tratar Arquivo Raw -----
+def tratar_dataset(df_raw: pl.DataFrame) -> pl.DataFrame:
+    """
+    Trata o dataset bruto etapa por etapa, como no script original.
+
+    Args:
+        df_raw (pl.DataFrame): Dataset bruto.
+
+    Returns:
+        pl.DataFrame: Dataset tratado, conforme o schema original.
+    """
+    # Transformar dtypes das colunas
+    df_raw = df_raw.with_columns(
+        [pl.col("Data_De_Realizacao_Do_Servico").str.strptime(pl.Date, "%Y-%m-%d")]
+    )
+
+    df_raw = df_raw.with_columns(
+        pl.col("Quantidade_De_Servicos_Realizados").cast(pl.Float64)
+    )
+
+    df_raw = df_raw.with_columns(
+        [pl.col("Valor_Total_Do_Servico_Realizado").cast(pl.Float64)]
+    )
+
+    df_raw = df_raw.with_columns([pl.col("Lucro_Do_Servico").cast(pl.Float64)])
+    df_raw = df_raw.with_columns(
+        [
+            pl.col("Tempo_Que_O_Servico_Levou_Para_Ser_Realizado_em_Horas").cast(
+                pl.Float64
+            )
+        ]
+    )
+
+    # Padronizar categoria do serviço
+    df_raw = df_raw.with_columns(
+        pl.col("Categoria_Do_Servico")
+        .replace(padronizar_categoria_serviço())
+        .alias("Categoria_Do_Servico_Padronizada")
+    )
+
+    # Totalizar o valor das OS e retornar no dataframe como Total_OS
+    df_totalizar_os: pl.DataFrame = df_raw.group_by("Numero_Da_OS_De_Servico").agg(
+        pl.col("Valor_Total_Do_Servico_Realizado").sum().alias("Total_OS")
+    )
+    df_raw = df_raw.join(df_totalizar_os, on="Numero_Da_OS_De_Servico", how="left")
+
+    # Ajustar o código da filial incorreto (1-1-3)
+    df_raw = df_raw.with_columns(
+        pl.when(pl.col("Cod_Filial") == "1-1-3")
+        .then(pl.lit("0-1-1"))
+        .otherwise(pl.col("Cod_Filial"))
+        .alias("Cod_Filial_Ajustado")
+    )
+
+    # Ajustar valor de revisões gratuitas que possuem valor acima de 0 para 0 (REVISÃO
+    # GRATUITA)
+    df_raw = df_raw.with_columns(
+        pl.when(
+            (pl.col("Categoria_Do_Servico_Padronizada") == "REVISÃO GRATUITA")
+            & (pl.col("Valor_Total_Do_Servico_Realizado") > 0)
+        )
+        .then(0)
+        .otherwise(pl.col("Valor_Total_Do_Servico_Realizado"))
+        .alias("Valor_Do_Servico_Ajustado_Com_Revisao_Gratuita")
+    )
+
+    # Ajustar valor negativo de tempo de serviço para positivo
+    df_raw = df_raw.with_columns(
+        pl.when(pl.col("Tempo_Que_O_Servico_Levou_Para_Ser_Realizado_em_Horas") < 0)
+        .then(pl.col("Tempo_Que_O_Servico_Levou_Para_Ser_Realizado_em_Horas") * -1)
+        .otherwise(pl.col("Tempo_Que_O_Servico_Levou_Para_Ser_Realizado_em_Horas"))
+        .alias("Tempo_Do_Servico_Horas_Ajustado")
+    )
+
+    # Ajustar nome das colunas para estarem em minúsculo
+    df_raw = df_raw.rename(str.lower)
+
+    # Salvar em um novo dataframe com os dados finais
+    return pl.DataFrame(data=df_raw, schema=HISTORICO_SERVICOS_SCHEMA)
+
+
+# endregion
@@ -0,0 +1,220 @@
+"""
+Script para executar o pipeline ETL completo (camadas Raw, Trusted e Gold) em
+paralelo.
+
+As etapas formam um grafo de dependências (ex.: a camada Trusted de um dataset depende
+da camada Raw do mesmo dataset, e o mart da camada Gold depende da camada Trusted).
+Etapas independentes, como os datasets diferentes, são executadas ao mesmo tempo em
+processos separados.
+
+Uso (a partir da raiz do projeto):
+    python -m src.etl.pipeline --workers 5
+    python -m src.etl.pipeline --datasets estoque-pecas historico-servicos
+"""
+
+import argparse
+import multiprocessing
+import os
+import runpy
+import sys
+import time
+
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from pathlib import Path
+
+# region ----- Caminho dos Scripts -----
+SCRIPTS_PATH: Path = Path(__file__).parent / "scripts"
+# endregion
+
+
+# region ----- Grafo de Etapas -----
+DATASETS: list = [
+    "estoque-pecas",
+    "estoque-veiculos",
+    "historico-servicos",
+    "historico-venda-pecas",
+    "historico-venda-veiculos",
+]
+
+# Marts da camada Gold além do resumo de cada dataset, com os datasets utilizados
+MARTS_ADICIONAIS: dict = {
+    "catalogo-pecas": ["estoque-pecas", "historico-venda-pecas"],
+    "ordens-servico": ["historico-servicos"],
+    "resultado-filial-mes": [
+        "historico-servicos",
+        "historico-venda-pecas",
+        "historico-venda-veiculos",
+    ],
+}
+
+
+def montar_etapas(datasets: list) -> dict:
+    """
+    Monta o grafo de etapas do pipeline para os datasets informados.
+
+    Os marts consolidados são incluídos apenas quando todos os datasets que utilizam
+    são processados.
+
+    Args:
+        datasets (list): Datasets a serem processados.
+
+    Returns:
+        dict: Etapas do pipeline, com o script a ser executado e as etapas das quais
+            cada uma depende.
+    """
+    etapas: dict = {}
+
+    for dataset in datasets:
+        etapas[f"{dataset}-raw"] = {
+            "script": SCRIPTS_PATH / "0-raw" / f"{dataset}-raw.py",
+            "dependencias": [],
+        }
+        etapas[f"{dataset}-trusted"] = {
+            "script": SCRIPTS_PATH / "1-trusted" / f"{dataset}-trusted.py",
+            "dependencias": [f"{dataset}-raw"],
+        }
+        etapas[f"{dataset}-gold"] = {
+            "script": SCRIPTS_PATH / "2-gold" / f"{dataset}-gold.py",
+            "dependencias": [f"{dataset}-trusted"],
+        }
+
+    for mart, datasets_mart in MARTS_ADICIONAIS.items():
+        if all(dataset in datasets for dataset in datasets_mart):
+            etapas[f"{mart}-gold"] = {
+                "script": SCRIPTS_PATH / "2-gold" / f"{mart}-gold.py",
+                "dependencias": [f"{dataset}-trusted" for dataset in datasets_mart],
+            }
+
+    return etapas
+
+
+# endregion
+
+
+# region ----- Execução -----
+def configurar_worker(threads_por_worker: int) -> None:
+    """
+    Limita a quantidade de threads do Polars em cada processo, evitando que os
+    processos concorram pelos mesmos núcleos da máquina.
+
+    Args:
+        threads_por_worker (int): Quantidade de threads do Polars por processo.
+    """
+    os.environ.setdefault("POLARS_MAX_THREADS", str(threads_por_worker))
+
+
+def executar_script(script: Path) -> float:
+    """
+    Executa um script do ETL como se fosse chamado diretamente pela linha de comando.
+
+    Args:
+        script (Path): Caminho do script.
+
+    Returns:
+        float: Tempo de execução, em segundos.
+    """
+    inicio: float = time.perf_counter()
+    runpy.run_path(path_name=str(script), run_name="__main__")
+
+    return time.perf_counter() - inicio
+
+
+def executar_pipeline(etapas: dict, workers: int) -> dict:
+    """
+    Executa as etapas do pipeline respeitando as dependências entre elas.
+
+    Cada etapa é enviada ao pool de processos assim que todas as etapas das quais
+    depende forem concluídas. Caso uma etapa falhe, as etapas que dependem dela não
+    são executadas.
+
+    Args:
+        etapas (dict): Etapas do pipeline, conforme `montar_etapas`.
+        workers (int): Quantidade de processos executando etapas ao mesmo tempo.
+
+    Returns:
+        dict: Status de cada etapa ("OK", "FALHA" ou "NÃO EXECUTADA") e o tempo de
+            execução, em segundos, das etapas executadas.
+    """
+    threads_por_worker: int = max(1, (os.cpu_count() or 1) // workers)
+    pendentes: dict = {
+        nome: set(etapa["dependencias"]) for nome, etapa in etapas.items()
+    }
+    em_execucao: dict[Future, str] = {}
+    resultado: dict = {}
+
+    # O Polars não é seguro com "fork", por isso os processos são iniciados com "spawn"
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=configurar_worker,
+        initargs=(threads_por_worker,),
+    ) as executor:
+        while pendentes or em_execucao:
+            prontas: list = [nome for nome, deps in pendentes.items() if not deps]
+            for nome in prontas:
+                del pendentes[nome]
+                future = executor.submit(executar_script, etapas[nome]["script"])
+                em_execucao[future] = nome
+                print(f"[pipeline] iniciando {nome}")
+
+            if not em_execucao:
+                break
+
+            concluidas, _ = wait(em_execucao, return_when=FIRST_COMPLETED)
+            for future in concluidas:
+                nome = em_execucao.pop(future)
+
+                if future.exception() is not None:
+                    resultado[nome] = {"status": "FALHA", "erro": future.exception()}
+                    print(f"[pipeline] falha em {nome}: {future.exception()!r}")
+                    continue
+
+                resultado[nome] = {"status": "OK", "segundos": future.result()}
+                print(f"[pipeline] {nome} concluído em {future.result():.2f}s")
+                for deps in pendentes.values():
+                    deps.discard(nome)
+
+    # Etapas restantes dependem, direta ou indiretamente, de uma etapa com falha
+    for nome in pendentes:
+        resultado[nome] = {"status": "NÃO EXECUTADA"}
+
+    return resultado
+
+
+# endregion
+
+
+# region ----- Linha de Comando -----
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Executa o pipeline ETL completo.")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=len(DATASETS),
+        help="Quantidade de processos executando etapas ao mesmo tempo.",
+    )
+    parser.add_argument(
+        "--datasets",
+        nargs="+",
+        choices=DATASETS,
+        default=DATASETS,
+        help="Datasets a serem processados (padrão: todos).",
+    )
+    args = parser.parse_args()
+
+    inicio: float = time.perf_counter()
+    resultado: dict = executar_pipeline(
+        etapas=montar_etapas(args.datasets),
+        workers=max(1, args.workers),
+    )
+
+    print(f"\n[pipeline] concluído em {time.perf_counter() - inicio:.2f}s")
+    for nome, status in resultado.items():
+        print(f"  {nome}: {status['status']}")
+
+    return 0 if all(s["status"] == "OK" for s in resultado.values()) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
+# endregion
@@ -0,0 +1,69 @@
+"""
+Regras de limpeza da camada Trusted do estoque de peças (ver
+`src/ferramentas/regras_limpeza.py`).
+"""
+
+import polars as pl
+
+from src.etl.regras.mapeamentos import CATEGORIAS_PECAS
+from src.ferramentas.conversores import FORMATOS_DATA, converter_moeda
+
+# Classificação obsolescencia
+CLASSIFICACAO_OBSOLESCENCIA: dict = {
+    "0": "1 - DE 0 A 6 MESES",
+    "6 MESES A 1 ANO": "2 - DE 6 MESES A 1 ANO",
+    "1 ANO A 2 ANOS": "3 - DE 1 ANO A 2 ANOS",
+    "2 ANOS A 3 ANOS": "4 - DE 2 ANOS A 3 ANOS",
+    "MAIS DE 3 ANOS": "5 - MAIS DE 3 ANOS",
+}
+
+ESTOQUE_PECAS_REGRAS: list = [
+    # Transformar dtypes das colunas
+    {
+        "coluna": "Valor_da_Peca_em_Estoque",
+        "tipo": "expressao",
+        "expressao": converter_moeda("Valor_da_Peca_em_Estoque"),
+    },
+    {"coluna": "Quantidade_da_Peca_em_Estoque", "tipo": "converter", "dtype": pl.Int64},
+    {
+        "coluna": "Data_de_Ultima_Venda_da_Peca",
+        "tipo": "converter",
+        "dtype": pl.Date,
+        "formato": FORMATOS_DATA,
+    },
+    {
+        "coluna": "Data_da_Ultima_Entrada_no_Estoque_da_Peca",
+        "tipo": "converter",
+        "dtype": pl.Date,
+        "formato": FORMATOS_DATA,
+    },
+    # Valores diferentes de verdadeiro/falso (inclusive nulos) são considerados falso
+    {
+        "coluna": "Peca_Esta_Obsoleta",
+        "tipo": "converter",
+        "dtype": pl.Boolean,
+        "padrao": False,
+    },
+    # Para peças em que a quantidade é igual a 0, o valor em estoque também deve ser
+    # igual a 0
+    {
+        "coluna": "Valor_da_Peca_em_Estoque_Revisado",
+        "tipo": "casos",
+        "casos": [(pl.col("Quantidade_da_Peca_em_Estoque") == 0, 0.0)],
+        "senao": pl.col("Valor_da_Peca_em_Estoque"),
+    },
+    # Padronizar as categorias
+    {
+        "coluna": "Categoria_da_Peca_Padronizada",
+        "tipo": "mapear",
+        "origem": "Categoria_da_Peca",
+        "valores": CATEGORIAS_PECAS,
+    },
+    # Incluir a classificação de obsolescencia
+    {
+        "coluna": "Classificacao_Obsolescencia",
+        "tipo": "mapear",
+        "origem": "Quanto_Tempo_a_Peca_Esta_Obsoleta",
+        "valores": CLASSIFICACAO_OBSOLESCENCIA,
+    },
+]
@@ -0,0 +1,77 @@
+"""
+Regras de limpeza da camada Trusted do estoque de veículos (ver
+`src/ferramentas/regras_limpeza.py`).
+"""
+
+import polars as pl
+
+from src.ferramentas.conversores import FORMATOS_DATA, converter_ano, converter_moeda
+
+# Classificação tempo no estoque
+CLASSIFICACAO_TEMPO_NO_ESTOQUE: dict = {
+    "MENOS DE 1 MES": "1 - MENOS DE 1 MES",
+    "1 A 3 MESES": "2 - 1 A 3 MESES",
+    "3 A 6 MESES": "3 - 3 A 6 MESES",
+    "6 A 9 MESES": "4 - 6 A 9 MESES",
+    "9 A 12 MESES": "5 - 9 A 12 MESES",
+    "1 A 2 ANOS": "6 - 1 A 2 ANOS",
+    "2 A 3 ANOS": "7 - 2 A 3 ANOS",
+    "MAIS DE 3 ANOS": "8 - MAIS DE 3 ANOS",
+}
+
+# Colunas de data de entrada no estoque (a coluna aparece repetida no arquivo de origem)
+COLUNAS_DATA_DE_ENTRADA: list = [
+    "Data_de_Entrada_do_Veiculo_no_Estoque",
+    "Data_de_Entrada_do_Veiculo_no_Estoque_duplicated_0",
+    "Data_de_Entrada_do_Veiculo_no_Estoque_duplicated_1",
+]
+
+ESTOQUE_VEICULOS_REGRAS: list = (
+    [
+        # Transformar dtypes das colunas
+        {
+            "coluna": "Custo_do_Veiculo",
+            "tipo": "expressao",
+            "expressao": converter_moeda("Custo_do_Veiculo"),
+        },
+    ]
+    + [
+        # Anos sem valor estão informados como "0"
+        {
+            "coluna": coluna,
+            "tipo": "expressao",
+            "expressao": converter_ano(coluna),
+        }
+        for coluna in ["Ano_Modelo_do_Veiculo", "Ano_Fabricacao_do_Veiculo"]
+    ]
+    + [
+        {
+            "coluna": coluna,
+            "tipo": "converter",
+            "dtype": pl.Date,
+            "formato": FORMATOS_DATA,
+        }
+        for coluna in COLUNAS_DATA_DE_ENTRADA
+    ]
+    + [
+        {
+            "coluna": "Kilometragem_Atual_do_Veiculo",
+            "tipo": "converter",
+            "dtype": pl.Float64,
+        },
+        # Classificação tempo no estoque
+        {
+            "coluna": "Classificacao_Tempo_no_Estoque",
+            "tipo": "mapear",
+            "origem": "Tempo_Total_no_Estoque",
+            "valores": CLASSIFICACAO_TEMPO_NO_ESTOQUE,
+        },
+        # Avaliar as colunas duplicadas de data, e considerar a data mais antiga
+        # De forma prudente, o custo deverá ser reconhecido no período mais antigo
+        {
+            "coluna": "Data_de_Entrada_do_Veiculo_no_Estoque_Atualizada",
+            "tipo": "expressao",
+            "expressao": pl.min_horizontal(COLUNAS_DATA_DE_ENTRADA),
+        },
+    ]
+)
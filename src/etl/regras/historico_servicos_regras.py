@@ -0,0 +1,112 @@
+"""
+Regras de limpeza da camada Trusted do histórico de serviços (ver
+`src/ferramentas/regras_limpeza.py`).
+"""
+
+import polars as pl
+
+from src.etl.regras.mapeamentos import CODIGOS_FILIAL_CORRIGIDOS
+from src.ferramentas.conversores import FORMATOS_DATA, converter_moeda
+
+# Padronizar categoria do serviço
+CATEGORIAS_SERVICO: dict = {
+    "ACESSORIOS": "ACESSORIOS",
+    "ALINHAMENTO/BALANCEAMENTO": "ALINHAMENTO E BALANCEAMENTO",
+    "ALINHAMENTO E BALANCEAMEN": "ALINHAMENTO E BALANCEAMENTO",
+    "LUBRIFICACAO": "LUBRIFICAÇÃO",
+    "LUBRIFICAÇÃO": "LUBRIFICAÇÃO",
+    "MECANICA GERAL": "MECANICA",
+    "MECANICA E ELETRICA": "MECANICA",
+    "MECANICA": "MECANICA",
+    "PDI-REVISÃO DE ENTREGA": "REVISÃO",
+    "REVISAO PROGRAMADA": "REVISÃO",
+    "REVISAO GRATUITA": "REVISÃO GRATUITA",
+    "REVISAO": "REVISÃO",
+    "SERV TERCEIROS": "SERVIÇOS DE TERCEIRO",
+    "SERVICO TERCEIRO": "SERVIÇOS DE TERCEIRO",
+    "SERVIÇOS DE TERCEIROS": "SERVIÇOS DE TERCEIRO",
+    "ELETRIC": "ELETRICA",
+    "FUNILARI": "FUNILARIA",
+    "MONTAGEM": "MONTAGEM",
+    "LAVAGE": "LAVAGEM",
+    "PINTURA": "PINTURA",
+    "DEMAIS CATEGORIA": "OUTROS",
+}
+
+HISTORICO_SERVICOS_REGRAS: list = (
+    [
+        # Transformar dtypes das colunas
+        {
+            "coluna": "Data_De_Realizacao_Do_Servico",
+            "tipo": "converter",
+            "dtype": pl.Date,
+            "formato": FORMATOS_DATA,
+        },
+    ]
+    + [
+        {"coluna": coluna, "tipo": "converter", "dtype": pl.Float64}
+        for coluna in [
+            "Quantidade_De_Servicos_Realizados",
+            "Tempo_Que_O_Servico_Levou_Para_Ser_Realizado_em_Horas",
+        ]
+    ]
+    + [
+        {"coluna": coluna, "tipo": "expressao", "expressao": converter_moeda(coluna)}
+        for coluna in ["Valor_Total_Do_Servico_Realizado", "Lucro_Do_Servico"]
+    ]
+    + [
+        # Padronizar categoria do serviço
+        {
+            "coluna": "Categoria_Do_Servico_Padronizada",
+            "tipo": "mapear",
+            "origem": "Categoria_Do_Servico",
+            "valores": CATEGORIAS_SERVICO,
+        },
+        # Ajustar o código da filial incorreto (1-1-3)
+        {
+            "coluna": "Cod_Filial_Ajustado",
+            "tipo": "mapear",
+            "origem": "Cod_Filial",
+            "valores": CODIGOS_FILIAL_CORRIGIDOS,
+        },
+        # Ajustar valor de revisões gratuitas que possuem valor acima de 0 para 0
+        # (REVISÃO GRATUITA)
+        {
+            "coluna": "Valor_Do_Servico_Ajustado_Com_Revisao_Gratuita",
+            "tipo": "casos",
+            "casos": [
+                (
+                    (pl.col("Categoria_Do_Servico_Padronizada") == "REVISÃO GRATUITA")
+                    & (pl.col("Valor_Total_Do_Servico_Realizado") > 0),
+                    0,
+                )
+            ],
+            "senao": pl.col("Valor_Total_Do_Servico_Realizado"),
+        },
+        # Ajustar valor negativo de tempo de serviço para positivo
+        {
+            "coluna": "Tempo_Do_Servico_Horas_Ajustado",
+            "tipo": "casos",
+            "casos": [
+                (
+                    pl.col("Tempo_Que_O_Servico_Levou_Para_Ser_Realizado_em_Horas") < 0,
+                    pl.col("Tempo_Que_O_Servico_Levou_Para_Ser_Realizado_em_Horas")
+                    * -1,
+                )
+            ],
+            "senao": pl.col("Tempo_Que_O_Servico_Levou_Para_Ser_Realizado_em_Horas"),
+        },
+        # Totalizar o valor de cada OS em todas as linhas da OS (função de janela, sem
+        # agrupar e unir o total de volta às linhas). Linhas sem número de OS ficam
+        # sem total
+        {
+            "coluna": "Total_OS",
+            "tipo": "expressao",
+            "expressao": pl.when(pl.col("Numero_Da_OS_De_Servico").is_not_null()).then(
+                pl.col("Valor_Total_Do_Servico_Realizado")
+                .sum()
+                .over("Numero_Da_OS_De_Servico")
+            ),
+        },
+    ]
+)
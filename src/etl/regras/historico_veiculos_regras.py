@@ -0,0 +1,216 @@
+"""
+Regras de limpeza da camada Trusted do histórico de venda de veículos (ver
+`src/ferramentas/regras_limpeza.py`).
+"""
+
+import polars as pl
+
+from src.etl.regras.mapeamentos import CODIGOS_FILIAL_CORRIGIDOS
+from src.ferramentas.conversores import FORMATOS_DATA, converter_ano, converter_moeda
+
+# Colunas consideradas para classificar as linhas parcialmente duplicadas (o código da
+# filial ajustado não é considerado, pois é obtido do próprio código da filial)
+COLUNAS_DUPLICIDADE_PARCIAL: list = [
+    "Cod_Concessionaria",
+    "Cod_Filial",
+    "Nome_da_Concessionaria",
+    "Nome_da_Filial",
+    "Marca_da_Filial",
+    "Data_da_Venda",
+    "Quantidade_Vendida",
+    "Valor_da_Venda",
+    "Custo_do_Veiculo",
+    "Lucro_da_Venda",
+    "Margem_da_Venda",
+    "Marca_do_Veiculo",
+    "Modelo_do_Veiculo",
+    "Familia_do_Veiculo",
+    "Categoria_do_Veiculo",
+    "Cor_do_Veiculo",
+    "Veiculo_Novo_ou_Semi_Novo",
+    "Tipo_do_Combustivel",
+    "Ano_Modelo_do_Veiculo",
+    "Ano_Fabricacao_do_Veiculo",
+    "Dias_que_o_Carro_Ficou_no_Estoque",
+    "Tipo_de_Venda_do_Veiculo",
+    "Cidade_da_Venda",
+    "Estado_Brasileiro_da_Venda",
+    "Macroregiao_Geografica_da_Venda",
+    "coluna_extra",
+]
+
+# Colunas deslocadas para a direita nas linhas com valor na coluna extra (sem nome no
+# arquivo de origem). Cada coluna ajustada recebe o valor da próxima coluna
+COLUNAS_DESLOCADAS: list = [
+    "Tipo_de_Venda_do_Veiculo",
+    "Nome_do_Vendedor_que_Realizou_a_Venda",
+    "Nome_do_Comprador_do_Veiculo",
+    "Cidade_da_Venda",
+    "Estado_Brasileiro_da_Venda",
+    "Macroregiao_Geografica_da_Venda",
+    "coluna_extra",
+]
+
+# Valor que identifica as linhas com colunas deslocadas e repetidas
+CHASSI_COLUNAS_DESLOCADAS: str = "9BWAG45U4PT01905"
+
+HISTORICO_VEICULOS_REGRAS: list = (
+    [
+        # Ajustar o código da filial incorreto (01/01/2002 / 01/01/2003)
+        {
+            "coluna": "Cod_Filial_Ajustado",
+            "tipo": "mapear",
+            "origem": "Cod_Filial",
+            "valores": CODIGOS_FILIAL_CORRIGIDOS,
+        },
+        # Classificar linhas duplicadas, parcialmente duplicadas
+        {"coluna": "Linha_Duplicada", "tipo": "duplicidade"},
+        {
+            "coluna": "Linha_Duplicada_Parcial",
+            "tipo": "duplicidade",
+            "colunas": COLUNAS_DUPLICIDADE_PARCIAL,
+        },
+        {
+            "coluna": "Status_Duplicidade",
+            "tipo": "casos",
+            "casos": [
+                (pl.col("Linha_Duplicada"), "DUPLICADO"),
+                (pl.col("Linha_Duplicada_Parcial"), "DUPLICADO PARCIALMENTE"),
+            ],
+            "senao": "OK",
+        },
+        # Classificar itens com colunas deslocadas e repetidas
+        {
+            "coluna": "Colunas_Deslocadas_e_Repetidas",
+            "tipo": "casos",
+            "casos": [
+                (
+                    pl.col("Dias_que_o_Carro_Ficou_no_Estoque").str.contains(
+                        CHASSI_COLUNAS_DESLOCADAS
+                    ),
+                    "CONTÉM COLUNAS DESLOCADAS E REPETIDAS",
+                )
+            ],
+            "senao": "OK",
+        },
+    ]
+    + [
+        # Ajustar as colunas deslocadas para a direita, por coluna
+        {
+            "coluna": f"{coluna}_Ajustado",
+            "tipo": "casos",
+            "casos": [(pl.col("coluna_extra").is_not_null(), pl.col(proxima))],
+            "senao": pl.col(coluna),
+        }
+        for coluna, proxima in zip(COLUNAS_DESLOCADAS[:-1], COLUNAS_DESLOCADAS[1:])
+    ]
+    + [
+        {
+            "coluna": "Dias_que_o_Carro_Ficou_no_Estoque_Ajustado",
+            "tipo": "casos",
+            "casos": [
+                (
+                    pl.col("Dias_que_o_Carro_Ficou_no_Estoque").str.contains(
+                        CHASSI_COLUNAS_DESLOCADAS
+                    ),
+                    0,
+                )
+            ],
+            "senao": pl.col("Dias_que_o_Carro_Ficou_no_Estoque"),
+        },
+        # Transformar dtypes das colunas
+        {
+            "coluna": "Data_da_Venda",
+            "tipo": "converter",
+            "dtype": pl.Date,
+            "formato": FORMATOS_DATA,
+        },
+        {"coluna": "Quantidade_Vendida", "tipo": "converter", "dtype": pl.Int64},
+    ]
+    + [
+        # Anos estão salvos como número decimal (ex.: "2019.0")
+        {
+            "coluna": coluna,
+            "tipo": "expressao",
+            "expressao": converter_ano(coluna),
+        }
+        for coluna in ["Ano_Modelo_do_Veiculo", "Ano_Fabricacao_do_Veiculo"]
+    ]
+    + [
+        # Valores no formato brasileiro (ex.: 1.234,56) ou com ponto decimal
+        {"coluna": coluna, "tipo": "expressao", "expressao": converter_moeda(coluna)}
+        for coluna in [
+            "Valor_da_Venda",
+            "Custo_do_Veiculo",
+            "Lucro_da_Venda",
+            "Margem_da_Venda",
+        ]
+    ]
+    + [
+        {
+            "coluna": "Dias_que_o_Carro_Ficou_no_Estoque_Ajustado",
+            "tipo": "converter",
+            "dtype": pl.Int64,
+        },
+        # Converter dias no estoque para valores positivos
+        {
+            "coluna": "Dias_que_o_Carro_Ficou_no_Estoque_Ajustado",
+            "tipo": "expressao",
+            "expressao": pl.col("Dias_que_o_Carro_Ficou_no_Estoque_Ajustado").abs(),
+        },
+        # Recalcular lucro e margem
+        {
+            "coluna": "Lucro_da_Venda_Recalculado",
+            "tipo": "expressao",
+            "expressao": pl.col("Valor_da_Venda") - pl.col("Custo_do_Veiculo"),
+        },
+        {
+            "coluna": "Margem_da_Venda_Recalculado",
+            "tipo": "expressao",
+            "expressao": pl.col("Lucro_da_Venda_Recalculado")
+            / pl.col("Valor_da_Venda"),
+        },
+        # Classificar tipo da venda do veiculo 0 como NAO ESPECIFICADO
+        {
+            "coluna": "Tipo_de_Venda_do_Veiculo_Ajustado",
+            "tipo": "casos",
+            "casos": [(pl.col("Tipo_de_Venda_do_Veiculo") == "0", "NAO ESPECIFICADO")],
+            "senao": pl.col("Tipo_de_Venda_do_Veiculo"),
+        },
+        # Classificar tipos de combustivel UNKOWN como NAO ESPECIFICADO
+        {
+            "coluna": "Tipo_do_Combustivel_Ajustado",
+            "tipo": "casos",
+            "casos": [(pl.col("Tipo_do_Combustivel") == "UNKNOWN", "NAO ESPECIFICADO")],
+            "senao": pl.col("Tipo_do_Combustivel"),
+        },
+        # Classificar devoluções com lucro
+        {
+            "coluna": "Lucro_da_Venda_Classificado",
+            "tipo": "casos",
+            "casos": [
+                (
+                    (pl.col("Lucro_da_Venda_Recalculado") > 0)
+                    & (pl.col("Tipo_de_Venda_do_Veiculo_Ajustado") == "DEVOLUCAO"),
+                    "DEVOLUCAO COM LUCRO",
+                )
+            ],
+            "senao": "OK",
+        },
+        # Classificar linhas como CONFIÁVEIS ou NÃO CONFIÁVEIS conforme a qualidade do
+        # registro
+        {
+            "coluna": "Confiabilidade_do_Registro",
+            "tipo": "casos",
+            "casos": [
+                (
+                    (pl.col("Status_Duplicidade") == "OK")
+                    & (pl.col("Colunas_Deslocadas_e_Repetidas") == "OK")
+                    & (pl.col("Lucro_da_Venda_Classificado") == "OK"),
+                    "CONFIÁVEL",
+                )
+            ],
+            "senao": "NÃO CONFIÁVEL",
+        },
+    ]
+)
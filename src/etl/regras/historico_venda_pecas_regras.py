@@ -0,0 +1,194 @@
+"""
+Regras de limpeza da camada Trusted do histórico de venda de peças (ver
+`src/ferramentas/regras_limpeza.py`).
+"""
+
+import polars as pl
+
+from src.etl.regras.mapeamentos import CATEGORIAS_PECAS, CODIGOS_FILIAL_CORRIGIDOS
+from src.ferramentas.conversores import FORMATOS_DATA, converter_moeda
+
+# Padronizar departamentos
+DEPARTAMENTOS_PADRONIZADOS: dict = {
+    "ACESSORIOS": "ACESSÓRIOS",
+    "ADMINISTRACAO": "ADMINISTRAÇÃO",
+    "ASSISTENCIA TECNICA": "ASSISTÊNCIA TÉCNICA",
+    "ASSISTENCIA TECNICA ": "ASSISTÊNCIA TÉCNICA",
+    "FUNILARIA E PINTURA": "FUNILARIA E PINTURA",
+    "OFICINA": "OFICINA",
+    "PECAS": "PEÇAS",
+    "PECAS ATACADO": "PEÇAS",
+    "PECAS BALCAO": "PEÇAS",
+    "PECAS VAREJO": "PEÇAS",
+    "VEICULOS NOVOS": "VEÍCULOS NOVOS",
+}
+
+# Colunas consideradas para destacar as linhas parcialmente duplicadas
+COLUNAS_DUPLICIDADE_PARCIAL: list = [
+    "Cod_Concessionaria",
+    "Cod_Filial",
+    "Nome_da_Concessionaria",
+    "Nome_da_Filial",
+    "Marca_da_Filial",
+    "Data_da_Venda",
+    "Quantidade_Vendida",
+    "Valor_da_Venda",
+    "Custo_da_Peca",
+    "Lucro_da_Venda",
+    "Margem_da_Venda",
+    "Descricao_da_Peca",
+    "Categoria_da_Peca",
+    "Departamento_da_Venda",
+    "Tipo_de_Venda_da_Peca",
+    "Cidade_da_Venda",
+    "Estado_Brasileiro_da_Venda",
+    "Macroregiao_Geografica_da_Venda",
+]
+
+# Valores zerados quando a quantidade vendida é igual a zero
+COLUNAS_ZERAR_VALORES: list = [
+    "Valor_da_Venda",
+    "Custo_da_Peca",
+    "Lucro_da_Venda",
+    "Margem_da_Venda",
+]
+
+# Custo da peça a partir do qual o valor é considerado desproporcional
+CUSTO_DESPROPORCIONAL: float = 400000
+
+HISTORICO_VENDA_PECAS_REGRAS: list = (
+    [
+        # Transformar dtypes das colunas
+        {
+            "coluna": "Data_da_Venda",
+            "tipo": "converter",
+            "dtype": pl.Date,
+            "formato": FORMATOS_DATA,
+        },
+        {"coluna": "Quantidade_Vendida", "tipo": "converter", "dtype": pl.Int64},
+    ]
+    + [
+        # Valores no formato brasileiro (ex.: 1.234,56) ou com ponto decimal
+        {"coluna": coluna, "tipo": "expressao", "expressao": converter_moeda(coluna)}
+        for coluna in COLUNAS_ZERAR_VALORES
+    ]
+    + [
+        # Destacar linhas duplicadas, parcialmente duplicadas
+        {"coluna": "Linha_Duplicada", "tipo": "duplicidade"},
+        {
+            "coluna": "Linha_Duplicada_Parcial",
+            "tipo": "duplicidade",
+            "colunas": COLUNAS_DUPLICIDADE_PARCIAL,
+        },
+        {
+            "coluna": "Status_Duplicidade",
+            "tipo": "casos",
+            "casos": [
+                (pl.col("Linha_Duplicada"), "DUPLICADO"),
+                (pl.col("Linha_Duplicada_Parcial"), "DUPLICADO PARCIALMENTE"),
+            ],
+            "senao": "OK",
+        },
+        # Padronizar as categorias
+        {
+            "coluna": "Categoria_da_Peca_Padronizada",
+            "tipo": "mapear",
+            "origem": "Categoria_da_Peca",
+            "valores": CATEGORIAS_PECAS,
+        },
+        # Padronizar departamentos
+        {
+            "coluna": "Departamento_da_Venda_Padronizada",
+            "tipo": "mapear",
+            "origem": "Departamento_da_Venda",
+            "valores": DEPARTAMENTOS_PADRONIZADOS,
+        },
+        # Ajustar o código da filial incorreto (1-1-3)
+        {
+            "coluna": "Cod_Filial_Ajustado",
+            "tipo": "mapear",
+            "origem": "Cod_Filial",
+            "valores": CODIGOS_FILIAL_CORRIGIDOS,
+        },
+    ]
+    + [
+        # Ajustar valores quando a quantidade vendida é igual a zero
+        {
+            "coluna": f"{coluna}_Ajustado",
+            "tipo": "casos",
+            "casos": [(pl.col("Quantidade_Vendida") == 0, 0)],
+            "senao": pl.col(coluna),
+        }
+        for coluna in COLUNAS_ZERAR_VALORES
+    ]
+    + [
+        # Recalcular lucro da venda
+        {
+            "coluna": "Lucro_da_Venda_Recalculado",
+            "tipo": "expressao",
+            "expressao": pl.col("Valor_da_Venda_Ajustado")
+            - pl.col("Custo_da_Peca_Ajustado"),
+        },
+        # Recalcular margem da venda
+        {
+            "coluna": "Margem_da_Venda_Recalculado",
+            "tipo": "expressao",
+            "expressao": pl.col("Lucro_da_Venda_Recalculado")
+            / pl.col("Valor_da_Venda_Ajustado"),
+        },
+        # Ajustar margem quando o lucro for 0
+        {
+            "coluna": "Margem_da_Venda_Recalculado",
+            "tipo": "casos",
+            "casos": [(pl.col("Lucro_da_Venda_Ajustado") == 0, 0)],
+            "senao": pl.col("Margem_da_Venda_Recalculado"),
+        },
+        # Classificar valor de custo desproporcionais
+        {
+            "coluna": "Custo_da_Peca_Classificado",
+            "tipo": "casos",
+            "casos": [
+                (
+                    pl.col("Custo_da_Peca") > CUSTO_DESPROPORCIONAL,
+                    "VALOR DE CUSTO DESPROPORCIONAL",
+                )
+            ],
+            "senao": "OK",
+        },
+        # Classificar devoluções com lucro
+        {
+            "coluna": "Lucro_da_Venda_Classificado",
+            "tipo": "casos",
+            "casos": [
+                (
+                    (pl.col("Lucro_da_Venda") > 0)
+                    & (pl.col("Tipo_de_Venda_da_Peca") == "DEVOLUCAO"),
+                    "DEVOLUCAO COM LUCRO",
+                )
+            ],
+            "senao": "OK",
+        },
+        # Classificar registros com valor de custo igual a 0
+        {
+            "coluna": "Custo_da_Peca_Classificado",
+            "tipo": "casos",
+            "casos": [(pl.col("Custo_da_Peca") == 0, "VALOR DE CUSTO IGUAL A 0")],
+            "senao": "OK",
+        },
+        # Classificar linhas como CONFIÁVEIS ou NÃO CONFIÁVEIS conforme a qualidade do
+        # registro
+        {
+            "coluna": "Confiabilidade_do_Registro",
+            "tipo": "casos",
+            "casos": [
+                (
+                    (pl.col("Status_Duplicidade") == "OK")
+                    & (pl.col("Custo_da_Peca_Classificado") == "OK")
+                    & (pl.col("Lucro_da_Venda_Classificado") == "OK"),
+                    "CONFIÁVEL",
+                )
+            ],
+            "senao": "NÃO CONFIÁVEL",
+        },
+    ]
+)
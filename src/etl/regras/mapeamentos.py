@@ -0,0 +1,49 @@
+"""
+Mapeamentos de padronização compartilhados entre os datasets da camada Trusted.
+
+Os mesmos valores aparecem em mais de um dataset (ex.: as categorias de peças, no
+estoque e no histórico de venda de peças), por isso são mantidos em um único lugar.
+"""
+
+# Padronização das categorias de peças
+CATEGORIAS_PECAS: dict = {
+    "ACESS.NAO ORIGINAIS": "ACESSORIOS NÃO ORIGINAIS",
+    "ACESSORIOS NAO ORIGI": "ACESSORIOS NÃO ORIGINAIS",
+    "ACESSORIOS NAO ORIG": "ACESSORIOS NÃO ORIGINAIS",
+    "ACESSORIOS ORIGINAIS": "ACESSORIOS ORIGINAIS",
+    "NISSAN-ACES. ORIG.": "ACESSORIOS ORIGINAIS",
+    "NISSAN-ACES.NAO ORIG": "ACESSORIOS NÃO ORIGINAIS",
+    "NISSAN-COM LUBRIF.": "LUBRIFICANTES/COMBUSTÍVEL",
+    "COMB./LUB.": "LUBRIFICANTES/COMBUSTÍVEL",
+    "LUBRIFICANTES": "LUBRIFICANTES/COMBUSTÍVEL",
+    "LUBRIFICANTES/COMB.": "LUBRIFICANTES/COMBUSTÍVEL",
+    "NISSAN-COM. LUBRIF.": "LUBRIFICANTES/COMBUSTÍVEL",
+    "VOLKS-COM. LUBRIF.": "LUBRIFICANTES/COMBUSTÍVEL",
+    "PECAS NAO ORIGINAIS": "PEÇAS NÃO ORIGINAIS",
+    "VOLKS-PEC. NAO ORIG.": "PEÇAS NÃO ORIGINAIS",
+    "PEÇAS N.ORIGINAIS": "PEÇAS NÃO ORIGINAIS",
+    "FORD-PECAS NAO ORIG.": "PEÇAS NÃO ORIGINAIS",
+    "NISSAN-PEC NAO ORIG.": "PEÇAS NÃO ORIGINAIS",
+    "GM-PECAS ORIG. ": "PEÇAS ORIGINAIS",
+    "NISSAN-PECAS ORIG.": "PEÇAS ORIGINAIS",
+    "PECAS ORIGINAIS VW": "PEÇAS ORIGINAIS",
+    "PECAS ORIGINAIS": "PEÇAS ORIGINAIS",
+    "PEÇAS ORIGINAIS": "PEÇAS ORIGINAIS",
+    "VOLKS-PECAS ORIG.": "PEÇAS ORIGINAIS",
+    "PNEUS": "PNEUS",
+    "VOLKS-PNEUS": "PNEUS",
+    "NISSAN-PNEUS": "PNEUS",
+    "OUTRAS MERCADORIAS": "OUTRAS MERCADORIAS",
+    "VOLKS-OUTRAS MERCAD.": "OUTRAS MERCADORIAS",
+}
+
+# Correção dos códigos de filial incorretos nos arquivos de origem
+CODIGOS_FILIAL_CORRIGIDOS: dict = {
+    "1-1-3": "0-1-1",
+    "01/01/2002": "0-1-1",
+    "01/01/2003": "0-1-1",
+}
+
+# Classificações comuns aos datasets históricos, na ordem das categorias
+STATUS_DUPLICIDADE: list = ["OK", "DUPLICADO PARCIALMENTE", "DUPLICADO"]
+CONFIABILIDADE_DO_REGISTRO: list = ["CONFIÁVEL", "NÃO CONFIÁVEL"]
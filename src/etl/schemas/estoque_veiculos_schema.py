@@ -4,16 +4,21 @@ Script para definir o esquema dos dados da camada Trusted de estoque de veiculos
 
 import polars as pl
 
+from src.etl.schemas.tipos_categoricos import (
+    CATEGORICO,
+    CLASSIFICACAO_TEMPO_NO_ESTOQUE_ENUM,
+)
+
 ESTOQUE_VEICULOS_SCHEMA: dict = {
-    "nome_da_concessionaria": pl.Utf8,
-    "nome_da_filial": pl.Utf8,
+    "nome_da_concessionaria": CATEGORICO,
+    "nome_da_filial": CATEGORICO,
     "custo_do_veiculo": pl.Float64,
-    "marca_da_filial": pl.Utf8,
-    "marca_do_veiculo": pl.Utf8,
+    "marca_da_filial": CATEGORICO,
+    "marca_do_veiculo": CATEGORICO,
     "modelo_do_veiculo": pl.Utf8,
-    "cor_do_veiculo": pl.Utf8,
-    "veiculo_novo_ou_semi_novo": pl.Utf8,
-    "tipo_do_combustivel": pl.Utf8,
+    "cor_do_veiculo": CATEGORICO,
+    "veiculo_novo_ou_semi_novo": CATEGORICO,
+    "tipo_do_combustivel": CATEGORICO,
     "ano_modelo_do_veiculo": pl.Date,
     "ano_fabricacao_do_veiculo": pl.Date,
     "tempo_total_no_estoque": pl.Utf8,
@@ -21,6 +26,7 @@ ESTOQUE_VEICULOS_SCHEMA: dict = {
     "data_de_entrada_do_veiculo_no_estoque": pl.Date,
     "data_de_entrada_do_veiculo_no_estoque_duplicated_0": pl.Date,
     "data_de_entrada_do_veiculo_no_estoque_duplicated_1": pl.Date,
-    "classificacao_tempo_no_estoque": pl.Utf8,
+    "classificacao_tempo_no_estoque": CLASSIFICACAO_TEMPO_NO_ESTOQUE_ENUM,
     "data_de_entrada_do_veiculo_no_estoque_atualizada": pl.Date,
+    "arquivo_de_origem": pl.Utf8,
 }
@@ -4,12 +4,20 @@ Script para definir o esquema dos dados da camada Trusted do historico de venda
 
 import polars as pl
 
+from src.etl.schemas.tipos_categoricos import (
+    CATEGORIA_PECA,
+    CATEGORICO,
+    CONFIABILIDADE_DO_REGISTRO_ENUM,
+    DEPARTAMENTO_DA_VENDA,
+    STATUS_DUPLICIDADE_ENUM,
+)
+
 HISTORICO_VENDA_PECAS_SCHEMA: dict = {
     "cod_concessionaria": pl.String,
     "cod_filial": pl.String,
-    "nome_da_concessionaria": pl.Utf8,
-    "nome_da_filial": pl.Utf8,
-    "marca_da_filial": pl.Utf8,
+    "nome_da_concessionaria": CATEGORICO,
+    "nome_da_filial": CATEGORICO,
+    "marca_da_filial": CATEGORICO,
     "data_da_venda": pl.Date,
     "quantidade_vendida": pl.Float64,
     "valor_da_venda": pl.Float64,
@@ -17,19 +25,23 @@ HISTORICO_VENDA_PECAS_SCHEMA: dict = {
     "lucro_da_venda": pl.Float64,
     "margem_da_venda": pl.Float64,
     "descricao_da_peca": pl.Utf8,
-    "categoria_da_peca": pl.Utf8,
-    "departamento_da_venda": pl.Utf8,
-    "tipo_de_venda_da_peca": pl.Utf8,
+    "categoria_da_peca": CATEGORICO,
+    "departamento_da_venda": CATEGORICO,
+    "tipo_de_venda_da_peca": CATEGORICO,
     "nome_do_vendedor_que_realizou_a_venda": pl.Utf8,
     "nome_do_comprador_da_peca": pl.Utf8,
-    "cidade_da_venda": pl.Utf8,
-    "estado_brasileiro_da_venda": pl.Utf8,
-    "macroregiao_geografica_da_venda": pl.Utf8,
+    "cidade_da_venda": CATEGORICO,
+    "estado_brasileiro_da_venda": CATEGORICO,
+    "macroregiao_geografica_da_venda": CATEGORICO,
     "linha_duplicada": pl.Utf8,
     "linha_duplicada_parcial": pl.Utf8,
-    "status_duplicidade": pl.Utf8,
-    "categoria_da_peca_padronizada": pl.Utf8,
-    "departamento_da_venda_padronizada": pl.Utf8,
+    "grupo_linha_duplicada": pl.UInt64,
+    "tamanho_grupo_linha_duplicada": pl.UInt32,
+    "grupo_linha_duplicada_parcial": pl.UInt64,
+    "tamanho_grupo_linha_duplicada_parcial": pl.UInt32,
+    "status_duplicidade": STATUS_DUPLICIDADE_ENUM,
+    "categoria_da_peca_padronizada": CATEGORIA_PECA,
+    "departamento_da_venda_padronizada": DEPARTAMENTO_DA_VENDA,
     "cod_filial_ajustado": pl.String,
     "valor_da_venda_ajustado": pl.Float64,
     "custo_da_peca_ajustado": pl.Float64,
@@ -37,7 +49,9 @@ HISTORICO_VENDA_PECAS_SCHEMA: dict = {
     "margem_da_venda_ajustado": pl.Float64,
     "lucro_da_venda_recalculado": pl.Float64,
     "margem_da_venda_recalculado": pl.Float64,
-    "custo_da_peca_classificado": pl.Utf8,
-    "lucro_da_venda_classificado": pl.Utf8,
-    "confiabilidade_do_registro": pl.Utf8,
+    "custo_da_peca_classificado": CATEGORICO,
+    "lucro_da_venda_classificado": CATEGORICO,
+    "confiabilidade_do_registro": CONFIABILIDADE_DO_REGISTRO_ENUM,
+    "chave_linha": pl.UInt64,
+    "arquivo_de_origem": pl.Utf8,
 }
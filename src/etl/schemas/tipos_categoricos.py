@@ -0,0 +1,53 @@
+"""
+Script para definir os tipos categóricos utilizados nos esquemas da camada Trusted.
+
+Colunas com poucos valores distintos, repetidos em todas as linhas, são gravadas como
+categorias: cada valor é armazenado uma única vez e as linhas guardam apenas um código
+inteiro, reduzindo o tamanho dos arquivos e acelerando os agrupamentos (`group_by`).
+
+- `pl.Enum`: conjunto fechado de valores, obtido dos mapeamentos de padronização
+  (src/etl/regras). Um valor fora do conjunto interrompe o tratamento, indicando que o
+  mapeamento precisa ser atualizado;
+- `pl.Categorical`: conjunto aberto de valores (ex.: nomes de filiais e marcas), que
+  pode crescer a cada novo arquivo de origem.
+"""
+
+import polars as pl
+
+from src.etl.regras.estoque_pecas_regras import CLASSIFICACAO_OBSOLESCENCIA
+from src.etl.regras.estoque_veiculos_regras import CLASSIFICACAO_TEMPO_NO_ESTOQUE
+from src.etl.regras.historico_servicos_regras import CATEGORIAS_SERVICO
+from src.etl.regras.historico_venda_pecas_regras import DEPARTAMENTOS_PADRONIZADOS
+from src.etl.regras.mapeamentos import (
+    CATEGORIAS_PECAS,
+    CONFIABILIDADE_DO_REGISTRO,
+    STATUS_DUPLICIDADE,
+)
+
+
+def enum_do_mapeamento(mapeamento: dict) -> pl.Enum:
+    """
+    Monta um Enum com os valores padronizados de um mapeamento, em ordem alfabética.
+
+    Args:
+        mapeamento (dict): Mapeamento de padronização (valor original: padronizado).
+
+    Returns:
+        pl.Enum: Tipo com os valores padronizados distintos.
+    """
+    return pl.Enum(sorted(set(mapeamento.values())))
+
+
+CATEGORICO: pl.Categorical = pl.Categorical()
+
+CATEGORIA_PECA: pl.Enum = enum_do_mapeamento(CATEGORIAS_PECAS)
+CATEGORIA_SERVICO: pl.Enum = enum_do_mapeamento(CATEGORIAS_SERVICO)
+DEPARTAMENTO_DA_VENDA: pl.Enum = enum_do_mapeamento(DEPARTAMENTOS_PADRONIZADOS)
+CLASSIFICACAO_OBSOLESCENCIA_ENUM: pl.Enum = enum_do_mapeamento(
+    CLASSIFICACAO_OBSOLESCENCIA
+)
+CLASSIFICACAO_TEMPO_NO_ESTOQUE_ENUM: pl.Enum = enum_do_mapeamento(
+    CLASSIFICACAO_TEMPO_NO_ESTOQUE
+)
+STATUS_DUPLICIDADE_ENUM: pl.Enum = pl.Enum(STATUS_DUPLICIDADE)
+CONFIABILIDADE_DO_REGISTRO_ENUM: pl.Enum = pl.Enum(CONFIABILIDADE_DO_REGISTRO)
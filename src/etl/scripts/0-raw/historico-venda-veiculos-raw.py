@@ -8,23 +8,35 @@ import polars as pl
 
 from datetime import datetime
 from pathlib import Path
-from src.ferramentas.funcoes_suporte import salvar_parquet
+from src.ferramentas.fingerprints import salvar_registro, verificar_fontes
+from src.ferramentas.funcoes_suporte import (
+    PERFIL_POR_CAMADA,
+    ler_csv_streaming,
+    listar_fontes,
+    salvar_parquet_streaming,
+)
+from src.ferramentas.identidade import identidade_das_fontes
+from src.ferramentas.instrumentacao import Instrumentacao
 
 # region ----- Caminho do dataset -----
 DATASETS_PATH: Path = Path(__file__).parent.parent.parent.parent / "datasets"
-# endregion
 
-# region ----- Ler dataset bruto -----
-venda_de_veiculos_raw: pl.DataFrame = pl.read_csv(
-    source=DATASETS_PATH / "historico-de-vendas-de-veiculos.csv",
-    separator=";",
-    infer_schema=False,
-    truncate_ragged_lines=True,
+# Arquivos de origem: o arquivo único ou uma exportação por filial e por mês
+# (ex.: historico-de-vendas-de-veiculos-0-1-1-2024-01.csv)
+SOURCE_FILES_PATTERN: str = "historico-de-vendas-de-veiculos*.csv"
+SOURCE_FILES: list[Path] = listar_fontes(
+    path=DATASETS_PATH, padrao=SOURCE_FILES_PATTERN
 )
+
+# Opções de leitura do arquivo CSV de origem
+OPCOES_CSV: dict = {
+    "separator": ";",
+    "truncate_ragged_lines": True,
+}
 # endregion
 
 
-# region ----- Salvar dataset bruto em Parquet -----
+# region ----- Caminho Arquivo Raw -----
 RAW_DATA_PATH: Path = (
     Path(__file__).parent.parent.parent.parent
     / "etl"
@@ -34,13 +46,72 @@ RAW_DATA_PATH: Path = (
 )
 RAW_DATA_PATH.mkdir(parents=True, exist_ok=True)
 
-time_now: datetime = datetime.now().strftime("%Y-%m-%d-%H-%M-%S")
-file_name: str = f"venda-de-veiculos-raw-{time_now}.parquet"
+REGISTRO_FINGERPRINTS_PATH: Path = (
+    Path(__file__).parent.parent.parent.parent
+    / "etl"
+    / "data"
+    / "fingerprints"
+    / "historico-venda-veiculos.json"
+)
+# endregion
 
 
-salvar_parquet(
-    df=venda_de_veiculos_raw,
-    file_name=file_name,
-    path=RAW_DATA_PATH,
-)
+# region ----- Instrumentação -----
+# Tempo e memória de cada etapa, com a variável de ambiente INSTRUMENTACAO_ETL=1
+instrumentacao: Instrumentacao = Instrumentacao(script=Path(__file__))
 # endregion
+
+
+# region ----- Verificar alterações no dataset bruto -----
+# Caso os arquivos de origem sejam idênticos aos da última ingestão, não há
+# necessidade de ler e salvar o dataset novamente
+with instrumentacao.etapa("Verificar alterações no dataset bruto"):
+    fonte_alterada, fingerprints = verificar_fontes(
+        fontes=SOURCE_FILES,
+        registro=REGISTRO_FINGERPRINTS_PATH,
+        destino=RAW_DATA_PATH,
+    )
+# endregion
+
+
+if fonte_alterada:
+    # region ----- Ler dataset bruto -----
+    # A leitura é preguiçosa (lazy): os arquivos só são lidos durante a escrita do
+    # Parquet, em paralelo e em lotes, sem concatenar tudo em memória. Cada linha
+    # recebe o nome do seu arquivo de origem
+    with instrumentacao.etapa("Ler dataset bruto"):
+        venda_de_veiculos_raw: pl.LazyFrame = ler_csv_streaming(
+            source=SOURCE_FILES, **OPCOES_CSV
+        )
+    # endregion
+
+    # region ----- Salvar dataset bruto em Parquet -----
+    time_now: datetime = datetime.now().strftime("%Y-%m-%d-%H-%M-%S")
+    file_name: str = f"venda-de-veiculos-raw-{time_now}.parquet"
+
+    with instrumentacao.etapa("Salvar dataset bruto em Parquet") as medicao:
+        salvar_parquet_streaming(
+            lf=venda_de_veiculos_raw,
+            file_name=file_name,
+            path=RAW_DATA_PATH,
+            perfil=PERFIL_POR_CAMADA["0-raw"],
+            identidade=identidade_das_fontes(
+                fingerprints=fingerprints, script=Path(__file__)
+            ),
+        )
+        medicao.linhas(saida=RAW_DATA_PATH / file_name)
+
+    salvar_registro(
+        registro=REGISTRO_FINGERPRINTS_PATH,
+        fingerprints=fingerprints,
+        arquivo_gerado=file_name,
+    )
+    # endregion
+else:
+    # Apenas atualiza o registro, caso a data de modificação dos arquivos tenha mudado
+    # sem alteração no conteúdo
+    salvar_registro(
+        registro=REGISTRO_FINGERPRINTS_PATH,
+        fingerprints=fingerprints,
+    )
+    print(f"{SOURCE_FILES_PATTERN} sem alterações desde a última ingestão.")
@@ -4,14 +4,27 @@ Script de tratamento dos dados da camada Trusted de estoque de veículos.
 Esta camada tem como objetivo a limpeza, padronização e tratamento dos dados brutos
 """
 
-import os
 import polars as pl
 
 from pathlib import Path
 from datetime import datetime
 from src.etl.schemas.estoque_veiculos_schema import ESTOQUE_VEICULOS_SCHEMA
-from src.ferramentas.funcoes_suporte import salvar_parquet
-
+from src.etl.regras.estoque_veiculos_regras import ESTOQUE_VEICULOS_REGRAS
+from src.ferramentas.catalogo import ultima_versao
+from src.ferramentas.funcoes_suporte import (
+    PERFIL_POR_CAMADA,
+    aplicar_schema,
+    incluir_arquivo_origem,
+    salvar_parquet_streaming,
+)
+from src.ferramentas.identidade import (
+    TAMANHO_IDENTIDADE_ARQUIVO,
+    calcular_identidade,
+    versao_identica,
+)
+from src.ferramentas.inspecao_plano import INSPECAO_PLANO, salvar_relatorio_plano
+from src.ferramentas.instrumentacao import Instrumentacao
+from src.ferramentas.regras_limpeza import aplicar_regras
 
 # region ----- Caminho Arquivo Raw -----
 RAW_FOLDER_PATH: Path = (
@@ -21,30 +34,6 @@ RAW_FOLDER_PATH: Path = (
     / "0-raw"
     / "estoque-veiculos"
 )
-
-RAW_DATA_FILE = os.listdir(RAW_FOLDER_PATH)[0]
-
-RAW_FILE_PATH = RAW_FOLDER_PATH / RAW_DATA_FILE
-# endregion
-
-
-# region ----- Suporte -----
-# Classificação tempo no estoque
-def class_tempo_no_estoque() -> dict:
-    class_tempo_no_estoque: dict = {
-        "MENOS DE 1 MES": "1 - MENOS DE 1 MES",
-        "1 A 3 MESES": "2 - 1 A 3 MESES",
-        "3 A 6 MESES": "3 - 3 A 6 MESES",
-        "6 A 9 MESES": "4 - 6 A 9 MESES",
-        "9 A 12 MESES": "5 - 9 A 12 MESES",
-        "1 A 2 ANOS": "6 - 1 A 2 ANOS",
-        "2 A 3 ANOS": "7 - 2 A 3 ANOS",
-        "MAIS DE 3 ANOS": "8 - MAIS DE 3 ANOS",
-    }
-
-    return class_tempo_no_estoque
-
-
 # endregion
 
 
@@ -61,73 +50,40 @@ TRUSTED_FOLDER_PATH.mkdir(parents=True, exist_ok=True)
 # endregion
 
 
-# region ----- Tratar Arquivo Raw -----
-# Ler o parquet raw
-df_raw: pl.DataFrame = pl.read_parquet(source=RAW_FILE_PATH)
-
-
-# Transformar dtypes das colunas
-df_raw = df_raw.with_columns([pl.col("Custo_do_Veiculo").cast(pl.Float64)])
-
-df_raw = df_raw.with_columns(
-    pl.col("Ano_Modelo_do_Veiculo").replace({"0": None}).cast(pl.String)
-)
-df_raw = df_raw.with_columns(
-    pl.col("Ano_Modelo_do_Veiculo")
-    .str.strptime(pl.Date, "%Y")
-    .cast(pl.Date, strict=True)
-)
-
-df_raw = df_raw.with_columns(
-    pl.col("Ano_Fabricacao_do_Veiculo").replace({"0": None}).cast(pl.String)
-)
-df_raw = df_raw.with_columns(
-    pl.col("Ano_Fabricacao_do_Veiculo")
-    .str.strptime(pl.Date, "%Y")
-    .cast(pl.Date, strict=True)
-)
+# region ----- Instrumentação -----
+# Tempo e memória de cada etapa, com a variável de ambiente INSTRUMENTACAO_ETL=1
+instrumentacao: Instrumentacao = Instrumentacao(script=Path(__file__))
+# endregion
 
-df_raw = df_raw.with_columns(
-    pl.col("Data_de_Entrada_do_Veiculo_no_Estoque")
-    .str.strptime(pl.Date, "%d/%m/%Y")
-    .cast(pl.Date, strict=True)
-)
 
-df_raw = df_raw.with_columns(
-    pl.col("Data_de_Entrada_do_Veiculo_no_Estoque_duplicated_0")
-    .str.strptime(pl.Date, "%d/%m/%Y")
-    .cast(pl.Date, strict=True)
-)
+# region ----- Tratar Arquivo Raw -----
+def tratar_dataset(df_raw: pl.LazyFrame) -> pl.LazyFrame:
+    """
+    Monta o tratamento do dataset bruto de estoque de veículos.
 
-df_raw = df_raw.with_columns(
-    pl.col("Data_de_Entrada_do_Veiculo_no_Estoque_duplicated_1")
-    .str.strptime(pl.Date, "%d/%m/%Y")
-    .cast(pl.Date, strict=True)
-)
+    Args:
+        df_raw (pl.LazyFrame): Dataset bruto. Um DataFrame também é aceito, com cada
+            etapa executada imediatamente.
 
-df_raw = df_raw.with_columns([pl.col("Kilometragem_Atual_do_Veiculo").cast(pl.Float64)])
+    Returns:
+        pl.LazyFrame: Plano do dataset tratado, conforme o schema da camada Trusted.
+    """
+    # Arquivo de origem de cada linha, ausente nos datasets brutos gravados antes
+    # de a camada Raw registrá-lo
+    df_raw = incluir_arquivo_origem(df_raw)
 
+    # Aplicar as regras de limpeza do dataset (src/etl/regras), compiladas em lotes,
+    # com as colunas Enum do schema convertidas nas próprias regras
+    df_raw = aplicar_regras(
+        df=df_raw, regras=ESTOQUE_VEICULOS_REGRAS, schema=ESTOQUE_VEICULOS_SCHEMA
+    )
 
-# Classificação tempo no estoque
-df_raw = df_raw.with_columns(
-    pl.col("Tempo_Total_no_Estoque")
-    .replace(class_tempo_no_estoque())
-    .alias("Classificacao_Tempo_no_Estoque")
-)
+    # Renomear colunas para estarem em minúsculo
+    df_raw = df_raw.rename(str.lower)
 
+    # Selecionar as colunas finais, pelo nome, conforme o schema da camada Trusted
+    return aplicar_schema(df=df_raw, schema=ESTOQUE_VEICULOS_SCHEMA)
 
-# Avaliar as colunas duplicadas de data, e considerar a data mais antiga
-# De forma prudente, o custo deverá ser reconhecido no período mais antigo
-df_raw = df_raw.with_columns(
-    pl.min_horizontal(
-        "Data_de_Entrada_do_Veiculo_no_Estoque",
-        "Data_de_Entrada_do_Veiculo_no_Estoque_duplicated_0",
-        "Data_de_Entrada_do_Veiculo_no_Estoque_duplicated_1",
-    ).alias("Data_de_Entrada_do_Veiculo_no_Estoque_Atualizada")
-)
-
-# Renomear colunas para estarem em minúsculo
-df_raw = df_raw.rename(str.lower)
 
 # endregion
 
@@ -136,21 +92,48 @@ df_raw = df_raw.rename(str.lower)
 
 
 # region ----- Salvar Arquivo Trusted -----
-# Salvar em um novo dataframe com os dados finais
-df_trusted: pl.DataFrame = pl.DataFrame(
-    data=df_raw,
-    schema=ESTOQUE_VEICULOS_SCHEMA,
-)
-
-time_now: datetime = datetime.now().strftime("%Y-%m-%d-%H-%M-%S")
-file_name_trusted: str = f"estoque-veiculos-trusted-{time_now}.parquet"
-
-
-salvar_parquet(
-    df=df_trusted,
-    path=TRUSTED_FOLDER_PATH,
-    file_name=file_name_trusted,
-)
-
-
+if __name__ == "__main__":
+    # Versão mais recente do dataset, conforme o catálogo da camada Raw
+    RAW_FILE_PATH: Path = ultima_versao(RAW_FOLDER_PATH)
+
+    # Identidade do resultado: dados da camada Raw, código do tratamento e schema
+    with instrumentacao.etapa("Calcular identidade"):
+        identidade: str = calcular_identidade(
+            entradas=[RAW_FILE_PATH],
+            script=Path(__file__),
+            schema=ESTOQUE_VEICULOS_SCHEMA,
+        )
+
+    if INSPECAO_PLANO:
+        # Apenas o relatório do plano de consulta, sem tratar nem gravar o dataset
+        # (ver src/ferramentas/inspecao_plano.py)
+        lf_raw: pl.LazyFrame = pl.scan_parquet(source=RAW_FILE_PATH)
+        salvar_relatorio_plano(
+            lf_raw=lf_raw, lf=tratar_dataset(lf_raw), nome=Path(__file__).stem
+        )
+    elif versao_identica(TRUSTED_FOLDER_PATH, identidade):
+        # A versão publicada já foi gerada a partir dos mesmos dados e do mesmo
+        # código: o tratamento geraria um arquivo idêntico
+        print(f"{RAW_FILE_PATH.name} já tratado com o código atual ({identidade}).")
+    else:
+        # Nada é lido até a gravação, quando o plano completo é otimizado e executado
+        lf_trusted: pl.LazyFrame = tratar_dataset(pl.scan_parquet(source=RAW_FILE_PATH))
+
+        time_now: datetime = datetime.now().strftime("%Y-%m-%d-%H-%M-%S")
+        # O início da identidade no nome identifica o conteúdo de cada versão
+        sufixo: str = identidade[:TAMANHO_IDENTIDADE_ARQUIVO]
+        file_name_trusted: str = f"estoque-veiculos-trusted-{time_now}-{sufixo}.parquet"
+
+        # Os dados são lidos, tratados e gravados em lotes (streaming)
+        with instrumentacao.etapa("Tratar e salvar Arquivo Trusted") as medicao:
+            salvar_parquet_streaming(
+                lf=lf_trusted,
+                path=TRUSTED_FOLDER_PATH,
+                file_name=file_name_trusted,
+                perfil=PERFIL_POR_CAMADA["1-trusted"],
+                identidade=identidade,
+            )
+            medicao.linhas(
+                entrada=RAW_FILE_PATH, saida=TRUSTED_FOLDER_PATH / file_name_trusted
+            )
 # endregion
@@ -4,14 +4,33 @@ Script de tratamento dos dados da camada Trusted do historico de serviços.
 Esta camada tem como objetivo a limpeza, padronização e tratamento dos dados brutos
 """
 
-import os
 import polars as pl
 
 from pathlib import Path
 from datetime import datetime
 from src.etl.schemas.historico_servicos_schema import HISTORICO_SERVICOS_SCHEMA
-from src.ferramentas.funcoes_suporte import salvar_parquet
-
+from src.etl.regras.historico_servicos_regras import HISTORICO_SERVICOS_REGRAS
+from src.ferramentas.catalogo import ultima_versao
+from src.ferramentas.funcoes_suporte import (
+    PERFIL_POR_CAMADA,
+    aplicar_schema,
+    incluir_arquivo_origem,
+    salvar_parquet_particionado,
+)
+from src.ferramentas.identidade import (
+    TAMANHO_IDENTIDADE_ARQUIVO,
+    calcular_identidade,
+    identidade_codigo,
+    versao_identica,
+)
+from src.ferramentas.incremental import (
+    PROCESSAMENTO_INCREMENTAL,
+    completar_chave_linha,
+    processar_incremental,
+)
+from src.ferramentas.inspecao_plano import INSPECAO_PLANO, salvar_relatorio_plano
+from src.ferramentas.instrumentacao import Instrumentacao
+from src.ferramentas.regras_limpeza import aplicar_regras, grupos_de_duplicidade
 
 # region ----- Caminho Arquivo Raw -----
 RAW_FOLDER_PATH: Path = (
@@ -21,10 +40,6 @@ RAW_FOLDER_PATH: Path = (
     / "0-raw"
     / "historico-servicos"
 )
-
-RAW_DATA_FILE = os.listdir(RAW_FOLDER_PATH)[0]
-
-RAW_FILE_PATH = RAW_FOLDER_PATH / RAW_DATA_FILE
 # endregion
 
 
@@ -41,128 +56,128 @@ TRUSTED_FOLDER_PATH.mkdir(parents=True, exist_ok=True)
 # endregion
 
 
-# region ----- Suporte -----
-# Padronizar categoria do serviço
-def padronizar_categoria_serviço() -> dict:
-    padronizar_categoria_serviço: dict = {
-        "ACESSORIOS": "ACESSORIOS",
-        "ALINHAMENTO/BALANCEAMENTO": "ALINHAMENTO E BALANCEAMENTO",
-        "ALINHAMENTO E BALANCEAMEN": "ALINHAMENTO E BALANCEAMENTO",
-        "LUBRIFICACAO": "LUBRIFICAÇÃO",
-        "LUBRIFICAÇÃO": "LUBRIFICAÇÃO",
-        "MECANICA GERAL": "MECANICA",
-        "MECANICA E ELETRICA": "MECANICA",
-        "MECANICA": "MECANICA",
-        "PDI-REVISÃO DE ENTREGA": "REVISÃO",
-        "REVISAO PROGRAMADA": "REVISÃO",
-        "REVISAO GRATUITA": "REVISÃO GRATUITA",
-        "REVISAO": "REVISÃO",
-        "SERV TERCEIROS": "SERVIÇOS DE TERCEIRO",
-        "SERVICO TERCEIRO": "SERVIÇOS DE TERCEIRO",
-        "SERVIÇOS DE TERCEIROS": "SERVIÇOS DE TERCEIRO",
-        "ELETRIC": "ELETRICA",
-        "FUNILARI": "FUNILARIA",
-        "MONTAGEM": "MONTAGEM",
-        "LAVAGE": "LAVAGEM",
-        "PINTURA": "PINTURA",
-        "DEMAIS CATEGORIA": "OUTROS",
-    }
-
-    return padronizar_categoria_serviço
+# region ----- Processamento Incremental -----
+# Grupos de linhas avaliadas em conjunto (duplicidade e Total_OS de cada OS),
+# tratados novamente por completo no processamento incremental
+GRUPOS_RECALCULO: list = grupos_de_duplicidade(HISTORICO_SERVICOS_REGRAS) + [
+    ["Numero_Da_OS_De_Servico"]
+]
+# endregion
 
 
+# region ----- Instrumentação -----
+# Tempo e memória de cada etapa, com a variável de ambiente INSTRUMENTACAO_ETL=1
+instrumentacao: Instrumentacao = Instrumentacao(script=Path(__file__))
 # endregion
 
 
 # region ----- Tratar Arquivo Raw -----
-# Ler o parquet raw
-df_raw: pl.DataFrame = pl.read_parquet(source=RAW_FILE_PATH)
-
-
-# Transformar dtypes das colunas
-df_raw = df_raw.with_columns(
-    [pl.col("Data_De_Realizacao_Do_Servico").str.strptime(pl.Date, "%Y-%m-%d")]
-)
-
-df_raw = df_raw.with_columns(
-    pl.col("Quantidade_De_Servicos_Realizados").cast(pl.Float64)
-)
-
-df_raw = df_raw.with_columns(
-    [pl.col("Valor_Total_Do_Servico_Realizado").cast(pl.Float64)]
-)
-
-df_raw = df_raw.with_columns([pl.col("Lucro_Do_Servico").cast(pl.Float64)])
-df_raw = df_raw.with_columns(
-    [pl.col("Tempo_Que_O_Servico_Levou_Para_Ser_Realizado_em_Horas").cast(pl.Float64)]
-)
-
-
-# Padronizar categoria do serviço
-df_raw = df_raw.with_columns(
-    pl.col("Categoria_Do_Servico")
-    .replace(padronizar_categoria_serviço())
-    .alias("Categoria_Do_Servico_Padronizada")
-)
-
-
-# Totalizar o valor das OS e retornar no dataframe como Total_OS
-df_totalizar_os: pl.DataFrame = df_raw.group_by("Numero_Da_OS_De_Servico").agg(
-    pl.col("Valor_Total_Do_Servico_Realizado").sum().alias("Total_OS")
-)
-df_raw = df_raw.join(df_totalizar_os, on="Numero_Da_OS_De_Servico", how="left")
-
-
-# Ajustar o código da filial incorreto (1-1-3)
-df_raw = df_raw.with_columns(
-    pl.when(pl.col("Cod_Filial") == "1-1-3")
-    .then(pl.lit("0-1-1"))
-    .otherwise(pl.col("Cod_Filial"))
-    .alias("Cod_Filial_Ajustado")
-)
-
-
-# Ajustar valor de revisões gratuitas que possuem valor acima de 0 para 0 (REVISÃO GRATUITA)
-df_raw = df_raw.with_columns(
-    pl.when(
-        (pl.col("Categoria_Do_Servico_Padronizada") == "REVISÃO GRATUITA")
-        & (pl.col("Valor_Total_Do_Servico_Realizado") > 0)
+def tratar_dataset(df_raw: pl.LazyFrame) -> pl.LazyFrame:
+    """
+    Monta o tratamento do dataset bruto de histórico de serviços.
+
+    Args:
+        df_raw (pl.LazyFrame): Dataset bruto. Um DataFrame também é aceito, com cada
+            etapa executada imediatamente.
+
+    Returns:
+        pl.LazyFrame: Plano do dataset tratado, conforme o schema da camada Trusted.
+    """
+    # Arquivo de origem de cada linha, ausente nos datasets brutos gravados antes
+    # de a camada Raw registrá-lo
+    df_raw = incluir_arquivo_origem(df_raw)
+
+    # Chave de cada linha da camada Raw, calculada apenas no processamento
+    # incremental (sem valor no tratamento completo)
+    df_raw = completar_chave_linha(df_raw)
+
+    # Aplicar as regras de limpeza do dataset (src/etl/regras), compiladas em lotes,
+    # com as colunas Enum do schema convertidas nas próprias regras
+    # (inclusive o Total_OS de cada OS)
+    df_raw = aplicar_regras(
+        df=df_raw, regras=HISTORICO_SERVICOS_REGRAS, schema=HISTORICO_SERVICOS_SCHEMA
     )
-    .then(0)
-    .otherwise(pl.col("Valor_Total_Do_Servico_Realizado"))
-    .alias("Valor_Do_Servico_Ajustado_Com_Revisao_Gratuita")
-)
 
+    # Ajustar nome das colunas para estarem em minúsculo
+    df_raw = df_raw.rename(str.lower)
 
-# Ajustar valor negativo de tempo de serviço para positivo
-df_raw = df_raw.with_columns(
-    pl.when(pl.col("Tempo_Que_O_Servico_Levou_Para_Ser_Realizado_em_Horas") < 0)
-    .then(pl.col("Tempo_Que_O_Servico_Levou_Para_Ser_Realizado_em_Horas") * -1)
-    .otherwise(pl.col("Tempo_Que_O_Servico_Levou_Para_Ser_Realizado_em_Horas"))
-    .alias("Tempo_Do_Servico_Horas_Ajustado")
-)
+    # Selecionar as colunas finais, pelo nome, conforme o schema da camada Trusted
+    return aplicar_schema(df=df_raw, schema=HISTORICO_SERVICOS_SCHEMA)
 
-# Ajustar nome das colunas para estarem em minúsculo
-df_raw = df_raw.rename(str.lower)
 
 # endregion
 
 # df_raw.write_excel(workbook="historico-servicos-raw.xlsx")
 
 # region ----- Salvar Arquivo Trusted -----
-# Salvar em um novo dataframe com os dados finais
-df_trusted: pl.DataFrame = pl.DataFrame(
-    data=df_raw,
-    schema=HISTORICO_SERVICOS_SCHEMA,
-)
-
-time_now: datetime = datetime.now().strftime("%Y-%m-%d-%H-%M-%S")
-file_name_trusted: str = f"historico-servicos-trusted-{time_now}.parquet"
-
-
-salvar_parquet(
-    df=df_trusted,
-    path=TRUSTED_FOLDER_PATH,
-    file_name=file_name_trusted,
-)
+if __name__ == "__main__":
+    # Versão mais recente do dataset, conforme o catálogo da camada Raw
+    RAW_FILE_PATH: Path = ultima_versao(RAW_FOLDER_PATH)
+
+    lf_raw: pl.LazyFrame = pl.scan_parquet(source=RAW_FILE_PATH)
+
+    # Identidade do resultado: dados da camada Raw, código do tratamento e schema
+    with instrumentacao.etapa("Calcular identidade"):
+        identidade: str = calcular_identidade(
+            entradas=[RAW_FILE_PATH],
+            script=Path(__file__),
+            schema=HISTORICO_SERVICOS_SCHEMA,
+            parametros={"processamento_incremental": PROCESSAMENTO_INCREMENTAL},
+        )
+        # Apenas o código do tratamento: registrado com a versão Trusted, indica se
+        # as linhas já tratadas podem ser reaproveitadas no processamento incremental
+        codigo: str = identidade_codigo(script=Path(__file__))
+
+    df_trusted: pl.DataFrame | None = None
+    with instrumentacao.etapa("Tratar Arquivo Raw") as medicao:
+        if INSPECAO_PLANO:
+            # Apenas o relatório do plano de consulta, sem tratar nem gravar o
+            # dataset (ver src/ferramentas/inspecao_plano.py)
+            salvar_relatorio_plano(
+                lf_raw=lf_raw, lf=tratar_dataset(lf_raw), nome=Path(__file__).stem
+            )
+        elif versao_identica(TRUSTED_FOLDER_PATH, identidade):
+            # A versão publicada já foi gerada a partir dos mesmos dados e do mesmo
+            # código: o tratamento geraria um arquivo idêntico
+            print(f"{RAW_FILE_PATH.name} já tratado com o código atual ({identidade}).")
+        elif PROCESSAMENTO_INCREMENTAL:
+            # Apenas as linhas novas (e os grupos afetados por elas) são tratadas
+            df_trusted = processar_incremental(
+                lf_raw=lf_raw,
+                trusted_path=TRUSTED_FOLDER_PATH,
+                tratar_dataset=tratar_dataset,
+                schema=HISTORICO_SERVICOS_SCHEMA,
+                grupos=GRUPOS_RECALCULO,
+                codigo=codigo,
+            )
+            if df_trusted is None:
+                print(
+                    f"{RAW_FILE_PATH.name} sem linhas novas desde a última versão "
+                    "Trusted."
+                )
+        else:
+            # Tratamento completo, com o plano otimizado e executado de uma só vez,
+            # em lotes (streaming), sem manter todas as etapas em memória
+            df_trusted = tratar_dataset(lf_raw).collect(engine="streaming")
+        medicao.linhas(entrada=RAW_FILE_PATH, saida=df_trusted)
+
+    time_now: datetime = datetime.now().strftime("%Y-%m-%d-%H-%M-%S")
+    # O início da identidade no nome identifica o conteúdo de cada versão
+    sufixo: str = identidade[:TAMANHO_IDENTIDADE_ARQUIVO]
+    file_name_trusted: str = f"historico-servicos-trusted-{time_now}-{sufixo}"
+
+    if df_trusted is not None:
+        # Particionado por ano/mês da data, para que leituras filtradas por período
+        # acessem apenas os arquivos necessários
+        with instrumentacao.etapa("Salvar Arquivo Trusted") as medicao:
+            salvar_parquet_particionado(
+                df=df_trusted,
+                path=TRUSTED_FOLDER_PATH,
+                file_name=file_name_trusted,
+                perfil=PERFIL_POR_CAMADA["1-trusted"],
+                coluna_data="data_de_realizacao_do_servico",
+                identidade=identidade,
+                codigo=codigo,
+            )
+            medicao.linhas(entrada=df_trusted, saida=df_trusted)
 # endregion
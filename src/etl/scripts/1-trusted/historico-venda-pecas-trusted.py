@@ -4,14 +4,34 @@ Script de tratamento dos dados da camada Trusted do historico de venda de peças
 Esta camada tem como objetivo a limpeza, padronização e tratamento dos dados brutos
 """
 
-import os
 import polars as pl
 
 from pathlib import Path
 from datetime import datetime
 from src.etl.schemas.historico_venda_pecas_schema import HISTORICO_VENDA_PECAS_SCHEMA
-from src.ferramentas.funcoes_suporte import salvar_parquet
-
+from src.etl.regras.historico_venda_pecas_regras import HISTORICO_VENDA_PECAS_REGRAS
+from src.ferramentas.catalogo import ultima_versao
+from src.ferramentas.funcoes_suporte import (
+    PERFIL_POR_CAMADA,
+    aplicar_schema,
+    incluir_arquivo_origem,
+    salvar_parquet_particionado,
+)
+from src.ferramentas.identidade import (
+    TAMANHO_IDENTIDADE_ARQUIVO,
+    calcular_identidade,
+    identidade_codigo,
+    versao_identica,
+)
+from src.ferramentas.incremental import (
+    PROCESSAMENTO_INCREMENTAL,
+    completar_chave_linha,
+    processar_incremental,
+)
+from src.ferramentas.inspecao_plano import INSPECAO_PLANO, salvar_relatorio_plano
+from src.ferramentas.instrumentacao import Instrumentacao
+from src.ferramentas.qualidade import salvar_metricas_qualidade
+from src.ferramentas.regras_limpeza import aplicar_regras, grupos_de_duplicidade
 
 # region ----- Caminho Arquivo Raw -----
 RAW_FOLDER_PATH: Path = (
@@ -21,10 +41,6 @@ RAW_FOLDER_PATH: Path = (
     / "0-raw"
     / "historico-venda-pecas"
 )
-
-RAW_DATA_FILE = os.listdir(RAW_FOLDER_PATH)[0]
-
-RAW_FILE_PATH = RAW_FOLDER_PATH / RAW_DATA_FILE
 # endregion
 
 
@@ -41,233 +57,64 @@ TRUSTED_FOLDER_PATH.mkdir(parents=True, exist_ok=True)
 # endregion
 
 
-# region ----- Suporte -----
-# Padronização categorias
-def categorias_padrao() -> dict:
-    categorias_padrao: dict = {
-        "ACESS.NAO ORIGINAIS": "ACESSORIOS NÃO ORIGINAIS",
-        "ACESSORIOS NAO ORIGI": "ACESSORIOS NÃO ORIGINAIS",
-        "ACESSORIOS NAO ORIG": "ACESSORIOS NÃO ORIGINAIS",
-        "ACESSORIOS ORIGINAIS": "ACESSORIOS ORIGINAIS",
-        "NISSAN-ACES. ORIG.": "ACESSORIOS ORIGINAIS",
-        "NISSAN-ACES.NAO ORIG": "ACESSORIOS NÃO ORIGINAIS",
-        "NISSAN-COM LUBRIF.": "LUBRIFICANTES/COMBUSTÍVEL",
-        "COMB./LUB.": "LUBRIFICANTES/COMBUSTÍVEL",
-        "LUBRIFICANTES": "LUBRIFICANTES/COMBUSTÍVEL",
-        "LUBRIFICANTES/COMB.": "LUBRIFICANTES/COMBUSTÍVEL",
-        "NISSAN-COM. LUBRIF.": "LUBRIFICANTES/COMBUSTÍVEL",
-        "VOLKS-COM. LUBRIF.": "LUBRIFICANTES/COMBUSTÍVEL",
-        "PECAS NAO ORIGINAIS": "PEÇAS NÃO ORIGINAIS",
-        "VOLKS-PEC. NAO ORIG.": "PEÇAS NÃO ORIGINAIS",
-        "PEÇAS N.ORIGINAIS": "PEÇAS NÃO ORIGINAIS",
-        "FORD-PECAS NAO ORIG.": "PEÇAS NÃO ORIGINAIS",
-        "NISSAN-PEC NAO ORIG.": "PEÇAS NÃO ORIGINAIS",
-        "GM-PECAS ORIG. ": "PEÇAS ORIGINAIS",
-        "NISSAN-PECAS ORIG.": "PEÇAS ORIGINAIS",
-        "PECAS ORIGINAIS VW": "PEÇAS ORIGINAIS",
-        "PECAS ORIGINAIS": "PEÇAS ORIGINAIS",
-        "PEÇAS ORIGINAIS": "PEÇAS ORIGINAIS",
-        "VOLKS-PECAS ORIG.": "PEÇAS ORIGINAIS",
-        "PNEUS": "PNEUS",
-        "VOLKS-PNEUS": "PNEUS",
-        "NISSAN-PNEUS": "PNEUS",
-        "OUTRAS MERCADORIAS": "OUTRAS MERCADORIAS",
-        "VOLKS-OUTRAS MERCAD.": "OUTRAS MERCADORIAS",
-    }
-
-    return categorias_padrao
-
-
-# Padronizar departamentos
-def departamentos_padronizados() -> dict:
-    departamentos_padronizados: dict = {
-        "ACESSORIOS": "ACESSÓRIOS",
-        "ADMINISTRACAO": "ADMINISTRAÇÃO",
-        "ASSISTENCIA TECNICA": "ASSISTÊNCIA TÉCNICA",
-        "ASSISTENCIA TECNICA ": "ASSISTÊNCIA TÉCNICA",
-        "FUNILARIA E PINTURA": "FUNILARIA E PINTURA",
-        "OFICINA": "OFICINA",
-        "PECAS": "PEÇAS",
-        "PECAS ATACADO": "PEÇAS",
-        "PECAS BALCAO": "PEÇAS",
-        "PECAS VAREJO": "PEÇAS",
-        "VEICULOS NOVOS": "VEÍCULOS NOVOS",
-    }
-
-    return departamentos_padronizados
-
-
+# region ----- Processamento Incremental -----
+# Grupos de linhas avaliadas em conjunto (duplicidade), tratados novamente por
+# completo no processamento incremental
+GRUPOS_RECALCULO: list = grupos_de_duplicidade(HISTORICO_VENDA_PECAS_REGRAS)
 # endregion
 
 
-# region ----- Tratar Arquivo Raw -----
-# Ler o parquet raw
-df_raw: pl.DataFrame = pl.read_parquet(source=RAW_FILE_PATH)
-
-
-# Transformar dtypes das colunas
-df_raw = df_raw.with_columns(
-    [pl.col("Data_da_Venda").str.strptime(pl.Date, "%Y-%m-%d")]
-)
-
-df_raw = df_raw.with_columns(pl.col("Quantidade_Vendida").cast(pl.Int64))
-df_raw = df_raw.with_columns(pl.col("Valor_da_Venda").cast(pl.Float64))
-df_raw = df_raw.with_columns(pl.col("Custo_da_Peca").cast(pl.Float64))
-df_raw = df_raw.with_columns(pl.col("Lucro_da_Venda").cast(pl.Float64))
-df_raw = df_raw.with_columns(pl.col("Margem_da_Venda").cast(pl.Float64))
-
-
-# Destacar linhas duplicadas, parcialmente duplicadas
-colunas_subset: list = [
-    "Cod_Concessionaria",
-    "Cod_Filial",
-    "Nome_da_Concessionaria",
-    "Nome_da_Filial",
-    "Marca_da_Filial",
-    "Data_da_Venda",
-    "Quantidade_Vendida",
-    "Valor_da_Venda",
-    "Custo_da_Peca",
-    "Lucro_da_Venda",
-    "Margem_da_Venda",
-    "Descricao_da_Peca",
-    "Categoria_da_Peca",
-    "Departamento_da_Venda",
-    "Tipo_de_Venda_da_Peca",
-    "Cidade_da_Venda",
-    "Estado_Brasileiro_da_Venda",
-    "Macroregiao_Geografica_da_Venda",
-]
-
-df_raw = df_raw.with_columns(
-    pl.struct(pl.all()).is_duplicated().alias("Linha_Duplicada")
-)
-
-
-df_raw = df_raw.with_columns(
-    pl.struct(colunas_subset).is_duplicated().alias("Linha_Duplicada_Parcial")
-)
-
-df_raw = df_raw.with_columns(
-    pl.when(pl.col("Linha_Duplicada"))
-    .then(pl.lit("DUPLICADO"))
-    .when(pl.col("Linha_Duplicada_Parcial"))
-    .then(pl.lit("DUPLICADO PARCIALMENTE"))
-    .otherwise(pl.lit("OK"))
-    .alias("Status_Duplicidade")
-)
-
-
-# Padronizar as categorias
-df_raw = df_raw.with_columns(
-    pl.col("Categoria_da_Peca")
-    .replace(categorias_padrao())
-    .alias("Categoria_da_Peca_Padronizada")
-)
-
-
-# Padronizar departamentos
-df_raw = df_raw.with_columns(
-    pl.col("Departamento_da_Venda")
-    .replace(departamentos_padronizados())
-    .alias("Departamento_da_Venda_Padronizada")
-)
-
-
-# Ajustar o código da filial incorreto (1-1-3)
-df_raw = df_raw.with_columns(
-    pl.when(pl.col("Cod_Filial") == "1-1-3")
-    .then(pl.lit("0-1-1"))
-    .otherwise(pl.col("Cod_Filial"))
-    .alias("Cod_Filial_Ajustado")
-)
-
-
-# Ajustar valores quando a quantidade vendida é igual a zero
-zerar_valores: list = [
-    "Valor_da_Venda",
-    "Custo_da_Peca",
-    "Lucro_da_Venda",
-    "Margem_da_Venda",
+# region ----- Métricas de Qualidade -----
+# Indicadores de qualidade contados por filial e mês a cada execução
+INDICADORES_QUALIDADE: list = [
+    "status_duplicidade",
+    "custo_da_peca_classificado",
+    "lucro_da_venda_classificado",
+    "confiabilidade_do_registro",
 ]
+# endregion
 
-df_raw = df_raw.with_columns(
-    [
-        pl.when(pl.col("Quantidade_Vendida") == 0)
-        .then(0)
-        .otherwise(pl.col(col))
-        .alias(f"{col}_Ajustado")
-        for col in zerar_valores
-    ]
-)
-
-
-# Recalcular lucro da venda
-df_raw = df_raw.with_columns(
-    (pl.col("Valor_da_Venda_Ajustado") - pl.col("Custo_da_Peca_Ajustado")).alias(
-        "Lucro_da_Venda_Recalculado"
-    )
-)
-
-# Recalcular margem da venda
-df_raw = df_raw.with_columns(
-    (pl.col("Lucro_da_Venda_Recalculado") / pl.col("Valor_da_Venda_Ajustado")).alias(
-        "Margem_da_Venda_Recalculado"
-    )
-)
-
-# Ajustar margem quando o lucro for 0
-df_raw = df_raw.with_columns(
-    pl.when(pl.col("Lucro_da_Venda_Ajustado") == 0)
-    .then(0)
-    .otherwise(pl.col("Margem_da_Venda_Recalculado"))
-    .alias("Margem_da_Venda_Recalculado")
-)
 
-# Classificar valor de custo desproporcionais
-df_raw = df_raw.with_columns(
-    pl.when(pl.col("Custo_da_Peca") > 400000)
-    .then(pl.lit("VALOR DE CUSTO DESPROPORCIONAL"))
-    .otherwise(pl.lit("OK"))
-    .alias("Custo_da_Peca_Classificado")
-)
+# region ----- Instrumentação -----
+# Tempo e memória de cada etapa, com a variável de ambiente INSTRUMENTACAO_ETL=1
+instrumentacao: Instrumentacao = Instrumentacao(script=Path(__file__))
+# endregion
 
 
-# Classificar devoluções com lucro
-df_raw = df_raw.with_columns(
-    pl.when(
-        (pl.col("Lucro_da_Venda") > 0)
-        & (pl.col("Tipo_de_Venda_da_Peca") == "DEVOLUCAO")
+# region ----- Tratar Arquivo Raw -----
+def tratar_dataset(df_raw: pl.LazyFrame) -> pl.LazyFrame:
+    """
+    Monta o tratamento do dataset bruto de histórico de venda de peças.
+
+    Args:
+        df_raw (pl.LazyFrame): Dataset bruto. Um DataFrame também é aceito, com cada
+            etapa executada imediatamente.
+
+    Returns:
+        pl.LazyFrame: Plano do dataset tratado, conforme o schema da camada Trusted.
+    """
+    # Arquivo de origem de cada linha, ausente nos datasets brutos gravados antes
+    # de a camada Raw registrá-lo
+    df_raw = incluir_arquivo_origem(df_raw)
+
+    # Chave de cada linha da camada Raw, calculada apenas no processamento
+    # incremental (sem valor no tratamento completo)
+    df_raw = completar_chave_linha(df_raw)
+
+    # Aplicar as regras de limpeza do dataset (src/etl/regras), compiladas em lotes,
+    # com as colunas Enum do schema convertidas nas próprias regras
+    df_raw = aplicar_regras(
+        df=df_raw,
+        regras=HISTORICO_VENDA_PECAS_REGRAS,
+        schema=HISTORICO_VENDA_PECAS_SCHEMA,
     )
-    .then(pl.lit("DEVOLUCAO COM LUCRO"))
-    .otherwise(pl.lit("OK"))
-    .alias("Lucro_da_Venda_Classificado")
-)
 
-# Classificar registros com valor de custo igual a 0
-df_raw = df_raw.with_columns(
-    pl.when(pl.col("Custo_da_Peca") == 0)
-    .then(pl.lit("VALOR DE CUSTO IGUAL A 0"))
-    .otherwise(pl.lit("OK"))
-    .alias("Custo_da_Peca_Classificado")
-)
+    # Renomear colunas para minusculas
+    df_raw = df_raw.rename(str.lower)
 
+    # Selecionar as colunas finais, pelo nome, conforme o schema da camada Trusted
+    return aplicar_schema(df=df_raw, schema=HISTORICO_VENDA_PECAS_SCHEMA)
 
-# Classificar linhas como CONFIÁVEIS ou NÃO CONFIÁVEIS conforme a qualidade do registro
-df_raw = df_raw.with_columns(
-    pl.when(
-        (pl.col("Status_Duplicidade") == "OK")
-        & (pl.col("Custo_da_Peca_Classificado") == "OK")
-        & (pl.col("Lucro_da_Venda_Classificado") == "OK")
-    )
-    .then(pl.lit("CONFIÁVEL"))
-    .otherwise(pl.lit("NÃO CONFIÁVEL"))
-    .alias("Confiabilidade_do_Registro")
-)
-
-
-# Renomear colunas para minusculas
-df_raw = df_raw.rename(str.lower)
 
 # endregion
 
@@ -276,35 +123,88 @@ df_raw = df_raw.rename(str.lower)
 
 
 # region ----- Salvar Arquivo Trusted -----
-# Salvar em um novo dataframe com os dados finais
-df_trusted: pl.DataFrame = pl.DataFrame(
-    data=df_raw,
-    schema=HISTORICO_VENDA_PECAS_SCHEMA,
-)
-
-time_now: datetime = datetime.now().strftime("%Y-%m-%d-%H-%M-%S")
-file_name_trusted: str = f"historico-venda-pecas-trusted-{time_now}.parquet"
-
-
-# salvar_parquet(
-#     df=df_trusted,
-#     path=TRUSTED_FOLDER_PATH,
-#     file_name=file_name_trusted,
-# )
-
-file = os.listdir(TRUSTED_FOLDER_PATH)[0]
-test: pl.DataFrame = pl.read_parquet(source=TRUSTED_FOLDER_PATH / file)
-
-print("usando arquivo: " + file)
-print(test)
-print(
-    test[
-        "custo_da_peca",
-        "custo_da_peca_ajustado",
-        "custo_da_peca_classificado",
-        "lucro_da_venda_recalculado",
-        "lucro_da_venda_ajustado",
-        "lucro_da_venda_classificado",
-    ].sort(by="custo_da_peca", descending=True)
-)
+if __name__ == "__main__":
+    # Versão mais recente do dataset, conforme o catálogo da camada Raw
+    RAW_FILE_PATH: Path = ultima_versao(RAW_FOLDER_PATH)
+
+    lf_raw: pl.LazyFrame = pl.scan_parquet(source=RAW_FILE_PATH)
+
+    # Identidade do resultado: dados da camada Raw, código do tratamento e schema
+    with instrumentacao.etapa("Calcular identidade"):
+        identidade: str = calcular_identidade(
+            entradas=[RAW_FILE_PATH],
+            script=Path(__file__),
+            schema=HISTORICO_VENDA_PECAS_SCHEMA,
+            parametros={"processamento_incremental": PROCESSAMENTO_INCREMENTAL},
+        )
+        # Apenas o código do tratamento: registrado com a versão Trusted, indica se
+        # as linhas já tratadas podem ser reaproveitadas no processamento incremental
+        codigo: str = identidade_codigo(script=Path(__file__))
+
+    df_trusted: pl.DataFrame | None = None
+    with instrumentacao.etapa("Tratar Arquivo Raw") as medicao:
+        if INSPECAO_PLANO:
+            # Apenas o relatório do plano de consulta, sem tratar nem gravar o
+            # dataset (ver src/ferramentas/inspecao_plano.py)
+            salvar_relatorio_plano(
+                lf_raw=lf_raw, lf=tratar_dataset(lf_raw), nome=Path(__file__).stem
+            )
+        elif versao_identica(TRUSTED_FOLDER_PATH, identidade):
+            # A versão publicada já foi gerada a partir dos mesmos dados e do mesmo
+            # código: o tratamento geraria um arquivo idêntico
+            print(f"{RAW_FILE_PATH.name} já tratado com o código atual ({identidade}).")
+        elif PROCESSAMENTO_INCREMENTAL:
+            # Apenas as linhas novas (e os grupos afetados por elas) são tratadas
+            df_trusted = processar_incremental(
+                lf_raw=lf_raw,
+                trusted_path=TRUSTED_FOLDER_PATH,
+                tratar_dataset=tratar_dataset,
+                schema=HISTORICO_VENDA_PECAS_SCHEMA,
+                grupos=GRUPOS_RECALCULO,
+                codigo=codigo,
+            )
+            if df_trusted is None:
+                print(
+                    f"{RAW_FILE_PATH.name} sem linhas novas desde a última versão "
+                    "Trusted."
+                )
+        else:
+            # Tratamento completo, com o plano otimizado e executado de uma só vez,
+            # em lotes (streaming), sem manter todas as etapas em memória
+            df_trusted = tratar_dataset(lf_raw).collect(engine="streaming")
+        medicao.linhas(entrada=RAW_FILE_PATH, saida=df_trusted)
+
+    execucao: datetime = datetime.now()
+    time_now: datetime = execucao.strftime("%Y-%m-%d-%H-%M-%S")
+    # O início da identidade no nome identifica o conteúdo de cada versão
+    sufixo: str = identidade[:TAMANHO_IDENTIDADE_ARQUIVO]
+    file_name_trusted: str = f"historico-venda-pecas-trusted-{time_now}-{sufixo}"
+
+    if df_trusted is not None:
+        # Particionado por ano/mês da data, para que leituras filtradas por período
+        # acessem apenas os arquivos necessários
+        with instrumentacao.etapa("Salvar Arquivo Trusted") as medicao:
+            salvar_parquet_particionado(
+                df=df_trusted,
+                path=TRUSTED_FOLDER_PATH,
+                file_name=file_name_trusted,
+                perfil=PERFIL_POR_CAMADA["1-trusted"],
+                coluna_data="data_da_venda",
+                identidade=identidade,
+                codigo=codigo,
+            )
+            medicao.linhas(entrada=df_trusted, saida=df_trusted)
+
+        # Métricas de qualidade da execução, lidas pelas páginas sem percorrer o
+        # dataset completo
+        with instrumentacao.etapa("Salvar métricas de qualidade") as medicao:
+            salvar_metricas_qualidade(
+                df=df_trusted,
+                trusted_path=TRUSTED_FOLDER_PATH,
+                indicadores=INDICADORES_QUALIDADE,
+                coluna_data="data_da_venda",
+                execucao=execucao,
+                file_name=f"historico-venda-pecas-qualidade-{time_now}.parquet",
+            )
+            medicao.linhas(entrada=df_trusted)
 # endregion
@@ -4,7 +4,6 @@ Script de tratamento dos dados da camada Trusted do historico de venda de peças
 Esta camada tem como objetivo a limpeza, padronização e tratamento dos dados brutos
 """
 
-import os
 import polars as pl
 
 from pathlib import Path
@@ -12,8 +11,29 @@ from datetime import datetime
 from src.etl.schemas.historico_veiculos_schema import (
     HISTORICO_VEICULOS_SCHEMA,
 )
-from src.ferramentas.funcoes_suporte import salvar_parquet
-
+from src.etl.regras.historico_veiculos_regras import HISTORICO_VEICULOS_REGRAS
+from src.ferramentas.catalogo import ultima_versao
+from src.ferramentas.funcoes_suporte import (
+    PERFIL_POR_CAMADA,
+    aplicar_schema,
+    incluir_arquivo_origem,
+    salvar_parquet_particionado,
+)
+from src.ferramentas.identidade import (
+    TAMANHO_IDENTIDADE_ARQUIVO,
+    calcular_identidade,
+    identidade_codigo,
+    versao_identica,
+)
+from src.ferramentas.incremental import (
+    PROCESSAMENTO_INCREMENTAL,
+    completar_chave_linha,
+    processar_incremental,
+)
+from src.ferramentas.inspecao_plano import INSPECAO_PLANO, salvar_relatorio_plano
+from src.ferramentas.instrumentacao import Instrumentacao
+from src.ferramentas.qualidade import salvar_metricas_qualidade
+from src.ferramentas.regras_limpeza import aplicar_regras, grupos_de_duplicidade
 
 # region ----- Caminho Arquivo Raw -----
 RAW_FOLDER_PATH: Path = (
@@ -23,10 +43,6 @@ RAW_FOLDER_PATH: Path = (
     / "0-raw"
     / "historico-venda-veiculos"
 )
-
-RAW_DATA_FILE = os.listdir(RAW_FOLDER_PATH)[0]
-
-RAW_FILE_PATH = RAW_FOLDER_PATH / RAW_DATA_FILE
 # endregion
 
 
@@ -43,230 +59,66 @@ TRUSTED_FOLDER_PATH.mkdir(parents=True, exist_ok=True)
 # endregion
 
 
-# region ----- Tratar Arquivo Raw -----
-# Ler o parquet raw
-df_raw: pl.DataFrame = pl.read_parquet(source=RAW_FILE_PATH)
-
-
-# Ajustar o código da filial incorreto (1-1-3 / 01/01/2002 / 01/01/2003)
-df_raw = df_raw.with_columns(
-    pl.when(
-        (pl.col("Cod_Filial") == "01/01/2002") | (pl.col("Cod_Filial") == "01/01/2003")
-    )
-    .then(pl.lit("0-1-1"))
-    .otherwise(pl.col("Cod_Filial"))
-    .alias("Cod_Filial_Ajustado")
-)
-
-
-# Classificar linhas duplicadas, parcialmente duplicadas
-colunas_subset: list = [
-    "Cod_Concessionaria",
-    "Cod_Filial",
-    "Nome_da_Concessionaria",
-    "Nome_da_Filial",
-    "Marca_da_Filial",
-    "Data_da_Venda",
-    "Quantidade_Vendida",
-    "Valor_da_Venda",
-    "Custo_do_Veiculo",
-    "Lucro_da_Venda",
-    "Margem_da_Venda",
-    "Marca_do_Veiculo",
-    "Modelo_do_Veiculo",
-    "Familia_do_Veiculo",
-    "Categoria_do_Veiculo",
-    "Cor_do_Veiculo",
-    "Veiculo_Novo_ou_Semi_Novo",
-    "Tipo_do_Combustivel",
-    "Ano_Modelo_do_Veiculo",
-    "Ano_Fabricacao_do_Veiculo",
-    "Dias_que_o_Carro_Ficou_no_Estoque",
-    "Tipo_de_Venda_do_Veiculo",
-    "Cidade_da_Venda",
-    "Estado_Brasileiro_da_Venda",
-    "Macroregiao_Geografica_da_Venda",
-    "",
-    "Cod_Filial_Ajustado",
-]
-
-df_raw = df_raw.with_columns(
-    pl.struct(pl.all()).is_duplicated().alias("Linha_Duplicada")
-)
-
-df_raw = df_raw.with_columns(
-    pl.struct(colunas_subset).is_duplicated().alias("Linha_Duplicada_Parcial")
-)
-
-df_raw = df_raw.with_columns(
-    pl.when(pl.col("Linha_Duplicada"))
-    .then(pl.lit("DUPLICADO"))
-    .when(pl.col("Linha_Duplicada_Parcial"))
-    .then(pl.lit("DUPLICADO PARCIALMENTE"))
-    .otherwise(pl.lit("OK"))
-    .alias("Status_Duplicidade")
-)
-
-
-# Classificar itens com colunas deslocadas e repetidas
-df_raw = df_raw.with_columns(
-    pl.when(
-        pl.col("Dias_que_o_Carro_Ficou_no_Estoque").str.contains("9BWAG45U4PT01905")
-    )
-    .then(pl.lit("CONTÉM COLUNAS DESLOCADAS E REPETIDAS"))
-    .otherwise(pl.lit("OK"))
-    .alias("Colunas_Deslocadas_e_Repetidas")
-)
-
-
-# Renomear coluna sem nome
-df_raw = df_raw.rename({"": "coluna_extra"})
+# region ----- Processamento Incremental -----
+# Grupos de linhas avaliadas em conjunto (duplicidade), tratados novamente por
+# completo no processamento incremental
+GRUPOS_RECALCULO: list = grupos_de_duplicidade(HISTORICO_VEICULOS_REGRAS)
+# endregion
 
 
-# Ajustar as colunas deslocadas para a direita, por coluna
-# O que será feito é criar novas colunas com os valores da coluna correta
-colunas_deslocadas = [
-    "Tipo_de_Venda_do_Veiculo",
-    "Nome_do_Vendedor_que_Realizou_a_Venda",
-    "Nome_do_Comprador_do_Veiculo",
-    "Cidade_da_Venda",
-    "Estado_Brasileiro_da_Venda",
-    "Macroregiao_Geografica_da_Venda",
-    "coluna_extra",
+# region ----- Métricas de Qualidade -----
+# Indicadores de qualidade contados por filial e mês a cada execução
+INDICADORES_QUALIDADE: list = [
+    "status_duplicidade",
+    "colunas_deslocadas_e_repetidas",
+    "lucro_da_venda_classificado",
+    "confiabilidade_do_registro",
 ]
-
-df_raw = df_raw.with_columns(
-    # Para cada coluna deslocada, pegar o valor da próxima coluna
-    # Utilizado list comprehension para iterar sobre as colunas
-    [
-        pl.when(pl.col("coluna_extra").is_not_null())
-        .then(pl.col(colunas_deslocadas[i + 1]))
-        .otherwise(pl.col(colunas_deslocadas[i]))
-        .alias(colunas_deslocadas[i] + "_Ajustado")
-        for i in range(len(colunas_deslocadas) - 1)
-    ]
-    + [
-        # A última coluna ajustada vira null (não existe valor correto)
-        pl.when(pl.col("coluna_extra").is_not_null())
-        .then(pl.lit(None))
-        .otherwise(pl.col("coluna_extra"))
-        .alias("coluna_extra_Ajustado")
-    ]
-)
-
-df_raw = df_raw.with_columns(
-    pl.when(
-        pl.col("Dias_que_o_Carro_Ficou_no_Estoque").str.contains("9BWAG45U4PT01905")
-    )
-    .then(0)
-    .otherwise(pl.col("Dias_que_o_Carro_Ficou_no_Estoque"))
-    .alias("Dias_que_o_Carro_Ficou_no_Estoque_Ajustado")
-)
-
-
-# Transformar dtypes das colunas
-df_raw = df_raw.with_columns(pl.col("Data_da_Venda").str.strptime(pl.Date, "%d/%m/%Y"))
-
-df_raw = df_raw.with_columns(
-    pl.col("Ano_Modelo_do_Veiculo")
-    .cast(pl.Float64)
-    .cast(pl.Int64)
-    .cast(pl.String)
-    .str.strptime(pl.Date, "%Y")
-)
-df_raw = df_raw.with_columns(
-    pl.col("Ano_Fabricacao_do_Veiculo")
-    .cast(pl.Float64)
-    .cast(pl.Int64)
-    .cast(pl.String)
-    .str.strptime(pl.Date, "%Y")
-)
-
-
-df_raw = df_raw.with_columns(pl.col("Quantidade_Vendida").cast(pl.String))
-
-df_raw = df_raw.with_columns(pl.col("Valor_da_Venda").cast(pl.Float64))
-df_raw = df_raw.with_columns(pl.col("Custo_do_Veiculo").cast(pl.Float64))
-df_raw = df_raw.with_columns(pl.col("Lucro_da_Venda").cast(pl.Float64))
-df_raw = df_raw.with_columns(pl.col("Margem_da_Venda").cast(pl.Float64))
-
-df_raw = df_raw.with_columns(
-    pl.col("Dias_que_o_Carro_Ficou_no_Estoque_Ajustado").cast(pl.Int64)
-)
-
-
-# Deletar coluna "coluna_extra_Ajustado"
-df_raw = df_raw.drop("coluna_extra_Ajustado")
-
-
-# Converter dias no estoque para valores positivos
-df_raw = df_raw.with_columns(
-    pl.when(pl.col("Dias_que_o_Carro_Ficou_no_Estoque_Ajustado") < 0)
-    .then(pl.col("Dias_que_o_Carro_Ficou_no_Estoque_Ajustado") * -1)
-    .otherwise(pl.col("Dias_que_o_Carro_Ficou_no_Estoque_Ajustado"))
-    .alias("Dias_que_o_Carro_Ficou_no_Estoque_Ajustado")
-)
-
-
-# Recalcular lucro e margem
-df_raw = df_raw.with_columns(
-    (pl.col("Valor_da_Venda") - pl.col("Custo_do_Veiculo")).alias(
-        "Lucro_da_Venda_Recalculado"
-    )
-)
-
-df_raw = df_raw.with_columns(
-    (pl.col("Lucro_da_Venda_Recalculado") / pl.col("Valor_da_Venda")).alias(
-        "Margem_da_Venda_Recalculado"
-    )
-)
-
-# Classificar tipo da venda do veiculo 0 como NAO ESPECIFICADO
-df_raw = df_raw.with_columns(
-    pl.when(pl.col("Tipo_de_Venda_do_Veiculo") == "0")
-    .then(pl.lit("NAO ESPECIFICADO"))
-    .otherwise(pl.col("Tipo_de_Venda_do_Veiculo"))
-    .alias("Tipo_de_Venda_do_Veiculo_Ajustado")
-)
+# endregion
 
 
-# Classificar tipos de combustivel UNKOWN como NAO ESPECIFICADO
-df_raw = df_raw.with_columns(
-    pl.when(pl.col("Tipo_do_Combustivel") == "UNKNOWN")
-    .then(pl.lit("NAO ESPECIFICADO"))
-    .otherwise(pl.col("Tipo_do_Combustivel"))
-    .alias("Tipo_do_Combustivel_Ajustado")
-)
+# region ----- Instrumentação -----
+# Tempo e memória de cada etapa, com a variável de ambiente INSTRUMENTACAO_ETL=1
+instrumentacao: Instrumentacao = Instrumentacao(script=Path(__file__))
+# endregion
 
 
-# Classificar devoluções com lucro
-df_raw = df_raw.with_columns(
-    pl.when(
-        (pl.col("Lucro_da_Venda_Recalculado") > 0)
-        & (pl.col("Tipo_de_Venda_do_Veiculo_Ajustado") == "DEVOLUCAO")
+# region ----- Tratar Arquivo Raw -----
+def tratar_dataset(df_raw: pl.LazyFrame) -> pl.LazyFrame:
+    """
+    Monta o tratamento do dataset bruto de histórico de venda de veículos.
+
+    Args:
+        df_raw (pl.LazyFrame): Dataset bruto. Um DataFrame também é aceito, com cada
+            etapa executada imediatamente.
+
+    Returns:
+        pl.LazyFrame: Plano do dataset tratado, conforme o schema da camada Trusted.
+    """
+    # Arquivo de origem de cada linha, ausente nos datasets brutos gravados antes
+    # de a camada Raw registrá-lo
+    df_raw = incluir_arquivo_origem(df_raw)
+
+    # Chave de cada linha da camada Raw, calculada apenas no processamento
+    # incremental (sem valor no tratamento completo)
+    df_raw = completar_chave_linha(df_raw)
+
+    # Renomear coluna sem nome
+    df_raw = df_raw.rename({"": "coluna_extra"})
+
+    # Aplicar as regras de limpeza do dataset (src/etl/regras), compiladas em lotes,
+    # com as colunas Enum do schema convertidas nas próprias regras
+    df_raw = aplicar_regras(
+        df=df_raw, regras=HISTORICO_VEICULOS_REGRAS, schema=HISTORICO_VEICULOS_SCHEMA
     )
-    .then(pl.lit("DEVOLUCAO COM LUCRO"))
-    .otherwise(pl.lit("OK"))
-    .alias("Lucro_da_Venda_Classificado")
-)
 
+    # Renomear colunas para minusculas
+    df_raw = df_raw.rename(str.lower)
 
-# Classificar linhas como CONFIÁVEIS ou NÃO CONFIÁVEIS conforme a qualidade do registro
-df_raw = df_raw.with_columns(
-    pl.when(
-        (pl.col("Status_Duplicidade") == "OK")
-        & (pl.col("Colunas_Deslocadas_e_Repetidas") == "OK")
-        & (pl.col("Lucro_da_Venda_Classificado") == "OK")
-    )
-    .then(pl.lit("CONFIÁVEL"))
-    .otherwise(pl.lit("NÃO CONFIÁVEL"))
-    .alias("Confiabilidade_do_Registro")
-)
+    # Selecionar as colunas finais, pelo nome, conforme o schema da camada Trusted
+    return aplicar_schema(df=df_raw, schema=HISTORICO_VEICULOS_SCHEMA)
 
-# Renomear colunas para minusculas
-df_raw = df_raw.rename(str.lower)
 
-# print(df_raw.columns)
 # endregion
 
 
@@ -274,22 +126,88 @@ df_raw = df_raw.rename(str.lower)
 
 
 # region ----- Salvar Arquivo Trusted -----
-# Salvar em um novo dataframe com os dados finais
-df_trusted: pl.DataFrame = pl.DataFrame(
-    data=df_raw,
-    schema=HISTORICO_VEICULOS_SCHEMA,
-)
-
-time_now: datetime = datetime.now().strftime("%Y-%m-%d-%H-%M-%S")
-file_name_trusted: str = f"historico-venda-veiculos-trusted-{time_now}.parquet"
-
-
-salvar_parquet(
-    df=df_trusted,
-    path=TRUSTED_FOLDER_PATH,
-    file_name=file_name_trusted,
-)
-
-# file = os.listdir(TRUSTED_FOLDER_PATH)[0]
-# test: pl.DataFrame = pl.read_parquet(source=TRUSTED_FOLDER_PATH / file)
+if __name__ == "__main__":
+    # Versão mais recente do dataset, conforme o catálogo da camada Raw
+    RAW_FILE_PATH: Path = ultima_versao(RAW_FOLDER_PATH)
+
+    lf_raw: pl.LazyFrame = pl.scan_parquet(source=RAW_FILE_PATH)
+
+    # Identidade do resultado: dados da camada Raw, código do tratamento e schema
+    with instrumentacao.etapa("Calcular identidade"):
+        identidade: str = calcular_identidade(
+            entradas=[RAW_FILE_PATH],
+            script=Path(__file__),
+            schema=HISTORICO_VEICULOS_SCHEMA,
+            parametros={"processamento_incremental": PROCESSAMENTO_INCREMENTAL},
+        )
+        # Apenas o código do tratamento: registrado com a versão Trusted, indica se
+        # as linhas já tratadas podem ser reaproveitadas no processamento incremental
+        codigo: str = identidade_codigo(script=Path(__file__))
+
+    df_trusted: pl.DataFrame | None = None
+    with instrumentacao.etapa("Tratar Arquivo Raw") as medicao:
+        if INSPECAO_PLANO:
+            # Apenas o relatório do plano de consulta, sem tratar nem gravar o
+            # dataset (ver src/ferramentas/inspecao_plano.py)
+            salvar_relatorio_plano(
+                lf_raw=lf_raw, lf=tratar_dataset(lf_raw), nome=Path(__file__).stem
+            )
+        elif versao_identica(TRUSTED_FOLDER_PATH, identidade):
+            # A versão publicada já foi gerada a partir dos mesmos dados e do mesmo
+            # código: o tratamento geraria um arquivo idêntico
+            print(f"{RAW_FILE_PATH.name} já tratado com o código atual ({identidade}).")
+        elif PROCESSAMENTO_INCREMENTAL:
+            # Apenas as linhas novas (e os grupos afetados por elas) são tratadas
+            df_trusted = processar_incremental(
+                lf_raw=lf_raw,
+                trusted_path=TRUSTED_FOLDER_PATH,
+                tratar_dataset=tratar_dataset,
+                schema=HISTORICO_VEICULOS_SCHEMA,
+                grupos=GRUPOS_RECALCULO,
+                codigo=codigo,
+            )
+            if df_trusted is None:
+                print(
+                    f"{RAW_FILE_PATH.name} sem linhas novas desde a última versão "
+                    "Trusted."
+                )
+        else:
+            # Tratamento completo, com o plano otimizado e executado de uma só vez,
+            # em lotes (streaming), sem manter todas as etapas em memória
+            df_trusted = tratar_dataset(lf_raw).collect(engine="streaming")
+        medicao.linhas(entrada=RAW_FILE_PATH, saida=df_trusted)
+
+    execucao: datetime = datetime.now()
+    time_now: datetime = execucao.strftime("%Y-%m-%d-%H-%M-%S")
+    # O início da identidade no nome identifica o conteúdo de cada versão
+    sufixo: str = identidade[:TAMANHO_IDENTIDADE_ARQUIVO]
+    file_name_trusted: str = f"historico-venda-veiculos-trusted-{time_now}-{sufixo}"
+
+    if df_trusted is not None:
+        # Particionado por ano/mês da data, para que leituras filtradas por período
+        # acessem apenas os arquivos necessários
+        with instrumentacao.etapa("Salvar Arquivo Trusted") as medicao:
+            salvar_parquet_particionado(
+                df=df_trusted,
+                path=TRUSTED_FOLDER_PATH,
+                file_name=file_name_trusted,
+                perfil=PERFIL_POR_CAMADA["1-trusted"],
+                coluna_data="data_da_venda",
+                identidade=identidade,
+                codigo=codigo,
+            )
+            medicao.linhas(entrada=df_trusted, saida=df_trusted)
+
+        # Métricas de qualidade da execução, lidas pelas páginas sem percorrer o
+        # dataset completo
+        with instrumentacao.etapa("Salvar métricas de qualidade") as medicao:
+            salvar_metricas_qualidade(
+                df=df_trusted,
+                trusted_path=TRUSTED_FOLDER_PATH,
+                indicadores=INDICADORES_QUALIDADE,
+                coluna_data="data_da_venda",
+                execucao=execucao,
+                file_name=f"historico-venda-veiculos-qualidade-{time_now}.parquet",
+            )
+            medicao.linhas(entrada=df_trusted)
 # endregion
@@ -0,0 +1,116 @@
+"""
+Script de geração do catálogo de peças canônicas da camada Gold.
+
+As descrições de peças do estoque e do histórico de vendas são agrupadas em peças
+canônicas (ver src/ferramentas/pecas_canonicas.py). O catálogo publicado é
+reaproveitado a cada execução: apenas as descrições novas são comparadas
+"""
+
+import polars as pl
+
+from pathlib import Path
+from datetime import datetime
+from src.ferramentas.catalogo import ler_ultima_versao, ultima_versao
+from src.ferramentas.funcoes_suporte import (
+    PERFIL_POR_CAMADA,
+    ler_parquet_particionado,
+    salvar_parquet,
+)
+from src.ferramentas.identidade import (
+    TAMANHO_IDENTIDADE_ARQUIVO,
+    calcular_identidade,
+    versao_identica,
+)
+from src.ferramentas.pecas_canonicas import COLUNA_DESCRICAO, canonizar_descricoes
+
+# region ----- Caminho Arquivos Trusted -----
+TRUSTED_PATH: Path = (
+    Path(__file__).parent.parent.parent.parent / "etl" / "data" / "1-trusted"
+)
+
+# Datasets com a descrição das peças
+DATASETS_PECAS: list = ["estoque-pecas", "historico-venda-pecas"]
+# endregion
+
+
+# region ---- Caminho Arquivo Gold ----
+GOLD_FOLDER_PATH: Path = (
+    Path(__file__).parent.parent.parent.parent
+    / "etl"
+    / "data"
+    / "2-gold"
+    / "catalogo-pecas"
+)
+
+GOLD_FOLDER_PATH.mkdir(parents=True, exist_ok=True)
+# endregion
+
+
+# region ----- Montar Catálogo -----
+def contar_descricoes(trusted_files: list) -> pl.DataFrame:
+    """
+    Conta os registros de cada descrição de peça distinta nos datasets de peças.
+
+    Args:
+        trusted_files (list): Versões dos datasets na camada Trusted.
+
+    Returns:
+        pl.DataFrame: Descrições distintas e a quantidade de registros de cada uma.
+    """
+    return (
+        pl.concat(
+            ler_parquet_particionado(path=trusted_file).select(COLUNA_DESCRICAO)
+            for trusted_file in trusted_files
+        )
+        .group_by(COLUNA_DESCRICAO)
+        .agg(pl.len().cast(pl.Int64).alias("quantidade_registros"))
+        .collect(engine="streaming")
+    )
+
+
+# endregion
+
+
+# region ----- Salvar Arquivo Gold -----
+if __name__ == "__main__":
+    # Versão mais recente de cada dataset, conforme o catálogo da camada Trusted
+    trusted_files: list = [
+        ultima_versao(TRUSTED_PATH / dataset) for dataset in DATASETS_PECAS
+    ]
+
+    # Identidade do catálogo: dados das fontes na camada Trusted e código do catálogo
+    identidade: str = calcular_identidade(entradas=trusted_files, script=Path(__file__))
+
+    if versao_identica(GOLD_FOLDER_PATH, identidade):
+        # O catálogo publicado já foi gerado a partir das mesmas versões Trusted
+        print(f"catalogo-pecas já gerado com o código atual ({identidade}).")
+    else:
+        # Catálogo publicado, reaproveitado como cache das descrições já agrupadas
+        catalogo_anterior: pl.DataFrame | None = (
+            pl.read_parquet(source=ultima_versao(GOLD_FOLDER_PATH))
+            if ler_ultima_versao(GOLD_FOLDER_PATH) is not None
+            else None
+        )
+
+        df_gold: pl.DataFrame = canonizar_descricoes(
+            descricoes=contar_descricoes(trusted_files),
+            catalogo_anterior=catalogo_anterior,
+        )
+        print(
+            f"catalogo-pecas: {df_gold.height} descrições em "
+            f"{df_gold['id_peca_canonica'].n_unique()} peças canônicas."
+        )
+
+        time_now: datetime = datetime.now().strftime("%Y-%m-%d-%H-%M-%S")
+        # O início da identidade no nome identifica o conteúdo de cada versão
+        sufixo: str = identidade[:TAMANHO_IDENTIDADE_ARQUIVO]
+        file_name_gold: str = f"catalogo-pecas-gold-{time_now}-{sufixo}.parquet"
+
+        salvar_parquet(
+            df=df_gold,
+            path=GOLD_FOLDER_PATH,
+            file_name=file_name_gold,
+            perfil=PERFIL_POR_CAMADA["2-gold"],
+            identidade=identidade,
+        )
+# endregion
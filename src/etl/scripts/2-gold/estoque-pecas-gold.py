@@ -0,0 +1,116 @@
+"""
+Script de geração do mart da camada Gold de estoque de peças.
+
+Esta camada tem como objetivo agregar os dados tratados nas dimensões utilizadas
+pelas visualizações, evitando que sejam recalculadas a cada interação no Streamlit
+"""
+
+import polars as pl
+
+from pathlib import Path
+from datetime import datetime
+from src.ferramentas.catalogo import ultima_versao
+from src.ferramentas.funcoes_suporte import (
+    PERFIL_POR_CAMADA,
+    ler_parquet_particionado,
+    salvar_parquet,
+)
+from src.ferramentas.identidade import (
+    TAMANHO_IDENTIDADE_ARQUIVO,
+    calcular_identidade,
+    versao_identica,
+)
+from src.ferramentas.marts import COLUNA_PRIMEIRA_OCORRENCIA, marcar_primeira_ocorrencia
+
+# region ----- Caminho Arquivo Trusted -----
+TRUSTED_FOLDER_PATH: Path = (
+    Path(__file__).parent.parent.parent.parent
+    / "etl"
+    / "data"
+    / "1-trusted"
+    / "estoque-pecas"
+)
+# endregion
+
+
+# region ---- Caminho Arquivo Gold ----
+GOLD_FOLDER_PATH: Path = (
+    Path(__file__).parent.parent.parent.parent
+    / "etl"
+    / "data"
+    / "2-gold"
+    / "estoque-pecas-resumo"
+)
+
+GOLD_FOLDER_PATH.mkdir(parents=True, exist_ok=True)
+# endregion
+
+
+# region ----- Montar Mart -----
+def montar_mart(lf_trusted: pl.LazyFrame) -> pl.LazyFrame:
+    """
+    Monta o resumo do estoque de peças por filial, categoria e obsolescência.
+
+    Args:
+        lf_trusted (pl.LazyFrame): Dataset da camada Trusted.
+
+    Returns:
+        pl.LazyFrame: Quantidade de peças e valor em estoque (linhas distintas).
+    """
+    return (
+        marcar_primeira_ocorrencia(lf_trusted)
+        .filter(pl.col(COLUNA_PRIMEIRA_OCORRENCIA))
+        .group_by(
+            "nome_da_filial",
+            "categoria_da_peca_padronizada",
+            "classificacao_obsolescencia",
+        )
+        .agg(
+            pl.col("categoria_da_peca")
+            .count()
+            .cast(pl.Int64)
+            .alias("quantidade_pecas"),
+            pl.col("valor_da_peca_em_estoque")
+            .sum()
+            .cast(pl.Float64)
+            .alias("valor_em_estoque"),
+        )
+    )
+
+
+# endregion
+
+
+# region ----- Salvar Arquivo Gold -----
+if __name__ == "__main__":
+    # Versão mais recente do dataset, conforme o catálogo da camada Trusted
+    TRUSTED_FILE_PATH: Path = ultima_versao(TRUSTED_FOLDER_PATH)
+
+    # Identidade do mart: dados da camada Trusted e código do mart
+    identidade: str = calcular_identidade(
+        entradas=[TRUSTED_FILE_PATH], script=Path(__file__)
+    )
+
+    if versao_identica(GOLD_FOLDER_PATH, identidade):
+        # O mart publicado já foi gerado a partir da mesma versão Trusted
+        print(
+            f"{TRUSTED_FILE_PATH.name} já agregado com o código atual ({identidade})."
+        )
+    else:
+        df_gold: pl.DataFrame = montar_mart(
+            ler_parquet_particionado(path=TRUSTED_FILE_PATH)
+        ).collect()
+
+        time_now: datetime = datetime.now().strftime("%Y-%m-%d-%H-%M-%S")
+        # O início da identidade no nome identifica o conteúdo de cada versão
+        sufixo: str = identidade[:TAMANHO_IDENTIDADE_ARQUIVO]
+        file_name_gold: str = f"estoque-pecas-resumo-gold-{time_now}-{sufixo}.parquet"
+
+        salvar_parquet(
+            df=df_gold,
+            path=GOLD_FOLDER_PATH,
+            file_name=file_name_gold,
+            perfil=PERFIL_POR_CAMADA["2-gold"],
+            identidade=identidade,
+        )
+# endregion
@@ -0,0 +1,121 @@
+"""
+Script de geração do mart da camada Gold de histórico de serviços.
+
+Esta camada tem como objetivo agregar os dados tratados nas dimensões utilizadas
+pelas visualizações, evitando que sejam recalculadas a cada interação no Streamlit
+"""
+
+import polars as pl
+
+from pathlib import Path
+from datetime import datetime
+from src.ferramentas.catalogo import ultima_versao
+from src.ferramentas.funcoes_suporte import (
+    PERFIL_POR_CAMADA,
+    ler_parquet_particionado,
+    salvar_parquet,
+)
+from src.ferramentas.identidade import (
+    TAMANHO_IDENTIDADE_ARQUIVO,
+    calcular_identidade,
+    versao_identica,
+)
+from src.ferramentas.marts import (
+    COLUNA_MES,
+    COLUNA_PRIMEIRA_OCORRENCIA,
+    incluir_mes,
+    marcar_primeira_ocorrencia,
+)
+
+# region ----- Caminho Arquivo Trusted -----
+TRUSTED_FOLDER_PATH: Path = (
+    Path(__file__).parent.parent.parent.parent
+    / "etl"
+    / "data"
+    / "1-trusted"
+    / "historico-servicos"
+)
+# endregion
+
+
+# region ---- Caminho Arquivo Gold ----
+GOLD_FOLDER_PATH: Path = (
+    Path(__file__).parent.parent.parent.parent
+    / "etl"
+    / "data"
+    / "2-gold"
+    / "historico-servicos-resumo"
+)
+
+GOLD_FOLDER_PATH.mkdir(parents=True, exist_ok=True)
+# endregion
+
+
+# region ----- Montar Mart -----
+def montar_mart(lf_trusted: pl.LazyFrame) -> pl.LazyFrame:
+    """
+    Monta o resumo dos serviços realizados por mês, filial e categoria do serviço.
+
+    Args:
+        lf_trusted (pl.LazyFrame): Dataset da camada Trusted.
+
+    Returns:
+        pl.LazyFrame: Valor dos serviços (linhas distintas) e quantidade de serviços
+            (todas as linhas).
+    """
+    return (
+        marcar_primeira_ocorrencia(
+            incluir_mes(lf_trusted, coluna_data="data_de_realizacao_do_servico")
+        )
+        .group_by(COLUNA_MES, "nome_da_filial", "categoria_do_servico_padronizada")
+        .agg(
+            pl.col("valor_do_servico_ajustado_com_revisao_gratuita")
+            .filter(pl.col(COLUNA_PRIMEIRA_OCORRENCIA))
+            .sum()
+            .alias("valor_total_servicos"),
+            pl.col("numero_da_os_de_servico")
+            .count()
+            .cast(pl.Int64)
+            .alias("quantidade_servicos"),
+        )
+    )
+
+
+# endregion
+
+
+# region ----- Salvar Arquivo Gold -----
+if __name__ == "__main__":
+    # Versão mais recente do dataset, conforme o catálogo da camada Trusted
+    TRUSTED_FILE_PATH: Path = ultima_versao(TRUSTED_FOLDER_PATH)
+
+    # Identidade do mart: dados da camada Trusted e código do mart
+    identidade: str = calcular_identidade(
+        entradas=[TRUSTED_FILE_PATH], script=Path(__file__)
+    )
+
+    if versao_identica(GOLD_FOLDER_PATH, identidade):
+        # O mart publicado já foi gerado a partir da mesma versão Trusted
+        print(
+            f"{TRUSTED_FILE_PATH.name} já agregado com o código atual ({identidade})."
+        )
+    else:
+        df_gold: pl.DataFrame = montar_mart(
+            ler_parquet_particionado(path=TRUSTED_FILE_PATH)
+        ).collect()
+
+        time_now: datetime = datetime.now().strftime("%Y-%m-%d-%H-%M-%S")
+        # O início da identidade no nome identifica o conteúdo de cada versão
+        sufixo: str = identidade[:TAMANHO_IDENTIDADE_ARQUIVO]
+        file_name_gold: str = (
+            f"historico-servicos-resumo-gold-{time_now}-{sufixo}.parquet"
+        )
+
+        salvar_parquet(
+            df=df_gold,
+            path=GOLD_FOLDER_PATH,
+            file_name=file_name_gold,
+            perfil=PERFIL_POR_CAMADA["2-gold"],
+            identidade=identidade,
+        )
+# endregion
@@ -0,0 +1,120 @@
+"""
+Script de geração do mart da camada Gold de histórico de venda de peças.
+
+Esta camada tem como objetivo agregar os dados tratados nas dimensões utilizadas
+pelas visualizações, evitando que sejam recalculadas a cada interação no Streamlit
+"""
+
+import polars as pl
+
+from pathlib import Path
+from datetime import datetime
+from src.etl.regras.historico_venda_pecas_regras import CUSTO_DESPROPORCIONAL
+from src.ferramentas.catalogo import ultima_versao
+from src.ferramentas.funcoes_suporte import (
+    PERFIL_POR_CAMADA,
+    ler_parquet_particionado,
+    salvar_parquet,
+)
+from src.ferramentas.identidade import (
+    TAMANHO_IDENTIDADE_ARQUIVO,
+    calcular_identidade,
+    versao_identica,
+)
+from src.ferramentas.marts import COLUNA_MES, incluir_mes
+
+# region ----- Caminho Arquivo Trusted -----
+TRUSTED_FOLDER_PATH: Path = (
+    Path(__file__).parent.parent.parent.parent
+    / "etl"
+    / "data"
+    / "1-trusted"
+    / "historico-venda-pecas"
+)
+# endregion
+
+
+# region ---- Caminho Arquivo Gold ----
+GOLD_FOLDER_PATH: Path = (
+    Path(__file__).parent.parent.parent.parent
+    / "etl"
+    / "data"
+    / "2-gold"
+    / "historico-venda-pecas-resumo"
+)
+
+GOLD_FOLDER_PATH.mkdir(parents=True, exist_ok=True)
+# endregion
+
+
+# region ----- Montar Mart -----
+def montar_mart(lf_trusted: pl.LazyFrame) -> pl.LazyFrame:
+    """
+    Monta o resumo das vendas de peças por mês, confiabilidade do registro e
+    departamento da venda.
+
+    Args:
+        lf_trusted (pl.LazyFrame): Dataset da camada Trusted.
+
+    Returns:
+        pl.LazyFrame: Quantidade de registros, de registros com custo desproporcional
+            e de registros com custo sem valor.
+    """
+    return (
+        incluir_mes(lf_trusted, coluna_data="data_da_venda")
+        .group_by(COLUNA_MES, "confiabilidade_do_registro", "departamento_da_venda")
+        .agg(
+            pl.col("tipo_de_venda_da_peca")
+            .count()
+            .cast(pl.Int64)
+            .alias("quantidade_registros"),
+            (pl.col("custo_da_peca") > CUSTO_DESPROPORCIONAL)
+            .sum()
+            .cast(pl.Int64)
+            .alias("quantidade_custo_desproporcional"),
+            (pl.col("custo_da_peca") == 0)
+            .sum()
+            .cast(pl.Int64)
+            .alias("quantidade_custo_sem_valor"),
+        )
+    )
+
+
+# endregion
+
+
+# region ----- Salvar Arquivo Gold -----
+if __name__ == "__main__":
+    # Versão mais recente do dataset, conforme o catálogo da camada Trusted
+    TRUSTED_FILE_PATH: Path = ultima_versao(TRUSTED_FOLDER_PATH)
+
+    # Identidade do mart: dados da camada Trusted e código do mart
+    identidade: str = calcular_identidade(
+        entradas=[TRUSTED_FILE_PATH], script=Path(__file__)
+    )
+
+    if versao_identica(GOLD_FOLDER_PATH, identidade):
+        # O mart publicado já foi gerado a partir da mesma versão Trusted
+        print(
+            f"{TRUSTED_FILE_PATH.name} já agregado com o código atual ({identidade})."
+        )
+    else:
+        df_gold: pl.DataFrame = montar_mart(
+            ler_parquet_particionado(path=TRUSTED_FILE_PATH)
+        ).collect()
+
+        time_now: datetime = datetime.now().strftime("%Y-%m-%d-%H-%M-%S")
+        # O início da identidade no nome identifica o conteúdo de cada versão
+        sufixo: str = identidade[:TAMANHO_IDENTIDADE_ARQUIVO]
+        file_name_gold: str = (
+            f"historico-venda-pecas-resumo-gold-{time_now}-{sufixo}.parquet"
+        )
+
+        salvar_parquet(
+            df=df_gold,
+            path=GOLD_FOLDER_PATH,
+            file_name=file_name_gold,
+            perfil=PERFIL_POR_CAMADA["2-gold"],
+            identidade=identidade,
+        )
+# endregion
@@ -0,0 +1,144 @@
+"""
+Script de geração da tabela fato de ordens de serviço (OS) da camada Gold.
+
+Esta camada tem como objetivo agregar os dados tratados nas dimensões utilizadas
+pelas visualizações, evitando que sejam recalculadas a cada interação no Streamlit.
+Cada linha representa uma OS, com os totais das linhas de serviço da OS, de forma
+que as análises por OS não precisam agrupar as linhas do histórico de serviços.
+"""
+
+import polars as pl
+
+from pathlib import Path
+from datetime import datetime
+from src.ferramentas.catalogo import ultima_versao
+from src.ferramentas.funcoes_suporte import (
+    PERFIL_POR_CAMADA,
+    ler_parquet_particionado,
+    salvar_parquet,
+)
+from src.ferramentas.identidade import (
+    TAMANHO_IDENTIDADE_ARQUIVO,
+    calcular_identidade,
+    versao_identica,
+)
+from src.ferramentas.marts import COLUNA_MES, incluir_mes
+
+# region ----- Caminho Arquivo Trusted -----
+TRUSTED_FOLDER_PATH: Path = (
+    Path(__file__).parent.parent.parent.parent
+    / "etl"
+    / "data"
+    / "1-trusted"
+    / "historico-servicos"
+)
+# endregion
+
+
+# region ---- Caminho Arquivo Gold ----
+GOLD_FOLDER_PATH: Path = (
+    Path(__file__).parent.parent.parent.parent
+    / "etl"
+    / "data"
+    / "2-gold"
+    / "ordens-servico"
+)
+
+GOLD_FOLDER_PATH.mkdir(parents=True, exist_ok=True)
+# endregion
+
+
+# region ----- Montar Mart -----
+# Informações do cabeçalho da OS, iguais em todas as linhas da OS
+COLUNAS_CABECALHO_OS: list = [
+    "cod_concessionaria",
+    "nome_da_concessionaria",
+    "cod_filial_ajustado",
+    "nome_da_filial",
+    "situacao_da_os",
+    "nome_do_cliente_que_fez_o_servico",
+]
+
+
+def montar_mart(lf_trusted: pl.LazyFrame) -> pl.LazyFrame:
+    """
+    Monta a tabela fato de ordens de serviço, com uma linha por OS.
+
+    Args:
+        lf_trusted (pl.LazyFrame): Dataset da camada Trusted do histórico de serviços.
+
+    Returns:
+        pl.LazyFrame: Cabeçalho, datas, quantidade de linhas, totais (valor, lucro,
+            horas) e categorias de serviço de cada OS.
+    """
+    return (
+        lf_trusted.filter(pl.col("numero_da_os_de_servico").is_not_null())
+        .group_by("numero_da_os_de_servico")
+        .agg(
+            pl.col(COLUNAS_CABECALHO_OS).first(),
+            pl.col("data_de_realizacao_do_servico").min().alias("data_da_os"),
+            pl.col("data_de_realizacao_do_servico")
+            .max()
+            .alias("data_do_ultimo_servico"),
+            pl.len().cast(pl.Int64).alias("quantidade_linhas"),
+            pl.col("quantidade_de_servicos_realizados")
+            .sum()
+            .alias("quantidade_de_servicos"),
+            pl.col("valor_total_do_servico_realizado").sum().alias("valor_total_os"),
+            pl.col("valor_do_servico_ajustado_com_revisao_gratuita")
+            .sum()
+            .alias("valor_ajustado_os"),
+            pl.col("lucro_do_servico").sum().alias("lucro_os"),
+            pl.col("tempo_do_servico_horas_ajustado").sum().alias("horas_os"),
+            pl.col("categoria_do_servico_padronizada")
+            .unique()
+            .sort()
+            .alias("categorias_do_servico"),
+        )
+        .with_columns(
+            pl.col("categorias_do_servico")
+            .list.len()
+            .cast(pl.Int64)
+            .alias("quantidade_categorias")
+        )
+        .pipe(incluir_mes, coluna_data="data_da_os")
+        .sort(COLUNA_MES, "numero_da_os_de_servico", nulls_last=True)
+    )
+
+
+# endregion
+
+
+# region ----- Salvar Arquivo Gold -----
+if __name__ == "__main__":
+    # Versão mais recente do dataset, conforme o catálogo da camada Trusted
+    TRUSTED_FILE_PATH: Path = ultima_versao(TRUSTED_FOLDER_PATH)
+
+    # Identidade do mart: dados da camada Trusted e código do mart
+    identidade: str = calcular_identidade(
+        entradas=[TRUSTED_FILE_PATH], script=Path(__file__)
+    )
+
+    if versao_identica(GOLD_FOLDER_PATH, identidade):
+        # O mart publicado já foi gerado a partir da mesma versão Trusted
+        print(
+            f"{TRUSTED_FILE_PATH.name} já agregado com o código atual ({identidade})."
+        )
+    else:
+        df_gold: pl.DataFrame = montar_mart(
+            ler_parquet_particionado(path=TRUSTED_FILE_PATH)
+        ).collect(engine="streaming")
+
+        time_now: datetime = datetime.now().strftime("%Y-%m-%d-%H-%M-%S")
+        # O início da identidade no nome identifica o conteúdo de cada versão
+        sufixo: str = identidade[:TAMANHO_IDENTIDADE_ARQUIVO]
+        file_name_gold: str = f"ordens-servico-gold-{time_now}-{sufixo}.parquet"
+
+        salvar_parquet(
+            df=df_gold,
+            path=GOLD_FOLDER_PATH,
+            file_name=file_name_gold,
+            perfil=PERFIL_POR_CAMADA["2-gold"],
+            identidade=identidade,
+        )
+# endregion
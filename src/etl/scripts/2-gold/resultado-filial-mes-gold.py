@@ -0,0 +1,198 @@
+"""
+Script de geração do mart da camada Gold do resultado consolidado da concessionária.
+
+Esta camada tem como objetivo agregar os dados tratados nas dimensões utilizadas
+pelas visualizações, evitando que sejam recalculadas a cada interação no Streamlit.
+O resultado de cada filial e mês combina o lucro das vendas de peças, das vendas de
+veículos e dos serviços realizados.
+"""
+
+import polars as pl
+
+from pathlib import Path
+from datetime import datetime
+from src.ferramentas.catalogo import ultima_versao
+from src.ferramentas.funcoes_suporte import (
+    PERFIL_POR_CAMADA,
+    ler_parquet_particionado,
+    salvar_parquet,
+)
+from src.ferramentas.identidade import (
+    TAMANHO_IDENTIDADE_ARQUIVO,
+    calcular_identidade,
+    versao_identica,
+)
+from src.ferramentas.marts import (
+    COLUNA_MES,
+    COLUNA_PRIMEIRA_OCORRENCIA,
+    incluir_mes,
+    marcar_primeira_ocorrencia,
+)
+
+# region ----- Caminho Arquivos Trusted -----
+TRUSTED_PATH: Path = (
+    Path(__file__).parent.parent.parent.parent / "etl" / "data" / "1-trusted"
+)
+# endregion
+
+
+# region ---- Caminho Arquivo Gold ----
+GOLD_FOLDER_PATH: Path = (
+    Path(__file__).parent.parent.parent.parent
+    / "etl"
+    / "data"
+    / "2-gold"
+    / "resultado-filial-mes"
+)
+
+GOLD_FOLDER_PATH.mkdir(parents=True, exist_ok=True)
+# endregion
+
+
+# region ----- Fontes do Resultado -----
+# Dataset da camada Trusted, coluna de data e coluna de lucro de cada fonte
+FONTES_RESULTADO: dict = {
+    "pecas": ("historico-venda-pecas", "data_da_venda", "lucro_da_venda_recalculado"),
+    "veiculos": (
+        "historico-venda-veiculos",
+        "data_da_venda",
+        "lucro_da_venda_recalculado",
+    ),
+    "servicos": (
+        "historico-servicos",
+        "data_de_realizacao_do_servico",
+        "lucro_do_servico",
+    ),
+}
+
+CHAVES_RESULTADO: list = ["cod_filial_ajustado", COLUNA_MES]
+# endregion
+
+
+# region ----- Montar Mart -----
+def agregar_fonte(
+    lf_trusted: pl.LazyFrame, fonte: str, coluna_data: str, coluna_lucro: str
+) -> pl.LazyFrame:
+    """
+    Agrega o lucro e a quantidade de registros de uma fonte por filial e mês.
+
+    Assim como no mart do histórico de serviços, o lucro é somado apenas uma vez por
+    linha distinta: as linhas duplicadas (`status_duplicidade` "DUPLICADO" nas vendas)
+    são repetições do mesmo registro e não representam novas vendas. A quantidade de
+    registros considera todas as linhas.
+
+    Args:
+        lf_trusted (pl.LazyFrame): Dataset da camada Trusted da fonte.
+        fonte (str): Nome da fonte, utilizado no nome das colunas.
+        coluna_data (str): Coluna de data do dataset.
+        coluna_lucro (str): Coluna de lucro do dataset.
+
+    Returns:
+        pl.LazyFrame: Lucro das linhas distintas (`lucro_<fonte>`) e quantidade de
+            registros (`registros_<fonte>`) por filial e mês.
+    """
+    return (
+        incluir_mes(
+            marcar_primeira_ocorrencia(lf_trusted).select(
+                "cod_filial_ajustado",
+                coluna_data,
+                coluna_lucro,
+                COLUNA_PRIMEIRA_OCORRENCIA,
+            ),
+            coluna_data=coluna_data,
+        )
+        .group_by(CHAVES_RESULTADO)
+        .agg(
+            pl.col(coluna_lucro)
+            .filter(pl.col(COLUNA_PRIMEIRA_OCORRENCIA))
+            .sum()
+            .alias(f"lucro_{fonte}"),
+            pl.len().cast(pl.Int64).alias(f"registros_{fonte}"),
+        )
+    )
+
+
+def montar_mart(fontes: dict) -> pl.LazyFrame:
+    """
+    Monta o resultado consolidado por filial e mês.
+
+    Cada fonte é agregada por filial e mês antes da união, de forma que as uniões
+    são feitas entre tabelas do tamanho da quantidade de filiais e meses (a mesma
+    divisão das partições ano/mês da camada Trusted), independente da quantidade de
+    registros dos históricos.
+
+    Args:
+        fontes (dict): Dataset agregado de cada fonte (ver `agregar_fonte`).
+
+    Returns:
+        pl.LazyFrame: Lucro e quantidade de registros de cada fonte e lucro total por
+            filial e mês.
+    """
+    agregados: list = list(fontes.values())
+
+    lf_resultado: pl.LazyFrame = agregados[0]
+    for lf_fonte in agregados[1:]:
+        lf_resultado = lf_resultado.join(
+            lf_fonte, on=CHAVES_RESULTADO, how="full", coalesce=True, nulls_equal=True
+        )
+
+    colunas_lucro: list = [f"lucro_{fonte}" for fonte in fontes]
+    colunas_registros: list = [f"registros_{fonte}" for fonte in fontes]
+
+    # Filiais sem registros de uma fonte no mês ficam com lucro e registros zerados
+    return (
+        lf_resultado.with_columns(
+            pl.col(colunas_lucro + colunas_registros).fill_null(0)
+        )
+        .with_columns(pl.sum_horizontal(colunas_lucro).alias("lucro_total"))
+        .sort(CHAVES_RESULTADO, nulls_last=True)
+    )
+
+
+# endregion
+
+
+# region ----- Salvar Arquivo Gold -----
+if __name__ == "__main__":
+    # Versão mais recente de cada fonte, conforme o catálogo da camada Trusted
+    trusted_files: dict = {
+        fonte: ultima_versao(TRUSTED_PATH / dataset)
+        for fonte, (dataset, _, _) in FONTES_RESULTADO.items()
+    }
+
+    # Identidade do mart: dados das fontes na camada Trusted e código do mart
+    identidade: str = calcular_identidade(
+        entradas=list(trusted_files.values()), script=Path(__file__)
+    )
+
+    if versao_identica(GOLD_FOLDER_PATH, identidade):
+        # O mart publicado já foi gerado a partir das mesmas versões Trusted
+        print(f"resultado-filial-mes já agregado com o código atual ({identidade}).")
+    else:
+        fontes: dict = {
+            fonte: agregar_fonte(
+                ler_parquet_particionado(path=trusted_files[fonte]),
+                fonte=fonte,
+                coluna_data=coluna_data,
+                coluna_lucro=coluna_lucro,
+            )
+            for fonte, (_, coluna_data, coluna_lucro) in FONTES_RESULTADO.items()
+        }
+
+        # As agregações são executadas com o motor de streaming, sem carregar os
+        # históricos completos em memória
+        df_gold: pl.DataFrame = montar_mart(fontes).collect(engine="streaming")
+
+        time_now: datetime = datetime.now().strftime("%Y-%m-%d-%H-%M-%S")
+        # O início da identidade no nome identifica o conteúdo de cada versão
+        sufixo: str = identidade[:TAMANHO_IDENTIDADE_ARQUIVO]
+        file_name_gold: str = f"resultado-filial-mes-gold-{time_now}-{sufixo}.parquet"
+
+        salvar_parquet(
+            df=df_gold,
+            path=GOLD_FOLDER_PATH,
+            file_name=file_name_gold,
+            perfil=PERFIL_POR_CAMADA["2-gold"],
+            identidade=identidade,
+        )
+# endregion
@@ -0,0 +1,305 @@
+"""
+Script para manter o catálogo de versões de cada dataset, em cada camada do ETL.
+
+Cada pasta de dataset (ex.: src/etl/data/1-trusted/estoque-pecas) possui:
+- `_catalogo.jsonl`: histórico de todos os arquivos gravados, um registro por linha,
+  com o nome do arquivo, a quantidade de linhas, o hash do schema e a data de gravação;
+- `_ultima_versao.json`: registro do arquivo mais recente, lido diretamente pelos
+  scripts e páginas, sem a necessidade de listar a pasta.
+
+Cada versão recebe um número sequencial (`versao`), que só aumenta. Os arquivos são
+gravados com um nome temporário e renomeados apenas quando completos, e somente então
+o ponteiro `_ultima_versao.json` é substituído (também de forma atômica). Assim, quem
+está lendo o dataset continua com a versão anterior até que a nova esteja publicada.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import polars as pl
+
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+
+ARQUIVO_CATALOGO: str = "_catalogo.jsonl"
+ARQUIVO_ULTIMA_VERSAO: str = "_ultima_versao.json"
+
+# Prefixo dos arquivos em gravação, ignorados na busca pela versão mais recente
+PREFIXO_TEMPORARIO: str = ".tmp-"
+
+
+def calcular_hash_schema(schema: pl.Schema | dict) -> str:
+    """
+    Calcula o hash de um schema (nomes e tipos das colunas, na ordem).
+
+    Args:
+        schema (pl.Schema | dict): Schema do dataset.
+
+    Returns:
+        str: Hash do schema em hexadecimal.
+    """
+    descricao: str = json.dumps([[nome, str(dtype)] for nome, dtype in schema.items()])
+
+    return hashlib.blake2b(descricao.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def registrar_versao(
+    path: Path,
+    file_name: str,
+    linhas: int,
+    schema: pl.Schema,
+    identidade: str | None = None,
+    codigo: str | None = None,
+) -> dict:
+    """
+    Registra no catálogo um arquivo gravado na pasta do dataset e o publica como a
+    versão mais recente, com o número de versão seguinte ao da versão atual.
+
+    Args:
+        path (Path): Pasta do dataset.
+        file_name (str): Nome do arquivo (ou pasta, quando particionado) gravado.
+        linhas (int): Quantidade de linhas do arquivo.
+        schema (pl.Schema): Schema do arquivo.
+        identidade (str | None): Identidade do conteúdo do arquivo (ver
+            `src/ferramentas/identidade.py`), quando calculada.
+        codigo (str | None): Identidade do código do tratamento (ver
+            `identidade_codigo`), quando calculada.
+
+    Returns:
+        dict: Registro da versão.
+    """
+    registro: dict = {
+        "versao": versao_atual(path) + 1,
+        "arquivo": file_name,
+        "linhas": linhas,
+        "schema_hash": calcular_hash_schema(schema),
+        "criado_em": datetime.now().isoformat(timespec="seconds"),
+    }
+    if identidade is not None:
+        registro["identidade"] = identidade
+    if codigo is not None:
+        registro["codigo"] = codigo
+
+    with open(path / ARQUIVO_CATALOGO, "a", encoding="utf-8") as catalogo:
+        catalogo.write(json.dumps(registro) + "\n")
+
+    # O ponteiro é substituído de uma só vez: leitores nunca veem um JSON incompleto
+    ponteiro_temporario: Path = path / f"{PREFIXO_TEMPORARIO}{ARQUIVO_ULTIMA_VERSAO}"
+    with open(ponteiro_temporario, "w", encoding="utf-8") as ultima:
+        json.dump(registro, ultima, indent=4)
+    os.replace(ponteiro_temporario, path / ARQUIVO_ULTIMA_VERSAO)
+
+    return registro
+
+
+def ler_ultima_versao(path: Path) -> dict | None:
+    """
+    Lê o registro da versão mais recente de um dataset.
+
+    Args:
+        path (Path): Pasta do dataset.
+
+    Returns:
+        dict | None: Registro da versão mais recente, ou None caso o dataset ainda
+            não possua catálogo.
+    """
+    if not (path / ARQUIVO_ULTIMA_VERSAO).exists():
+        return None
+
+    with open(path / ARQUIVO_ULTIMA_VERSAO, "r", encoding="utf-8") as ultima:
+        return json.load(ultima)
+
+
+def versao_atual(path: Path) -> int:
+    """
+    Retorna o número da versão publicada mais recente de um dataset.
+
+    Args:
+        path (Path): Pasta do dataset.
+
+    Returns:
+        int: Número da versão, ou 0 caso o dataset ainda não possua catálogo.
+    """
+    registro: dict | None = ler_ultima_versao(path)
+
+    return registro.get("versao", 0) if registro is not None else 0
+
+
+def versao_publicada(path: Path) -> tuple[int, Path]:
+    """
+    Retorna o número e o caminho da versão publicada mais recente de um dataset,
+    lidos do mesmo registro (e, portanto, sempre correspondentes).
+
+    Utilizado pelas páginas do Streamlit: o número da versão é a chave do cache dos
+    dados, que é invalidado apenas quando uma nova versão completa for publicada.
+
+    Args:
+        path (Path): Pasta do dataset.
+
+    Returns:
+        tuple[int, Path]: Número da versão (0 para pastas sem catálogo) e caminho do
+            arquivo (ou pasta, quando particionado).
+    """
+    registro: dict | None = ler_ultima_versao(path)
+    if registro is not None:
+        return registro.get("versao", 0), path / registro["arquivo"]
+
+    return 0, ultima_versao(path)
+
+
+def versao_disponivel(path: Path) -> tuple[int, Path | None]:
+    """
+    Retorna o número e o caminho da versão publicada mais recente de um dataset,
+    como `versao_publicada`, sem interromper a execução quando o dataset ainda não
+    foi gravado.
+
+    Utilizado pelas páginas do Streamlit, que exibem um aviso (ou montam os dados a
+    partir da camada anterior) em vez de falhar quando o pipeline não foi executado.
+
+    Args:
+        path (Path): Pasta do dataset.
+
+    Returns:
+        tuple[int, Path | None]: Número da versão e caminho do arquivo, ou (0, None)
+            quando a pasta não existe ou não possui arquivos.
+    """
+    try:
+        return versao_publicada(path)
+    except FileNotFoundError:
+        return 0, None
+
+
+def ultima_versao(path: Path) -> Path:
+    """
+    Retorna o caminho do arquivo mais recente de um dataset.
+
+    Para pastas sem catálogo, é considerado o arquivo com o maior nome, já que os
+    nomes dos arquivos terminam com a data e hora da gravação.
+
+    Args:
+        path (Path): Pasta do dataset.
+
+    Returns:
+        Path: Caminho do arquivo (ou pasta, quando particionado) mais recente.
+    """
+    registro: dict | None = ler_ultima_versao(path)
+    if registro is not None:
+        return path / registro["arquivo"]
+
+    arquivos: list = sorted(
+        arquivo.name
+        for arquivo in path.iterdir()
+        if not arquivo.name.startswith(("_", "."))
+    )
+    if not arquivos:
+        raise FileNotFoundError(f"Nenhum arquivo encontrado em {path}")
+
+    return path / arquivos[-1]
+
+
+def verificar_nome_livre(destino: Path) -> None:
+    """
+    Verifica se o nome final de uma gravação ainda não está em uso na pasta do
+    dataset.
+
+    Args:
+        destino (Path): Caminho final do arquivo (ou pasta, quando particionado).
+
+    Raises:
+        FileExistsError: Quando o nome já está em uso.
+    """
+    if destino.exists():
+        raise FileExistsError(
+            f"Já existe uma versão gravada como {destino}: duas gravações do "
+            "dataset no mesmo segundo. Aguarde o término da outra execução e "
+            "execute novamente."
+        )
+
+
+@contextmanager
+def gravacao_atomica(path: Path, file_name: str):
+    """
+    Fornece um caminho temporário para a gravação de um arquivo (ou pasta, quando
+    particionado) e o renomeia para o nome final apenas ao término da gravação.
+
+    A renomeação é atômica, portanto o nome final nunca aponta para um arquivo
+    incompleto. Caso a gravação falhe, o arquivo temporário é removido.
+
+    Versões já gravadas nunca são substituídas: como os nomes incluem a data e hora
+    da gravação (em segundos), duas gravações do mesmo dataset no mesmo segundo
+    (ex.: execuções simultâneas do pipeline) geram o mesmo nome, e a segunda falha.
+
+    Args:
+        path (Path): Pasta do dataset.
+        file_name (str): Nome final do arquivo.
+
+    Yields:
+        Path: Caminho temporário onde o arquivo deve ser gravado.
+
+    Raises:
+        FileExistsError: Quando já existe um arquivo (ou pasta) com o nome final,
+            verificado antes e ao término da gravação.
+    """
+    path.mkdir(parents=True, exist_ok=True)
+    temporario: Path = path / f"{PREFIXO_TEMPORARIO}{file_name}"
+    verificar_nome_livre(path / file_name)
+
+    try:
+        yield temporario
+        verificar_nome_livre(path / file_name)
+        os.replace(temporario, path / file_name)
+    finally:
+        if temporario.is_dir():
+            shutil.rmtree(temporario)
+        elif temporario.exists():
+            temporario.unlink()
+
+
+def listar_versoes(path: Path) -> list:
+    """
+    Lista o histórico de versões de um dataset, da mais antiga para a mais recente.
+
+    Args:
+        path (Path): Pasta do dataset.
+
+    Returns:
+        list: Registros de todas as versões gravadas.
+    """
+    if not (path / ARQUIVO_CATALOGO).exists():
+        return []
+
+    with open(path / ARQUIVO_CATALOGO, "r", encoding="utf-8") as catalogo:
+        return [json.loads(linha) for linha in catalogo if linha.strip()]
+
+
+def indexar_pasta(path: Path) -> None:
+    """
+    Cria o catálogo de uma pasta com arquivos gravados antes da existência do
+    catálogo, registrando os arquivos na ordem dos nomes (data e hora da gravação).
+
+    Args:
+        path (Path): Pasta do dataset.
+    """
+    if (path / ARQUIVO_CATALOGO).exists():
+        return
+
+    for arquivo in sorted(path.iterdir()):
+        if arquivo.name.startswith(("_", ".")):
+            continue
+
+        # Datasets particionados não registram as colunas de partição (year/month)
+        lf: pl.LazyFrame = (
+            pl.scan_parquet(source=arquivo)
+            if arquivo.is_file()
+            else pl.scan_parquet(source=arquivo, hive_partitioning=True).drop(
+                ["year", "month"], strict=False
+            )
+        )
+        registrar_versao(
+            path=path,
+            file_name=arquivo.name,
+            linhas=lf.select(pl.len()).collect().item(),
+            schema=lf.collect_schema(),
+        )
@@ -0,0 +1,191 @@
+"""
+Script para manter os conversores dos formatos encontrados nos arquivos das
+concessionárias (booleanos, datas, anos, valores em reais e valores sentinela).
+
+Todos os conversores retornam expressões do Polars, executadas de forma vetorizada
+sobre a coluna inteira, sem funções Python aplicadas linha a linha
+(`map_elements`). Podem ser utilizados diretamente em `with_columns` ou nas regras de
+limpeza do tipo "expressao" (ver `src/ferramentas/regras_limpeza.py`).
+"""
+
+import polars as pl
+
+# Valores aceitos como verdadeiro / falso (comparados em maiúsculas, sem espaços)
+VALORES_VERDADEIROS: list = ["TRUE", "T", "1", "SIM", "S", "VERDADEIRO", "YES", "Y"]
+VALORES_FALSOS: list = ["FALSE", "F", "0", "NAO", "NÃO", "N", "FALSO", "NO"]
+
+# Valores utilizados nos arquivos de origem para indicar a ausência de informação
+SENTINELAS_NULO: list = ["", "NULL", "NONE", "NAN", "UNKNOWN"]
+
+# Formatos de data encontrados nos arquivos das concessionárias (sem ambiguidade entre
+# si, já que apenas o primeiro começa pelo ano)
+FORMATOS_DATA: list = ["%Y-%m-%d", "%d/%m/%Y"]
+
+
+def coluna_expressao(coluna: str | pl.Expr) -> pl.Expr:
+    """
+    Converte o nome de uma coluna em expressão (expressões são mantidas).
+
+    Args:
+        coluna (str | pl.Expr): Nome da coluna ou expressão.
+
+    Returns:
+        pl.Expr: Expressão da coluna.
+    """
+    return pl.col(coluna) if isinstance(coluna, str) else coluna
+
+
+def nulo_se_sentinela(
+    coluna: str | pl.Expr, sentinelas: list = SENTINELAS_NULO
+) -> pl.Expr:
+    """
+    Substitui por nulo os valores sentinela (ex.: "UNKNOWN", "0") de uma coluna de
+    texto. A comparação desconsidera maiúsculas/minúsculas e espaços nas pontas.
+
+    Args:
+        coluna (str | pl.Expr): Coluna de texto.
+        sentinelas (list): Valores sentinela, em maiúsculas.
+
+    Returns:
+        pl.Expr: Coluna com os valores sentinela nulos.
+    """
+    texto: pl.Expr = coluna_expressao(coluna)
+
+    # Sem `otherwise`, os valores sentinela ficam nulos
+    return pl.when(~texto.str.strip_chars().str.to_uppercase().is_in(sentinelas)).then(
+        texto
+    )
+
+
+def converter_booleano(coluna: str | pl.Expr, padrao: bool | None = None) -> pl.Expr:
+    """
+    Converte uma coluna de texto em booleano (ex.: "True", "SIM", "1" / "False",
+    "NAO", "0").
+
+    Os valores aceitos (`VALORES_VERDADEIROS` e `VALORES_FALSOS`) são mais amplos que
+    a comparação com "True" utilizada antes: "1", "SIM" e "T" também são verdadeiros.
+
+    Args:
+        coluna (str | pl.Expr): Coluna de texto.
+        padrao (bool | None): Valor dos registros que não correspondem a verdadeiro
+            nem a falso (inclusive nulos).
+
+    Returns:
+        pl.Expr: Coluna booleana.
+    """
+    valores: dict = {valor: True for valor in VALORES_VERDADEIROS} | {
+        valor: False for valor in VALORES_FALSOS
+    }
+
+    return (
+        coluna_expressao(coluna)
+        .str.strip_chars()
+        .str.to_uppercase()
+        .replace_strict(valores, default=padrao, return_dtype=pl.Boolean)
+    )
+
+
+def converter_data(
+    coluna: str | pl.Expr, formatos: str | list, strict: bool = True
+) -> pl.Expr:
+    """
+    Converte uma coluna de texto em data, aceitando um ou mais formatos (ex.:
+    "%d/%m/%Y" e "%Y-%m-%d", quando arquivos de origem diferentes utilizam formatos
+    diferentes).
+
+    Cada valor recebe a data do primeiro formato, na ordem informada, em que pode ser
+    lido. Um valor preenchido que não corresponde a nenhum formato interrompe a
+    execução, com os valores na mensagem de erro (ou fica nulo, com `strict=False`).
+
+    Args:
+        coluna (str | pl.Expr): Coluna de texto.
+        formatos (str | list): Formato ou lista de formatos (`strptime`).
+        strict (bool): Interrompe a execução quando um valor não pode ser convertido.
+
+    Returns:
+        pl.Expr: Coluna de data.
+    """
+    texto: pl.Expr = coluna_expressao(coluna)
+    formatos = [formatos] if isinstance(formatos, str) else formatos
+
+    # Todos os valores são lidos com o primeiro formato; os demais formatos (e os
+    # valores com espaços nas pontas) são tentados apenas nos valores sem data. Sem
+    # `otherwise`, os valores já convertidos ficam nulos no texto lido novamente
+    data: pl.Expr = texto.str.strptime(pl.Date, formatos[0], strict=False)
+    restante: pl.Expr = pl.when(data.is_null()).then(texto).str.strip_chars()
+    data_restante: pl.Expr = pl.coalesce(
+        [restante.str.strptime(pl.Date, formato, strict=False) for formato in formatos]
+    )
+    if not strict:
+        return pl.coalesce(data, data_restante)
+
+    # Apenas os valores não convertidos são lidos novamente, com o primeiro formato e
+    # sem `strict=False`, para que a conversão falhe informando esses valores
+    return pl.coalesce(
+        data,
+        data_restante,
+        pl.when(data_restante.is_null())
+        .then(restante)
+        .str.strptime(pl.Date, formatos[0]),
+    )
+
+
+def converter_ano(coluna: str | pl.Expr) -> pl.Expr:
+    """
+    Converte uma coluna com o ano (ex.: "2019" ou "2019.0", quando salvo como número
+    decimal) na data do primeiro dia do ano. Anos informados como "0" ficam nulos.
+
+    Args:
+        coluna (str | pl.Expr): Coluna de texto.
+
+    Returns:
+        pl.Expr: Coluna de data.
+    """
+    ano: pl.Expr = (
+        coluna_expressao(coluna)
+        .str.strip_chars()
+        .cast(pl.Float64, strict=False)
+        .cast(pl.Int32)
+    )
+
+    # O ano "0" é um valor sentinela (sem `otherwise`, fica nulo)
+    return pl.when(ano > 0).then(pl.date(ano, 1, 1)).name.keep()
+
+
+def converter_moeda(coluna: str | pl.Expr, strict: bool = True) -> pl.Expr:
+    """
+    Converte uma coluna de valores monetários em número decimal.
+
+    Valores com o ponto como separador decimal (ex.: "1234.56") são convertidos
+    diretamente. Apenas os valores preenchidos que não podem ser convertidos assim
+    (ex.: "R$ 1.234,56", no formato brasileiro, com a vírgula como separador decimal)
+    passam pela limpeza do texto. Valores que não representam um número interrompem a
+    conversão (ou ficam nulos, com `strict=False`).
+
+    Args:
+        coluna (str | pl.Expr): Coluna de texto.
+        strict (bool): Interrompe a execução quando um valor não pode ser convertido.
+
+    Returns:
+        pl.Expr: Coluna Float64.
+    """
+    texto: pl.Expr = coluna_expressao(coluna)
+    valor: pl.Expr = texto.cast(pl.Float64, strict=False)
+
+    # Sem `otherwise`, os valores já convertidos ficam nulos no texto a limpar, de
+    # forma que as substituições são feitas apenas nos demais (as substituições
+    # literais percorrem também os nulos, por isso são utilizadas expressões regulares)
+    texto_restante: pl.Expr = (
+        pl.when(valor.is_null() & texto.is_not_null())
+        .then(texto)
+        .str.replace(r"^\s*R\$", "")
+        .str.replace_all(r"\s", "")
+    )
+    valor_restante: pl.Expr = (
+        pl.when(texto_restante.str.contains(",", literal=True))
+        .then(texto_restante.str.replace_all(r"\.", "").str.replace(",", "."))
+        .otherwise(texto_restante)
+        .cast(pl.Float64, strict=strict)
+    )
+
+    return pl.coalesce(valor, valor_restante)
@@ -0,0 +1,210 @@
+"""
+Script para identificar linhas duplicadas (completa ou parcialmente) a partir do hash
+de cada linha.
+
+Em vez de comparar as linhas inteiras (`pl.struct(...).is_duplicated()`, que exige a
+tabela completa em memória), cada linha é resumida em um hash de 64 bits
+(`hash_linha`), e a quantidade de linhas de cada hash é contada com uma janela
+(`pl.len().over(...)`), no mesmo plano preguiçoso (LazyFrame) do tratamento: nada é
+lido ao montar o tratamento, e a contagem é executada junto com o restante do plano.
+A memória da contagem depende da quantidade de linhas (8 bytes por linha), e não da
+largura das linhas.
+
+Comparação no histórico de venda de peças com 1,5 milhão de linhas (linhas completa
+e parcialmente duplicadas, um processo por medição):
+- janela sobre o hash, com o hash da comparação parcial reaproveitado na completa
+  (ver `marcar_duplicidades`): 1,8 s e 1,1 GB;
+- janela sobre o hash, com cada hash calculado sobre todas as colunas: 2,3 s;
+- agrupamento dos hashes unido de volta ao dataset (join): 4,2 s e 1,8 GB;
+- `pl.struct(...).is_duplicated()`: 1,75 s e 1,9 GB para apenas uma das regras.
+Com dois hashes por linha (128 bits), o tempo passava a ser 20% maior, por isso é
+utilizado apenas um. A chance de duas linhas diferentes terem o mesmo hash é de
+aproximadamente n² / 2⁶⁵ (menos de 1 em 1 milhão até 6 milhões de linhas distintas).
+
+Para datasets muito grandes, a contagem pode ser feita em partes (`particoes`): os
+hashes são agrupados por intervalo, uma parte de cada vez, e apenas os grupos
+duplicados são unidos de volta ao dataset. A memória do agrupamento fica limitada a
+1/`particoes` das linhas distintas, em troca de um tempo maior (a união). A
+quantidade de partes é lida da variável de ambiente `PARTICOES_DUPLICIDADE`.
+
+Cada grupo de linhas duplicadas recebe um identificador (o hash das linhas), o mesmo
+em todas as linhas do grupo, e a quantidade de linhas do grupo. Linhas sem
+duplicidade ficam com o identificador nulo e tamanho 1. O identificador é estável
+entre execuções com a mesma versão do Polars.
+"""
+
+import os
+import polars as pl
+
+# Quantidade de partes em que o agrupamento dos hashes é dividido
+PARTICOES_DUPLICIDADE: int = int(os.environ.get("PARTICOES_DUPLICIDADE", "1"))
+
+# Semente do hash de cada linha
+SEMENTE_HASH: int = 0
+
+# Colunas auxiliares, removidas ao final
+COLUNA_HASH: str = "_hash_linha"
+COLUNA_TAMANHO_AUXILIAR: str = "_tamanho_grupo"
+
+
+def hash_linha(colunas: list, semente: int = SEMENTE_HASH) -> pl.Expr:
+    """
+    Calcula o hash de 64 bits dos valores das colunas informadas, em cada linha.
+
+    Args:
+        colunas (list): Colunas consideradas na comparação das linhas.
+        semente (int): Semente do hash.
+
+    Returns:
+        pl.Expr: Expressão do hash (UInt64).
+    """
+    return pl.struct(colunas).hash(seed=semente)
+
+
+def contar_grupos_duplicados(lf: pl.LazyFrame, particoes: int = 1) -> pl.LazyFrame:
+    """
+    Conta as linhas de cada grupo de linhas iguais (pelo hash), mantendo apenas os
+    grupos com mais de uma linha.
+
+    Args:
+        lf (pl.LazyFrame): Dataset avaliado, com o hash de cada linha
+            (`COLUNA_HASH`).
+        particoes (int): Quantidade de partes em que o agrupamento é dividido.
+
+    Returns:
+        pl.LazyFrame: Hash e quantidade de linhas de cada grupo duplicado.
+    """
+    hashes: pl.LazyFrame = lf.select(COLUNA_HASH)
+
+    grupos: list = []
+    for particao in range(particoes):
+        parte: pl.LazyFrame = (
+            hashes
+            if particoes == 1
+            else hashes.filter(pl.col(COLUNA_HASH) % particoes == particao)
+        )
+        grupos.append(
+            parte.group_by(COLUNA_HASH)
+            .agg(pl.len().alias(COLUNA_TAMANHO_AUXILIAR))
+            .filter(pl.col(COLUNA_TAMANHO_AUXILIAR) > 1)
+        )
+
+    # As partes são executadas uma de cada vez, para não somar a memória de todas
+    return pl.concat(grupos, parallel=False)
+
+
+def marcar_duplicidades(
+    df: pl.DataFrame | pl.LazyFrame,
+    grupos: list,
+    particoes: int | None = None,
+) -> pl.DataFrame | pl.LazyFrame:
+    """
+    Inclui no dataset o identificador e o tamanho do grupo de linhas duplicadas de
+    cada linha, em cada uma das comparações informadas (ex.: linhas completa e
+    parcialmente duplicadas).
+
+    As comparações são calculadas da que considera menos colunas para a que considera
+    mais. Quando as colunas de uma comparação incluem todas as colunas de uma
+    comparação anterior, o hash da anterior é reaproveitado: apenas ele e as colunas
+    restantes são resumidos no novo hash, sem calcular novamente o hash de cada texto.
+
+    A contagem dos grupos (uma janela sobre o hash ou, em partes, o agrupamento dos
+    hashes unido ao dataset) é incluída no plano, executado apenas quando consumido.
+
+    Args:
+        df (pl.DataFrame | pl.LazyFrame): Dataset avaliado.
+        grupos (list): Comparações, cada uma com as colunas consideradas, o nome da
+            coluna do identificador do grupo e o nome da coluna da quantidade de
+            linhas do grupo.
+        particoes (int | None): Quantidade de partes em que o agrupamento é dividido
+            (padrão: `PARTICOES_DUPLICIDADE`).
+
+    Returns:
+        pl.DataFrame | pl.LazyFrame: Dataset com as colunas dos grupos, na ordem
+            original das linhas.
+    """
+    particoes = max(1, particoes or PARTICOES_DUPLICIDADE)
+    lf: pl.LazyFrame = df.lazy()
+
+    # Colunas e coluna do hash de cada comparação já calculada
+    calculados: list = []
+    for colunas, coluna_grupo, coluna_tamanho in sorted(
+        grupos, key=lambda g: len(g[0])
+    ):
+        base: tuple | None = max(
+            (
+                (colunas_base, hash_base)
+                for colunas_base, hash_base in calculados
+                if set(colunas_base) <= set(colunas)
+            ),
+            key=lambda calculado: len(calculado[0]),
+            default=None,
+        )
+        coluna_hash: str = f"{COLUNA_HASH}_{coluna_grupo}"
+        if base is None:
+            lf = lf.with_columns(hash_linha(colunas).alias(coluna_hash))
+        else:
+            lf = lf.with_columns(
+                hash_linha([base[1]] + [c for c in colunas if c not in base[0]]).alias(
+                    coluna_hash
+                )
+            )
+        calculados.append((colunas, coluna_hash))
+
+        if particoes == 1:
+            # Quantidade de linhas de cada hash, sem unir uma tabela de grupos
+            lf = lf.with_columns(
+                pl.len()
+                .over(coluna_hash)
+                .cast(pl.UInt32)
+                .alias(COLUNA_TAMANHO_AUXILIAR)
+            )
+        else:
+            lf = lf.join(
+                contar_grupos_duplicados(
+                    lf=lf.select(pl.col(coluna_hash).alias(COLUNA_HASH)),
+                    particoes=particoes,
+                ).rename({COLUNA_HASH: coluna_hash}),
+                on=coluna_hash,
+                how="left",
+                maintain_order="left",
+            )
+
+        lf = lf.with_columns(
+            pl.when(pl.col(COLUNA_TAMANHO_AUXILIAR) > 1)
+            .then(pl.col(coluna_hash))
+            .alias(coluna_grupo),
+            pl.col(COLUNA_TAMANHO_AUXILIAR).fill_null(1).alias(coluna_tamanho),
+        ).drop(COLUNA_TAMANHO_AUXILIAR)
+
+    resultado: pl.LazyFrame = lf.drop([coluna_hash for _, coluna_hash in calculados])
+
+    return resultado if isinstance(df, pl.LazyFrame) else resultado.collect()
+
+
+def marcar_duplicidade(
+    df: pl.DataFrame | pl.LazyFrame,
+    colunas: list,
+    coluna_grupo: str,
+    coluna_tamanho: str,
+    particoes: int | None = None,
+) -> pl.DataFrame | pl.LazyFrame:
+    """
+    Inclui no dataset o identificador e o tamanho do grupo de linhas duplicadas de
+    cada linha, considerando as colunas informadas (ver `marcar_duplicidades`).
+
+    Args:
+        df (pl.DataFrame | pl.LazyFrame): Dataset avaliado.
+        colunas (list): Colunas consideradas na comparação das linhas.
+        coluna_grupo (str): Nome da coluna do identificador do grupo.
+        coluna_tamanho (str): Nome da coluna da quantidade de linhas do grupo.
+        particoes (int | None): Quantidade de partes em que o agrupamento é dividido
+            (padrão: `PARTICOES_DUPLICIDADE`).
+
+    Returns:
+        pl.DataFrame | pl.LazyFrame: Dataset com as colunas do grupo, na ordem
+            original das linhas.
+    """
+    return marcar_duplicidades(
+        df=df, grupos=[(colunas, coluna_grupo, coluna_tamanho)], particoes=particoes
+    )
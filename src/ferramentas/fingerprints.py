@@ -0,0 +1,149 @@
+"""
+Script para manter o registro de fingerprints dos arquivos de origem da camada Raw.
+
+Cada dataset possui um registro (arquivo JSON) com o tamanho, a data de modificação e
+o hash do conteúdo de cada arquivo de origem lido na última ingestão. Assim é possível
+identificar se o arquivo mudou e evitar reprocessar arquivos idênticos.
+"""
+
+import hashlib
+import json
+import os
+from pathlib import Path
+
+# Tamanho dos blocos lidos para calcular o hash, evitando carregar o arquivo inteiro
+# em memória
+TAMANHO_BLOCO_HASH: int = 1024 * 1024
+
+
+def calcular_hash(source: Path) -> str:
+    """
+    Calcula o hash (blake2b) do conteúdo de um arquivo, lendo-o em blocos.
+
+    Args:
+        source (Path): Caminho do arquivo.
+
+    Returns:
+        str: Hash do conteúdo do arquivo em hexadecimal.
+    """
+    hash_arquivo = hashlib.blake2b(digest_size=32)
+    with open(source, "rb") as arquivo:
+        while bloco := arquivo.read(TAMANHO_BLOCO_HASH):
+            hash_arquivo.update(bloco)
+
+    return hash_arquivo.hexdigest()
+
+
+def calcular_fingerprint(source: Path, anterior: dict | None = None) -> dict:
+    """
+    Calcula o fingerprint (tamanho, data de modificação e hash) de um arquivo.
+
+    Quando o tamanho e a data de modificação forem iguais aos do fingerprint anterior,
+    o arquivo é considerado inalterado e o hash não é recalculado.
+
+    Args:
+        source (Path): Caminho do arquivo.
+        anterior (dict | None): Fingerprint registrado na última ingestão.
+
+    Returns:
+        dict: Fingerprint do arquivo.
+    """
+    status: os.stat_result = source.stat()
+
+    if (
+        anterior is not None
+        and anterior["tamanho"] == status.st_size
+        and anterior["mtime_ns"] == status.st_mtime_ns
+    ):
+        return anterior
+
+    return {
+        "tamanho": status.st_size,
+        "mtime_ns": status.st_mtime_ns,
+        "hash": calcular_hash(source),
+    }
+
+
+def ler_registro(registro: Path) -> dict:
+    """
+    Lê o registro de fingerprints de um dataset.
+
+    Args:
+        registro (Path): Caminho do arquivo de registro.
+
+    Returns:
+        dict: Registro com os fingerprints dos arquivos de origem e o arquivo gerado
+            na última ingestão. Vazio caso o registro ainda não exista.
+    """
+    if not registro.exists():
+        return {}
+
+    with open(registro, "r", encoding="utf-8") as arquivo:
+        return json.load(arquivo)
+
+
+def verificar_fontes(
+    fontes: list[Path], registro: Path, destino: Path
+) -> tuple[bool, dict]:
+    """
+    Verifica se os arquivos de origem de um dataset foram alterados desde a última
+    ingestão.
+
+    Os arquivos são considerados alterados quando o conjunto de arquivos mudou, quando
+    o hash de algum deles mudou ou quando o arquivo gerado na última ingestão não
+    existe mais na pasta de destino.
+
+    Args:
+        fontes (list[Path]): Arquivos de origem do dataset.
+        registro (Path): Caminho do arquivo de registro.
+        destino (Path): Pasta onde os arquivos Parquet do dataset são salvos.
+
+    Returns:
+        tuple[bool, dict]: Indicação se os arquivos foram alterados e os fingerprints
+            atuais de cada arquivo, a serem salvos com `salvar_registro`.
+    """
+    registro_anterior: dict = ler_registro(registro)
+    fingerprints_anteriores: dict = registro_anterior.get("arquivos", {})
+
+    fingerprints: dict = {
+        fonte.name: calcular_fingerprint(
+            source=fonte, anterior=fingerprints_anteriores.get(fonte.name)
+        )
+        for fonte in fontes
+    }
+
+    arquivo_gerado: str | None = registro_anterior.get("arquivo_gerado")
+    alterado: bool = (
+        arquivo_gerado is None
+        or not (destino / arquivo_gerado).exists()
+        or {nome: fp["hash"] for nome, fp in fingerprints.items()}
+        != {nome: fp["hash"] for nome, fp in fingerprints_anteriores.items()}
+    )
+
+    return alterado, fingerprints
+
+
+def salvar_registro(
+    registro: Path, fingerprints: dict, arquivo_gerado: str | None = None
+) -> None:
+    """
+    Salva o registro de fingerprints de um dataset.
+
+    Args:
+        registro (Path): Caminho do arquivo de registro.
+        fingerprints (dict): Fingerprints dos arquivos de origem.
+        arquivo_gerado (str | None): Nome do arquivo Parquet gerado a partir dos
+            arquivos de origem. Quando não informado, mantém o arquivo da última
+            ingestão.
+    """
+    if arquivo_gerado is None:
+        arquivo_gerado = ler_registro(registro).get("arquivo_gerado")
+
+    registro.parent.mkdir(parents=True, exist_ok=True)
+
+    with open(registro, "w", encoding="utf-8") as arquivo:
+        json.dump(
+            {"arquivos": fingerprints, "arquivo_gerado": arquivo_gerado},
+            arquivo,
+            indent=4,
+        )
@@ -4,17 +4,345 @@ modular.
 """
 
 import polars as pl
+
+from datetime import date
 from pathlib import Path
+from src.ferramentas.catalogo import gravacao_atomica, registrar_versao
+from src.ferramentas.validacao_schema import validar_schema
+
+# Coluna adicionada na camada Raw com o nome do arquivo de origem de cada linha
+COLUNA_ARQUIVO_ORIGEM: str = "Arquivo_de_Origem"
+
+# Coluna adicionada na camada Trusted dos datasets históricos com a chave de cada linha
+# da camada Raw (ver `src/ferramentas/incremental.py`)
+COLUNA_CHAVE_LINHA: str = "Chave_Linha"
+
+# Colunas utilizadas para particionar (estilo Hive) os datasets históricos
+COLUNAS_PARTICAO: list = ["year", "month"]
+
+# Perfis de escrita dos arquivos Parquet, conforme o padrão de acesso aos dados:
+# - padrao: configuração padrão do Polars;
+# - arquivamento: compressão máxima, para dados lidos raramente e sempre por completo;
+# - consulta: grupos de linhas menores e estatísticas completas, permitindo que
+#   leituras filtradas ignorem os grupos de linhas que não atendem ao filtro.
+PERFIS_ESCRITA: dict = {
+    "padrao": {},
+    "arquivamento": {
+        "compression": "zstd",
+        "compression_level": 19,
+        "statistics": True,
+        "row_group_size": 1_000_000,
+    },
+    "consulta": {
+        "compression": "zstd",
+        "compression_level": 3,
+        "statistics": "full",
+        "row_group_size": 50_000,
+    },
+}
+
+# Perfil de escrita utilizado em cada camada do ETL
+PERFIL_POR_CAMADA: dict = {
+    "0-raw": "arquivamento",
+    "1-trusted": "consulta",
+    "2-gold": "padrao",
+}
 
 
-def salvar_parquet(df: pl.DataFrame, file_name: str, path: Path) -> None:
+def salvar_parquet(
+    df: pl.DataFrame,
+    file_name: str,
+    path: Path,
+    perfil: str = "padrao",
+    identidade: str | None = None,
+) -> None:
     """
     Salva um DataFrame em um arquivo Parquet.
 
+    O arquivo é gravado com um nome temporário e publicado como nova versão do
+    dataset apenas quando completo (ver `gravacao_atomica`).
+
     Args:
         df (pl.DataFrame): DataFrame a ser salvo.
         file_name (str): Nome do arquivo a ser salvo.
         path (str): Caminho onde o arquivo irá ser salvo.
+        perfil (str): Perfil de escrita (ver `PERFIS_ESCRITA`).
+        identidade (str | None): Identidade do conteúdo, registrada no catálogo (ver
+            `src/ferramentas/identidade.py`).
+    """
+    with gravacao_atomica(path=path, file_name=file_name) as temporario:
+        df.write_parquet(file=temporario, **PERFIS_ESCRITA[perfil])
+
+    registrar_versao(
+        path=path,
+        file_name=file_name,
+        linhas=df.height,
+        schema=df.schema,
+        identidade=identidade,
+    )
+
+
+def listar_fontes(path: Path, padrao: str) -> list[Path]:
+    """
+    Lista os arquivos de origem de um dataset que atendem ao padrão informado.
+
+    As concessionárias podem enviar um único arquivo ou uma exportação por filial e
+    por mês (ex.: historico-de-vendas-de-pecas-0-1-1-2024-01.csv), todas atendidas
+    pelo mesmo padrão.
+
+    Args:
+        path (Path): Pasta dos arquivos de origem.
+        padrao (str): Padrão (glob) dos nomes dos arquivos.
+
+    Returns:
+        list[Path]: Arquivos encontrados, ordenados pelo nome.
+    """
+    fontes: list[Path] = sorted(path.glob(padrao))
+    if not fontes:
+        raise FileNotFoundError(f"Nenhum arquivo {padrao} encontrado em {path}")
+
+    return fontes
+
+
+def ler_csv_streaming(source: Path | list[Path], **csv_options) -> pl.LazyFrame:
+    """
+    Prepara a leitura de um ou mais arquivos CSV brutos de forma preguiçosa (lazy).
+
+    Todas as colunas são lidas como texto, mantendo o dado o mais próximo do
+    original o possível. Cada linha recebe o nome do seu arquivo de origem (ver
+    `COLUNA_ARQUIVO_ORIGEM`). Com vários arquivos, cada um é lido por um plano
+    próprio, executados em paralelo, e as colunas são unidas pelo nome (arquivos sem
+    alguma coluna ficam com o valor nulo). Nenhum dado é carregado em memória até que
+    o LazyFrame seja consumido, por exemplo com `salvar_parquet_streaming`.
+
+    Args:
+        source (Path | list[Path]): Caminho do arquivo CSV, ou lista de arquivos.
+        **csv_options: Opções adicionais repassadas ao `pl.scan_csv` (ex.:
+            separator, truncate_ragged_lines).
+
+    Returns:
+        pl.LazyFrame: Plano de leitura dos arquivos CSV.
+    """
+    fontes: list[Path] = [source] if isinstance(source, Path) else source
+
+    return pl.concat(
+        [
+            pl.scan_csv(source=fonte, infer_schema=False, **csv_options).with_columns(
+                pl.lit(fonte.name).alias(COLUNA_ARQUIVO_ORIGEM)
+            )
+            for fonte in fontes
+        ],
+        how="diagonal",
+        parallel=True,
+    )
+
+
+def salvar_parquet_streaming(
+    lf: pl.LazyFrame,
+    file_name: str,
+    path: Path,
+    perfil: str = "padrao",
+    identidade: str | None = None,
+) -> None:
+    """
+    Salva um LazyFrame em um arquivo Parquet utilizando o motor de streaming.
+
+    Os dados são lidos, processados e escritos em lotes, de forma que o consumo de
+    memória fica limitado independente do tamanho do arquivo de origem.
+
+    Args:
+        lf (pl.LazyFrame): LazyFrame a ser salvo.
+        file_name (str): Nome do arquivo a ser salvo.
+        path (Path): Caminho onde o arquivo irá ser salvo.
+        perfil (str): Perfil de escrita (ver `PERFIS_ESCRITA`).
+        identidade (str | None): Identidade do conteúdo, registrada no catálogo (ver
+            `src/ferramentas/identidade.py`).
+    """
+    with gravacao_atomica(path=path, file_name=file_name) as temporario:
+        lf.sink_parquet(path=temporario, **PERFIS_ESCRITA[perfil])
+
+    # A quantidade de linhas é lida dos metadados do arquivo gravado
+    arquivo_salvo: pl.LazyFrame = pl.scan_parquet(source=path / file_name)
+    registrar_versao(
+        path=path,
+        file_name=file_name,
+        linhas=arquivo_salvo.select(pl.len()).collect().item(),
+        schema=arquivo_salvo.collect_schema(),
+        identidade=identidade,
+    )
+
+
+def salvar_parquet_particionado(
+    df: pl.DataFrame,
+    file_name: str,
+    path: Path,
+    coluna_data: str,
+    perfil: str = "padrao",
+    identidade: str | None = None,
+    codigo: str | None = None,
+) -> None:
+    """
+    Salva um DataFrame em Parquet particionado por ano e mês (estilo Hive).
+
+    É criada uma pasta com o nome do arquivo, contendo uma subpasta para cada
+    ano/mês da coluna de data (ex.: year=2024/month=1/). Assim, leituras filtradas por
+    data acessam apenas os arquivos das partições necessárias.
+
+    Args:
+        df (pl.DataFrame): DataFrame a ser salvo.
+        file_name (str): Nome da pasta do dataset particionado.
+        path (Path): Caminho onde o dataset irá ser salvo.
+        coluna_data (str): Coluna de data utilizada para definir as partições.
+        perfil (str): Perfil de escrita (ver `PERFIS_ESCRITA`).
+        identidade (str | None): Identidade do conteúdo, registrada no catálogo (ver
+            `src/ferramentas/identidade.py`).
+        codigo (str | None): Identidade do código do tratamento, registrada no
+            catálogo (ver `identidade_codigo`).
     """
-    path_with_file_name: Path = path / file_name
-    df.write_parquet(file=path_with_file_name)
+    # A pasta inteira é gravada com um nome temporário e renomeada ao final, de forma
+    # que a nova versão só fica visível com todas as partições gravadas
+    with gravacao_atomica(path=path, file_name=file_name) as temporario:
+        df.with_columns(
+            pl.col(coluna_data).dt.year().alias("year"),
+            pl.col(coluna_data).dt.month().alias("month"),
+        ).write_parquet(
+            file=temporario,
+            partition_by=COLUNAS_PARTICAO,
+            **PERFIS_ESCRITA[perfil],
+        )
+
+    registrar_versao(
+        path=path,
+        file_name=file_name,
+        linhas=df.height,
+        schema=df.schema,
+        identidade=identidade,
+        codigo=codigo,
+    )
+
+
+def incluir_arquivo_origem(
+    df: pl.DataFrame | pl.LazyFrame,
+) -> pl.DataFrame | pl.LazyFrame:
+    """
+    Inclui a coluna do arquivo de origem (`COLUNA_ARQUIVO_ORIGEM`), sem valor, nos
+    datasets brutos gravados antes de a camada Raw registrar o arquivo de cada linha.
+    Datasets que já possuem a coluna não são alterados.
+
+    Args:
+        df (pl.DataFrame | pl.LazyFrame): Dataset bruto.
+
+    Returns:
+        pl.DataFrame | pl.LazyFrame: Dataset com a coluna `COLUNA_ARQUIVO_ORIGEM`.
+    """
+    if COLUNA_ARQUIVO_ORIGEM in df.collect_schema().names():
+        return df
+
+    return df.with_columns(pl.lit(None, pl.String).alias(COLUNA_ARQUIVO_ORIGEM))
+
+
+def aplicar_schema(
+    df: pl.DataFrame | pl.LazyFrame, schema: dict
+) -> pl.DataFrame | pl.LazyFrame:
+    """
+    Seleciona as colunas de um dataset conforme o schema, na ordem e com os tipos
+    definidos.
+
+    As colunas são associadas pelo nome, e não pela posição, de forma que uma
+    diferença na ordem das colunas não troca os valores de uma coluna com outra.
+    Antes da seleção, o schema do dataset é validado sem executar o plano (ver
+    `src/ferramentas/validacao_schema.py`).
+
+    Args:
+        df (pl.DataFrame | pl.LazyFrame): Dataset tratado.
+        schema (dict): Schema final do dataset.
+
+    Returns:
+        pl.DataFrame | pl.LazyFrame: Dataset com apenas as colunas do schema.
+
+    Raises:
+        ErroSchema: Quando há colunas ausentes ou com tipo incompatível.
+    """
+    validar_schema(df=df, schema=schema)
+
+    return df.select([pl.col(coluna).cast(dtype) for coluna, dtype in schema.items()])
+
+
+def ler_parquet_particionado(
+    path: Path,
+    coluna_data: str | None = None,
+    data_inicio: date | None = None,
+    data_fim: date | None = None,
+) -> pl.LazyFrame:
+    """
+    Prepara a leitura de um dataset Parquet, particionado por ano e mês ou não.
+
+    Quando um período é informado, apenas as partições (ano/mês) que podem conter
+    registros do período são lidas, e os registros são filtrados pela coluna de data.
+    Arquivos Parquet não particionados também são aceitos, sendo apenas filtrados.
+
+    Args:
+        path (Path): Caminho do arquivo Parquet ou da pasta do dataset particionado.
+        coluna_data (str | None): Coluna de data utilizada no filtro do período.
+        data_inicio (date | None): Data inicial do período (inclusive).
+        data_fim (date | None): Data final do período (inclusive).
+
+    Returns:
+        pl.LazyFrame: Plano de leitura do dataset, sem as colunas de partição.
+    """
+    if path.is_file():
+        lf: pl.LazyFrame = pl.scan_parquet(source=path)
+    else:
+        mes_inicio: tuple = (
+            (data_inicio.year, data_inicio.month) if data_inicio else (0, 0)
+        )
+        mes_fim: tuple = (data_fim.year, data_fim.month) if data_fim else (9999, 12)
+
+        particoes: list = []
+        for particao in sorted(path.glob("year=*/month=*")):
+            ano: str = particao.parent.name.removeprefix("year=")
+            mes: str = particao.name.removeprefix("month=")
+
+            # Partição sem data (nula): lida apenas quando não há filtro de período
+            if not (ano.isdigit() and mes.isdigit()):
+                if data_inicio is None and data_fim is None:
+                    particoes.append(particao)
+                continue
+
+            if mes_inicio <= (int(ano), int(mes)) <= mes_fim:
+                particoes.append(particao)
+
+        arquivos: list = [arquivo for p in particoes for arquivo in p.glob("*.parquet")]
+
+        # Sem partições no período, apenas o schema do dataset é lido
+        lf = (
+            pl.scan_parquet(source=arquivos, hive_partitioning=True)
+            if arquivos
+            else pl.scan_parquet(source=path, hive_partitioning=True).head(0)
+        ).drop(COLUNAS_PARTICAO)
+
+    if coluna_data is not None and data_inicio is not None:
+        lf = lf.filter(pl.col(coluna_data) >= data_inicio)
+    if coluna_data is not None and data_fim is not None:
+        lf = lf.filter(pl.col(coluna_data) <= data_fim)
+
+    return lf
+
+
+def tamanho_em_disco(path: Path) -> int:
+    """
+    Retorna o tamanho em disco de um arquivo ou da soma dos arquivos de uma pasta
+    (ex.: dataset particionado).
+
+    Args:
+        path (Path): Caminho do arquivo ou da pasta.
+
+    Returns:
+        int: Tamanho em bytes.
+    """
+    if path.is_file():
+        return path.stat().st_size
+
+    return sum(
+        arquivo.stat().st_size for arquivo in path.rglob("*") if arquivo.is_file()
+    )
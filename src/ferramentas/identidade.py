@@ -0,0 +1,251 @@
+"""
+Script para calcular a identidade do conteúdo dos arquivos gerados pelas camadas Raw,
+Trusted e Gold.
+
+A identidade de uma versão é o hash de tudo o que determina o seu conteúdo:
+- os dados de entrada: na camada Raw, os fingerprints dos arquivos de origem (já
+  calculados na verificação das fontes, ver `src/ferramentas/fingerprints.py`); nas
+  demais camadas, a identidade das versões da camada anterior utilizadas, lida do
+  catálogo, sem ler os dados novamente;
+- o código do tratamento (script do dataset, regras de limpeza, schemas e ferramentas
+  do ETL);
+- o schema esperado (na camada Trusted), os parâmetros da execução que alteram o
+  resultado (ex.: processamento incremental) e a versão do Polars.
+
+A identidade é registrada no catálogo junto com a versão gravada. Quando a identidade
+calculada antes do tratamento é igual à da versão publicada, o resultado seria o
+mesmo arquivo, e o tratamento não é executado. Como novas versões só são gravadas
+quando o conteúdo muda, o número da versão (chave do cache das páginas) também só
+muda quando há dados novos ou o código do tratamento foi alterado.
+"""
+
+import hashlib
+import os
+import polars as pl
+
+from pathlib import Path
+from src.ferramentas.catalogo import (
+    calcular_hash_schema,
+    ler_ultima_versao,
+    listar_versoes,
+)
+from src.ferramentas.fingerprints import calcular_hash
+
+# Pastas com o código que participa do tratamento dos datasets. Qualquer
+# alteração nelas gera uma nova identidade (e, portanto, um novo tratamento)
+SRC_PATH: Path = Path(__file__).parent.parent
+PASTAS_CODIGO: list[Path] = [
+    SRC_PATH / "etl" / "regras",
+    SRC_PATH / "etl" / "schemas",
+    SRC_PATH / "ferramentas",
+]
+
+# Quantidade de caracteres da identidade incluída no nome dos arquivos
+TAMANHO_IDENTIDADE_ARQUIVO: int = 12
+
+# Campos do catálogo que identificam uma versão gravada sem identidade (ex.: versões
+# da camada Raw anteriores ao registro da identidade). Os arquivos das versões não
+# são sobrescritos, portanto o registro identifica o conteúdo
+CAMPOS_VERSAO: list = ["arquivo", "linhas", "schema_hash", "criado_em"]
+
+
+def listar_arquivos(path: Path, padrao: str = "*") -> list[Path]:
+    """
+    Lista os arquivos de um caminho, em ordem.
+
+    Args:
+        path (Path): Arquivo ou pasta (ex.: dataset particionado).
+        padrao (str): Padrão dos arquivos considerados nas pastas.
+
+    Returns:
+        list[Path]: Arquivos do caminho.
+    """
+    if path.is_file():
+        return [path]
+
+    return sorted(arquivo for arquivo in path.rglob(padrao) if arquivo.is_file())
+
+
+def hash_dos_arquivos(path: Path, padrao: str = "*") -> str:
+    """
+    Calcula o hash do conteúdo de um arquivo ou de todos os arquivos de uma pasta,
+    incluindo o caminho relativo de cada arquivo.
+
+    Args:
+        path (Path): Arquivo ou pasta.
+        padrao (str): Padrão dos arquivos considerados nas pastas.
+
+    Returns:
+        str: Hash em hexadecimal.
+    """
+    hash_caminho = hashlib.blake2b(digest_size=32)
+    for arquivo in listar_arquivos(path, padrao=padrao):
+        nome: str = arquivo.name if path.is_file() else str(arquivo.relative_to(path))
+        hash_caminho.update(f"{nome}:{calcular_hash(arquivo)}\n".encode("utf-8"))
+
+    return hash_caminho.hexdigest()
+
+
+def identidade_da_entrada(entrada: Path) -> str | dict | list:
+    """
+    Retorna o que identifica o conteúdo de uma versão da camada anterior, sem ler
+    os dados.
+
+    Args:
+        entrada (Path): Versão utilizada (arquivo ou pasta, dentro da pasta do
+            dataset).
+
+    Returns:
+        str | dict | list: Identidade registrada no catálogo; os campos do catálogo
+            (`CAMPOS_VERSAO`), para versões gravadas sem identidade; ou o nome, o
+            tamanho e a data de modificação de cada arquivo, para pastas sem
+            catálogo.
+    """
+    for registro in listar_versoes(entrada.parent):
+        if registro["arquivo"] == entrada.name:
+            return registro.get("identidade") or {
+                campo: registro.get(campo) for campo in CAMPOS_VERSAO
+            }
+
+    arquivos: list = []
+    for arquivo in listar_arquivos(entrada):
+        status: os.stat_result = arquivo.stat()
+        arquivos.append(
+            (
+                str(arquivo.relative_to(entrada.parent)),
+                status.st_size,
+                status.st_mtime_ns,
+            )
+        )
+
+    return arquivos
+
+
+def combinar_componentes(componentes: dict, script: Path) -> str:
+    """
+    Calcula a identidade a partir dos componentes informados, do código do
+    tratamento e da versão do Polars.
+
+    Args:
+        componentes (dict): Componentes específicos da camada (entradas, schema,
+            parâmetros da execução).
+        script (Path): Script de tratamento do dataset.
+
+    Returns:
+        str: Identidade em hexadecimal.
+    """
+    componentes = {
+        **componentes,
+        "script": calcular_hash(script),
+        "codigo": [hash_dos_arquivos(pasta, padrao="*.py") for pasta in PASTAS_CODIGO],
+        "polars": pl.__version__,
+    }
+
+    return hashlib.blake2b(
+        repr(sorted(componentes.items())).encode("utf-8"), digest_size=32
+    ).hexdigest()
+
+
+def calcular_identidade(
+    entradas: list[Path],
+    script: Path,
+    schema: dict | None = None,
+    parametros: dict | None = None,
+) -> str:
+    """
+    Calcula a identidade do arquivo gerado a partir das versões de entrada, do
+    código do tratamento, do schema esperado e dos parâmetros da execução.
+
+    Args:
+        entradas (list[Path]): Versões da camada anterior utilizadas (arquivos ou
+            pastas).
+        script (Path): Script de tratamento do dataset.
+        schema (dict | None): Schema esperado do dataset, quando definido.
+        parametros (dict | None): Parâmetros da execução que alteram o resultado
+            (ex.: processamento incremental).
+
+    Returns:
+        str: Identidade em hexadecimal.
+    """
+    return combinar_componentes(
+        {
+            "entradas": [identidade_da_entrada(entrada) for entrada in entradas],
+            "schema": calcular_hash_schema(schema) if schema is not None else None,
+            "parametros": sorted((parametros or {}).items()),
+        },
+        script=script,
+    )
+
+
+def identidade_codigo(script: Path) -> str:
+    """
+    Calcula a parte da identidade que depende apenas do código do tratamento
+    (script do dataset, regras de limpeza, schemas, ferramentas do ETL e versão do
+    Polars), sem os dados de entrada.
+
+    Registrada no catálogo junto com as versões da camada Trusted, indica se as
+    linhas já tratadas de uma versão podem ser reaproveitadas pelo processamento
+    incremental (ver `src/ferramentas/incremental.py`).
+
+    Args:
+        script (Path): Script de tratamento do dataset.
+
+    Returns:
+        str: Identidade do código em hexadecimal.
+    """
+    return combinar_componentes({}, script=script)
+
+
+def identidade_das_fontes(fingerprints: dict, script: Path) -> str:
+    """
+    Calcula a identidade de uma versão da camada Raw a partir dos fingerprints dos
+    arquivos de origem e do código da ingestão.
+
+    Args:
+        fingerprints (dict): Fingerprints dos arquivos de origem (ver
+            `verificar_fontes`).
+        script (Path): Script de ingestão do dataset.
+
+    Returns:
+        str: Identidade em hexadecimal.
+    """
+    return combinar_componentes(
+        {
+            "fontes": sorted(
+                (nome, fingerprint["hash"])
+                for nome, fingerprint in fingerprints.items()
+            )
+        },
+        script=script,
+    )
+
+
+def identidade_publicada(path: Path) -> str | None:
+    """
+    Retorna a identidade registrada na versão publicada mais recente de um dataset.
+
+    Args:
+        path (Path): Pasta do dataset.
+
+    Returns:
+        str | None: Identidade da versão, ou None quando o dataset não possui
+            catálogo ou a versão foi gravada sem identidade.
+    """
+    registro: dict | None = ler_ultima_versao(path)
+
+    return registro.get("identidade") if registro is not None else None
+
+
+def versao_identica(path: Path, identidade: str) -> bool:
+    """
+    Indica se a versão publicada de um dataset já possui a identidade informada,
+    ou seja, se o tratamento geraria o mesmo conteúdo.
+
+    Args:
+        path (Path): Pasta do dataset.
+        identidade (str): Identidade calculada para o novo tratamento.
+
+    Returns:
+        bool: True quando o tratamento pode ser ignorado.
+    """
+    return identidade_publicada(path) == identidade
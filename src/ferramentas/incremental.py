@@ -0,0 +1,259 @@
+"""
+Script para o processamento incremental da camada Trusted dos datasets históricos.
+
+Cada linha da camada Raw recebe uma chave (`COLUNA_CHAVE_LINHA`), calculada a partir
+dos valores da linha (inclusive o arquivo de origem) e da ordem da linha entre as
+linhas iguais. A chave é calculada apenas no processamento incremental e mantida na
+camada Trusted, de forma que, a cada execução, apenas as linhas da camada Raw cujas
+chaves ainda não existem na camada Trusted são tratadas, e o resultado é unido às
+linhas já tratadas. No tratamento completo, a coluna da chave fica sem valor.
+
+Algumas colunas dependem de outras linhas do dataset (ex.: duplicidade, Total_OS de
+cada OS). Por isso, além das linhas novas, são tratadas novamente todas as linhas que
+pertencem aos mesmos grupos (`grupos`, ex.: mesmas colunas da regra de duplicidade,
+mesma OS) das linhas novas, até que nenhum grupo afetado fique incompleto.
+
+O dataset é tratado por completo quando:
+- ainda não existe versão na camada Trusted;
+- a versão atual foi gravada com outro código de tratamento (script, regras de
+  limpeza, schemas, ferramentas ou versão do Polars), conforme a identidade do código
+  registrada no catálogo (ver `identidade_codigo`), já que as linhas já tratadas
+  poderiam ter outro resultado;
+- a versão atual foi gravada pelo tratamento completo (sem as chaves das linhas);
+- o schema da versão atual é diferente do schema esperado (ex.: nova coluna);
+- linhas deixaram de existir na camada Raw (ex.: arquivo de origem substituído).
+"""
+
+import os
+import polars as pl
+
+from pathlib import Path
+from typing import Callable
+from src.ferramentas.catalogo import ler_ultima_versao, ultima_versao
+from src.ferramentas.duplicidade import hash_linha
+from src.ferramentas.funcoes_suporte import (
+    COLUNA_ARQUIVO_ORIGEM,
+    COLUNA_CHAVE_LINHA,
+    ler_parquet_particionado,
+)
+from src.ferramentas.validacao_schema import comparar_schema
+
+# Ativa o processamento incremental nos scripts da camada Trusted
+PROCESSAMENTO_INCREMENTAL: bool = os.environ.get("PROCESSAMENTO_INCREMENTAL") == "1"
+
+
+def incluir_chave_linha(
+    df: pl.DataFrame | pl.LazyFrame,
+) -> pl.DataFrame | pl.LazyFrame:
+    """
+    Inclui a chave de cada linha do dataset bruto.
+
+    Linhas iguais (inclusive no arquivo de origem) são diferenciadas pela ordem em
+    que aparecem. Caso o dataset já possua a chave (calculada sobre a camada Raw
+    completa, no processamento incremental), ela é mantida.
+
+    Args:
+        df (pl.DataFrame | pl.LazyFrame): Dataset bruto.
+
+    Returns:
+        pl.DataFrame | pl.LazyFrame: Dataset com a coluna `COLUNA_CHAVE_LINHA`.
+    """
+    colunas: list = df.collect_schema().names()
+    if COLUNA_CHAVE_LINHA in colunas:
+        return df
+
+    hash_valores: pl.Expr = hash_linha(colunas, semente=0)
+
+    return df.with_columns(
+        pl.struct(
+            hash_valores.alias("valores"),
+            pl.int_range(pl.len()).over(hash_valores).alias("ordem"),
+        )
+        .hash(seed=0)
+        .alias(COLUNA_CHAVE_LINHA)
+    )
+
+
+def completar_chave_linha(
+    df: pl.DataFrame | pl.LazyFrame,
+) -> pl.DataFrame | pl.LazyFrame:
+    """
+    Inclui a coluna da chave de cada linha, sem valor, quando o dataset ainda não a
+    possui.
+
+    Utilizada pelos scripts da camada Trusted: no processamento incremental, a chave
+    já foi calculada (`incluir_chave_linha`) antes do tratamento; no tratamento
+    completo, a chave não é utilizada e o cálculo (hash de todas as colunas de cada
+    linha) é evitado.
+
+    Args:
+        df (pl.DataFrame | pl.LazyFrame): Dataset bruto.
+
+    Returns:
+        pl.DataFrame | pl.LazyFrame: Dataset com a coluna `COLUNA_CHAVE_LINHA`.
+    """
+    if COLUNA_CHAVE_LINHA in df.collect_schema().names():
+        return df
+
+    return df.with_columns(pl.lit(None, pl.UInt64).alias(COLUNA_CHAVE_LINHA))
+
+
+def hashes_dos_grupos(colunas_raw: list, grupos: list) -> list[pl.Expr]:
+    """
+    Monta as expressões do hash de cada grupo de linhas avaliadas em conjunto.
+
+    Args:
+        colunas_raw (list): Colunas do dataset bruto.
+        grupos (list): Listas de colunas de cada grupo. `None` representa todas as
+            colunas do dataset bruto, exceto o arquivo de origem e a chave. Colunas
+            que não existem no dataset bruto (ex.: criadas no tratamento) são
+            desconsideradas, o que apenas amplia os grupos.
+
+    Returns:
+        list[pl.Expr]: Expressão do hash de cada grupo (`_grupo_0`, `_grupo_1`, ...).
+    """
+    todas: list = [
+        c for c in colunas_raw if c not in [COLUNA_ARQUIVO_ORIGEM, COLUNA_CHAVE_LINHA]
+    ]
+
+    hashes: list = []
+    for i, colunas in enumerate(grupos):
+        colunas = todas if colunas is None else [c for c in colunas if c in colunas_raw]
+
+        # Sem colunas no dataset bruto, todas as linhas formam um único grupo
+        hashes.append(
+            (hash_linha(colunas, semente=0) if colunas else pl.lit(0, pl.UInt64)).alias(
+                f"_grupo_{i}"
+            )
+        )
+
+    return hashes
+
+
+def fechar_grupos(indice: pl.DataFrame, chaves: pl.Series) -> pl.Series:
+    """
+    Amplia as chaves informadas com as chaves de todas as linhas que pertencem aos
+    mesmos grupos, até que nenhum grupo fique incompleto.
+
+    Args:
+        indice (pl.DataFrame): Chave e hashes dos grupos de cada linha da camada Raw.
+        chaves (pl.Series): Chaves das linhas novas.
+
+    Returns:
+        pl.Series: Chaves das linhas a serem tratadas.
+    """
+    colunas_grupo: list = [c for c in indice.columns if c != COLUNA_CHAVE_LINHA]
+    afetadas: pl.DataFrame = indice.filter(pl.col(COLUNA_CHAVE_LINHA).is_in(chaves))
+
+    while True:
+        ampliadas: pl.DataFrame = indice.filter(
+            pl.any_horizontal(
+                [pl.col(c).is_in(afetadas[c].unique()) for c in colunas_grupo]
+            )
+        )
+        if ampliadas.height == afetadas.height:
+            return ampliadas[COLUNA_CHAVE_LINHA]
+
+        afetadas = ampliadas
+
+
+def processar_incremental(
+    lf_raw: pl.LazyFrame,
+    trusted_path: Path,
+    tratar_dataset: Callable,
+    schema: dict,
+    grupos: list,
+    codigo: str,
+) -> pl.DataFrame | None:
+    """
+    Trata apenas as linhas novas da camada Raw (e as linhas dos grupos afetados por
+    elas) e as une às linhas já tratadas da versão atual da camada Trusted.
+
+    Args:
+        lf_raw (pl.LazyFrame): Versão mais recente do dataset bruto.
+        trusted_path (Path): Pasta do dataset na camada Trusted.
+        tratar_dataset (Callable): Função de tratamento do script do dataset.
+        schema (dict): Schema do dataset na camada Trusted.
+        grupos (list): Listas de colunas dos grupos de linhas avaliadas em conjunto
+            (ver `hashes_dos_grupos`).
+        codigo (str): Identidade do código do tratamento atual (ver
+            `identidade_codigo`), comparada com a registrada na versão atual.
+
+    Returns:
+        pl.DataFrame | None: Dataset tratado completo, ou None quando não há linhas
+            novas na camada Raw.
+    """
+    lf_raw = incluir_chave_linha(lf_raw)
+    chave_trusted: str = COLUNA_CHAVE_LINHA.lower()
+
+    registro: dict | None = ler_ultima_versao(trusted_path)
+    if registro is None:
+        print(
+            f"[incremental] {trusted_path.name}: sem versão Trusted, "
+            "tratamento completo"
+        )
+        return tratar_dataset(lf_raw).collect(engine="streaming")
+
+    # Versões gravadas sem a identidade do código também são tratadas por completo
+    if registro.get("codigo") != codigo:
+        print(
+            f"[incremental] {trusted_path.name}: código do tratamento alterado desde "
+            "a versão Trusted, tratamento completo"
+        )
+        return tratar_dataset(lf_raw).collect(engine="streaming")
+
+    lf_trusted: pl.LazyFrame = ler_parquet_particionado(
+        path=ultima_versao(trusted_path)
+    )
+    diferencas: pl.DataFrame = comparar_schema(lf_trusted.collect_schema(), schema)
+    if not diferencas.is_empty():
+        print(
+            f"[incremental] {trusted_path.name}: schema alterado "
+            f"({diferencas['coluna'].to_list()}), tratamento completo"
+        )
+        return tratar_dataset(lf_raw).collect(engine="streaming")
+
+    indice: pl.DataFrame = lf_raw.select(
+        [pl.col(COLUNA_CHAVE_LINHA)]
+        + hashes_dos_grupos(lf_raw.collect_schema().names(), grupos)
+    ).collect()
+    chaves_trusted: pl.Series = lf_trusted.select(chave_trusted).collect().to_series()
+
+    # Versões gravadas pelo tratamento completo não possuem as chaves das linhas
+    if chaves_trusted.null_count():
+        print(
+            f"[incremental] {trusted_path.name}: versão Trusted sem chaves de linha "
+            "(tratamento completo anterior), tratamento completo"
+        )
+        return tratar_dataset(lf_raw).collect(engine="streaming")
+
+    removidas: int = (~chaves_trusted.is_in(indice[COLUNA_CHAVE_LINHA])).sum()
+    if removidas:
+        print(
+            f"[incremental] {trusted_path.name}: {removidas} linhas removidas da "
+            "camada Raw, tratamento completo"
+        )
+        return tratar_dataset(lf_raw).collect(engine="streaming")
+
+    novas: pl.Series = indice.filter(~pl.col(COLUNA_CHAVE_LINHA).is_in(chaves_trusted))[
+        COLUNA_CHAVE_LINHA
+    ]
+    if novas.is_empty():
+        return None
+
+    afetadas: pl.Series = fechar_grupos(indice=indice, chaves=novas)
+    print(
+        f"[incremental] {trusted_path.name}: {novas.len()} linhas novas, "
+        f"{afetadas.len()} linhas tratadas (de {indice.height})"
+    )
+
+    df_afetadas: pl.DataFrame = tratar_dataset(
+        lf_raw.filter(pl.col(COLUNA_CHAVE_LINHA).is_in(afetadas))
+    ).collect()
+
+    return pl.concat(
+        [
+            lf_trusted.filter(~pl.col(chave_trusted).is_in(afetadas)).collect(),
+            df_afetadas,
+        ]
+    )
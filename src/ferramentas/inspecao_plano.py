@@ -0,0 +1,328 @@
+"""
+Script para inspecionar o plano de consulta do tratamento da camada Trusted.
+
+Com a variável de ambiente `INSPECAO_PLANO`, os scripts da camada Trusted não tratam
+o dataset: apenas montam o plano (`tratar_dataset`) e gravam, em
+`src/etl/data/planos/<script>.txt`, o plano não otimizado, o plano otimizado (o que
+o Polars de fato executa) e um relatório com:
+- funções Python (UDFs, ex.: `map_elements`), executadas linha a linha ou lote a lote
+  fora do motor do Polars e que impedem otimizações ao redor delas;
+- structs com muitas colunas (ex.: hash da linha completa), que obrigam a leitura de
+  todas as colunas envolvidas;
+- colunas convertidas (cast) mais de uma vez ao longo do plano;
+- pontos de materialização (joins, agrupamentos, ordenações, janelas, caches e
+  DataFrames já carregados em memória), que precisam de todas as linhas antes de
+  continuar;
+- colunas do dataset bruto não utilizadas pelo plano (que podem deixar de ser lidas
+  ou gravadas na camada Raw) e colunas utilizadas apenas em structs.
+
+A análise é feita sobre o texto dos planos (`LazyFrame.explain`), sem ler os dados.
+"""
+
+import os
+import re
+import polars as pl
+
+from pathlib import Path
+
+# Ativa o modo de inspeção do plano nos scripts da camada Trusted
+INSPECAO_PLANO: bool = os.environ.get("INSPECAO_PLANO") == "1"
+
+# Pasta dos relatórios dos planos
+PLANOS_PATH: Path = Path(__file__).parent.parent / "etl" / "data" / "planos"
+
+# Structs com ao menos esta quantidade de colunas são consideradas "largas"
+MINIMO_COLUNAS_STRUCT: int = 10
+
+# Operações que precisam de todas as linhas (ou de todas as linhas de um grupo) antes
+# de continuar, conforme aparecem no texto do plano
+PONTOS_MATERIALIZACAO: dict = {
+    "join": r"^\s*\w+ JOIN:",
+    "agrupamento": r"^\s*AGGREGATE\[",
+    "ordenação": r"^\s*SORT BY",
+    "unique": r"^\s*UNIQUE\[",
+    "cache": r"^\s*CACHE\[",
+    "DataFrame em memória": r"^\s*DF \[",
+    "janela (over)": r"\.over\(",
+}
+
+# Referência a uma coluna no texto do plano (ex.: col("Cod_Filial"))
+PADRAO_COLUNA: str = r'col\("([^"]+)"\)'
+
+# Conversões de tipo encadeadas a uma coluna (ex.: col("a").strict_cast(Int64))
+PADRAO_CAST: str = PADRAO_COLUNA + r"((?:\.(?:strict_)?cast\((?:[^()]|\([^()]*\))*\))+)"
+
+
+# region ----- Análise do Plano -----
+def colunas_referenciadas(texto: str) -> set:
+    """
+    Retorna as colunas referenciadas em um trecho do plano, sem as colunas
+    auxiliares criadas pelo otimizador (eliminação de subexpressões comuns).
+
+    Args:
+        texto (str): Texto do plano.
+
+    Returns:
+        set: Nomes das colunas.
+    """
+    return {
+        coluna
+        for coluna in re.findall(PADRAO_COLUNA, texto)
+        if not coluna.startswith("__POLARS")
+    }
+
+
+def trecho_entre_colchetes(texto: str, inicio: int) -> str:
+    """
+    Retorna o trecho do texto entre o colchete de abertura na posição informada e o
+    colchete de fechamento correspondente.
+
+    Args:
+        texto (str): Texto do plano.
+        inicio (int): Posição do colchete de abertura.
+
+    Returns:
+        str: Trecho entre os colchetes (inclusive).
+    """
+    nivel: int = 0
+    for posicao in range(inicio, len(texto)):
+        if texto[posicao] == "[":
+            nivel += 1
+        elif texto[posicao] == "]":
+            nivel -= 1
+            if nivel == 0:
+                return texto[inicio : posicao + 1]
+
+    return texto[inicio:]
+
+
+def encontrar_structs(texto: str) -> list[set]:
+    """
+    Encontra as structs montadas no plano e as colunas de cada uma.
+
+    Args:
+        texto (str): Texto do plano.
+
+    Returns:
+        list[set]: Colunas de cada struct.
+    """
+    structs: list = []
+    for encontrado in re.finditer(PADRAO_COLUNA + r"\.as_struct\(", texto):
+        campos: str = trecho_entre_colchetes(texto, encontrado.end())
+        # A primeira coluna da struct aparece antes de `.as_struct`
+        structs.append({encontrado.group(1)} | colunas_referenciadas(campos))
+
+    return structs
+
+
+def remover_structs(texto: str) -> str:
+    """
+    Remove do texto do plano as structs e as suas colunas.
+
+    Args:
+        texto (str): Texto do plano.
+
+    Returns:
+        str: Texto do plano sem as structs.
+    """
+    while encontrado := re.search(PADRAO_COLUNA + r"\.as_struct\(", texto):
+        campos: str = trecho_entre_colchetes(texto, encontrado.end())
+        texto = texto[: encontrado.start()] + texto[encontrado.end() + len(campos) :]
+
+    return texto
+
+
+def encontrar_udfs(texto: str) -> list:
+    """
+    Encontra as funções Python (UDFs) do plano e a coluna à qual cada uma é aplicada.
+
+    Args:
+        texto (str): Texto do plano.
+
+    Returns:
+        list: Colunas com funções Python, na ordem do plano.
+    """
+    udfs: list = []
+    for encontrado in re.finditer(r"\.python_udf\(", texto):
+        colunas: list = re.findall(PADRAO_COLUNA, texto[: encontrado.start()])
+        udfs.append(colunas[-1] if colunas else "(sem coluna)")
+
+    return udfs
+
+
+def encontrar_casts_repetidos(texto: str) -> dict:
+    """
+    Encontra as colunas convertidas mais de uma vez no plano. Os nomes são comparados
+    em minúsculas, já que os scripts renomeiam as colunas para minúsculas.
+
+    Args:
+        texto (str): Texto do plano.
+
+    Returns:
+        dict: Tipos para os quais cada coluna é convertida, na ordem do plano
+            (do último nó do plano, a seleção final, para a leitura).
+    """
+    casts: dict = {}
+    for coluna, cadeia in re.findall(PADRAO_CAST, texto):
+        tipos: list = re.findall(r"cast\(((?:[^()]|\([^()]*\))*)\)", cadeia)
+        casts.setdefault(coluna.lower(), []).extend(tipos)
+
+    return {coluna: tipos for coluna, tipos in casts.items() if len(tipos) > 1}
+
+
+def contar_materializacoes(texto: str) -> dict:
+    """
+    Conta os pontos de materialização do plano, por tipo.
+
+    Args:
+        texto (str): Texto do plano.
+
+    Returns:
+        dict: Quantidade de cada tipo de ponto de materialização encontrado.
+    """
+    contagem: dict = {
+        tipo: len(re.findall(padrao, texto, flags=re.MULTILINE))
+        for tipo, padrao in PONTOS_MATERIALIZACAO.items()
+    }
+
+    return {tipo: quantidade for tipo, quantidade in contagem.items() if quantidade}
+
+
+def inspecionar_plano(lf_raw: pl.LazyFrame, lf: pl.LazyFrame) -> dict:
+    """
+    Monta o relatório do plano de consulta do tratamento de um dataset.
+
+    Args:
+        lf_raw (pl.LazyFrame): Leitura do dataset bruto (camada Raw).
+        lf (pl.LazyFrame): Plano do dataset tratado.
+
+    Returns:
+        dict: Planos não otimizado e otimizado e os problemas encontrados no plano
+            otimizado.
+    """
+    plano_otimizado: str = lf.explain()
+    colunas_raw: list = lf_raw.collect_schema().names()
+
+    # Colunas do dataset bruto utilizadas pelo plano, dentro e fora de structs
+    utilizadas: set = colunas_referenciadas(plano_otimizado)
+    fora_de_structs: set = colunas_referenciadas(remover_structs(plano_otimizado))
+
+    return {
+        "plano_nao_otimizado": lf.explain(optimized=False),
+        "plano_otimizado": plano_otimizado,
+        "udfs": encontrar_udfs(plano_otimizado),
+        "structs_largas": [
+            sorted(struct)
+            for struct in encontrar_structs(plano_otimizado)
+            if len(struct) >= MINIMO_COLUNAS_STRUCT
+        ],
+        "casts_repetidos": encontrar_casts_repetidos(plano_otimizado),
+        "materializacoes": contar_materializacoes(plano_otimizado),
+        "colunas_nao_utilizadas": [
+            coluna for coluna in colunas_raw if coluna not in utilizadas
+        ],
+        "colunas_apenas_em_structs": [
+            coluna
+            for coluna in colunas_raw
+            if coluna in utilizadas and coluna not in fora_de_structs
+        ],
+    }
+
+
+# endregion
+
+
+# region ----- Relatório -----
+def formatar_relatorio(relatorio: dict, nome: str) -> str:
+    """
+    Formata o relatório do plano como texto.
+
+    Args:
+        relatorio (dict): Resultado de `inspecionar_plano`.
+        nome (str): Nome do script ou dataset inspecionado.
+
+    Returns:
+        str: Relatório seguido dos planos otimizado e não otimizado.
+    """
+    linhas: list = [f"===== Inspeção do plano: {nome} =====", ""]
+
+    linhas.append(f"Funções Python (UDFs): {len(relatorio['udfs'])}")
+    linhas += [f"  - {coluna}" for coluna in relatorio["udfs"]]
+
+    linhas.append(
+        f"Structs com {MINIMO_COLUNAS_STRUCT} ou mais colunas: "
+        f"{len(relatorio['structs_largas'])}"
+    )
+    linhas += [
+        f"  - {len(struct)} colunas: {', '.join(struct)}"
+        for struct in relatorio["structs_largas"]
+    ]
+
+    linhas.append(
+        f"Colunas convertidas mais de uma vez: {len(relatorio['casts_repetidos'])}"
+    )
+    linhas += [
+        f"  - {coluna}: {' <- '.join(tipos)}"
+        for coluna, tipos in relatorio["casts_repetidos"].items()
+    ]
+
+    linhas.append("Pontos de materialização:")
+    linhas += [
+        f"  - {tipo}: {quantidade}"
+        for tipo, quantidade in relatorio["materializacoes"].items()
+    ] or ["  - nenhum"]
+
+    linhas.append(
+        "Colunas do dataset bruto não utilizadas (podem deixar de ser lidas): "
+        f"{len(relatorio['colunas_nao_utilizadas'])}"
+    )
+    linhas += [f"  - {coluna!r}" for coluna in relatorio["colunas_nao_utilizadas"]]
+
+    linhas.append(
+        "Colunas do dataset bruto utilizadas apenas em structs: "
+        f"{len(relatorio['colunas_apenas_em_structs'])}"
+    )
+    linhas += [f"  - {coluna!r}" for coluna in relatorio["colunas_apenas_em_structs"]]
+
+    linhas += [
+        "",
+        "===== Plano otimizado =====",
+        relatorio["plano_otimizado"],
+        "",
+        "===== Plano não otimizado =====",
+        relatorio["plano_nao_otimizado"],
+    ]
+
+    return "\n".join(linhas) + "\n"
+
+
+def salvar_relatorio_plano(
+    lf_raw: pl.LazyFrame, lf: pl.LazyFrame, nome: str, path: Path = PLANOS_PATH
+) -> Path:
+    """
+    Inspeciona o plano do tratamento de um dataset, exibe o relatório e o grava com
+    os planos.
+
+    Args:
+        lf_raw (pl.LazyFrame): Leitura do dataset bruto (camada Raw).
+        lf (pl.LazyFrame): Plano do dataset tratado.
+        nome (str): Nome do script inspecionado (nome do arquivo do relatório).
+        path (Path): Pasta dos relatórios.
+
+    Returns:
+        Path: Caminho do relatório gravado.
+    """
+    texto: str = formatar_relatorio(inspecionar_plano(lf_raw=lf_raw, lf=lf), nome)
+
+    path.mkdir(parents=True, exist_ok=True)
+    arquivo: Path = path / f"{nome}.txt"
+    arquivo.write_text(texto, encoding="utf-8")
+
+    # Apenas o relatório é exibido; os planos completos ficam no arquivo
+    print(texto.split("\n===== Plano otimizado =====")[0])
+    print(f"Planos gravados em {arquivo}")
+
+    return arquivo
+
+
+# endregion
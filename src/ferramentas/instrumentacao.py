@@ -0,0 +1,283 @@
+"""
+Script para medir o tempo e a memória de cada etapa dos scripts do ETL.
+
+Cada script cria uma `Instrumentacao` e envolve as suas etapas (as mesmas regiões do
+código) com `etapa`, como gerenciador de contexto, ou com `medir`, como decorador de
+funções. Para cada etapa são registrados o tempo de execução, as linhas de entrada e
+de saída (quando informadas), a memória residente (RSS) no início e no fim da etapa e
+o pico de memória do processo até o fim da etapa.
+
+A instrumentação é ativada pela variável de ambiente `INSTRUMENTACAO_ETL`. Desativada,
+`etapa` retorna um objeto sem efeito, de forma que o custo nos scripts é apenas o da
+chamada. Ativada, cada etapa é gravada assim que termina, como uma linha de JSON, no
+registro do script em `src/etl/data/instrumentacao` (`<script>.jsonl`), acumulando o
+histórico das execuções. O registro pode ser lido como DataFrame com
+`ler_instrumentacao`.
+
+A contagem de linhas não executa planos preguiçosos (LazyFrame): são contadas apenas
+linhas de DataFrames e de arquivos Parquet (a partir dos metadados do arquivo).
+"""
+
+import json
+import os
+import resource
+import sys
+import time
+import polars as pl
+
+from contextlib import contextmanager
+from datetime import datetime
+from functools import wraps
+from pathlib import Path
+from typing import Callable, Iterator
+
+# Ativa a instrumentação das etapas nos scripts do ETL
+INSTRUMENTACAO: bool = os.environ.get("INSTRUMENTACAO_ETL") == "1"
+
+# Pasta dos registros das execuções
+INSTRUMENTACAO_PATH: Path = (
+    Path(__file__).parent.parent / "etl" / "data" / "instrumentacao"
+)
+
+# Tamanho da página de memória, para converter a memória residente (/proc) em bytes
+TAMANHO_PAGINA: int = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+
+# region ----- Memória -----
+def memoria_atual_mb() -> float | None:
+    """
+    Retorna a memória residente (RSS) atual do processo.
+
+    Returns:
+        float | None: Memória em MB, ou None quando o sistema não informa a memória
+            atual (disponível apenas no Linux, em /proc).
+    """
+    try:
+        with open("/proc/self/statm", "r") as statm:
+            paginas: int = int(statm.read().split()[1])
+    except OSError:
+        return None
+
+    return paginas * TAMANHO_PAGINA / 1024**2
+
+
+def pico_memoria_mb() -> float:
+    """
+    Retorna o pico de memória residente (RSS máximo) do processo.
+
+    Returns:
+        float: Pico de memória em MB.
+    """
+    # ru_maxrss é informado em KB no Linux e em bytes no macOS
+    pico: int = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    return pico / 1024**2 if sys.platform == "darwin" else pico / 1024
+
+
+def contar_linhas(dados: pl.DataFrame | Path | int | None) -> int | None:
+    """
+    Conta as linhas de um DataFrame ou arquivo Parquet, sem executar planos
+    preguiçosos.
+
+    Args:
+        dados (pl.DataFrame | Path | int | None): DataFrame, arquivo ou pasta
+            Parquet, ou a quantidade de linhas já conhecida.
+
+    Returns:
+        int | None: Quantidade de linhas, ou None quando não pode ser obtida sem
+            ler os dados (ex.: LazyFrame).
+    """
+    if isinstance(dados, pl.DataFrame):
+        return dados.height
+    if isinstance(dados, int):
+        return dados
+    if isinstance(dados, Path) and dados.exists():
+        source: str = str(dados / "**" / "*.parquet") if dados.is_dir() else str(dados)
+        # A contagem utiliza apenas os metadados dos arquivos Parquet
+        return pl.scan_parquet(source=source).select(pl.len()).collect().item()
+
+    return None
+
+
+# endregion
+
+
+# region ----- Etapas -----
+class Medicao:
+    """
+    Medição de uma etapa em andamento, com as linhas de entrada e de saída
+    informadas pelo script.
+    """
+
+    def __init__(self) -> None:
+        self.linhas_entrada: pl.DataFrame | Path | int | None = None
+        self.linhas_saida: pl.DataFrame | Path | int | None = None
+
+    def linhas(
+        self,
+        entrada: pl.DataFrame | Path | int | None = None,
+        saida: pl.DataFrame | Path | int | None = None,
+    ) -> None:
+        """
+        Informa os dados de entrada e de saída da etapa, contados no fim da etapa.
+
+        Args:
+            entrada (pl.DataFrame | Path | int | None): Dados de entrada.
+            saida (pl.DataFrame | Path | int | None): Dados de saída.
+        """
+        if entrada is not None:
+            self.linhas_entrada = entrada
+        if saida is not None:
+            self.linhas_saida = saida
+
+
+class MedicaoDesativada(Medicao):
+    """
+    Medição sem efeito, utilizada quando a instrumentação está desativada.
+    """
+
+    def __enter__(self) -> "MedicaoDesativada":
+        return self
+
+    def __exit__(self, *excecao) -> None:
+        return None
+
+    def linhas(self, entrada=None, saida=None) -> None:
+        return None
+
+
+MEDICAO_DESATIVADA: MedicaoDesativada = MedicaoDesativada()
+
+
+class Instrumentacao:
+    """
+    Instrumentação das etapas de um script do ETL.
+
+    Args:
+        script (Path): Caminho do script instrumentado.
+        ativa (bool): Indica se as etapas são medidas (padrão: variável de ambiente
+            `INSTRUMENTACAO_ETL`).
+        path (Path): Pasta dos registros das execuções.
+    """
+
+    def __init__(
+        self,
+        script: Path,
+        ativa: bool = INSTRUMENTACAO,
+        path: Path = INSTRUMENTACAO_PATH,
+    ) -> None:
+        self.script: str = Path(script).stem
+        self.ativa: bool = ativa
+        self.registro: Path = path / f"{self.script}.jsonl"
+        # Identifica as etapas da mesma execução do script
+        self.execucao: str = datetime.now().isoformat(timespec="seconds")
+
+    def etapa(self, nome: str):
+        """
+        Mede uma etapa do script, como gerenciador de contexto.
+
+        Exemplo:
+            with instrumentacao.etapa("Salvar Arquivo Trusted") as medicao:
+                ...
+                medicao.linhas(entrada=df_raw, saida=df_trusted)
+
+        Args:
+            nome (str): Nome da etapa (ex.: nome da região do código).
+
+        Returns:
+            Gerenciador de contexto que fornece a `Medicao` da etapa.
+        """
+        if not self.ativa:
+            return MEDICAO_DESATIVADA
+
+        return self._medir_etapa(nome)
+
+    def medir(self, nome: str) -> Callable:
+        """
+        Mede cada chamada de uma função, como decorador. O primeiro argumento e o
+        retorno da função são considerados as linhas de entrada e de saída.
+
+        Args:
+            nome (str): Nome da etapa.
+
+        Returns:
+            Callable: Decorador da função.
+        """
+
+        def decorador(funcao: Callable) -> Callable:
+            if not self.ativa:
+                return funcao
+
+            @wraps(funcao)
+            def funcao_medida(*args, **kwargs):
+                with self._medir_etapa(nome) as medicao:
+                    resultado = funcao(*args, **kwargs)
+                    medicao.linhas(entrada=args[0] if args else None, saida=resultado)
+
+                return resultado
+
+            return funcao_medida
+
+        return decorador
+
+    @contextmanager
+    def _medir_etapa(self, nome: str) -> Iterator[Medicao]:
+        medicao: Medicao = Medicao()
+        memoria_inicio: float | None = memoria_atual_mb()
+        inicio: float = time.perf_counter()
+
+        yield medicao
+
+        segundos: float = time.perf_counter() - inicio
+        memoria_fim: float | None = memoria_atual_mb()
+
+        self._gravar(
+            {
+                "execucao": self.execucao,
+                "script": self.script,
+                "etapa": nome,
+                "segundos": round(segundos, 4),
+                "linhas_entrada": contar_linhas(medicao.linhas_entrada),
+                "linhas_saida": contar_linhas(medicao.linhas_saida),
+                "memoria_inicio_mb": memoria_inicio,
+                "memoria_fim_mb": memoria_fim,
+                "variacao_memoria_mb": (
+                    memoria_fim - memoria_inicio
+                    if memoria_inicio is not None and memoria_fim is not None
+                    else None
+                ),
+                "pico_memoria_mb": pico_memoria_mb(),
+            }
+        )
+
+    def _gravar(self, etapa: dict) -> None:
+        # Cada etapa é gravada assim que termina, mantendo as etapas já medidas caso o
+        # script seja interrompido
+        self.registro.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.registro, "a", encoding="utf-8") as registro:
+            registro.write(json.dumps(etapa, ensure_ascii=False) + "\n")
+
+
+# endregion
+
+
+# region ----- Leitura -----
+def ler_instrumentacao(path: Path = INSTRUMENTACAO_PATH) -> pl.DataFrame:
+    """
+    Lê os registros das execuções instrumentadas.
+
+    Args:
+        path (Path): Registro de um script (`<script>.jsonl`) ou pasta com os
+            registros de todos os scripts.
+
+    Returns:
+        pl.DataFrame: Uma linha por etapa medida.
+    """
+    registros: list = [path] if path.is_file() else sorted(path.glob("*.jsonl"))
+
+    return pl.concat(
+        [pl.read_ndjson(registro) for registro in registros], how="diagonal_relaxed"
+    )
+
+
+# endregion
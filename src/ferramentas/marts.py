@@ -0,0 +1,134 @@
+"""
+Script para manter as funções comuns aos marts da camada Gold.
+
+Os marts são tabelas pequenas, com os valores da camada Trusted já agregados nas
+dimensões utilizadas pelos gráficos do Streamlit (filial, marca, categoria e mês).
+São gravados uma vez a cada execução do pipeline, de forma que as páginas apenas
+somam as linhas do mart, sem agrupar as tabelas completas a cada interação.
+
+Para que os valores possam ser somados em qualquer combinação das dimensões, os
+marts guardam somas e contagens (ex.: a média é gravada como soma e quantidade).
+"""
+
+import runpy
+import polars as pl
+
+from datetime import date
+from pathlib import Path
+from src.ferramentas.catalogo import ultima_versao
+from src.ferramentas.duplicidade import hash_linha
+from src.ferramentas.funcoes_suporte import (
+    COLUNA_ARQUIVO_ORIGEM,
+    COLUNA_CHAVE_LINHA,
+    ler_parquet_particionado,
+)
+
+# Colunas de controle do ETL, desconsideradas na comparação das linhas
+COLUNAS_CONTROLE: list = [COLUNA_ARQUIVO_ORIGEM.lower(), COLUNA_CHAVE_LINHA.lower()]
+
+# Scripts da camada Gold, cada um com a função `montar_mart` do seu mart
+GOLD_SCRIPTS_PATH: Path = Path(__file__).parent.parent / "etl" / "scripts" / "2-gold"
+
+# Coluna do mês (primeiro dia do mês) dos marts dos datasets históricos
+COLUNA_MES: str = "mes"
+
+# Coluna auxiliar que indica a primeira ocorrência de cada linha distinta
+COLUNA_PRIMEIRA_OCORRENCIA: str = "_primeira_ocorrencia"
+
+# Grupo de linhas duplicadas (todas as colunas da camada Raw) dos datasets históricos
+# de vendas, calculado na camada Trusted
+COLUNA_GRUPO_DUPLICIDADE: str = "grupo_linha_duplicada"
+
+
+def incluir_mes(lf: pl.LazyFrame, coluna_data: str) -> pl.LazyFrame:
+    """
+    Inclui o mês (primeiro dia do mês) da coluna de data informada.
+
+    Args:
+        lf (pl.LazyFrame): Dataset da camada Trusted.
+        coluna_data (str): Coluna de data do dataset.
+
+    Returns:
+        pl.LazyFrame: Dataset com a coluna `COLUNA_MES`.
+    """
+    return lf.with_columns(pl.col(coluna_data).dt.truncate("1mo").alias(COLUNA_MES))
+
+
+def marcar_primeira_ocorrencia(lf: pl.LazyFrame) -> pl.LazyFrame:
+    """
+    Indica a primeira ocorrência de cada linha distinta do dataset, desconsiderando
+    as colunas de controle (`COLUNAS_CONTROLE`).
+
+    Permite calcular, no mesmo agrupamento, valores sobre as linhas distintas (como
+    em `df.unique()`) e sobre todas as linhas. Nos datasets com o grupo de linhas
+    duplicadas da camada Trusted (`COLUNA_GRUPO_DUPLICIDADE`), o grupo já calculado
+    é utilizado; nos demais, as linhas são comparadas pelo hash de 64 bits de cada
+    linha (ver `src/ferramentas/duplicidade.py`).
+
+    Args:
+        lf (pl.LazyFrame): Dataset da camada Trusted.
+
+    Returns:
+        pl.LazyFrame: Dataset com a coluna `COLUNA_PRIMEIRA_OCORRENCIA`.
+    """
+    colunas: list = [
+        c for c in lf.collect_schema().names() if c not in COLUNAS_CONTROLE
+    ]
+
+    if COLUNA_GRUPO_DUPLICIDADE in colunas:
+        # Linhas sem duplicidade ficam sem grupo
+        grupo: pl.Expr = pl.col(COLUNA_GRUPO_DUPLICIDADE)
+        primeira_ocorrencia: pl.Expr = grupo.is_null() | grupo.is_first_distinct()
+    else:
+        primeira_ocorrencia = hash_linha(colunas).is_first_distinct()
+
+    return lf.with_columns(primeira_ocorrencia.alias(COLUNA_PRIMEIRA_OCORRENCIA))
+
+
+def filtrar_meses(
+    df: pl.DataFrame, data_inicio: date | None = None, data_fim: date | None = None
+) -> pl.DataFrame:
+    """
+    Filtra as linhas de um mart dos meses do período informado (meses completos).
+
+    Args:
+        df (pl.DataFrame): Mart com a coluna `COLUNA_MES`.
+        data_inicio (date | None): Data inicial do período.
+        data_fim (date | None): Data final do período.
+
+    Returns:
+        pl.DataFrame: Linhas dos meses do período, ou o mart completo quando o período
+            não é informado.
+    """
+    if data_inicio is None or data_fim is None:
+        return df
+
+    return df.filter(
+        pl.col(COLUNA_MES).is_between(data_inicio.replace(day=1), data_fim)
+    )
+
+
+def montar_mart_trusted(script: str, trusted_path: Path) -> pl.DataFrame:
+    """
+    Monta um mart a partir da versão mais recente do dataset na camada Trusted, com a
+    mesma função (`montar_mart`) do script da camada Gold.
+
+    Utilizado pelas páginas do Streamlit quando o mart ainda não foi publicado (ex.:
+    pipeline da camada Gold não executado), para que os gráficos agreguem a tabela
+    da camada Trusted em vez de interromper a página.
+
+    Args:
+        script (str): Nome do script da camada Gold, sem o sufixo "-gold.py" (ex.:
+            "estoque-pecas").
+        trusted_path (Path): Pasta do dataset na camada Trusted.
+
+    Returns:
+        pl.DataFrame: Mart montado a partir da camada Trusted.
+    """
+    montar_mart = runpy.run_path(
+        path_name=str(GOLD_SCRIPTS_PATH / f"{script}-gold.py"), run_name="pagina"
+    )["montar_mart"]
+
+    return montar_mart(
+        ler_parquet_particionado(path=ultima_versao(trusted_path))
+    ).collect()
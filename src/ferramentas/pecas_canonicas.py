@@ -0,0 +1,540 @@
+"""
+Script para agrupar as descrições de peças quase idênticas em peças canônicas.
+
+As descrições de peças (`descricao_da_peca`) não seguem um padrão: a mesma peça
+aparece com variações de pontuação, espaços, abreviações e plural (ex.: "PASTILHA CJ,
+FREIO DIANT", "PASTILHA  FREIO DIANT", "PASTILHAS CJ, FREIO DIANT"). O catálogo de
+peças canônicas associa cada descrição a um identificador (`id_peca_canonica`) e a
+uma descrição canônica, de forma que as análises de peças possam agrupar as
+variações da mesma peça.
+
+O agrupamento é feito em etapas:
+1. as descrições são normalizadas (maiúsculas, sem acentos e sem pontuação), e as
+   descrições iguais após a normalização são unidas;
+2. cada descrição normalizada é dividida em n-gramas de caracteres, e a semelhança
+   entre duas descrições é a proporção de n-gramas em comum (Jaccard);
+3. para não comparar todas as descrições entre si (O(n²)), apenas pares que
+   compartilham algum dos n-gramas mais raros de cada descrição são comparados
+   (filtro de prefixo). Com `LIMIAR_SIMILARIDADE`, todo par com semelhança acima do
+   limiar compartilha ao menos um desses n-gramas, de forma que nenhum par é perdido;
+4. descrições com números diferentes (ex.: medidas, "M6X15" e "M6X16") ou com lado
+   ou tamanho diferentes (ex.: "LD" e "LE", "G" e "GG") nunca são unidas;
+5. os pares acima do limiar formam grupos (componentes conectados), e a descrição
+   mais frequente de cada grupo é a descrição canônica.
+
+O catálogo gravado funciona como cache: nas execuções seguintes, apenas os prefixos
+das descrições novas são unidos aos prefixos de todas as descrições, e somente esses
+pares (descrição nova com as já catalogadas e com as outras novas) são comparados. Os
+grupos do catálogo anterior são unidos aos pares novos, e os grupos finais são os
+mesmos de um catálogo montado do zero; quando uma descrição nova une grupos já
+catalogados, o grupo resultante mantém um único identificador. O catálogo é refeito
+por completo quando `VERSAO_CANONIZACAO` é alterada (ex.: mudança do limiar).
+"""
+
+import hashlib
+import polars as pl
+
+# Tamanho dos n-gramas de caracteres comparados
+TAMANHO_NGRAMA: int = 3
+
+# Semelhança mínima (proporção de n-gramas em comum) entre descrições da mesma peça
+LIMIAR_SIMILARIDADE: float = 0.8
+
+# Versão das regras de agrupamento. Catálogos gravados com outra versão são
+# descartados, e todas as descrições são agrupadas novamente
+VERSAO_CANONIZACAO: int = 2
+
+# Quantidade de caracteres do identificador das peças canônicas
+TAMANHO_ID_PECA: int = 6
+
+COLUNA_DESCRICAO: str = "descricao_da_peca"
+
+CATALOGO_PECAS_SCHEMA: dict = {
+    "descricao_da_peca": pl.String,
+    "descricao_normalizada": pl.String,
+    "id_peca_canonica": pl.String,
+    "descricao_canonica": pl.String,
+    "quantidade_registros": pl.Int64,
+    "versao_canonizacao": pl.Int64,
+}
+
+# Palavras que diferenciam variantes da mesma peça (lado e tamanho), tratadas como os
+# números: descrições com palavras diferentes não são unidas
+PALAVRAS_VARIANTE: list = ["LD", "LE", "PP", "P", "M", "G", "GG", "XG", "XGG"]
+
+# Letras acentuadas e as letras sem acento correspondentes
+ACENTOS: dict = {
+    "ÁÀÂÃÄ": "A",
+    "ÉÈÊË": "E",
+    "ÍÌÎÏ": "I",
+    "ÓÒÔÕÖ": "O",
+    "ÚÙÛÜ": "U",
+    "Ç": "C",
+}
+
+
+# region ----- Normalização -----
+def normalizar_descricao(coluna: str = COLUNA_DESCRICAO) -> pl.Expr:
+    """
+    Normaliza a descrição da peça: maiúsculas, sem acentos, sem pontuação e com um
+    único espaço entre as palavras.
+
+    Args:
+        coluna (str): Coluna da descrição.
+
+    Returns:
+        pl.Expr: Descrição normalizada.
+    """
+    letras: list = [letra for acentuadas in ACENTOS for letra in acentuadas]
+    sem_acento: list = [
+        ACENTOS[acentuadas] for acentuadas in ACENTOS for _ in acentuadas
+    ]
+
+    return (
+        pl.col(coluna)
+        .str.to_uppercase()
+        .str.replace_many(letras, sem_acento)
+        .str.replace_all(r"[^A-Z0-9/]+", " ")
+        .str.strip_chars()
+        .alias("descricao_normalizada")
+    )
+
+
+def assinatura_variante(coluna: str = "descricao_normalizada") -> pl.Expr:
+    """
+    Monta a assinatura da variante da peça a partir da descrição normalizada: as
+    palavras com números e as de `PALAVRAS_VARIANTE`, ordenadas. Descrições com
+    assinaturas diferentes não são unidas.
+
+    Args:
+        coluna (str): Coluna da descrição normalizada.
+
+    Returns:
+        pl.Expr: Assinatura da variante (vazia quando a descrição não possui números
+            nem palavras de variante).
+    """
+    return (
+        pl.col(coluna)
+        .str.split(" ")
+        .list.eval(
+            pl.element().filter(
+                pl.element().str.contains(r"\d") | pl.element().is_in(PALAVRAS_VARIANTE)
+            )
+        )
+        .list.unique()
+        .list.sort()
+        .list.join(" ")
+        .alias("assinatura")
+    )
+
+
+def gerar_ngramas(df: pl.DataFrame) -> pl.DataFrame:
+    """
+    Divide cada descrição normalizada em n-gramas de caracteres distintos. A descrição
+    recebe um espaço no início e no fim, para que o começo e o fim das palavras
+    também sejam comparados.
+
+    Args:
+        df (pl.DataFrame): Descrições normalizadas (`descricao_normalizada`).
+
+    Returns:
+        pl.DataFrame: Um n-grama por linha, com a assinatura da variante da descrição.
+    """
+    return (
+        df.select("descricao_normalizada", "assinatura")
+        .with_columns(
+            pl.format(" {} ", pl.col("descricao_normalizada")).alias("_texto")
+        )
+        .with_columns(
+            pl.int_ranges(
+                0, pl.col("_texto").str.len_chars() - TAMANHO_NGRAMA + 1
+            ).alias("_posicao")
+        )
+        .explode("_posicao")
+        .select(
+            "descricao_normalizada",
+            "assinatura",
+            pl.col("_texto")
+            .str.slice(pl.col("_posicao"), TAMANHO_NGRAMA)
+            .alias("ngrama"),
+        )
+        .unique()
+    )
+
+
+# endregion
+
+
+# region ----- Comparação -----
+def pares_candidatos(ngramas: pl.DataFrame, novas: list | None = None) -> pl.DataFrame:
+    """
+    Seleciona os pares de descrições a comparar (blocagem por n-gramas).
+
+    Os n-gramas são ordenados do mais raro para o mais frequente, e cada descrição é
+    representada apenas pelos seus primeiros n-gramas (prefixo). Dois conjuntos com
+    semelhança acima de `LIMIAR_SIMILARIDADE` compartilham ao menos um n-grama dos
+    seus prefixos, de forma que apenas os pares com prefixos em comum (e a mesma
+    assinatura da variante) precisam ser comparados.
+
+    Com `novas`, apenas os prefixos das descrições novas são unidos aos prefixos de
+    todas as descrições: os pares entre descrições já catalogadas não são gerados. A
+    ordem dos n-gramas continua sendo calculada com todas as descrições, de forma
+    que os pares com alguma descrição nova são os mesmos da blocagem completa.
+
+    Args:
+        ngramas (pl.DataFrame): Resultado de `gerar_ngramas`.
+        novas (list | None): Descrições normalizadas novas (todas as descrições
+            quando não informadas).
+
+    Returns:
+        pl.DataFrame: Pares de descrições (`descricao_a` < `descricao_b`).
+    """
+    prefixos: pl.DataFrame = (
+        ngramas.with_columns(
+            pl.len().over("ngrama").alias("_frequencia"),
+            pl.len().over("descricao_normalizada").alias("_quantidade_ngramas"),
+        )
+        # Ordem global dos n-gramas: do mais raro para o mais frequente
+        .sort("_frequencia", "ngrama")
+        .with_columns(
+            (pl.int_range(pl.len()).over("descricao_normalizada") + 1).alias("_ordem")
+        )
+        # Tamanho do prefixo: quantidade de n-gramas menos o mínimo em comum exigido
+        # pelo limiar, mais um (a tolerância evita erros de arredondamento)
+        .filter(
+            pl.col("_ordem")
+            <= pl.col("_quantidade_ngramas")
+            - (LIMIAR_SIMILARIDADE * pl.col("_quantidade_ngramas") - 1e-9).ceil()
+            + 1
+        )
+        .select("descricao_normalizada", "assinatura", "ngrama")
+    )
+
+    if novas is None:
+        return (
+            prefixos.join(prefixos, on=["ngrama", "assinatura"], suffix="_b")
+            .filter(pl.col("descricao_normalizada") < pl.col("descricao_normalizada_b"))
+            .select(
+                pl.col("descricao_normalizada").alias("descricao_a"),
+                pl.col("descricao_normalizada_b").alias("descricao_b"),
+            )
+            .unique()
+        )
+
+    # Pares de uma descrição nova com qualquer outra descrição (nova ou catalogada).
+    # Os pares entre duas descrições novas aparecem nos dois sentidos e são unidos
+    # pela ordenação das descrições do par
+    return (
+        prefixos.filter(pl.col("descricao_normalizada").is_in(novas))
+        .join(prefixos, on=["ngrama", "assinatura"], suffix="_b")
+        .filter(pl.col("descricao_normalizada") != pl.col("descricao_normalizada_b"))
+        .select(
+            pl.min_horizontal("descricao_normalizada", "descricao_normalizada_b").alias(
+                "descricao_a"
+            ),
+            pl.max_horizontal("descricao_normalizada", "descricao_normalizada_b").alias(
+                "descricao_b"
+            ),
+        )
+        .unique()
+    )
+
+
+def comparar_pares(pares: pl.DataFrame, ngramas: pl.DataFrame) -> pl.DataFrame:
+    """
+    Calcula a semelhança (Jaccard dos n-gramas) dos pares candidatos e mantém os
+    pares acima de `LIMIAR_SIMILARIDADE`.
+
+    Args:
+        pares (pl.DataFrame): Resultado de `pares_candidatos`.
+        ngramas (pl.DataFrame): Resultado de `gerar_ngramas`.
+
+    Returns:
+        pl.DataFrame: Pares semelhantes, com a semelhança de cada par.
+    """
+    quantidade: pl.DataFrame = ngramas.group_by("descricao_normalizada").agg(
+        pl.len().alias("_quantidade")
+    )
+    ngramas = ngramas.select("descricao_normalizada", "ngrama")
+
+    return (
+        pares.join(ngramas, left_on="descricao_a", right_on="descricao_normalizada")
+        .join(
+            ngramas,
+            left_on=["descricao_b", "ngrama"],
+            right_on=["descricao_normalizada", "ngrama"],
+        )
+        .group_by("descricao_a", "descricao_b")
+        .agg(pl.len().alias("_em_comum"))
+        .join(quantidade, left_on="descricao_a", right_on="descricao_normalizada")
+        .join(
+            quantidade,
+            left_on="descricao_b",
+            right_on="descricao_normalizada",
+            suffix="_b",
+        )
+        .with_columns(
+            (
+                pl.col("_em_comum")
+                / (
+                    pl.col("_quantidade")
+                    + pl.col("_quantidade_b")
+                    - pl.col("_em_comum")
+                )
+            ).alias("similaridade")
+        )
+        .filter(pl.col("similaridade") >= LIMIAR_SIMILARIDADE)
+        .select("descricao_a", "descricao_b", "similaridade")
+    )
+
+
+def agrupar_componentes(descricoes: list, pares: list) -> dict:
+    """
+    Agrupa as descrições ligadas por pares semelhantes (componentes conectados).
+
+    Args:
+        descricoes (list): Descrições normalizadas.
+        pares (list): Pares de descrições semelhantes.
+
+    Returns:
+        dict: Grupo (uma das descrições do grupo) de cada descrição.
+    """
+    grupo: dict = {descricao: descricao for descricao in descricoes}
+
+    def raiz(descricao: str) -> str:
+        while grupo[descricao] != descricao:
+            grupo[descricao] = grupo[grupo[descricao]]
+            descricao = grupo[descricao]
+        return descricao
+
+    for descricao_a, descricao_b in pares:
+        raiz_a, raiz_b = raiz(descricao_a), raiz(descricao_b)
+        if raiz_a != raiz_b:
+            grupo[max(raiz_a, raiz_b)] = min(raiz_a, raiz_b)
+
+    return {descricao: raiz(descricao) for descricao in descricoes}
+
+
+def identificador_peca(descricao_normalizada: str) -> str:
+    """
+    Gera o identificador de uma peça canônica a partir da sua descrição normalizada.
+
+    Args:
+        descricao_normalizada (str): Descrição canônica normalizada.
+
+    Returns:
+        str: Identificador em hexadecimal.
+    """
+    return hashlib.blake2b(
+        descricao_normalizada.encode("utf-8"), digest_size=TAMANHO_ID_PECA
+    ).hexdigest()
+
+
+# endregion
+
+
+# region ----- Catálogo -----
+def aplicar_catalogo_pecas(
+    lf: pl.LazyFrame | pl.DataFrame,
+    catalogo: pl.LazyFrame | pl.DataFrame,
+    coluna: str = COLUNA_DESCRICAO,
+) -> pl.LazyFrame | pl.DataFrame:
+    """
+    Inclui o identificador e a descrição da peça canônica em um dataset, por meio de
+    um join com o catálogo de peças canônicas, mantendo a ordem das linhas.
+
+    Args:
+        lf (pl.LazyFrame | pl.DataFrame): Dataset com a descrição da peça.
+        catalogo (pl.LazyFrame | pl.DataFrame): Catálogo de peças canônicas, do
+            mesmo tipo do dataset.
+        coluna (str): Coluna da descrição da peça no dataset.
+
+    Returns:
+        pl.LazyFrame | pl.DataFrame: Dataset com as colunas `id_peca_canonica` e
+            `descricao_canonica` (nulas nas descrições fora do catálogo).
+    """
+    return lf.join(
+        catalogo.select(COLUNA_DESCRICAO, "id_peca_canonica", "descricao_canonica"),
+        left_on=coluna,
+        right_on=COLUNA_DESCRICAO,
+        how="left",
+        maintain_order="left",
+    )
+
+
+def canonizar_descricoes(
+    descricoes: pl.DataFrame, catalogo_anterior: pl.DataFrame | None = None
+) -> pl.DataFrame:
+    """
+    Monta o catálogo de peças canônicas, reaproveitando o catálogo anterior.
+
+    Apenas os pares com alguma descrição nova são gerados e comparados (ver
+    `pares_candidatos`): os grupos do catálogo anterior já representam as ligações
+    entre as descrições catalogadas. Os grupos finais são os componentes conectados
+    de todas as descrições (catalogadas e novas), considerando os grupos anteriores
+    e os pares novos, de forma que o agrupamento não depende da ordem em que as
+    descrições apareceram: uma descrição nova semelhante a descrições de grupos
+    diferentes une esses grupos, como em um catálogo montado do zero com todas as
+    descrições.
+
+    O identificador de cada grupo é mantido entre as execuções:
+    - um grupo com um único identificador anterior mantém esse identificador e a
+      sua descrição canônica;
+    - grupos anteriores unidos por uma descrição nova passam a ter o identificador
+      (e a descrição canônica) do grupo anterior com mais registros, e os demais
+      identificadores deixam de existir;
+    - um grupo apenas com descrições novas recebe um identificador gerado a partir
+      da sua descrição canônica (a mais frequente).
+
+    Args:
+        descricoes (pl.DataFrame): Descrições distintas (`descricao_da_peca`) e a
+            quantidade de registros de cada uma (`quantidade_registros`).
+        catalogo_anterior (pl.DataFrame | None): Catálogo gravado na execução
+            anterior, quando existir.
+
+    Returns:
+        pl.DataFrame: Catálogo com uma linha por descrição, conforme
+            `CATALOGO_PECAS_SCHEMA`.
+    """
+    descricoes = descricoes.filter(pl.col(COLUNA_DESCRICAO).is_not_null())
+
+    if (
+        catalogo_anterior is None
+        or catalogo_anterior.filter(
+            pl.col("versao_canonizacao") != VERSAO_CANONIZACAO
+        ).height
+    ):
+        catalogo_anterior = pl.DataFrame(schema=CATALOGO_PECAS_SCHEMA)
+
+    # Todas as descrições: as do catálogo anterior (inclusive as ausentes nos dados
+    # atuais, com quantidade de registros igual a zero) e as novas
+    novas: pl.DataFrame = descricoes.join(
+        catalogo_anterior.select(COLUNA_DESCRICAO), on=COLUNA_DESCRICAO, how="anti"
+    ).select(COLUNA_DESCRICAO, normalizar_descricao())
+    todas: pl.DataFrame = (
+        pl.concat(
+            [
+                catalogo_anterior.select(
+                    COLUNA_DESCRICAO,
+                    "descricao_normalizada",
+                    pl.col("id_peca_canonica").alias("_id_anterior"),
+                ),
+                novas.with_columns(pl.lit(None, pl.String).alias("_id_anterior")),
+            ]
+        )
+        .join(descricoes, on=COLUNA_DESCRICAO, how="left")
+        .with_columns(pl.col("quantidade_registros").fill_null(0))
+    )
+
+    # Descrições normalizadas, com a quantidade de registros, a descrição original
+    # mais frequente e o identificador anterior de cada uma
+    normalizadas: pl.DataFrame = (
+        todas.sort("quantidade_registros", COLUNA_DESCRICAO, descending=[True, False])
+        .group_by("descricao_normalizada", maintain_order=True)
+        .agg(
+            pl.col(COLUNA_DESCRICAO).first().alias("_descricao_frequente"),
+            pl.col("quantidade_registros").sum(),
+            pl.col("_id_anterior").drop_nulls().first(),
+        )
+    )
+
+    # Pares semelhantes com ao menos uma descrição normalizada nova: os n-gramas de
+    # todas as descrições definem a ordem dos prefixos, mas apenas os prefixos das
+    # descrições novas geram pares candidatos
+    chaves_novas: list = normalizadas.filter(pl.col("_id_anterior").is_null())[
+        "descricao_normalizada"
+    ].to_list()
+    ngramas: pl.DataFrame = gerar_ngramas(
+        normalizadas.select("descricao_normalizada").with_columns(assinatura_variante())
+    )
+    pares: list = [
+        (descricao_a, descricao_b)
+        for descricao_a, descricao_b, _ in comparar_pares(
+            pares_candidatos(ngramas, novas=chaves_novas), ngramas
+        ).iter_rows()
+    ]
+
+    # Ligações dos grupos anteriores: cada descrição catalogada é ligada à primeira
+    # descrição do seu grupo
+    ligacoes: pl.DataFrame = (
+        normalizadas.filter(pl.col("_id_anterior").is_not_null())
+        .sort("descricao_normalizada")
+        .select(
+            "descricao_normalizada",
+            pl.col("descricao_normalizada").first().over("_id_anterior").alias("_b"),
+        )
+    )
+
+    grupos: dict = agrupar_componentes(
+        descricoes=normalizadas["descricao_normalizada"].to_list(),
+        pares=pares + list(ligacoes.iter_rows()),
+    )
+    normalizadas = normalizadas.with_columns(
+        pl.col("descricao_normalizada")
+        .replace_strict(grupos, return_dtype=pl.String)
+        .alias("_grupo")
+    )
+
+    # Identificador anterior que permanece em cada grupo: o do grupo anterior com
+    # mais registros (em caso de empate, o menor identificador)
+    ids_anteriores: pl.DataFrame = (
+        normalizadas.filter(pl.col("_id_anterior").is_not_null())
+        .group_by("_grupo", "_id_anterior")
+        .agg(pl.col("quantidade_registros").sum())
+        .sort("quantidade_registros", "_id_anterior", descending=[True, False])
+        .group_by("_grupo", maintain_order=True)
+        .agg(pl.col("_id_anterior").first().alias("_id_grupo"))
+        .join(
+            catalogo_anterior.group_by("id_peca_canonica").agg(
+                pl.col("descricao_canonica").first().alias("_descricao_grupo")
+            ),
+            left_on="_id_grupo",
+            right_on="id_peca_canonica",
+        )
+    )
+
+    # Descrição canônica de cada grupo: a mais frequente (em caso de empate, a
+    # menor e, depois, a primeira em ordem alfabética)
+    canonicas: pl.DataFrame = (
+        normalizadas.sort(
+            pl.col("quantidade_registros"),
+            pl.col("descricao_normalizada").str.len_chars(),
+            pl.col("descricao_normalizada"),
+            descending=[True, False, False],
+        )
+        .group_by("_grupo", maintain_order=True)
+        .agg(
+            pl.col("descricao_normalizada").first().alias("_canonica_normalizada"),
+            pl.col("_descricao_frequente").first().alias("_descricao_canonica"),
+        )
+    )
+    canonicas = canonicas.with_columns(
+        pl.Series(
+            "_id_novo",
+            [identificador_peca(d) for d in canonicas["_canonica_normalizada"]],
+            dtype=pl.String,
+        )
+    ).join(ids_anteriores, on="_grupo", how="left")
+
+    grupos_finais: pl.DataFrame = normalizadas.join(canonicas, on="_grupo").select(
+        "descricao_normalizada",
+        pl.coalesce("_id_grupo", "_id_novo").alias("id_peca_canonica"),
+        pl.coalesce("_descricao_grupo", "_descricao_canonica").alias(
+            "descricao_canonica"
+        ),
+    )
+
+    return (
+        todas.join(grupos_finais, on="descricao_normalizada")
+        .with_columns(pl.lit(VERSAO_CANONIZACAO).alias("versao_canonizacao"))
+        .select(
+            [
+                pl.col(coluna).cast(tipo)
+                for coluna, tipo in CATALOGO_PECAS_SCHEMA.items()
+            ]
+        )
+        .sort("id_peca_canonica", COLUNA_DESCRICAO)
+    )
+
+
+# endregion
@@ -0,0 +1,169 @@
+"""
+Script para manter as métricas de qualidade dos dados geradas na camada Trusted.
+
+A cada execução do tratamento de um dataset, a quantidade de registros de cada valor
+dos indicadores de qualidade (ex.: `status_duplicidade`, `confiabilidade_do_registro`)
+é contada por filial e mês e gravada em uma tabela pequena, na pasta
+`<dataset>-qualidade` da camada Trusted. Cada execução grava apenas um arquivo com as
+suas métricas (o espaço em disco cresce com a quantidade de execuções, sem regravar o
+histórico), e as páginas e alertas leem todos os arquivos da pasta de uma vez (ver
+`ler_metricas_qualidade`), acompanhando a evolução da qualidade sem percorrer o
+dataset completo.
+"""
+
+import polars as pl
+
+from pathlib import Path
+from datetime import datetime
+from src.ferramentas.catalogo import versao_atual
+from src.ferramentas.funcoes_suporte import PERFIL_POR_CAMADA, salvar_parquet
+from src.ferramentas.marts import COLUNA_MES, incluir_mes
+
+# Sufixo da pasta das métricas de cada dataset (ex.: historico-venda-pecas-qualidade)
+SUFIXO_PASTA_QUALIDADE: str = "-qualidade"
+
+# Arquivos de métricas da pasta, sem os arquivos em gravação (".tmp-") e os arquivos
+# do catálogo ("_")
+PADRAO_ARQUIVOS_METRICAS: str = "[!._]*.parquet"
+
+# Dimensões das métricas, além do indicador e do seu valor
+COLUNAS_DIMENSAO: list = ["cod_filial_ajustado", COLUNA_MES]
+
+SCHEMA_METRICAS: pl.Schema = pl.Schema(
+    {
+        "execucao": pl.Datetime("us"),
+        "versao_trusted": pl.Int64,
+        "cod_filial_ajustado": pl.String,
+        COLUNA_MES: pl.Date,
+        "indicador": pl.String,
+        "valor": pl.String,
+        "quantidade_registros": pl.Int64,
+    }
+)
+
+
+def pasta_qualidade(trusted_path: Path) -> Path:
+    """
+    Retorna a pasta das métricas de qualidade de um dataset da camada Trusted.
+
+    Args:
+        trusted_path (Path): Pasta do dataset na camada Trusted.
+
+    Returns:
+        Path: Pasta `<dataset>-qualidade`, ao lado da pasta do dataset.
+    """
+    return trusted_path.parent / f"{trusted_path.name}{SUFIXO_PASTA_QUALIDADE}"
+
+
+def ler_metricas_qualidade(path: Path) -> pl.LazyFrame:
+    """
+    Prepara a leitura das métricas de todas as execuções gravadas na pasta de
+    métricas de um dataset.
+
+    Args:
+        path (Path): Pasta das métricas (ver `pasta_qualidade`).
+
+    Returns:
+        pl.LazyFrame: Métricas de todas as execuções, conforme `SCHEMA_METRICAS`.
+    """
+    return pl.scan_parquet(source=path / PADRAO_ARQUIVOS_METRICAS).select(
+        SCHEMA_METRICAS.names()
+    )
+
+
+def montar_metricas_qualidade(
+    df: pl.DataFrame | pl.LazyFrame,
+    indicadores: list,
+    coluna_data: str,
+    execucao: datetime,
+    versao_trusted: int,
+) -> pl.DataFrame:
+    """
+    Conta os registros de cada valor dos indicadores de qualidade por filial e mês.
+
+    Os indicadores são empilhados (uma linha por registro e indicador) antes do
+    agrupamento, de forma que todos são contados em uma única passagem pelo dataset.
+
+    Args:
+        df (pl.DataFrame | pl.LazyFrame): Dataset da camada Trusted.
+        indicadores (list): Colunas com os indicadores de qualidade.
+        coluna_data (str): Coluna de data utilizada no mês das métricas.
+        execucao (datetime): Data e hora da execução do tratamento.
+        versao_trusted (int): Versão da camada Trusted gravada na execução.
+
+    Returns:
+        pl.DataFrame: Métricas da execução, conforme `SCHEMA_METRICAS`.
+    """
+    return (
+        incluir_mes(
+            df.lazy().select(
+                pl.col("cod_filial_ajustado").cast(pl.String),
+                coluna_data,
+                pl.col(indicadores).cast(pl.String),
+            ),
+            coluna_data=coluna_data,
+        )
+        .unpivot(
+            on=indicadores,
+            index=COLUNAS_DIMENSAO,
+            variable_name="indicador",
+            value_name="valor",
+        )
+        .group_by(COLUNAS_DIMENSAO + ["indicador", "valor"])
+        .agg(pl.len().cast(pl.Int64).alias("quantidade_registros"))
+        .with_columns(
+            pl.lit(execucao, dtype=SCHEMA_METRICAS["execucao"]).alias("execucao"),
+            pl.lit(versao_trusted, dtype=pl.Int64).alias("versao_trusted"),
+        )
+        .select(SCHEMA_METRICAS.names())
+        .sort(["indicador", "valor"] + COLUNAS_DIMENSAO, nulls_last=True)
+        .collect()
+    )
+
+
+def salvar_metricas_qualidade(
+    df: pl.DataFrame,
+    trusted_path: Path,
+    indicadores: list,
+    coluna_data: str,
+    execucao: datetime,
+    file_name: str,
+) -> pl.DataFrame:
+    """
+    Gera as métricas de qualidade da execução e as grava em um novo arquivo da pasta
+    de métricas do dataset. As métricas das execuções anteriores não são regravadas:
+    cada arquivo contém apenas a sua execução (ver `ler_metricas_qualidade`).
+
+    Deve ser chamada após a gravação da camada Trusted, para que a versão registrada
+    nas métricas seja a versão gravada na execução.
+
+    Args:
+        df (pl.DataFrame): Dataset da camada Trusted gravado na execução.
+        trusted_path (Path): Pasta do dataset na camada Trusted.
+        indicadores (list): Colunas com os indicadores de qualidade.
+        coluna_data (str): Coluna de data utilizada no mês das métricas.
+        execucao (datetime): Data e hora da execução do tratamento.
+        file_name (str): Nome do arquivo de métricas.
+
+    Returns:
+        pl.DataFrame: Métricas da execução.
+    """
+    path: Path = pasta_qualidade(trusted_path)
+    path.mkdir(parents=True, exist_ok=True)
+
+    df_execucao: pl.DataFrame = montar_metricas_qualidade(
+        df=df,
+        indicadores=indicadores,
+        coluna_data=coluna_data,
+        execucao=execucao,
+        versao_trusted=versao_atual(trusted_path),
+    )
+
+    salvar_parquet(
+        df=df_execucao,
+        path=path,
+        file_name=file_name,
+        perfil=PERFIL_POR_CAMADA["1-trusted"],
+    )
+
+    return df_execucao
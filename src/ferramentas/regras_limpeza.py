@@ -0,0 +1,291 @@
+"""
+Script para aplicar as regras de limpeza declarativas da camada Trusted.
+
+As regras de cada dataset ficam em src/etl/regras e são listas de dicionários, na
+ordem em que devem ser aplicadas. Cada regra gera (ou substitui) uma coluna:
+
+- "converter": converte a coluna para outro tipo, com o formato (ou a lista de
+  formatos) das datas e o valor padrão dos booleanos (ver
+  `src/ferramentas/conversores.py`);
+- "mapear": substitui os valores da coluna de origem conforme um dicionário;
+- "casos": classificação `when/then/otherwise`, com uma lista de (condição, valor)
+  e o valor padrão (`senao`);
+- "expressao": qualquer expressão do Polars;
+- "duplicidade": indica as linhas duplicadas considerando as colunas informadas (ou
+  todas as colunas do dataset bruto, exceto o arquivo de origem e a chave da linha).
+  Também são incluídos o identificador e o tamanho do grupo de linhas duplicadas
+  (`Grupo_<coluna>` e `Tamanho_Grupo_<coluna>`, ver `src/ferramentas/duplicidade.py`),
+  calculados sobre o dataset bruto, antes das demais regras.
+
+As regras são compiladas em lotes: todas as regras que não dependem de colunas
+geradas por outras regras são aplicadas em um único `with_columns`, as que dependem
+apenas destas no lote seguinte, e assim por diante. Com isso, incluir uma regra não
+adiciona uma nova passagem pelos dados, e o resultado é o mesmo de aplicar as regras
+uma a uma, na ordem da lista.
+
+As colunas geradas por regras "mapear" e "casos" cujo tipo no schema da camada
+Trusted é um `pl.Enum` são convertidas na própria regra (ver `tipar_regras`). Os
+valores declarados na regra (valores do mapeamento, valores dos casos) são conferidos
+com as categorias do Enum na montagem do plano, e um valor da coluna de origem sem
+mapeamento interrompe a execução na regra, com o nome da coluna e os valores não
+mapeados na mensagem de erro.
+"""
+
+import polars as pl
+
+from src.ferramentas.conversores import converter_booleano, converter_data
+from src.ferramentas.duplicidade import marcar_duplicidades
+from src.ferramentas.funcoes_suporte import COLUNA_ARQUIVO_ORIGEM, COLUNA_CHAVE_LINHA
+
+TIPOS_REGRA: set = {"converter", "mapear", "casos", "expressao", "duplicidade"}
+
+
+def valor_expressao(valor) -> pl.Expr:
+    """
+    Converte o valor de uma regra em expressão (valores literais viram `pl.lit`).
+
+    Args:
+        valor: Valor literal ou expressão do Polars.
+
+    Returns:
+        pl.Expr: Expressão do valor.
+    """
+    return valor if isinstance(valor, pl.Expr) else pl.lit(valor)
+
+
+def colunas_grupo_duplicidade(regra: dict) -> tuple[str, str]:
+    """
+    Retorna os nomes das colunas do identificador e do tamanho do grupo de linhas
+    duplicadas de uma regra de duplicidade.
+
+    Args:
+        regra (dict): Regra de duplicidade.
+
+    Returns:
+        tuple[str, str]: Coluna do identificador e coluna do tamanho do grupo.
+    """
+    return f"Grupo_{regra['coluna']}", f"Tamanho_Grupo_{regra['coluna']}"
+
+
+def grupos_de_duplicidade(regras: list) -> list:
+    """
+    Retorna as colunas consideradas em cada regra de duplicidade de um dataset.
+
+    Args:
+        regras (list): Regras do dataset.
+
+    Returns:
+        list: Lista de colunas de cada regra (`None` quando todas as colunas do
+            dataset bruto são consideradas).
+    """
+    return [
+        regra.get("colunas") for regra in regras if regra.get("tipo") == "duplicidade"
+    ]
+
+
+def valores_declarados(regra: dict) -> set:
+    """
+    Retorna os valores literais que uma regra "mapear" ou "casos" pode gerar.
+
+    Args:
+        regra (dict): Regra "mapear" ou "casos".
+
+    Returns:
+        set: Valores do mapeamento ou valores literais dos casos e do valor padrão
+            (expressões e valores nulos são desconsiderados).
+    """
+    if regra["tipo"] == "mapear":
+        valores: list = list(regra["valores"].values())
+    else:
+        valores = [valor for _, valor in regra["casos"]] + [regra["senao"]]
+
+    return {
+        valor
+        for valor in valores
+        if valor is not None and not isinstance(valor, pl.Expr)
+    }
+
+
+def tipar_regras(regras: list, schema: dict) -> list:
+    """
+    Inclui o tipo Enum do schema nas regras "mapear" e "casos" que geram colunas
+    Enum, conferindo os valores declarados em cada regra com as categorias do Enum.
+
+    Args:
+        regras (list): Regras do dataset.
+        schema (dict): Schema do dataset na camada Trusted (nomes em minúsculas).
+
+    Returns:
+        list: Regras com o tipo (`dtype`) das colunas Enum.
+
+    Raises:
+        ValueError: Quando uma regra declara valores que não existem no Enum.
+    """
+    tipadas: list = []
+    for regra in regras:
+        dtype: pl.DataType | None = schema.get(regra["coluna"].lower())
+        if regra.get("tipo") not in ("mapear", "casos") or not isinstance(
+            dtype, pl.Enum
+        ):
+            tipadas.append(regra)
+            continue
+
+        fora: list = sorted(valores_declarados(regra) - set(dtype.categories))
+        if fora:
+            raise ValueError(
+                f"Regra {regra['coluna']} com valores que não existem no Enum da "
+                f"coluna: {fora}"
+            )
+
+        tipadas.append({**regra, "dtype": dtype})
+
+    return tipadas
+
+
+def compilar_regra(regra: dict) -> tuple[pl.Expr, set]:
+    """
+    Compila uma regra em uma expressão do Polars.
+
+    Args:
+        regra (dict): Regra a ser compilada.
+
+    Returns:
+        tuple[pl.Expr, set]: Expressão da regra e colunas lidas pela expressão.
+    """
+    if regra.get("tipo") not in TIPOS_REGRA:
+        raise ValueError(
+            f"Tipo de regra inválido para a coluna {regra.get('coluna')}: "
+            f"{regra.get('tipo')}"
+        )
+
+    coluna: str = regra["coluna"]
+    origem: pl.Expr = pl.col(regra.get("origem", coluna))
+
+    if regra["tipo"] == "converter":
+        if "formato" in regra:
+            expressao: pl.Expr = converter_data(origem, regra["formato"])
+        elif regra["dtype"] == pl.Boolean:
+            expressao = converter_booleano(origem, padrao=regra.get("padrao"))
+        else:
+            expressao = origem.cast(regra["dtype"])
+    elif regra["tipo"] == "mapear":
+        expressao = origem.replace(regra["valores"])
+    elif regra["tipo"] == "casos":
+        condicao, valor = regra["casos"][0]
+        expressao = pl.when(condicao).then(valor_expressao(valor))
+        for condicao, valor in regra["casos"][1:]:
+            expressao = expressao.when(condicao).then(valor_expressao(valor))
+        expressao = expressao.otherwise(valor_expressao(regra["senao"]))
+    elif regra["tipo"] == "expressao":
+        expressao = regra["expressao"]
+    else:
+        # O tamanho do grupo é calculado antes das regras (ver `aplicar_regras`)
+        expressao = pl.col(colunas_grupo_duplicidade(regra)[1]) > 1
+
+    # Colunas Enum (ver `tipar_regras`): um valor sem mapeamento interrompe a
+    # execução nesta regra, e não apenas na seleção das colunas finais
+    if regra["tipo"] in ("mapear", "casos") and "dtype" in regra:
+        expressao = expressao.cast(regra["dtype"])
+
+    expressao = expressao.alias(coluna)
+
+    return expressao, set(expressao.meta.root_names())
+
+
+def compilar_regras(regras: list) -> list[list[pl.Expr]]:
+    """
+    Compila as regras de um dataset em lotes de expressões independentes.
+
+    Cada regra é colocada no primeiro lote posterior aos lotes das regras que geram
+    as colunas que ela lê. Uma regra que substitui uma coluna nunca é colocada antes
+    das regras anteriores que leem essa coluna (no mesmo lote, elas ainda leem o
+    valor original, como na aplicação uma a uma).
+
+    Args:
+        regras (list): Regras do dataset, na ordem de aplicação.
+
+    Returns:
+        list[list[pl.Expr]]: Lotes de expressões, cada um aplicado em um
+            `with_columns`.
+    """
+    lotes: list = []
+    # Lote da última regra que gerou cada coluna
+    lote_gerador: dict = {}
+    # Maior lote das regras que leram cada coluna desde a última vez que foi gerada
+    lote_leitor: dict = {}
+
+    for regra in regras:
+        expressao, lidas = compilar_regra(regra)
+        coluna: str = regra["coluna"]
+
+        lote: int = max(
+            [lote_gerador[c] + 1 for c in lidas if c in lote_gerador]
+            + [lote_gerador[coluna] + 1 if coluna in lote_gerador else 0]
+            + [lote_leitor.get(coluna, 0)]
+        )
+
+        if lote == len(lotes):
+            lotes.append([])
+        lotes[lote].append(expressao)
+
+        for c in lidas:
+            lote_leitor[c] = max(lote_leitor.get(c, 0), lote)
+        lote_gerador[coluna] = lote
+        lote_leitor.pop(coluna, None)
+
+    return lotes
+
+
+def aplicar_regras(
+    df: pl.DataFrame | pl.LazyFrame, regras: list, schema: dict | None = None
+) -> pl.DataFrame | pl.LazyFrame:
+    """
+    Aplica as regras de limpeza de um dataset.
+
+    Args:
+        df (pl.DataFrame | pl.LazyFrame): Dataset bruto.
+        regras (list): Regras do dataset, na ordem de aplicação.
+        schema (dict | None): Schema do dataset na camada Trusted, utilizado para
+            converter as colunas Enum nas próprias regras (ver `tipar_regras`).
+
+    Returns:
+        pl.DataFrame | pl.LazyFrame: Dataset com as colunas geradas pelas regras.
+
+    Raises:
+        ValueError: Quando uma regra declara valores que não existem no Enum da
+            coluna gerada.
+    """
+    if schema is not None:
+        regras = tipar_regras(regras=regras, schema=schema)
+
+    colunas_dataset: list = df.collect_schema().names()
+
+    # Os grupos de linhas duplicadas são identificados no dataset bruto
+    grupos: list = []
+    for regra in regras:
+        if regra.get("tipo") != "duplicidade":
+            continue
+
+        colunas: list = regra.get("colunas") or [
+            c
+            for c in colunas_dataset
+            if c not in [COLUNA_ARQUIVO_ORIGEM, COLUNA_CHAVE_LINHA]
+        ]
+        ausentes: list = [c for c in colunas if c not in colunas_dataset]
+        if ausentes:
+            raise ValueError(
+                f"Regra de duplicidade {regra['coluna']} com colunas que não existem "
+                f"no dataset bruto: {ausentes}"
+            )
+
+        grupos.append((colunas, *colunas_grupo_duplicidade(regra)))
+
+    if grupos:
+        # Todas as regras de duplicidade juntas, para que os hashes sejam
+        # reaproveitados entre elas
+        df = marcar_duplicidades(df=df, grupos=grupos)
+
+    for lote in compilar_regras(regras):
+        df = df.with_columns(lote)
+
+    return df
@@ -0,0 +1,135 @@
+"""
+Script para validar o schema de um dataset tratado antes da sua execução.
+
+O schema do plano (`collect_schema`) é comparado com o schema esperado da camada
+Trusted sem ler os dados, gerando um relatório com as colunas ausentes, as colunas
+extras e as colunas com tipo diferente do esperado. Assim, uma mudança nas colunas
+dos arquivos de origem ou nas regras de limpeza interrompe o tratamento logo na
+montagem do plano, e não ao final de uma execução completa.
+
+Uma diferença de tipo é aceita quando a conversão não pode falhar nem mudar os
+valores durante a execução (ex.: texto para Categorical, inteiro para decimal). Texto
+para Enum não é aceito: a conversão falharia apenas na execução, ao encontrar um
+valor fora do Enum. As colunas Enum devem ser geradas já com o tipo do schema, pelas
+regras que conferem os valores (ver `tipar_regras` em
+`src/ferramentas/regras_limpeza.py`).
+"""
+
+import polars as pl
+
+
+class ErroSchema(ValueError):
+    """
+    Erro de um dataset cujo schema não corresponde ao schema esperado.
+
+    Args:
+        relatorio (pl.DataFrame): Diferenças encontradas (ver `comparar_schema`).
+    """
+
+    def __init__(self, relatorio: pl.DataFrame):
+        self.relatorio: pl.DataFrame = relatorio
+
+        with pl.Config(tbl_rows=-1, fmt_str_lengths=60, tbl_hide_dataframe_shape=True):
+            super().__init__(f"Schema diferente do esperado:\n{relatorio}")
+
+
+def conversao_segura(atual: pl.DataType, esperado: pl.DataType) -> bool:
+    """
+    Indica se a conversão entre dois tipos pode ser feita sem falhas nem perda de
+    informação durante a execução.
+
+    Args:
+        atual (pl.DataType): Tipo da coluna no dataset.
+        esperado (pl.DataType): Tipo da coluna no schema.
+
+    Returns:
+        bool: True quando a conversão é segura.
+    """
+    if atual == esperado or atual == pl.Null or esperado == pl.String:
+        return True
+
+    # Texto para categorias abertas (no Enum, a conversão pode falhar na execução)
+    if isinstance(esperado, pl.Categorical):
+        return atual in (pl.String, pl.Categorical)
+
+    return atual.is_integer() and esperado.is_float()
+
+
+def comparar_schema(atual: pl.Schema, esperado: dict) -> pl.DataFrame:
+    """
+    Compara o schema de um dataset com o schema esperado.
+
+    Args:
+        atual (pl.Schema): Schema do dataset.
+        esperado (dict): Schema esperado.
+
+    Returns:
+        pl.DataFrame: Uma linha por diferença, com a coluna, o problema ("ausente",
+            "extra" ou "tipo"), os tipos atual e esperado e se a conversão do tipo é
+            segura. Vazio quando os schemas são iguais.
+    """
+    diferencas: list = []
+
+    for coluna, dtype in esperado.items():
+        if coluna not in atual:
+            diferencas.append((coluna, "ausente", None, dtype, False))
+        elif atual[coluna] != dtype:
+            diferencas.append(
+                (
+                    coluna,
+                    "tipo",
+                    atual[coluna],
+                    dtype,
+                    conversao_segura(atual[coluna], dtype),
+                )
+            )
+
+    for coluna, dtype in atual.items():
+        if coluna not in esperado:
+            diferencas.append((coluna, "extra", dtype, None, False))
+
+    return pl.DataFrame(
+        [
+            (coluna, problema, str(tipo_atual), str(tipo_esperado), segura)
+            for coluna, problema, tipo_atual, tipo_esperado, segura in diferencas
+        ],
+        schema={
+            "coluna": pl.String,
+            "problema": pl.String,
+            "tipo_atual": pl.String,
+            "tipo_esperado": pl.String,
+            "conversao_segura": pl.Boolean,
+        },
+        orient="row",
+    )
+
+
+def validar_schema(
+    df: pl.DataFrame | pl.LazyFrame, schema: dict, permitir_extras: bool = True
+) -> None:
+    """
+    Valida o schema de um dataset (ou do plano de um dataset, sem executá-lo).
+
+    Args:
+        df (pl.DataFrame | pl.LazyFrame): Dataset tratado.
+        schema (dict): Schema esperado.
+        permitir_extras (bool): Aceita colunas que não estão no schema (descartadas
+            na seleção das colunas finais).
+
+    Raises:
+        ErroSchema: Quando há colunas ausentes, colunas com conversão de tipo não
+            segura ou, se não permitidas, colunas extras. O relatório do erro inclui
+            também as colunas extras.
+    """
+    # Conversões seguras são feitas na seleção das colunas finais
+    relatorio: pl.DataFrame = comparar_schema(df.collect_schema(), schema).filter(
+        ~pl.col("conversao_segura")
+    )
+    falhas: pl.DataFrame = relatorio.filter(
+        (pl.col("problema") != "extra") | (not permitir_extras)
+    )
+
+    # As colunas extras também são informadas, já que uma coluna renomeada aparece
+    # como ausente (nome esperado) e extra (nome atual)
+    if not falhas.is_empty():
+        raise ErroSchema(relatorio)
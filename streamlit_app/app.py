@@ -2,8 +2,14 @@
 Script principal para iniciar o app Streamlit.
 """
 
+import sys
 import streamlit as st
 
+from pathlib import Path
+
+# Permite que as páginas utilizem as ferramentas do ETL (src/)
+sys.path.append(str(Path(__file__).parent.parent))
+
 pgs: dict = {
     "HOME": [
         st.Page(title="Sobre", page="./app_pages/home/about.py"),
@@ -54,6 +60,16 @@ pgs: dict = {
             title="Historico de Vendas de Veículos",
             page="./app_pages/camada_trusted/historico_venda_veiculos_trusted_page.py",
         ),
+        st.Page(
+            title="Qualidade dos Dados",
+            page="./app_pages/camada_trusted/qualidade_dados_page.py",
+        ),
+    ],
+    "CAMADA GOLD": [
+        st.Page(
+            title="Resultado por Filial",
+            page="./app_pages/camada_gold/resultado_filial_mes_page.py",
+        ),
     ],
     "CONSIDERAÇÕES FINAIS": [
         st.Page(
@@ -0,0 +1,131 @@
+"""
+Página de visualização do resultado consolidado (camada gold) por filial e mês.
+"""
+
+import streamlit as st
+import polars as pl
+
+from pathlib import Path
+from src.ferramentas.catalogo import versao_disponivel
+from src.ferramentas.marts import COLUNA_MES, filtrar_meses
+
+
+# region ----- Página Config -----
+st.set_page_config(
+    page_title="Resultado por Filial",
+    layout="wide",
+)
+
+# endregion
+
+
+# region ----- Caminho Arquivos -----
+CAMADA_GOLD_PATH: Path = (
+    Path(__file__).parent.parent.parent.parent
+    / "src"
+    / "etl"
+    / "data"
+    / "2-gold"
+    / "resultado-filial-mes"
+)
+
+# Versão publicada mais recente do mart, conforme o catálogo da camada (sem versão
+# publicada, a página exibe um aviso)
+VERSAO, PARQUET_FILE_PATH = versao_disponivel(CAMADA_GOLD_PATH)
+
+
+@st.cache_data
+def read_parquet(path: Path, versao: int) -> pl.DataFrame:
+    # A versão faz parte da chave do cache: os dados só são relidos quando uma nova
+    # versão completa do mart for publicada
+    return pl.read_parquet(source=path)
+
+
+# endregion
+
+
+# region ----- Introdução -----
+st.title("Resultado por Filial")
+st.write(
+    """
+        Nesta página é apresentado o resultado consolidado de cada filial, mês a
+        mês, combinando o lucro das vendas de peças, das vendas de veículos e dos
+        serviços realizados. Linhas duplicadas são consideradas apenas uma vez no
+        lucro.
+
+        ---
+    """
+)
+# endregion
+
+# O mart combina três históricos da camada Trusted e só é montado pelo pipeline
+if PARQUET_FILE_PATH is None:
+    st.info(
+        "Resultado ainda não consolidado. Execute o pipeline "
+        "(`python -m src.etl.pipeline`) para gerar o mart da camada Gold."
+    )
+    st.stop()
+
+# region ----- Tabela -----
+st.subheader("Tabela")
+periodo: tuple = st.date_input("Período", value=(), format="DD/MM/YYYY")
+data_inicio, data_fim = periodo if len(periodo) == 2 else (None, None)
+
+df: pl.DataFrame = filtrar_meses(
+    read_parquet(path=PARQUET_FILE_PATH, versao=VERSAO),
+    data_inicio=data_inicio,
+    data_fim=data_fim,
+)
+st.dataframe(df)
+st.divider()
+# endregion
+
+
+# region ----- Visualizações -----
+st.subheader("Visualizações")
+
+st.write(" #### Lucro Total por Filial")
+st.write(
+    """
+        Neste gráfico comparamos o lucro total de cada filial no período,
+        separado pela origem do resultado.
+    """
+)
+
+df_lucro_filial = (
+    df.group_by("cod_filial_ajustado")
+    .agg(pl.col("lucro_pecas", "lucro_veiculos", "lucro_servicos").sum())
+    .sort("cod_filial_ajustado")
+)
+
+st.bar_chart(
+    df_lucro_filial,
+    x="cod_filial_ajustado",
+    x_label="",
+    y=["lucro_pecas", "lucro_veiculos", "lucro_servicos"],
+    y_label="",
+)
+
+st.write(" #### Evolução do Lucro Total")
+st.write(
+    """
+        Aqui acompanhamos o lucro total de todas as filiais mês a mês.
+    """
+)
+
+df_lucro_mes = (
+    df.group_by(COLUNA_MES)
+    .agg(pl.col("lucro_pecas", "lucro_veiculos", "lucro_servicos", "lucro_total").sum())
+    .sort(COLUNA_MES)
+)
+
+st.line_chart(
+    df_lucro_mes,
+    x=COLUNA_MES,
+    x_label="",
+    y=["lucro_pecas", "lucro_veiculos", "lucro_servicos", "lucro_total"],
+    y_label="",
+)
+
+st.divider()
+# endregion
@@ -7,6 +7,7 @@ import streamlit as st
 import polars as pl
 
 from pathlib import Path
+from src.ferramentas.catalogo import versao_publicada
 
 
 # region ----- Página Config -----
@@ -28,11 +29,15 @@ CAMADA_RAW_PATH: Path = (
     / "historico-venda-pecas"
 )
 
-parquet_file = os.listdir(CAMADA_RAW_PATH)[0]
+# Versão publicada mais recente do dataset, conforme o catálogo da camada
+VERSAO, PARQUET_FILE_PATH = versao_publicada(CAMADA_RAW_PATH)
 
 
-def read_parquet() -> pl.DataFrame:
-    return pl.read_parquet(source=CAMADA_RAW_PATH / parquet_file)
+@st.cache_data
+def read_parquet(path: Path, versao: int) -> pl.DataFrame:
+    # A versão faz parte da chave do cache: os dados só são relidos quando uma nova
+    # versão completa do dataset for publicada
+    return pl.read_parquet(source=path)
 
 
 # endregion
@@ -57,7 +62,7 @@ st.write(
 
 # region ----- Tabela -----
 st.subheader("Tabela")
-df: pl.DataFrame = read_parquet()
+df: pl.DataFrame = read_parquet(path=PARQUET_FILE_PATH, versao=VERSAO)
 st.dataframe(df)
 st.divider()
 # endregion
@@ -82,7 +87,7 @@ with col3:
 with col4:
     st.metric(
         "Tamanho do arquivo (em Parquet)",
-        str(round(os.path.getsize(CAMADA_RAW_PATH / parquet_file) / 1024, 2)) + " KB",
+        str(round(os.path.getsize(PARQUET_FILE_PATH) / 1024, 2)) + " KB",
         border=True,
     )
 
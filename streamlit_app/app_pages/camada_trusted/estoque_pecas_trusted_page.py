@@ -7,6 +7,9 @@ import streamlit as st
 import polars as pl
 
 from pathlib import Path
+from src.ferramentas.catalogo import versao_disponivel
+from src.ferramentas.marts import COLUNAS_CONTROLE, montar_mart_trusted
+from src.ferramentas.pecas_canonicas import aplicar_catalogo_pecas
 from datetime import date
 
 
@@ -29,11 +32,64 @@ CAMADA_TRUSTED_PATH: Path = (
     / "estoque-pecas"
 )
 
-parquet_file = os.listdir(CAMADA_TRUSTED_PATH)[0]
+# Versão publicada mais recente do dataset, conforme o catálogo da camada (sem
+# versão publicada, a página exibe um aviso)
+VERSAO, PARQUET_FILE_PATH = versao_disponivel(CAMADA_TRUSTED_PATH)
+
+CAMADA_GOLD_PATH: Path = (
+    Path(__file__).parent.parent.parent.parent
+    / "src"
+    / "etl"
+    / "data"
+    / "2-gold"
+    / "estoque-pecas-resumo"
+)
+
+# Mart da camada Gold com os valores já agregados das visualizações (sem mart
+# publicado, ver `read_mart`)
+VERSAO_MART, MART_FILE_PATH = versao_disponivel(CAMADA_GOLD_PATH)
+
+CATALOGO_PECAS_PATH: Path = (
+    Path(__file__).parent.parent.parent.parent
+    / "src"
+    / "etl"
+    / "data"
+    / "2-gold"
+    / "catalogo-pecas"
+)
+
+# Catálogo de peças canônicas da camada Gold (sem catálogo publicado, a tabela é
+# exibida sem as colunas da peça canônica)
+VERSAO_CATALOGO, CATALOGO_FILE_PATH = versao_disponivel(CATALOGO_PECAS_PATH)
+
+
+@st.cache_data
+def read_parquet(path: Path, versao: int) -> pl.DataFrame:
+    # A versão faz parte da chave do cache: os dados só são relidos quando uma nova
+    # versão completa do dataset for publicada
+    return pl.read_parquet(source=path)
 
 
-def read_parquet() -> pl.DataFrame:
-    return pl.read_parquet(source=CAMADA_TRUSTED_PATH / parquet_file)
+@st.cache_data
+def read_mart(path: Path | None, versao: int, versao_trusted: int) -> pl.DataFrame:
+    # Sem mart publicado na camada Gold, o mart é montado a partir da camada Trusted
+    # (a versão Trusted faz parte da chave do cache)
+    if path is None:
+        return montar_mart_trusted(
+            script="estoque-pecas", trusted_path=CAMADA_TRUSTED_PATH
+        )
+
+    return pl.read_parquet(source=path)
+
+
+@st.cache_data
+def read_catalogo(path: Path | None, versao: int) -> pl.DataFrame | None:
+    # A versão faz parte da chave do cache: o catálogo só é relido quando uma nova
+    # versão for publicada
+    if path is None:
+        return None
+
+    return pl.read_parquet(source=path)
 
 
 # endregion
@@ -53,10 +109,26 @@ st.write(
 )
 # endregion
 
+# Sem versão publicada na camada Trusted, não há dados a exibir
+if PARQUET_FILE_PATH is None:
+    st.info(
+        "Dataset ainda não tratado. Execute o pipeline "
+        "(`python -m src.etl.pipeline`) para gerar a camada Trusted."
+    )
+    st.stop()
+
 # region ----- Tabela -----
 st.subheader("Tabela")
-df: pl.DataFrame = read_parquet()
-st.dataframe(df)
+df: pl.DataFrame = read_parquet(path=PARQUET_FILE_PATH, versao=VERSAO)
+
+# Peça canônica de cada descrição (grafias diferentes da mesma peça), quando o
+# catálogo de peças canônicas estiver publicado
+catalogo_pecas: pl.DataFrame | None = read_catalogo(
+    path=CATALOGO_FILE_PATH, versao=VERSAO_CATALOGO
+)
+st.dataframe(
+    df if catalogo_pecas is None else aplicar_catalogo_pecas(df, catalogo_pecas)
+)
 st.divider()
 # endregion
 
@@ -70,11 +142,17 @@ col1, col2, col3, col4 = st.columns(spec=4, gap="small")
 with col1:
     st.metric("Total de linhas", df.height, border=True)
 
-    duplicadas = df.is_duplicated().sum()
+    # As colunas de controle do ETL (arquivo de origem, chave da linha) diferenciam
+    # linhas iguais, por isso não são consideradas
+    duplicadas = df.select(pl.exclude(COLUNAS_CONTROLE)).is_duplicated().sum()
     st.metric("Linhas duplicadas", duplicadas, border=True)
 
 with col2:
-    st.metric("Valores únicos por linha", df.n_unique(), border=True)
+    st.metric(
+        "Valores únicos por linha",
+        df.select(pl.exclude(COLUNAS_CONTROLE)).n_unique(),
+        border=True,
+    )
 
 with col3:
     st.metric("Total de colunas", df.width, border=True)
@@ -82,7 +160,7 @@ with col3:
 with col4:
     st.metric(
         "Tamanho do arquivo (em Parquet)",
-        str(round(os.path.getsize(CAMADA_TRUSTED_PATH / parquet_file) / 1024, 2))
+        str(round(os.path.getsize(PARQUET_FILE_PATH) / 1024, 2))
         + " KB",
         border=True,
     )
@@ -92,6 +170,12 @@ st.divider()
 
 
 # region ----- Visualizações -----
+# Os gráficos somam as linhas do mart da camada Gold, já agregado por filial,
+# categoria e obsolescência (linhas distintas)
+df_mart: pl.DataFrame = read_mart(
+    path=MART_FILE_PATH, versao=VERSAO_MART, versao_trusted=VERSAO
+)
+
 st.subheader("Quantidade de Peças por Unidade")
 st.write(
     """
@@ -102,14 +186,8 @@ st.write(
 )
 
 df_unidade_quantidade_veiculos = (
-    df.unique()
-    .group_by("nome_da_filial")
-    .agg(
-        pl.col("categoria_da_peca")
-        .count()
-        .cast(pl.Int64)
-        .alias("quantidade_total_pecas")
-    )
+    df_mart.group_by("nome_da_filial")
+    .agg(pl.col("quantidade_pecas").sum().alias("quantidade_total_pecas"))
     .sort("quantidade_total_pecas")
 )
 
@@ -130,9 +208,8 @@ st.write(
 )
 
 df_marca_quantidade_veiculos = (
-    df.unique()
-    .group_by("categoria_da_peca_padronizada")
-    .agg(pl.col("valor_da_peca_em_estoque").sum().cast(pl.Float64).alias("valor"))
+    df_mart.group_by("categoria_da_peca_padronizada")
+    .agg(pl.col("valor_em_estoque").sum().alias("valor"))
     .sort("valor")
 )
 
@@ -155,9 +232,8 @@ st.write(
 )
 
 df_categoria_obsolescencia = (
-    df.unique()
-    .group_by("classificacao_obsolescencia")
-    .agg(pl.col("valor_da_peca_em_estoque").sum().cast(pl.Float64).alias("valor"))
+    df_mart.group_by("classificacao_obsolescencia")
+    .agg(pl.col("valor_em_estoque").sum().alias("valor"))
     .sort("valor")
 )
 
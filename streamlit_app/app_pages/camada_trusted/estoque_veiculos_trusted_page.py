@@ -7,6 +7,8 @@ import streamlit as st
 import polars as pl
 
 from pathlib import Path
+from src.ferramentas.catalogo import versao_disponivel
+from src.ferramentas.marts import COLUNAS_CONTROLE, montar_mart_trusted
 from datetime import date
 
 
@@ -29,11 +31,41 @@ CAMADA_TRUSTED_PATH: Path = (
     / "estoque-veiculos"
 )
 
-parquet_file = os.listdir(CAMADA_TRUSTED_PATH)[0]
+# Versão publicada mais recente do dataset, conforme o catálogo da camada (sem
+# versão publicada, a página exibe um aviso)
+VERSAO, PARQUET_FILE_PATH = versao_disponivel(CAMADA_TRUSTED_PATH)
 
+CAMADA_GOLD_PATH: Path = (
+    Path(__file__).parent.parent.parent.parent
+    / "src"
+    / "etl"
+    / "data"
+    / "2-gold"
+    / "estoque-veiculos-resumo"
+)
+
+# Mart da camada Gold com os valores já agregados das visualizações (sem mart
+# publicado, ver `read_mart`)
+VERSAO_MART, MART_FILE_PATH = versao_disponivel(CAMADA_GOLD_PATH)
 
-def read_parquet() -> pl.DataFrame:
-    return pl.read_parquet(source=CAMADA_TRUSTED_PATH / parquet_file)
+
+@st.cache_data
+def read_parquet(path: Path, versao: int) -> pl.DataFrame:
+    # A versão faz parte da chave do cache: os dados só são relidos quando uma nova
+    # versão completa do dataset for publicada
+    return pl.read_parquet(source=path)
+
+
+@st.cache_data
+def read_mart(path: Path | None, versao: int, versao_trusted: int) -> pl.DataFrame:
+    # Sem mart publicado na camada Gold, o mart é montado a partir da camada Trusted
+    # (a versão Trusted faz parte da chave do cache)
+    if path is None:
+        return montar_mart_trusted(
+            script="estoque-veiculos", trusted_path=CAMADA_TRUSTED_PATH
+        )
+
+    return pl.read_parquet(source=path)
 
 
 # endregion
@@ -53,9 +85,17 @@ st.write(
 )
 # endregion
 
+# Sem versão publicada na camada Trusted, não há dados a exibir
+if PARQUET_FILE_PATH is None:
+    st.info(
+        "Dataset ainda não tratado. Execute o pipeline "
+        "(`python -m src.etl.pipeline`) para gerar a camada Trusted."
+    )
+    st.stop()
+
 # region ----- Tabela -----
 st.subheader("Tabela")
-df: pl.DataFrame = read_parquet()
+df: pl.DataFrame = read_parquet(path=PARQUET_FILE_PATH, versao=VERSAO)
 st.dataframe(df)
 st.divider()
 # endregion
@@ -70,11 +110,17 @@ col1, col2, col3, col4 = st.columns(spec=4, gap="small")
 with col1:
     st.metric("Total de linhas", df.height, border=True)
 
-    duplicadas = df.is_duplicated().sum()
+    # As colunas de controle do ETL (arquivo de origem, chave da linha) diferenciam
+    # linhas iguais, por isso não são consideradas
+    duplicadas = df.select(pl.exclude(COLUNAS_CONTROLE)).is_duplicated().sum()
     st.metric("Linhas duplicadas", duplicadas, border=True)
 
 with col2:
-    st.metric("Valores únicos por linha", df.n_unique(), border=True)
+    st.metric(
+        "Valores únicos por linha",
+        df.select(pl.exclude(COLUNAS_CONTROLE)).n_unique(),
+        border=True,
+    )
 
 with col3:
     st.metric("Total de colunas", df.width, border=True)
@@ -82,7 +128,7 @@ with col3:
 with col4:
     st.metric(
         "Tamanho do arquivo (em Parquet)",
-        str(round(os.path.getsize(CAMADA_TRUSTED_PATH / parquet_file) / 1024, 2))
+        str(round(os.path.getsize(PARQUET_FILE_PATH) / 1024, 2))
         + " KB",
         border=True,
     )
@@ -92,6 +138,12 @@ st.divider()
 
 
 # region ----- Visualizações -----
+# Os gráficos somam as linhas do mart da camada Gold, já agregado por filial, marca
+# e tempo no estoque (linhas distintas)
+df_mart: pl.DataFrame = read_mart(
+    path=MART_FILE_PATH, versao=VERSAO_MART, versao_trusted=VERSAO
+)
+
 st.subheader("Quantidade de Veículos por Unidade")
 st.write(
     """
@@ -102,14 +154,8 @@ st.write(
 )
 
 df_unidade_quantidade_veiculos = (
-    df.unique()
-    .group_by("nome_da_filial")
-    .agg(
-        pl.col("marca_do_veiculo")
-        .count()
-        .cast(pl.Int64)
-        .alias("quantidade_total_veiculos")
-    )
+    df_mart.group_by("nome_da_filial")
+    .agg(pl.col("quantidade_veiculos").sum().alias("quantidade_total_veiculos"))
     .sort("quantidade_total_veiculos")
 )
 
@@ -130,14 +176,8 @@ st.write(
 )
 
 df_marca_quantidade_veiculos = (
-    df.unique()
-    .group_by("marca_do_veiculo")
-    .agg(
-        pl.col("marca_do_veiculo")
-        .count()
-        .cast(pl.Int64)
-        .alias("quantidade_total_veiculos")
-    )
+    df_mart.group_by("marca_do_veiculo")
+    .agg(pl.col("quantidade_veiculos").sum().alias("quantidade_total_veiculos"))
     .sort("quantidade_total_veiculos")
 )
 
@@ -162,7 +202,9 @@ st.write(
 if "marca_selecionada" not in st.session_state:
     st.session_state.marca_selecionada = "Todas as Marcas"
 
-marca_unica = ["Todas as Marcas"] + sorted(df["marca_do_veiculo"].unique().to_list())
+marca_unica = ["Todas as Marcas"] + sorted(
+    df_mart["marca_do_veiculo"].unique().to_list()
+)
 
 if st.session_state.marca_selecionada not in marca_unica:
     st.session_state.marca_selecionada = "Todas as Marcas"
@@ -181,19 +223,13 @@ marca_selecionada = st.selectbox(
 st.session_state.marca_selecionada = marca_selecionada
 
 if marca_selecionada != "Todas as Marcas":
-    df_filtrado = df.filter(pl.col("marca_do_veiculo") == marca_selecionada)
+    df_filtrado = df_mart.filter(pl.col("marca_do_veiculo") == marca_selecionada)
 else:
-    df_filtrado = df
+    df_filtrado = df_mart
 
 df_tempo_veiculos = (
-    df_filtrado.unique()
-    .group_by("classificacao_tempo_no_estoque")
-    .agg(
-        pl.col("marca_do_veiculo")
-        .count()
-        .cast(pl.Int64)
-        .alias("quantidade_total_veiculos")
-    )
+    df_filtrado.group_by("classificacao_tempo_no_estoque")
+    .agg(pl.col("quantidade_veiculos").sum().alias("quantidade_total_veiculos"))
     .sort("classificacao_tempo_no_estoque")
 )
 
@@ -2,12 +2,18 @@
 Página de visualização dos dados tratados (camada trusted) do historico de veículos..
 """
 
-import os
 import streamlit as st
 import polars as pl
 
 from pathlib import Path
 from datetime import date
+from src.ferramentas.catalogo import versao_disponivel
+from src.ferramentas.funcoes_suporte import ler_parquet_particionado, tamanho_em_disco
+from src.ferramentas.marts import (
+    COLUNAS_CONTROLE,
+    filtrar_meses,
+    montar_mart_trusted,
+)
 
 
 # region ----- Página Config -----
@@ -29,11 +35,53 @@ CAMADA_TRUSTED_PATH: Path = (
     / "historico-servicos"
 )
 
-parquet_file = os.listdir(CAMADA_TRUSTED_PATH)[0]
+# Versão publicada mais recente do dataset, conforme o catálogo da camada (sem
+# versão publicada, a página exibe um aviso)
+VERSAO, PARQUET_FILE_PATH = versao_disponivel(CAMADA_TRUSTED_PATH)
 
+CAMADA_GOLD_PATH: Path = (
+    Path(__file__).parent.parent.parent.parent
+    / "src"
+    / "etl"
+    / "data"
+    / "2-gold"
+    / "historico-servicos-resumo"
+)
 
-def read_parquet() -> pl.DataFrame:
-    return pl.read_parquet(source=CAMADA_TRUSTED_PATH / parquet_file)
+# Mart da camada Gold com os valores já agregados das visualizações (sem mart
+# publicado, ver `read_mart`)
+VERSAO_MART, MART_FILE_PATH = versao_disponivel(CAMADA_GOLD_PATH)
+
+
+@st.cache_data
+def read_parquet(
+    path: Path,
+    versao: int,
+    data_inicio: date | None = None,
+    data_fim: date | None = None,
+) -> pl.DataFrame:
+    # A versão faz parte da chave do cache: os dados só são relidos quando uma nova
+    # versão completa do dataset for publicada. Apenas as partições (ano/mês) do
+    # período selecionado são lidas
+    return ler_parquet_particionado(
+        path=path,
+        coluna_data="data_de_realizacao_do_servico",
+        data_inicio=data_inicio,
+        data_fim=data_fim,
+    ).collect()
+
+
+@st.cache_data
+def read_mart(path: Path | None, versao: int, versao_trusted: int) -> pl.DataFrame:
+    # O mart é pequeno e lido por completo: as visualizações apenas somam as linhas
+    # dos meses do período selecionado. Sem mart publicado na camada Gold, o mart é
+    # montado a partir da camada Trusted (a versão Trusted faz parte da chave do cache)
+    if path is None:
+        return montar_mart_trusted(
+            script="historico-servicos", trusted_path=CAMADA_TRUSTED_PATH
+        )
+
+    return pl.read_parquet(source=path)
 
 
 # endregion
@@ -53,9 +101,22 @@ st.write(
 )
 # endregion
 
+# Sem versão publicada na camada Trusted, não há dados a exibir
+if PARQUET_FILE_PATH is None:
+    st.info(
+        "Dataset ainda não tratado. Execute o pipeline "
+        "(`python -m src.etl.pipeline`) para gerar a camada Trusted."
+    )
+    st.stop()
+
 # region ----- Tabela -----
 st.subheader("Tabela")
-df: pl.DataFrame = read_parquet()
+periodo: tuple = st.date_input("Período", value=(), format="DD/MM/YYYY")
+data_inicio, data_fim = periodo if len(periodo) == 2 else (None, None)
+
+df: pl.DataFrame = read_parquet(
+    path=PARQUET_FILE_PATH, versao=VERSAO, data_inicio=data_inicio, data_fim=data_fim
+)
 st.dataframe(df)
 st.divider()
 # endregion
@@ -70,11 +131,17 @@ col1, col2, col3, col4 = st.columns(spec=4, gap="small")
 with col1:
     st.metric("Total de linhas", df.height, border=True)
 
-    duplicadas = df.is_duplicated().sum()
+    # As colunas de controle do ETL (arquivo de origem, chave da linha) diferenciam
+    # linhas iguais, por isso não são consideradas
+    duplicadas = df.select(pl.exclude(COLUNAS_CONTROLE)).is_duplicated().sum()
     st.metric("Linhas duplicadas", duplicadas, border=True)
 
 with col2:
-    st.metric("Valores únicos por linha", df.n_unique(), border=True)
+    st.metric(
+        "Valores únicos por linha",
+        df.select(pl.exclude(COLUNAS_CONTROLE)).n_unique(),
+        border=True,
+    )
 
 with col3:
     st.metric("Total de colunas", df.width, border=True)
@@ -82,7 +149,7 @@ with col3:
 with col4:
     st.metric(
         "Tamanho do arquivo (em Parquet)",
-        str(round(os.path.getsize(CAMADA_TRUSTED_PATH / parquet_file) / 1024, 2))
+        str(round(tamanho_em_disco(PARQUET_FILE_PATH) / 1024, 2))
         + " KB",
         border=True,
     )
@@ -94,6 +161,14 @@ st.divider()
 # region ----- Visualizações -----
 st.subheader("Visualizações")
 
+# Os gráficos somam as linhas do mart da camada Gold, já agregado por mês, filial e
+# categoria do serviço, dos meses completos do período selecionado
+df_mart: pl.DataFrame = filtrar_meses(
+    read_mart(path=MART_FILE_PATH, versao=VERSAO_MART, versao_trusted=VERSAO),
+    data_inicio=data_inicio,
+    data_fim=data_fim,
+)
+
 st.write(" #### Valor de Serviços Realizados por Unidade")
 st.write(
     """
@@ -104,13 +179,8 @@ st.write(
 )
 
 df_unidade_valor_servicos = (
-    df.unique()
-    .group_by("nome_da_filial")
-    .agg(
-        pl.col("valor_do_servico_ajustado_com_revisao_gratuita")
-        .sum()
-        .alias("valor_total_servicos")
-    )
+    df_mart.group_by("nome_da_filial")
+    .agg(pl.col("valor_total_servicos").sum())
     .sort("valor_total_servicos")
 )
 
@@ -133,13 +203,8 @@ st.write(
 )
 
 df_tipo_servico_valor_servicos = (
-    df.unique()
-    .group_by("categoria_do_servico_padronizada")
-    .agg(
-        pl.col("valor_do_servico_ajustado_com_revisao_gratuita")
-        .sum()
-        .alias("valor_total_servicos")
-    )
+    df_mart.group_by("categoria_do_servico_padronizada")
+    .agg(pl.col("valor_total_servicos").sum())
     .sort("valor_total_servicos")
 )
 
@@ -164,8 +229,8 @@ st.write(
 
 # considerar a coluna Numero_Da_OS_De_Servico para saber o total de serviços
 df_categoria_servico_quantidade_servicos = (
-    df.group_by("categoria_do_servico_padronizada")
-    .agg(pl.col("numero_da_os_de_servico").count().alias("quantidade_total_servicos"))
+    df_mart.group_by("categoria_do_servico_padronizada")
+    .agg(pl.col("quantidade_servicos").sum().alias("quantidade_total_servicos"))
     .sort("quantidade_total_servicos")
 )
 
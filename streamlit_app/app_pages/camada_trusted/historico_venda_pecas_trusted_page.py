@@ -2,12 +2,19 @@
 Página de visualização dos dados tratados (camada trusted) do histórico de venda de peças.
 """
 
-import os
 import streamlit as st
 import polars as pl
 
 from pathlib import Path
 from datetime import date
+from src.ferramentas.catalogo import versao_disponivel
+from src.ferramentas.funcoes_suporte import ler_parquet_particionado, tamanho_em_disco
+from src.ferramentas.marts import (
+    COLUNAS_CONTROLE,
+    filtrar_meses,
+    montar_mart_trusted,
+)
+from src.ferramentas.pecas_canonicas import aplicar_catalogo_pecas
 
 
 # region ----- Página Config -----
@@ -29,11 +36,76 @@ CAMADA_TRUSTED_PATH: Path = (
     / "historico-venda-pecas"
 )
 
-parquet_file = os.listdir(CAMADA_TRUSTED_PATH)[0]
+# Versão publicada mais recente do dataset, conforme o catálogo da camada (sem
+# versão publicada, a página exibe um aviso)
+VERSAO, PARQUET_FILE_PATH = versao_disponivel(CAMADA_TRUSTED_PATH)
+
+CAMADA_GOLD_PATH: Path = (
+    Path(__file__).parent.parent.parent.parent
+    / "src"
+    / "etl"
+    / "data"
+    / "2-gold"
+    / "historico-venda-pecas-resumo"
+)
+
+# Mart da camada Gold com os valores já agregados das visualizações (sem mart
+# publicado, ver `read_mart`)
+VERSAO_MART, MART_FILE_PATH = versao_disponivel(CAMADA_GOLD_PATH)
+
+CATALOGO_PECAS_PATH: Path = (
+    Path(__file__).parent.parent.parent.parent
+    / "src"
+    / "etl"
+    / "data"
+    / "2-gold"
+    / "catalogo-pecas"
+)
+
+# Catálogo de peças canônicas da camada Gold (sem catálogo publicado, a tabela é
+# exibida sem as colunas da peça canônica)
+VERSAO_CATALOGO, CATALOGO_FILE_PATH = versao_disponivel(CATALOGO_PECAS_PATH)
+
+
+@st.cache_data
+def read_parquet(
+    path: Path,
+    versao: int,
+    data_inicio: date | None = None,
+    data_fim: date | None = None,
+) -> pl.DataFrame:
+    # A versão faz parte da chave do cache: os dados só são relidos quando uma nova
+    # versão completa do dataset for publicada. Apenas as partições (ano/mês) do
+    # período selecionado são lidas
+    return ler_parquet_particionado(
+        path=path,
+        coluna_data="data_da_venda",
+        data_inicio=data_inicio,
+        data_fim=data_fim,
+    ).collect()
+
+
+@st.cache_data
+def read_mart(path: Path | None, versao: int, versao_trusted: int) -> pl.DataFrame:
+    # O mart é pequeno e lido por completo: as visualizações apenas somam as linhas
+    # dos meses do período selecionado. Sem mart publicado na camada Gold, o mart é
+    # montado a partir da camada Trusted (a versão Trusted faz parte da chave do cache)
+    if path is None:
+        return montar_mart_trusted(
+            script="historico-venda-pecas", trusted_path=CAMADA_TRUSTED_PATH
+        )
 
+    return pl.read_parquet(source=path)
 
-def read_parquet() -> pl.DataFrame:
-    return pl.read_parquet(source=CAMADA_TRUSTED_PATH / parquet_file)
+
+@st.cache_data
+def read_catalogo(path: Path | None, versao: int) -> pl.DataFrame | None:
+    # A versão faz parte da chave do cache: o catálogo só é relido quando uma nova
+    # versão for publicada
+    if path is None:
+        return None
+
+    return pl.read_parquet(source=path)
 
 
 # endregion
@@ -56,11 +128,32 @@ st.write(
 )
 # endregion
 
+# Sem versão publicada na camada Trusted, não há dados a exibir
+if PARQUET_FILE_PATH is None:
+    st.info(
+        "Dataset ainda não tratado. Execute o pipeline "
+        "(`python -m src.etl.pipeline`) para gerar a camada Trusted."
+    )
+    st.stop()
+
 # region ----- Tabela -----
 st.subheader("Tabela")
-df: pl.DataFrame = read_parquet()
+periodo: tuple = st.date_input("Período", value=(), format="DD/MM/YYYY")
+data_inicio, data_fim = periodo if len(periodo) == 2 else (None, None)
+
+df: pl.DataFrame = read_parquet(
+    path=PARQUET_FILE_PATH, versao=VERSAO, data_inicio=data_inicio, data_fim=data_fim
+)
 df = df.drop("lucro_da_venda_recalculado")
-st.dataframe(df)
+
+# Peça canônica de cada descrição (grafias diferentes da mesma peça), quando o
+# catálogo de peças canônicas estiver publicado
+catalogo_pecas: pl.DataFrame | None = read_catalogo(
+    path=CATALOGO_FILE_PATH, versao=VERSAO_CATALOGO
+)
+st.dataframe(
+    df if catalogo_pecas is None else aplicar_catalogo_pecas(df, catalogo_pecas)
+)
 st.divider()
 # endregion
 
@@ -74,11 +167,17 @@ col1, col2, col3, col4 = st.columns(spec=4, gap="small")
 with col1:
     st.metric("Total de linhas", df.height, border=True)
 
-    duplicadas = df.is_duplicated().sum()
+    # As colunas de controle do ETL (arquivo de origem, chave da linha) diferenciam
+    # linhas iguais, por isso não são consideradas
+    duplicadas = df.select(pl.exclude(COLUNAS_CONTROLE)).is_duplicated().sum()
     st.metric("Linhas duplicadas", duplicadas, border=True)
 
 with col2:
-    st.metric("Valores únicos por linha", df.n_unique(), border=True)
+    st.metric(
+        "Valores únicos por linha",
+        df.select(pl.exclude(COLUNAS_CONTROLE)).n_unique(),
+        border=True,
+    )
 
 with col3:
     st.metric("Total de colunas", df.width, border=True)
@@ -86,7 +185,7 @@ with col3:
 with col4:
     st.metric(
         "Tamanho do arquivo (em Parquet)",
-        str(round(os.path.getsize(CAMADA_TRUSTED_PATH / parquet_file) / 1024, 2))
+        str(round(tamanho_em_disco(PARQUET_FILE_PATH) / 1024, 2))
         + " KB",
         border=True,
     )
@@ -98,6 +197,15 @@ st.divider()
 # region ----- Visualizações -----
 st.subheader("Visualizações")
 
+# Os gráficos somam as linhas do mart da camada Gold, já agregado por mês,
+# confiabilidade do registro e departamento da venda, dos meses completos do período
+# selecionado
+df_mart: pl.DataFrame = filtrar_meses(
+    read_mart(path=MART_FILE_PATH, versao=VERSAO_MART, versao_trusted=VERSAO),
+    data_inicio=data_inicio,
+    data_fim=data_fim,
+)
+
 st.write(" #### Total de Registros Confiáveis e Não Confiáveis")
 st.write(
     """
@@ -113,8 +221,8 @@ st.write(
     """
 )
 
-df_total_registros = df.group_by("confiabilidade_do_registro").agg(
-    pl.col("tipo_de_venda_da_peca").count().alias("total_registros_confiaveis")
+df_total_registros = df_mart.group_by("confiabilidade_do_registro").agg(
+    pl.col("quantidade_registros").sum().alias("total_registros_confiaveis")
 )
 
 st.bar_chart(
@@ -139,14 +247,14 @@ st.write(
     """
 )
 
-df_registros_com_custo_da_venda_desproporcional = df.filter(
-    pl.col("custo_da_peca") > 400000
-)
-
 df_registros_com_custo_da_venda_desproporcional = (
-    df_registros_com_custo_da_venda_desproporcional.group_by(
-        "departamento_da_venda",
-    ).agg(pl.count().alias("quantidade_de_registros"))
+    df_mart.group_by("departamento_da_venda")
+    .agg(
+        pl.col("quantidade_custo_desproporcional")
+        .sum()
+        .alias("quantidade_de_registros")
+    )
+    .filter(pl.col("quantidade_de_registros") > 0)
 )
 
 
@@ -172,12 +280,10 @@ st.write(
 )
 
 
-df_registros_com_custo_da_venda_sem_valor = df.filter(pl.col("custo_da_peca") == 0)
-
 df_registros_com_custo_da_venda_sem_valor = (
-    df_registros_com_custo_da_venda_sem_valor.group_by(
-        "departamento_da_venda",
-    ).agg(pl.count().alias("quantidade_de_registros"))
+    df_mart.group_by("departamento_da_venda")
+    .agg(pl.col("quantidade_custo_sem_valor").sum().alias("quantidade_de_registros"))
+    .filter(pl.col("quantidade_de_registros") > 0)
 )
 
 st.bar_chart(
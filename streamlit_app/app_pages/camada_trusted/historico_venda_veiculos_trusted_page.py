@@ -2,12 +2,18 @@
 Página de visualização dos dados tratados (camada trusted) do histórico de venda de veículos.
 """
 
-import os
 import streamlit as st
 import polars as pl
 
 from pathlib import Path
 from datetime import date
+from src.ferramentas.catalogo import versao_disponivel
+from src.ferramentas.funcoes_suporte import ler_parquet_particionado, tamanho_em_disco
+from src.ferramentas.marts import (
+    COLUNAS_CONTROLE,
+    filtrar_meses,
+    montar_mart_trusted,
+)
 
 
 # region ----- Página Config -----
@@ -29,11 +35,53 @@ CAMADA_TRUSTED_PATH: Path = (
     / "historico-venda-veiculos"
 )
 
-parquet_file = os.listdir(CAMADA_TRUSTED_PATH)[0]
+# Versão publicada mais recente do dataset, conforme o catálogo da camada (sem
+# versão publicada, a página exibe um aviso)
+VERSAO, PARQUET_FILE_PATH = versao_disponivel(CAMADA_TRUSTED_PATH)
 
+CAMADA_GOLD_PATH: Path = (
+    Path(__file__).parent.parent.parent.parent
+    / "src"
+    / "etl"
+    / "data"
+    / "2-gold"
+    / "historico-venda-veiculos-resumo"
+)
 
-def read_parquet() -> pl.DataFrame:
-    return pl.read_parquet(source=CAMADA_TRUSTED_PATH / parquet_file)
+# Mart da camada Gold com os valores já agregados das visualizações (sem mart
+# publicado, ver `read_mart`)
+VERSAO_MART, MART_FILE_PATH = versao_disponivel(CAMADA_GOLD_PATH)
+
+
+@st.cache_data
+def read_parquet(
+    path: Path,
+    versao: int,
+    data_inicio: date | None = None,
+    data_fim: date | None = None,
+) -> pl.DataFrame:
+    # A versão faz parte da chave do cache: os dados só são relidos quando uma nova
+    # versão completa do dataset for publicada. Apenas as partições (ano/mês) do
+    # período selecionado são lidas
+    return ler_parquet_particionado(
+        path=path,
+        coluna_data="data_da_venda",
+        data_inicio=data_inicio,
+        data_fim=data_fim,
+    ).collect()
+
+
+@st.cache_data
+def read_mart(path: Path | None, versao: int, versao_trusted: int) -> pl.DataFrame:
+    # O mart é pequeno e lido por completo: as visualizações apenas somam as linhas
+    # dos meses do período selecionado. Sem mart publicado na camada Gold, o mart é
+    # montado a partir da camada Trusted (a versão Trusted faz parte da chave do cache)
+    if path is None:
+        return montar_mart_trusted(
+            script="historico-venda-veiculos", trusted_path=CAMADA_TRUSTED_PATH
+        )
+
+    return pl.read_parquet(source=path)
 
 
 # endregion
@@ -53,9 +101,22 @@ st.write(
 )
 # endregion
 
+# Sem versão publicada na camada Trusted, não há dados a exibir
+if PARQUET_FILE_PATH is None:
+    st.info(
+        "Dataset ainda não tratado. Execute o pipeline "
+        "(`python -m src.etl.pipeline`) para gerar a camada Trusted."
+    )
+    st.stop()
+
 # region ----- Tabela -----
 st.subheader("Tabela")
-df: pl.DataFrame = read_parquet()
+periodo: tuple = st.date_input("Período", value=(), format="DD/MM/YYYY")
+data_inicio, data_fim = periodo if len(periodo) == 2 else (None, None)
+
+df: pl.DataFrame = read_parquet(
+    path=PARQUET_FILE_PATH, versao=VERSAO, data_inicio=data_inicio, data_fim=data_fim
+)
 st.dataframe(df)
 st.divider()
 # endregion
@@ -70,11 +131,17 @@ col1, col2, col3, col4 = st.columns(spec=4, gap="small")
 with col1:
     st.metric("Total de linhas", df.height, border=True)
 
-    duplicadas = df.is_duplicated().sum()
+    # As colunas de controle do ETL (arquivo de origem, chave da linha) diferenciam
+    # linhas iguais, por isso não são consideradas
+    duplicadas = df.select(pl.exclude(COLUNAS_CONTROLE)).is_duplicated().sum()
     st.metric("Linhas duplicadas", duplicadas, border=True)
 
 with col2:
-    st.metric("Valores únicos por linha", df.n_unique(), border=True)
+    st.metric(
+        "Valores únicos por linha",
+        df.select(pl.exclude(COLUNAS_CONTROLE)).n_unique(),
+        border=True,
+    )
 
 with col3:
     st.metric("Total de colunas", df.width, border=True)
@@ -82,7 +149,7 @@ with col3:
 with col4:
     st.metric(
         "Tamanho do arquivo (em Parquet)",
-        str(round(os.path.getsize(CAMADA_TRUSTED_PATH / parquet_file) / 1024, 2))
+        str(round(tamanho_em_disco(PARQUET_FILE_PATH) / 1024, 2))
         + " KB",
         border=True,
     )
@@ -94,6 +161,15 @@ st.divider()
 # region ----- Visualizações -----
 st.subheader("Visualizações")
 
+# Os gráficos somam as linhas do mart da camada Gold, já agregado por mês,
+# confiabilidade do registro, marca e tipo de venda, dos meses completos do período
+# selecionado
+df_mart: pl.DataFrame = filtrar_meses(
+    read_mart(path=MART_FILE_PATH, versao=VERSAO_MART, versao_trusted=VERSAO),
+    data_inicio=data_inicio,
+    data_fim=data_fim,
+)
+
 st.write(" #### Total de Registros Confiáveis e Não Confiáveis")
 st.write(
     """
@@ -107,8 +183,8 @@ st.write(
     """
 )
 
-df_total_registros = df.group_by("confiabilidade_do_registro").agg(
-    pl.col("marca_do_veiculo").count().alias("total_registros_confiaveis")
+df_total_registros = df_mart.group_by("confiabilidade_do_registro").agg(
+    pl.col("quantidade_registros").sum().alias("total_registros_confiaveis")
 )
 
 st.bar_chart(
@@ -130,13 +206,14 @@ st.write(
     """
 )
 
-df_vendas_normais = df.filter(pl.col("tipo_de_venda_do_veiculo") == "NORMAL")
+df_vendas_normais = df_mart.filter(pl.col("tipo_de_venda_do_veiculo") == "NORMAL")
 
-# Agrupa por marca e classificação de tempo no estoque
+# Agrupa por marca (média a partir da soma e da quantidade de dias do mart)
 df_estoque_marcas = df_vendas_normais.group_by("marca_do_veiculo").agg(
-    pl.mean("dias_que_o_carro_ficou_no_estoque_ajustado").alias(
-        "media_de_dias_em_estoque"
-    )
+    (
+        pl.col("soma_dias_em_estoque").sum()
+        / pl.col("quantidade_dias_em_estoque").sum()
+    ).alias("media_de_dias_em_estoque")
 )
 
 st.bar_chart(
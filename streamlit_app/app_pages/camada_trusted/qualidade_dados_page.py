@@ -0,0 +1,162 @@
+"""
+Página de acompanhamento das métricas de qualidade dos dados (camada trusted).
+"""
+
+import streamlit as st
+import polars as pl
+
+from pathlib import Path
+from src.ferramentas.catalogo import versao_disponivel
+from src.ferramentas.marts import filtrar_meses
+from src.ferramentas.qualidade import ler_metricas_qualidade, pasta_qualidade
+
+
+# region ----- Página Config -----
+st.set_page_config(
+    page_title="Qualidade dos Dados",
+    layout="wide",
+)
+
+# endregion
+
+
+# region ----- Caminho Arquivos -----
+CAMADA_TRUSTED_PATH: Path = (
+    Path(__file__).parent.parent.parent.parent / "src" / "etl" / "data" / "1-trusted"
+)
+
+# Datasets com indicadores de qualidade gerados na camada Trusted
+DATASETS_QUALIDADE: dict = {
+    "Historico de Vendas de Peças": "historico-venda-pecas",
+    "Historico de Vendas de Veículos": "historico-venda-veiculos",
+}
+
+
+@st.cache_data
+def read_metricas(path: Path, versao: int) -> pl.DataFrame:
+    # A versão faz parte da chave do cache: as métricas só são relidas quando uma
+    # nova execução da camada Trusted for publicada. Cada execução possui o seu
+    # arquivo, e todos os arquivos da pasta são lidos juntos
+    return ler_metricas_qualidade(path).collect()
+
+
+# endregion
+
+
+# region ----- Introdução -----
+st.title("Qualidade dos Dados")
+st.write(
+    """
+        Nesta página acompanhamos os indicadores de qualidade dos históricos de
+        venda (duplicidade, classificação do custo e do lucro, colunas deslocadas e
+        confiabilidade do registro).
+
+        As quantidades são contadas por filial e mês a cada execução da camada
+        Trusted, de forma que esta página lê apenas as métricas já agregadas, sem
+        percorrer os datasets completos.
+
+        ---
+    """
+)
+# endregion
+
+# region ----- Tabela -----
+st.subheader("Tabela")
+dataset_escolhido = st.selectbox("Selecione um dataset", list(DATASETS_QUALIDADE))
+periodo: tuple = st.date_input("Período", value=(), format="DD/MM/YYYY")
+data_inicio, data_fim = periodo if len(periodo) == 2 else (None, None)
+
+QUALIDADE_PATH: Path = pasta_qualidade(
+    CAMADA_TRUSTED_PATH / DATASETS_QUALIDADE[dataset_escolhido]
+)
+
+# A versão publicada mais recente é a chave do cache das métricas (sem versão
+# publicada, a página exibe um aviso)
+VERSAO, PARQUET_FILE_PATH = versao_disponivel(QUALIDADE_PATH)
+if PARQUET_FILE_PATH is None:
+    st.info(
+        "Métricas ainda não geradas para este dataset. Execute o pipeline "
+        "(`python -m src.etl.pipeline`) para gerar a camada Trusted."
+    )
+    st.stop()
+
+df_metricas: pl.DataFrame = filtrar_meses(
+    read_metricas(path=QUALIDADE_PATH, versao=VERSAO),
+    data_inicio=data_inicio,
+    data_fim=data_fim,
+)
+
+# Métricas da execução mais recente
+df_ultima_execucao: pl.DataFrame = df_metricas.filter(
+    pl.col("execucao") == pl.col("execucao").max()
+)
+st.dataframe(df_ultima_execucao)
+st.divider()
+# endregion
+
+
+# region ----- Visualizações -----
+st.subheader("Visualizações")
+
+st.write(" #### Registros por Indicador de Qualidade")
+st.write(
+    """
+        Neste gráfico apresentamos, para a execução mais recente, a quantidade de
+        registros de cada valor do indicador selecionado, por filial.
+    """
+)
+
+indicador_escolhido = st.selectbox(
+    "Selecione um indicador", df_metricas["indicador"].unique().sort().to_list()
+)
+
+df_indicador = (
+    df_ultima_execucao.filter(pl.col("indicador") == indicador_escolhido)
+    .pivot(
+        on="valor",
+        index="cod_filial_ajustado",
+        values="quantidade_registros",
+        aggregate_function="sum",
+    )
+    .fill_null(0)
+    .sort("cod_filial_ajustado")
+)
+
+st.bar_chart(
+    df_indicador,
+    x="cod_filial_ajustado",
+    x_label="",
+    y=[coluna for coluna in df_indicador.columns if coluna != "cod_filial_ajustado"],
+    y_label="",
+)
+
+st.write(" #### Evolução por Execução")
+st.write(
+    """
+        Aqui acompanhamos a quantidade de registros de cada valor do indicador
+        selecionado a cada execução da camada Trusted.
+    """
+)
+
+df_evolucao = (
+    df_metricas.filter(pl.col("indicador") == indicador_escolhido)
+    .pivot(
+        on="valor",
+        index="execucao",
+        values="quantidade_registros",
+        aggregate_function="sum",
+    )
+    .fill_null(0)
+    .sort("execucao")
+)
+
+st.line_chart(
+    df_evolucao,
+    x="execucao",
+    x_label="",
+    y=[coluna for coluna in df_evolucao.columns if coluna != "execucao"],
+    y_label="",
+)
+
+st.divider()
+# endregion
@@ -0,0 +1,26 @@
+"""
+Testes da gravação atômica das versões de cada dataset.
+"""
+
+import polars as pl
+import pytest
+
+from pathlib import Path
+from src.ferramentas.catalogo import gravacao_atomica
+
+DF: pl.DataFrame = pl.DataFrame({"valor": [1, 2]})
+
+
+def test_gravacao_com_nome_em_uso_falha_sem_substituir_a_versao(tmp_path: Path):
+    file_name: str = "dataset-2024-03-01-10-00-00"
+
+    with gravacao_atomica(path=tmp_path, file_name=file_name) as temporario:
+        DF.write_parquet(temporario, partition_by="valor")
+
+    # Segunda gravação no mesmo segundo (mesmo nome), detectada antes de gravar
+    with pytest.raises(FileExistsError):
+        with gravacao_atomica(path=tmp_path, file_name=file_name) as temporario:
+            DF.write_parquet(temporario, partition_by="valor")
+
+    assert pl.read_parquet(tmp_path / file_name).height == 2
+    assert [p.name for p in tmp_path.iterdir()] == [file_name]
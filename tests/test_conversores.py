@@ -0,0 +1,55 @@
+"""
+Testes dos conversores utilizados pelas regras da camada Trusted.
+"""
+
+import datetime
+
+import polars as pl
+import pytest
+
+from src.ferramentas.conversores import (
+    FORMATOS_DATA,
+    converter_booleano,
+    converter_data,
+    converter_moeda,
+)
+
+
+def test_data_fora_dos_formatos_interrompe_a_conversao():
+    df: pl.DataFrame = pl.DataFrame({"data": ["2024-01-31", "31/01/2024", "sem data"]})
+
+    with pytest.raises(pl.exceptions.InvalidOperationError, match="sem data"):
+        df.select(converter_data("data", FORMATOS_DATA))
+
+
+def test_data_fora_dos_formatos_fica_nula_sem_strict():
+    df: pl.DataFrame = pl.DataFrame({"data": ["2024-01-31", "31/01/2024", "sem data"]})
+
+    assert df.select(converter_data("data", FORMATOS_DATA, strict=False))[
+        "data"
+    ].to_list() == [datetime.date(2024, 1, 31), datetime.date(2024, 1, 31), None]
+
+
+def test_moeda_converte_apenas_os_valores_fora_do_formato_numerico():
+    df: pl.DataFrame = pl.DataFrame({"valor": ["10.5", "R$ 1.234,56", " 7,5 ", None]})
+
+    assert df.select(converter_moeda("valor"))["valor"].to_list() == [
+        10.5,
+        1234.56,
+        7.5,
+        None,
+    ]
+
+    with pytest.raises(pl.exceptions.InvalidOperationError, match="invalido"):
+        pl.DataFrame({"valor": ["10.5", "invalido"]}).select(converter_moeda("valor"))
+
+
+def test_booleano_desconsidera_espacos_nas_pontas():
+    df: pl.DataFrame = pl.DataFrame({"ativo": [" SIM", "nao ", "talvez"]})
+
+    assert df.select(converter_booleano("ativo"))["ativo"].to_list() == [
+        True,
+        False,
+        None,
+    ]
+
@@ -0,0 +1,58 @@
+"""
+Testes da marcação das linhas duplicadas pelo hash de cada linha.
+"""
+
+import polars as pl
+
+from src.ferramentas.duplicidade import marcar_duplicidade, marcar_duplicidades
+
+DF: pl.DataFrame = pl.DataFrame(
+    {
+        "filial": ["A", "A", "A", "B", "B"],
+        "valor": ["10", "10", "10", "20", "20"],
+        "vendedor": ["ANA", "ANA", "RUI", "ANA", "ANA"],
+    }
+)
+
+GRUPOS: list = [
+    (["filial", "valor", "vendedor"], "grupo_completo", "tamanho_completo"),
+    (["filial", "valor"], "grupo_parcial", "tamanho_parcial"),
+]
+
+
+def particao(df: pl.DataFrame, coluna_grupo: str) -> list:
+    """
+    Substitui o identificador de cada grupo pela primeira linha do grupo.
+    """
+    return (
+        df.with_row_index()
+        .select(
+            pl.when(pl.col(coluna_grupo).is_not_null()).then(
+                pl.col("index").first().over(coluna_grupo)
+            )
+        )[:, 0]
+        .to_list()
+    )
+
+
+def test_hash_reaproveitado_marca_os_mesmos_grupos():
+    df: pl.DataFrame = marcar_duplicidades(DF, grupos=GRUPOS)
+
+    assert df["tamanho_completo"].to_list() == [2, 2, 1, 2, 2]
+    assert df["tamanho_parcial"].to_list() == [3, 3, 3, 2, 2]
+
+    for colunas, coluna_grupo, coluna_tamanho in GRUPOS:
+        separado: pl.DataFrame = marcar_duplicidade(
+            DF,
+            colunas=colunas,
+            coluna_grupo=coluna_grupo,
+            coluna_tamanho=coluna_tamanho,
+        )
+        assert particao(df, coluna_grupo) == particao(separado, coluna_grupo)
+
+
+def test_agrupamento_em_partes_marca_os_mesmos_grupos():
+    janela: pl.DataFrame = marcar_duplicidades(DF, grupos=GRUPOS)
+    partes: pl.DataFrame = marcar_duplicidades(DF, grupos=GRUPOS, particoes=3)
+
+    assert janela.equals(partes)
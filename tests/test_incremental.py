@@ -0,0 +1,71 @@
+"""
+Testes do processamento incremental da camada Trusted.
+
+As linhas já tratadas só podem ser reaproveitadas quando a versão Trusted foi gravada
+com o mesmo código de tratamento; caso contrário, o dataset é tratado por completo.
+"""
+
+import polars as pl
+
+from datetime import date
+from pathlib import Path
+from src.ferramentas.funcoes_suporte import salvar_parquet_particionado
+from src.ferramentas.incremental import incluir_chave_linha, processar_incremental
+
+LF_RAW: pl.LazyFrame = pl.LazyFrame(
+    {
+        "Data_da_Venda": [date(2024, 1, 5), date(2024, 2, 1)],
+        "Valor": [10, 20],
+    }
+)
+
+SCHEMA: dict = {
+    "data_da_venda": pl.Date,
+    "valor": pl.Int64,
+    "chave_linha": pl.UInt64,
+}
+
+
+def tratar_dataset(lf: pl.LazyFrame) -> pl.LazyFrame:
+    return lf.rename(str.lower)
+
+
+def gravar_trusted(trusted_path: Path, codigo: str) -> None:
+    salvar_parquet_particionado(
+        df=tratar_dataset(incluir_chave_linha(LF_RAW)).collect(),
+        file_name="trusted",
+        path=trusted_path,
+        coluna_data="data_da_venda",
+        codigo=codigo,
+    )
+
+
+def test_mesmo_codigo_reaproveita_a_versao_trusted(tmp_path: Path):
+    gravar_trusted(tmp_path, codigo="a")
+
+    # Sem linhas novas na camada Raw, nada é tratado
+    assert (
+        processar_incremental(
+            lf_raw=LF_RAW,
+            trusted_path=tmp_path,
+            tratar_dataset=tratar_dataset,
+            schema=SCHEMA,
+            grupos=[],
+            codigo="a",
+        )
+        is None
+    )
+
+
+def test_codigo_alterado_trata_o_dataset_completo(tmp_path: Path):
+    gravar_trusted(tmp_path, codigo="a")
+
+    df: pl.DataFrame = processar_incremental(
+        lf_raw=LF_RAW,
+        trusted_path=tmp_path,
+        tratar_dataset=tratar_dataset,
+        schema=SCHEMA,
+        grupos=[],
+        codigo="b",
+    )
+    assert df.height == 2
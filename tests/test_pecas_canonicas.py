@@ -0,0 +1,92 @@
+"""
+Testes do catálogo de peças canônicas montado a partir do catálogo anterior.
+"""
+
+import polars as pl
+
+from src.ferramentas.pecas_canonicas import (
+    assinatura_variante,
+    canonizar_descricoes,
+    gerar_ngramas,
+    normalizar_descricao,
+    pares_candidatos,
+)
+
+DESCRICOES: pl.DataFrame = pl.DataFrame(
+    {
+        "descricao_da_peca": [
+            "PASTILHA FREIO DIANTEIRA CJ",
+            "PASTILHA FREIO DIANTEIRO",
+        ],
+        "quantidade_registros": [5, 3],
+    }
+)
+
+DESCRICAO_NOVA: pl.DataFrame = pl.DataFrame(
+    {"descricao_da_peca": ["PASTILHA FREIO DIANTEIRA"], "quantidade_registros": [1]}
+)
+
+
+def grupos(catalogo: pl.DataFrame) -> set:
+    """
+    Agrupa as descrições do catálogo por peça canônica, sem o identificador.
+    """
+    return {
+        frozenset(descricoes)
+        for descricoes in catalogo.group_by("id_peca_canonica")
+        .agg("descricao_da_peca")["descricao_da_peca"]
+        .to_list()
+    }
+
+
+def test_descricao_nova_une_grupos_ja_catalogados():
+    catalogo_anterior: pl.DataFrame = canonizar_descricoes(DESCRICOES)
+    assert catalogo_anterior["id_peca_canonica"].n_unique() == 2
+
+    todas: pl.DataFrame = pl.concat([DESCRICOES, DESCRICAO_NOVA])
+    catalogo: pl.DataFrame = canonizar_descricoes(todas, catalogo_anterior)
+
+    # Mesmo agrupamento de um catálogo montado do zero, mantendo o identificador e a
+    # descrição canônica do grupo anterior com mais registros
+    assert grupos(catalogo) == grupos(canonizar_descricoes(todas))
+    assert catalogo["id_peca_canonica"].n_unique() == 1
+    assert catalogo["id_peca_canonica"][0] == (
+        catalogo_anterior.filter(
+            pl.col("descricao_da_peca") == "PASTILHA FREIO DIANTEIRA CJ"
+        )["id_peca_canonica"][0]
+    )
+    assert catalogo["descricao_canonica"].unique().to_list() == [
+        "PASTILHA FREIO DIANTEIRA CJ"
+    ]
+
+
+def test_grupos_ja_catalogados_mantem_o_identificador():
+    catalogo_anterior: pl.DataFrame = canonizar_descricoes(DESCRICOES)
+
+    catalogo: pl.DataFrame = canonizar_descricoes(
+        DESCRICOES.with_columns(pl.col("quantidade_registros") * 10),
+        catalogo_anterior,
+    )
+
+    assert catalogo.select("descricao_da_peca", "id_peca_canonica").equals(
+        catalogo_anterior.select("descricao_da_peca", "id_peca_canonica")
+    )
+
+
+def test_pares_candidatos_apenas_das_descricoes_novas():
+    ngramas: pl.DataFrame = gerar_ngramas(
+        pl.concat([DESCRICOES, DESCRICAO_NOVA])
+        .select(normalizar_descricao())
+        .with_columns(assinatura_variante())
+    )
+    nova: str = "PASTILHA FREIO DIANTEIRA"
+
+    # Os mesmos pares da blocagem completa que possuem a descrição nova, sem o par
+    # entre as duas descrições já catalogadas
+    completos: pl.DataFrame = pares_candidatos(ngramas)
+    assert completos.height == 3
+    assert pares_candidatos(ngramas, novas=[nova]).sort(pl.all()).equals(
+        completos.filter(
+            (pl.col("descricao_a") == nova) | (pl.col("descricao_b") == nova)
+        ).sort(pl.all())
+    )
@@ -0,0 +1,44 @@
+"""
+Testes da gravação das métricas de qualidade, um arquivo por execução.
+"""
+
+import polars as pl
+
+from datetime import date, datetime
+from pathlib import Path
+from src.ferramentas.qualidade import (
+    ler_metricas_qualidade,
+    pasta_qualidade,
+    salvar_metricas_qualidade,
+)
+
+DF: pl.DataFrame = pl.DataFrame(
+    {
+        "cod_filial_ajustado": ["1", "1", "2"],
+        "data_da_venda": [date(2024, 1, 5), date(2024, 1, 9), date(2024, 2, 1)],
+        "status_duplicidade": ["UNICA", "DUPLICADA", "UNICA"],
+    }
+)
+
+
+def test_cada_execucao_grava_apenas_as_suas_metricas(tmp_path: Path):
+    trusted_path: Path = tmp_path / "historico-venda-pecas"
+
+    for execucao in [datetime(2024, 3, 1, 10), datetime(2024, 3, 2, 10)]:
+        salvar_metricas_qualidade(
+            df=DF,
+            trusted_path=trusted_path,
+            indicadores=["status_duplicidade"],
+            coluna_data="data_da_venda",
+            execucao=execucao,
+            file_name=f"metricas-{execucao:%Y-%m-%d}.parquet",
+        )
+
+    path: Path = pasta_qualidade(trusted_path)
+    segunda: pl.DataFrame = pl.read_parquet(path / "metricas-2024-03-02.parquet")
+    assert segunda["execucao"].unique().to_list() == [datetime(2024, 3, 2, 10)]
+    assert segunda.height == 3
+
+    metricas: pl.DataFrame = ler_metricas_qualidade(path).collect()
+    assert metricas.height == 6
+    assert metricas.group_by("execucao").agg(pl.len())["len"].to_list() == [3, 3]
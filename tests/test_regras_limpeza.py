@@ -0,0 +1,58 @@
+"""
+Testes da conversão das colunas Enum nas regras de limpeza da camada Trusted.
+"""
+
+import polars as pl
+import pytest
+
+from src.ferramentas.regras_limpeza import aplicar_regras
+from src.ferramentas.validacao_schema import ErroSchema, validar_schema
+
+SCHEMA: dict = {"categoria_padronizada": pl.Enum(["FREIO", "MOTOR"])}
+
+REGRA_MAPEAR: dict = {
+    "coluna": "Categoria_Padronizada",
+    "tipo": "mapear",
+    "origem": "Categoria",
+    "valores": {"freio": "FREIO", "motor": "MOTOR"},
+}
+
+
+def test_mapeamento_gera_a_coluna_enum():
+    lf: pl.LazyFrame = aplicar_regras(
+        df=pl.LazyFrame({"Categoria": ["freio", "motor", None]}),
+        regras=[REGRA_MAPEAR],
+        schema=SCHEMA,
+    )
+
+    assert (
+        lf.collect_schema()["Categoria_Padronizada"] == SCHEMA["categoria_padronizada"]
+    )
+    assert lf.collect()["Categoria_Padronizada"].to_list() == ["FREIO", "MOTOR", None]
+
+
+def test_valor_declarado_fora_do_enum_falha_na_montagem_do_plano():
+    regra: dict = {**REGRA_MAPEAR, "valores": {"freio": "FREIO", "pneu": "PNEU"}}
+
+    with pytest.raises(ValueError, match="PNEU"):
+        aplicar_regras(
+            df=pl.LazyFrame({"Categoria": ["freio"]}), regras=[regra], schema=SCHEMA
+        )
+
+
+def test_valor_sem_mapeamento_informa_os_valores():
+    lf: pl.LazyFrame = aplicar_regras(
+        df=pl.LazyFrame({"Categoria": ["freio", "pneu"]}),
+        regras=[REGRA_MAPEAR],
+        schema=SCHEMA,
+    )
+
+    with pytest.raises(pl.exceptions.InvalidOperationError, match="pneu"):
+        lf.collect()
+
+
+def test_texto_para_enum_nao_e_conversao_segura():
+    with pytest.raises(ErroSchema):
+        validar_schema(
+            df=pl.LazyFrame({"categoria_padronizada": ["FREIO"]}), schema=SCHEMA
+        )
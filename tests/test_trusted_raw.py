@@ -0,0 +1,51 @@
+"""
+Testes dos scripts da camada Trusted sobre os dados da camada Raw versionados no
+repositório.
+
+Cada versão Raw registrada no catálogo (inclusive as gravadas antes de alterações na
+camada Raw, como a coluna do arquivo de origem) deve continuar sendo tratada pelo
+código atual, conforme o schema da camada Trusted.
+"""
+
+import runpy
+import polars as pl
+import pytest
+
+from pathlib import Path
+from src.etl.pipeline import DATASETS, SCRIPTS_PATH
+from src.ferramentas.catalogo import listar_versoes
+
+
+def versoes_raw(dataset: str) -> list:
+    """
+    Lista as versões da camada Raw de um dataset existentes em disco.
+
+    Args:
+        dataset (str): Nome do dataset.
+
+    Returns:
+        list: Parâmetros do teste (script e arquivo Raw) de cada versão.
+    """
+    script: Path = SCRIPTS_PATH / "1-trusted" / f"{dataset}-trusted.py"
+    raw_path: Path = SCRIPTS_PATH.parent / "data" / "0-raw" / dataset
+
+    return [
+        pytest.param(script, raw_path / versao["arquivo"], id=versao["arquivo"])
+        for versao in listar_versoes(raw_path)
+        if (raw_path / versao["arquivo"]).exists()
+    ]
+
+
+@pytest.mark.parametrize(
+    "script, arquivo_raw",
+    [param for dataset in DATASETS for param in versoes_raw(dataset)],
+)
+def test_tratamento_da_versao_raw(script: Path, arquivo_raw: Path) -> None:
+    # Apenas as definições do script, sem executar o bloco principal (gravação)
+    namespace: dict = runpy.run_path(path_name=str(script), run_name="teste")
+
+    lf_raw: pl.LazyFrame = pl.scan_parquet(source=arquivo_raw)
+    df_trusted: pl.DataFrame = namespace["tratar_dataset"](lf_raw).collect()
+
+    linhas_raw: int = lf_raw.select(pl.len()).collect().item()
+    assert df_trusted.height == linhas_raw